@@ -1,18 +1,33 @@
 #!/usr/bin/python3
 # -*- coding: utf-8 -*-
 
+from classes.startupTimer import StartupTimer
+
+import os
 import sys
 import platform
 import ctypes
 
-from classes.interface.MainWindow import MainWindow
-from classes.ressourcesFilepath import Images
-
-from PyQt5.QtWidgets import QApplication, QSplashScreen
-from PyQt5.QtGui import QPixmap
+from classes.commandLine import CommandLine
 
 if __name__.endswith('__main__'):
 
+    #Library commands run without the interface
+    if sys.argv[1:2] and sys.argv[1] in ('-h', '--help') + CommandLine.COMMANDS:
+        sys.exit(CommandLine.run(sys.argv[1:]))
+
+    #Startup check: python DragonShout.py --startup-budget [seconds]
+    #The application starts offscreen, prints the time of each phase and quits,
+    #failing if the window took longer than the budget to be painted.
+    budget = None
+    if sys.argv[1:2] == ['--startup-budget']:
+        budget = float(sys.argv[2]) if sys.argv[2:3] else StartupTimer.FIRSTPAINTBUDGET
+        os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+    from classes.interface.MainWindow import MainWindow
+
+    from PyQt5.QtWidgets import QApplication
+
     if platform.system() == "Windows":
         #This insure that the application icon will appear on windows task bar.
         myappid = 'Dragoncave.DragonShout'
@@ -21,12 +36,17 @@ if __name__.endswith('__main__'):
 
     application = QApplication(sys.argv)
     application.setApplicationName(MainWindow.APPLICATIONNAME)
+    StartupTimer.mark(StartupTimer.IMPORTS)
 
-    splashScreen = QSplashScreen(QPixmap(Images.applicationIcon))
-    splashScreen.show()
-
+    #The window is painted right away, no splash screen is needed
     window = MainWindow(application)
-    splashScreen.finish(window)
 
+    if budget is not None:
+        def checkBudget():
+            print(StartupTimer.report())
+            firstPaint = StartupTimer.elapsed(StartupTimer.FIRSTPAINT)
+            print('First paint after {:.0f} ms, budget {:.0f} ms'.format(firstPaint*1000, budget*1000))
+            application.exit(0 if firstPaint <= budget else 1)
+        window.startupFinished.connect(checkBudget)
 
     sys.exit(application.exec_())
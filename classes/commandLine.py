@@ -0,0 +1,463 @@
+#---------------------------------
+#Author: Chappuis Anthony
+#
+#Commands working on the library files without the interface, so that
+#libraries can be prepared by scripts, on a server or from cron jobs. Only
+#the library classes are imported at startup: the audio modules are loaded
+#by the commands needing them and no widget is ever created.
+#
+#Application: DragonShout music sampler
+#Last Edited: October 19th 2026
+#---------------------------------
+
+import os
+import sys
+import json
+import argparse
+
+from classes.library.Library import Library
+from classes.library.Track import Track
+from classes.library.StemTrack import StemTrack
+from classes.library.Sequence import Sequence
+from classes.library.SampleSet import SampleSet
+from classes.library.SearchIndex import SearchIndex
+from classes.library.TagIndex import TagIndex
+from classes.contentIndex import ContentIndex
+
+class CommandLine():
+
+    #Same name as the interface, so that both share the same user folders
+    APPLICATIONNAME = 'Dragon Shout'
+
+    COMMANDS = ('import', 'validate', 'stats', 'search', 'duplicates', 'convert', 'analyze', 'render')
+
+    #Files added by the import command, as in the playlist file dialog
+    MUSICEXTENSIONS = ('.mp3', '.wav', '.ogg', '.flac', '.wma', '.aiff', '.m4a')
+
+    #Number of most played tracks listed by the stats command
+    MOSTPLAYED = 5
+
+    def parser(cls):
+        """Returns the parser of the command line arguments.
+            - Takes no parameter.
+            - Returns an argparse.ArgumentParser.
+        """
+        parser = argparse.ArgumentParser(prog='DragonShout.py', description='Work on DragonShout libraries without the interface.')
+        commands = parser.add_subparsers(dest='command', required=True)
+
+        command = commands.add_parser('import', help='add music files to a theme, creating the library and the theme if needed')
+        command.set_defaults(run=cls.importFiles)
+        command.add_argument('library')
+        command.add_argument('theme')
+        command.add_argument('paths', nargs='+', help='music files or folders')
+        command.add_argument('--recursive', action='store_true', help='also import the files of the sub folders')
+
+        command = commands.add_parser('validate', help='check that every file and reference of a library exists')
+        command.set_defaults(run=cls.validate)
+        command.add_argument('library')
+
+        command = commands.add_parser('stats', help='count the themes, tracks, pads, scenes and sequences')
+        command.set_defaults(run=cls.stats)
+        command.add_argument('library')
+        command.add_argument('--json', action='store_true', help='print the statistics as JSON')
+        command.add_argument('--latency', action='store_true', help='read the files ahead and print their open latency, cold and warm')
+
+        command = commands.add_parser('search', help='find the themes, tracks and pads matching words')
+        command.set_defaults(run=cls.search)
+        command.add_argument('library')
+        command.add_argument('words', nargs='+', help='start or part of the words of the names and file paths')
+        command.add_argument('--limit', type=int, default=SearchIndex.MAX_RESULTS)
+
+        command = commands.add_parser('duplicates', help='find the files with the same content, read and decoded once')
+        command.set_defaults(run=cls.duplicates)
+        command.add_argument('library')
+        command.add_argument('--workers', type=int, default=ContentIndex.WORKERS, help='number of files hashed at once')
+        command.add_argument('--json', action='store_true', help='print the duplicates and the savings as JSON')
+
+        command = commands.add_parser('convert', help='save a library in the current format, moving its files')
+        command.set_defaults(run=cls.convert)
+        command.add_argument('library')
+        command.add_argument('output')
+        command.add_argument('--replace', nargs=2, action='append', default=[], metavar=('OLD', 'NEW'),
+                            help='replace the start of the file paths, can be repeated')
+
+        command = commands.add_parser('analyze', help='decode the tracks to measure their duration and level')
+        command.set_defaults(run=cls.analyze)
+        command.add_argument('library')
+        command.add_argument('--theme', default='', help='only analyze this theme')
+        command.add_argument('--segments', action='store_true', help='detect the segment markers of the tracks having none')
+        command.add_argument('--save', action='store_true', help='store the durations and segments in the library')
+
+        command = commands.add_parser('render', help='render a scene or a sequence faster than real time')
+        command.set_defaults(run=cls.render)
+        command.add_argument('library', help='library file, with its sample set')
+        command.add_argument('output', help='.wav file, or .flac file if the soundfile package is installed')
+        command.add_argument('--scene', default='', help='scene to render, or to play under the sequence')
+        command.add_argument('--sequence', default='', help='sequence to render')
+        command.add_argument('--duration', type=float, default=None, help='length of a scene render in seconds')
+        command.add_argument('--tail', type=float, default=None, help='seconds rendered after the last step of a sequence')
+        command.add_argument('--samplerate', type=int, default=None)
+        command.add_argument('--seed', type=int, default=None, help='seed of the random choices, to render the same mix again')
+
+        return parser
+    parser = classmethod(parser)
+
+    def run(cls, arguments:list):
+        """Run a command.
+            - Takes one parameter:
+                - arguments as list of strings, the command name first.
+            - Returns the exit code as integer.
+        """
+        from PyQt5.QtCore import QCoreApplication
+
+        options = cls.parser().parse_args(arguments)
+        QCoreApplication.setApplicationName(CommandLine.APPLICATIONNAME)
+        return options.run(options)
+    run = classmethod(run)
+
+    def openLibrary(cls, filepath:str):
+        """Returns the library saved in a file or None after printing the error."""
+        library = Library.load(filepath)
+        if not library :
+            print('ERROR - {} is not a readable library file'.format(filepath), file=sys.stderr)
+            return None
+        return library
+    openLibrary = classmethod(openLibrary)
+
+    #Commands: each one takes the parsed arguments and returns the exit code
+    def importFiles(cls, options):
+        """Add music files to a theme, skipping the files it already plays."""
+        library = Library.load(options.library) if os.path.isfile(options.library) else Library(os.path.basename(options.library), '')
+        if not library :
+            print('ERROR - {} is not a readable library file'.format(options.library), file=sys.stderr)
+            return 1
+
+        filepaths = []
+        for path in options.paths:
+            if os.path.isdir(path):
+                for folder, subFolders, filenames in os.walk(path):
+                    filepaths += [os.path.join(folder, filename) for filename in sorted(filenames)]
+                    if not options.recursive:
+                        break
+                    subFolders.sort()
+            else:
+                filepaths.append(path)
+
+        if not library.get_category(options.theme):
+            library.add_category(options.theme)
+        theme = library.get_category(options.theme)
+        if theme.query :
+            print('ERROR - {} is a smart theme, its tracks are chosen by their tags'.format(theme.name), file=sys.stderr)
+            return 1
+
+        known = set(location for track in theme.tracks for location in track.get_locations())
+        added = 0
+        for filepath in filepaths:
+            filepath = os.path.abspath(filepath)
+            if os.path.splitext(filepath)[1].lower() not in CommandLine.MUSICEXTENSIONS or filepath in known:
+                continue
+            if not os.path.isfile(filepath):
+                print('WARNING - {} does not exist'.format(filepath), file=sys.stderr)
+                continue
+
+            library.add_track(theme, Track(os.path.basename(filepath), filepath))
+            known.add(filepath)
+            added += 1
+
+        library.save(options.library)
+        print('{} track(s) added to {}'.format(added, theme.name))
+        return 0
+    importFiles = classmethod(importFiles)
+
+    def validate(cls, options):
+        """List the missing files and the references to missing themes or pads."""
+        library = cls.openLibrary(options.library)
+        if library is None:
+            return 1
+
+        issues = []
+        for theme in library.categories:
+            if theme.query :
+                try:
+                    TagIndex.parse_query(theme.query)
+                except ValueError as error:
+                    issues.append('smart theme "{}": {}'.format(theme.name, error))
+                continue
+
+            locations = set()
+            for track in theme.tracks:
+                for location in track.get_locations():
+                    if not os.path.isfile(location):
+                        issues.append('theme "{}": missing file {}'.format(theme.name, location))
+                    if location in locations:
+                        issues.append('theme "{}": {} is listed twice'.format(theme.name, location))
+                    locations.add(location)
+
+        sampleSet = library.sample_set or SampleSet()
+        for bank, pad in sampleSet.get_pads():
+            for filepath in pad.get_sound_files():
+                if not os.path.isfile(filepath):
+                    issues.append('pad {} of bank {}: missing file {}'.format(list(pad.coordinates), bank+1, filepath))
+
+        for scene in library.scenes:
+            if scene.theme and not library.get_category(scene.theme):
+                issues.append('scene "{}": unknown theme "{}"'.format(scene.name, scene.theme))
+            for loop in scene.loops:
+                pad = sampleSet.get_pad(*loop)
+                if not pad or not pad.loop :
+                    issues.append('scene "{}": no looping pad at {}'.format(scene.name, loop))
+
+        for sequence in library.sequences:
+            for step in sequence.steps:
+                if step["type"] == Sequence.THEME_STEP and not library.get_category(step["theme"]):
+                    issues.append('sequence "{}": unknown theme "{}"'.format(sequence.name, step["theme"]))
+                elif step["type"] == Sequence.PAD_STEP and not sampleSet.get_pad(step["bank"], step["row"], step["column"]):
+                    issues.append('sequence "{}": no pad at bank {}, row {}, column {}'.format(sequence.name, step["bank"]+1, step["row"], step["column"]))
+
+        for issue in issues:
+            print(issue)
+        print('{}: {} issue(s)'.format(options.library, len(issues)))
+        return 1 if issues else 0
+    validate = classmethod(validate)
+
+    def stats(cls, options):
+        """Print the size of a library and how much its tracks are played."""
+        library = cls.openLibrary(options.library)
+        if library is None:
+            return 1
+
+        #Tracks listed by several themes are counted once
+        tracks = list({id(track): track for theme in library.categories if not theme.query for track in theme.tracks}.values())
+        pads = [pad for bank, pad in (library.sample_set or SampleSet()).get_pads()]
+        mostPlayed = sorted(tracks, key=lambda track: track.playCount, reverse=True)[:CommandLine.MOSTPLAYED]
+
+        statistics = {"themes":             len(library.categories),
+                        "smartThemes":      len([theme for theme in library.categories if theme.query]),
+                        "tracks":           len(tracks),
+                        "sharedTracks":     len([track for track in tracks if len(library.tag_index.get_themes(track)) > 1]),
+                        "tags":             len(library.tag_index.get_tags()),
+                        "stemTracks":       len([track for track in tracks if isinstance(track, StemTrack)]),
+                        "segmentedTracks":  len([track for track in tracks if track.segments]),
+                        "knownDuration":    sum(track.duration for track in tracks)/1000,
+                        "plays":            sum(track.playCount for track in tracks),
+                        "mostPlayed":       [[track.name, track.playCount] for track in mostPlayed if track.playCount],
+                        "pads":             len([pad for pad in pads if pad.get_sound_files()]),
+                        "loopingPads":      len([pad for pad in pads if pad.loop]),
+                        "scenes":           len(library.scenes),
+                        "sequences":        len(library.sequences)}
+
+        if options.latency:
+            from classes.multimedia.Prefetcher import Prefetcher
+            statistics["latencies"] = [list(latency) for latency in Prefetcher().measure(ContentIndex.libraryFiles(library))]
+
+        if options.json:
+            print(json.dumps(statistics, indent=4))
+            return 0
+
+        for key, value in statistics.items():
+            if key == "mostPlayed":
+                value = ', '.join('{} ({})'.format(name, plays) for name, plays in value) or '-'
+            elif key == "knownDuration":
+                value = '{:.0f} min'.format(value/60)
+            elif key == "latencies":
+                value = ''.join('\n    {:8.2f} ms cold {:8.2f} ms warm  {}'.format(cold, warm, filepath) for filepath, cold, warm in value) or '-'
+            print('{:<16} {}'.format(key, value))
+        return 0
+    stats = classmethod(stats)
+
+    def search(cls, options):
+        """Print the themes, tracks and pads matching the words, one per line."""
+        library = cls.openLibrary(options.library)
+        if library is None:
+            return 1
+
+        index = SearchIndex()
+        index.index_library(library)
+        results = index.search(' '.join(options.words), options.limit)
+
+        for kind, item, owner in results:
+            if kind == SearchIndex.THEME:
+                print('{:<6} {}'.format(kind, item.name))
+            elif kind == SearchIndex.TRACK:
+                print('{:<6} {} [{}] {}'.format(kind, item.name, owner.name, item.location))
+            else:
+                print('{:<6} bank {} {},{} {}'.format(kind, owner+1, item.coordinates[0], item.coordinates[1], item.get_filepath()))
+        return 0 if results else 1
+    search = classmethod(search)
+
+    def duplicates(cls, options):
+        """Print the files of a library sharing the same content and what reading them once saves."""
+        library = cls.openLibrary(options.library)
+        if library is None:
+            return 1
+
+        from classes.multimedia.Mixer import Mixer
+
+        contents = ContentIndex()
+        contents.scan(ContentIndex.libraryFiles(library), options.workers)
+        contents.save()
+
+        durations = {location: track.duration for theme in library.categories for track in theme.tracks for location in track.get_locations()}
+        report = contents.report(durations, Mixer.SAMPLERATE)
+
+        if options.json:
+            report["duplicates"] = contents.duplicates()
+            print(json.dumps(report, indent=4))
+            return 0
+
+        for group in contents.duplicates():
+            print(group[0])
+            for filepath in group[1:]:
+                print('    = {}'.format(filepath))
+        print('{} duplicate file(s): {:.1f} MB on disk, {:.1f} MB of decoded sound for the tracks of known duration'.format(
+            report["duplicateFiles"], report["savedBytes"]/1024**2, report["savedCacheBytes"]/1024**2))
+        return 0
+    duplicates = classmethod(duplicates)
+
+    def convert(cls, options):
+        """Save a library in the current format, replacing the start of its file paths."""
+        library = cls.openLibrary(options.library)
+        if library is None:
+            return 1
+
+        def remap(path:str):
+            for old, new in options.replace:
+                if path and path.startswith(old):
+                    return new + path[len(old):]
+            return path
+
+        #Tracks listed by several themes are moved once
+        moved = set()
+        for theme in library.categories:
+            theme.iconPath = remap(theme.iconPath)
+            for track in theme.tracks:
+                if id(track) in moved:
+                    continue
+                moved.add(id(track))
+                if isinstance(track, StemTrack):
+                    for stem in track.stems:
+                        stem["location"] = remap(stem["location"])
+                track.location = remap(track.location)
+
+        for bank, pad in (library.sample_set or SampleSet()).get_pads():
+            pad.icon_path = remap(pad.icon_path)
+            pad.filepaths = [remap(filepath) for filepath in pad.filepaths]
+
+        library.save(options.output)
+        print('{} saved'.format(options.output))
+        return 0
+    convert = classmethod(convert)
+
+    def analyze(cls, options):
+        """Decode the tracks to store their duration and print their level."""
+        library = cls.openLibrary(options.library)
+        if library is None:
+            return 1
+
+        import numpy as np
+        from classes.multimedia.Mixer import Mixer
+        from classes.multimedia.SoundDecoder import SoundDecoder
+        from classes.multimedia.SegmentDetector import SegmentDetector
+        from PyQt5.QtCore import QCoreApplication
+
+        #Formats other than WAV are decoded by Qt, which needs an application object
+        #kept alive until the decoding is done: it is deleted with the last reference
+        _application = QCoreApplication.instance() or QCoreApplication([])
+
+        themes = [library.get_category(options.theme)] if options.theme else library.categories
+        if not all(themes):
+            print('ERROR - no theme named {}'.format(options.theme), file=sys.stderr)
+            return 1
+
+        #Copies of the same files are decoded and measured once
+        contents = ContentIndex()
+        contents.scan([location for theme in themes for track in theme.tracks for location in track.get_locations()])
+        contents.save()
+        measures = {}
+
+        failures = 0
+        analyzed = set()
+        for theme in themes:
+            for track in theme.tracks:
+                #Tracks listed by several themes are analyzed once
+                if id(track) in analyzed:
+                    continue
+                analyzed.add(id(track))
+
+                content = tuple(contents.canonical(location) for location in track.get_locations())
+                if content not in measures:
+                    try:
+                        buffers = [SoundDecoder.decode(location, Mixer.SAMPLERATE) for location in content]
+                    except (OSError, ValueError) as error:
+                        print('ERROR - {}'.format(error), file=sys.stderr)
+                        failures += 1
+                        continue
+
+                    frames = max(len(buffer) for buffer in buffers)
+                    mix = np.zeros((frames, 2), dtype=np.float32)
+                    for buffer in buffers:
+                        mix[:len(buffer)] += buffer
+                    peak = 20*np.log10(max(float(np.abs(mix).max()), 1e-9))
+                    rms = 20*np.log10(max(float(np.sqrt(np.mean(np.square(mix)))), 1e-9))
+
+                    #Markers already set are given to the copies of the track
+                    segments = None
+                    if options.segments and not isinstance(track, StemTrack):
+                        segments = track.segments or SegmentDetector.detect(buffers[0], Mixer.SAMPLERATE)
+                    measures[content] = (frames, peak, rms, segments)
+
+                frames, peak, rms, segments = measures[content]
+                track.duration = int(frames*1000/Mixer.SAMPLERATE)
+                if segments and not track.segments:
+                    track.segments = segments
+
+                segments = ''
+                if track.segments :
+                    segments = 'intro {loopStart:.2f} s, outro {loopEnd:.2f} s'.format(**track.segments)
+                print('{} / {}: {:.1f} s, peak {:.1f} dBFS, rms {:.1f} dBFS {}'.format(theme.name, track.name, frames/Mixer.SAMPLERATE, peak, rms, segments))
+
+        if options.save:
+            library.save(options.library)
+        return 1 if failures else 0
+    analyze = classmethod(analyze)
+
+    def render(cls, options):
+        """Render a scene or a sequence to a sound file and print the render speed."""
+        from classes.multimedia.Mixer import Mixer
+        from classes.multimedia.OfflineRenderer import OfflineRenderer
+        from PyQt5.QtCore import QCoreApplication
+
+        if not options.scene and not options.sequence:
+            print('ERROR - a scene or a sequence is needed', file=sys.stderr)
+            return 1
+
+        #Formats other than WAV are decoded by Qt, which needs an application object
+        #kept alive until the decoding is done: it is deleted with the last reference
+        _application = QCoreApplication.instance() or QCoreApplication([])
+
+        try:
+            #Copies of the same files are decoded once
+            contents = ContentIndex()
+            renderer = OfflineRenderer.load(options.library, options.samplerate or Mixer.SAMPLERATE, seed=options.seed, contents=contents)
+            contents.scan(ContentIndex.libraryFiles(renderer.library))
+            contents.save()
+            if options.sequence :
+                tail = OfflineRenderer.TAIL if options.tail is None else options.tail
+                report = renderer.renderSequence(options.sequence, options.output, options.scene, tail)
+            else:
+                duration = OfflineRenderer.SCENEDURATION if options.duration is None else options.duration
+                report = renderer.renderScene(options.scene, options.output, duration)
+        except KeyError as error:
+            print('ERROR - no scene or sequence named {}'.format(error), file=sys.stderr)
+            return 1
+        except (OSError, ValueError) as error:
+            print('ERROR - {}'.format(error), file=sys.stderr)
+            return 1
+
+        for filepath in report["missingFiles"]:
+            print('WARNING - {} could not be decoded'.format(filepath), file=sys.stderr)
+
+        print('Rendered {:.1f} s in {:.2f} s ({:.1f}x real time, {:.2f} s spent decoding)'.format(
+            report["duration"], report["renderTime"], report["speed"], report["decodingTime"]))
+        return 0
+    render = classmethod(render)
@@ -0,0 +1,275 @@
+#---------------------------------
+#Author: Chappuis Anthony
+#
+#Index of the files of the library by content, so that a sound copied under
+#several paths or names is read, decoded and analyzed once. Files are only
+#compared with the files of the same size: their first and last bytes are
+#hashed, then the whole files for the ones still alike. Hashes are computed
+#by a pool of worker threads and kept in the user cache folder from one
+#launch to the next, so that only new or modified files are read again.
+#
+#Application: DragonShout music sampler
+#Last Edited: October 19th 2026
+#---------------------------------
+
+import os
+import json
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtCore import QStandardPaths
+
+class ContentIndex():
+
+    FILENAME = 'contents.json'
+
+    #Bytes hashed at the start and at the end of a file before hashing all of it
+    PARTSIZE = 64*1024
+    CHUNKSIZE = 1024*1024
+    WORKERS = 4
+
+    #Bytes of a second of decoded sound: two channels of float32 frames
+    DECODEDBYTES = 2*4
+
+    def libraryFiles(cls, library):
+        """Returns the files played by a library: the tracks of its themes then the
+            sound files of its pads, each path once.
+            - Takes one parameter:
+                - library as Library object.
+            - Returns a list of strings.
+        """
+        filepaths = [location for theme in library.categories for track in theme.tracks for location in track.get_locations()]
+        if library.sample_set is not None:
+            filepaths += [filepath for bank, pad in library.sample_set.get_pads() for filepath in pad.get_sound_files()]
+        return [filepath for filepath in dict.fromkeys(filepaths) if filepath]
+    libraryFiles = classmethod(libraryFiles)
+
+    def __init__(self, filepath:str=''):
+        if filepath == '':
+            filepath = os.path.join(QStandardPaths.writableLocation(QStandardPaths.CacheLocation), ContentIndex.FILENAME)
+        self.filepath = filepath
+
+        #real path => [modification time in ns, size, partial hash, full hash]
+        self._fingerprints = {}
+        #Paths sharing a content, the one read for all of them first
+        self._groups = []
+        #real path => path read instead, for the duplicates only
+        self._canonical = {}
+        self._lock = threading.Lock()
+
+        self.load()
+
+    def load(self):
+        """Read the hashes and duplicates found by the previous launches, starting
+            with an empty index if the file can't be read.
+            - Takes no parameter.
+            - Returns nothing.
+        """
+        try:
+            with open(self.filepath, 'r', encoding='utf-8') as contentsFile:
+                data = json.load(contentsFile)
+            fingerprints = data["fingerprints"]
+            groups = data["groups"]
+        except (OSError, ValueError, KeyError):
+            return
+
+        with self._lock:
+            self._fingerprints = fingerprints
+            self._setGroups(groups)
+
+    def save(self):
+        """Write the hashes and duplicates. The file is replaced at once so that a
+            crash while writing never loses the previous index.
+            - Takes no parameter.
+            - Returns nothing.
+        """
+        with self._lock:
+            data = {"fingerprints": self._fingerprints, "groups": self._groups}
+
+        temporaryPath = self.filepath + '.tmp'
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.filepath)), exist_ok=True)
+            with open(temporaryPath, 'w', encoding='utf-8') as contentsFile:
+                json.dump(data, contentsFile)
+            os.replace(temporaryPath, self.filepath)
+        except OSError:
+            print('WARNING - the content index could not be saved in {}'.format(self.filepath))
+
+    def scan(self, filepaths:list, workers:int=WORKERS):
+        """Find the files sharing the same content. Files of a size no other file has
+            are never read, the others are compared by their first and last bytes then,
+            if still alike, by their whole content. Hashes of unmodified files are reused.
+            - Takes two parameters:
+                - filepaths as list of strings, every file of the library.
+                - workers as integer, number of files read at once.
+            - Returns nothing.
+        """
+        #A file named by several paths is read once and never reported as its own copy
+        filepaths = list(dict.fromkeys(self._path(filepath) for filepath in filepaths))
+
+        with self._lock:
+            known = dict(self._fingerprints)
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            statuses = list(pool.map(self._stat, filepaths))
+
+            fingerprints = {}
+            for filepath, status in zip(filepaths, statuses):
+                if status is None:
+                    continue
+
+                #Modified files are hashed again
+                fingerprint = known.get(filepath)
+                if fingerprint is None or fingerprint[:2] != list(status):
+                    fingerprint = list(status) + [None, None]
+                fingerprints[filepath] = list(fingerprint)
+
+            candidates = self._alike(fingerprints, fingerprints, 1)
+            self._hash(pool, candidates, fingerprints, 2, self._partialHash)
+
+            candidates = self._alike(candidates, fingerprints, 2)
+            self._hash(pool, candidates, fingerprints, 3, self._fullHash)
+
+        contents = {}
+        for filepath in self._alike(candidates, fingerprints, 3):
+            contents.setdefault(tuple(fingerprints[filepath][1:]), []).append(filepath)
+
+        #Files that couldn't be read are read again by the next scan
+        with self._lock:
+            for filepath, fingerprint in fingerprints.items():
+                self._fingerprints[filepath] = [None if str(value).startswith('unreadable:') else value for value in fingerprint]
+            self._setGroups(list(contents.values()))
+
+    def scanInBackground(self, filepaths:list, finished=None):
+        """Find the files sharing the same content on a worker thread, then save the index.
+            - Takes two parameters:
+                - filepaths as list of strings, every file of the library.
+                - finished as function without parameter or None, called by the worker thread once done.
+            - Returns nothing.
+        """
+        def run():
+            self.scan(filepaths)
+            self.save()
+            if finished :
+                finished()
+
+        threading.Thread(target=run, name='ContentIndex', daemon=True).start()
+
+    def canonical(self, filepath:str):
+        """Returns the file to read for a sound: the first file found with the same
+            content, or the file itself. Files modified since the scan are read as they are.
+            - Takes one parameter:
+                - filepath as string.
+            - Returns a string.
+        """
+        path = self._path(filepath)
+        with self._lock:
+            canonicalPath = self._canonical.get(path)
+            if canonicalPath is None:
+                return filepath
+            fingerprints = [self._fingerprints.get(path), self._fingerprints.get(canonicalPath)]
+
+        for path, fingerprint in zip((filepath, canonicalPath), fingerprints):
+            status = self._stat(path)
+            if status is None or fingerprint is None or list(status) != fingerprint[:2]:
+                return filepath
+        return canonicalPath
+
+    def duplicates(self):
+        """Returns the files sharing the same content.
+            - Takes no parameter.
+            - Returns a list of lists of strings, the file read for the others first.
+        """
+        with self._lock:
+            return [list(group) for group in self._groups]
+
+    def report(self, durations:dict=None, sampleRate:int=48000):
+        """Returns what the duplicates would cost without the index: the disk space of
+            the copies and the memory of their decoded sounds, estimated from the known
+            durations.
+            - Takes two parameters:
+                - durations as dictionnary: filepath => duration in msec.
+                - sampleRate as integer, sample rate of the decoded sounds.
+            - Returns a dictionnary: duplicateFiles, savedBytes and savedCacheBytes.
+        """
+        durations = {self._path(filepath): duration for filepath, duration in (durations or {}).items()}
+        duplicateFiles = savedBytes = savedCacheBytes = 0
+
+        with self._lock:
+            for group in self._groups:
+                copies = len(group) - 1
+                fingerprint = self._fingerprints[group[0]]
+                duration = max(durations.get(filepath, 0) for filepath in group)
+
+                duplicateFiles += copies
+                savedBytes += copies*fingerprint[1]
+                savedCacheBytes += copies*int(duration*sampleRate/1000)*ContentIndex.DECODEDBYTES
+
+        return {"duplicateFiles": duplicateFiles, "savedBytes": savedBytes, "savedCacheBytes": savedCacheBytes}
+
+    def _setGroups(self, groups:list):
+        """Replace the duplicates, the lock being held."""
+        self._groups = [group for group in groups if len(group) > 1]
+        self._canonical = {}
+        for group in self._groups:
+            for filepath in group[1:]:
+                self._canonical[filepath] = group[0]
+
+    def _path(self, filepath:str):
+        """Returns the path a file is known by in the index: absolute, links resolved."""
+        return os.path.realpath(filepath)
+
+    def _alike(self, filepaths, fingerprints:dict, column:int):
+        """Returns the files whose fingerprint up to a column is shared with another file."""
+        counts = {}
+        for filepath in filepaths:
+            key = tuple(fingerprints[filepath][1:column+1])
+            counts[key] = counts.get(key, 0) + 1
+        return [filepath for filepath in filepaths if counts[tuple(fingerprints[filepath][1:column+1])] > 1]
+
+    def _hash(self, pool:ThreadPoolExecutor, filepaths:list, fingerprints:dict, column:int, function):
+        """Fill a column of the fingerprints not known yet, reading the files in the pool.
+            Files that can't be read get a hash of their own so they are never merged.
+        """
+        filepaths = [filepath for filepath in filepaths if fingerprints[filepath][column] is None]
+        for filepath, digest in zip(filepaths, pool.map(function, filepaths)):
+            fingerprints[filepath][column] = digest or 'unreadable:{}'.format(filepath)
+
+            #Short files are read whole by the partial hash
+            if column == 2 and digest and fingerprints[filepath][1] <= 2*ContentIndex.PARTSIZE:
+                fingerprints[filepath][3] = digest
+
+    def _stat(self, filepath:str):
+        """Returns the modification time in ns and the size of a file, or None if it doesn't exist."""
+        try:
+            status = os.stat(filepath)
+        except OSError:
+            return None
+        return status.st_mtime_ns, status.st_size
+
+    def _partialHash(self, filepath:str):
+        """Returns the hash of the first and last bytes of a file, or None if it can't be read."""
+        digest = hashlib.blake2b(digest_size=16)
+        try:
+            with open(filepath, 'rb') as hashedFile:
+                digest.update(hashedFile.read(ContentIndex.PARTSIZE))
+                if hashedFile.seek(0, os.SEEK_END) > 2*ContentIndex.PARTSIZE:
+                    hashedFile.seek(-ContentIndex.PARTSIZE, os.SEEK_END)
+                else:
+                    hashedFile.seek(ContentIndex.PARTSIZE)
+                digest.update(hashedFile.read())
+        except OSError:
+            return None
+        return digest.hexdigest()
+
+    def _fullHash(self, filepath:str):
+        """Returns the hash of a whole file, or None if it can't be read."""
+        digest = hashlib.blake2b(digest_size=16)
+        try:
+            with open(filepath, 'rb') as hashedFile:
+                for chunk in iter(lambda: hashedFile.read(ContentIndex.CHUNKSIZE), b''):
+                    digest.update(chunk)
+        except OSError:
+            return None
+        return digest.hexdigest()
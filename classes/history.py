@@ -0,0 +1,275 @@
+#---------------------------------
+#Author: Chappuis Anthony
+#
+#Play history of the tracks and pads. Each play, skip and pad trigger is
+#counted in memory and queued: a worker thread appends the queued events to
+#a log file every second and regularly compacts the log into one line of
+#statistics per file, so that the history stays small and quick to reload
+#whatever the number of events. It is kept in the user data folder.
+#
+#Application: DragonShout music sampler
+#Last Edited: October 19th 2026
+#---------------------------------
+
+import os
+import json
+import time
+import random
+import threading
+from collections import deque
+
+from PyQt5.QtCore import QStandardPaths
+
+class History():
+
+    #Event types
+    PLAY = 'play'
+    SKIP = 'skip'
+    TRIGGER = 'trigger'
+
+    #Column of each event type in the statistics of a file, the last one
+    #being the time of the last play or trigger
+    COLUMNS = {PLAY: 0, SKIP: 1, TRIGGER: 2}
+    LASTPLAYED = 3
+
+    FOLDERNAME = 'history'
+    STATISTICSFILENAME = 'statistics.json'
+    LOGEXTENSION = '.log'
+
+    #Seconds between two writes and number of logged events starting a compaction
+    WRITEINTERVAL = 1.0
+    COMPACTEVENTS = 100000
+
+    #Time after which a track is fresh again, in seconds, and weight of a track
+    #played a moment ago relatively to a fresh one
+    FRESHNESS = 6*3600
+    MINFRESHNESS = 0.05
+
+    def __init__(self, folder:str=''):
+        if folder == '':
+            folder = os.path.join(QStandardPaths.writableLocation(QStandardPaths.AppDataLocation), History.FOLDERNAME)
+        self.folder = folder
+
+        #filepath => [plays, skips, triggers, time of the last play or trigger]
+        self._statistics = {}
+        #Events counted but not written yet
+        self._queue = deque()
+        self._lock = threading.Lock()
+
+        #Log generation written to and number of events it holds
+        self._generation = 0
+        self._logEvents = 0
+        #False if the history couldn't be read: its files are then left untouched
+        self._loaded = False
+
+        self._stopped = threading.Event()
+        self._worker = threading.Thread(target=self._run, name='History', daemon=True)
+        self._worker.start()
+
+    def record(self, event:str, filepath:str):
+        """Count an event. It only updates the statistics in memory and queues the
+            event for the worker thread, so that it can be called on every trigger.
+            - Takes two parameters:
+                - event as one of the History event constants: PLAY, SKIP, TRIGGER.
+                - filepath as string, the track location or the pad sound file.
+            - Returns nothing.
+        """
+        now = time.time()
+        with self._lock:
+            self._count(event, filepath, now)
+            self._queue.append((now, event, filepath))
+
+    def statistics(self, filepath:str):
+        """Returns the statistics of a file.
+            - Takes one parameter:
+                - filepath as string.
+            - Returns a dictionnary: plays, skips, triggers and lastPlayed (None if never played).
+        """
+        with self._lock:
+            plays, skips, triggers, lastPlayed = self._statistics.get(filepath, (0, 0, 0, None))
+        return {"plays": plays, "skips": skips, "triggers": triggers, "lastPlayed": lastPlayed}
+
+    def lastPlayed(self, filepath:str):
+        """Returns the time of the last play or trigger of a file, as given by
+            time.time(), or None if it was never played.
+            - Takes one parameter:
+                - filepath as string.
+            - Returns a float or None.
+        """
+        return self.statistics(filepath)["lastPlayed"]
+
+    def leastPlayed(self, filepaths:list):
+        """Returns the file played the fewest times, the one played the longest time
+            ago among equals.
+            - Takes one parameter:
+                - filepaths as list of strings, for instance the tracks of a theme.
+            - Returns a string or None if the list is empty.
+        """
+        with self._lock:
+            statistics = [self._statistics.get(filepath, (0, 0, 0, None)) for filepath in filepaths]
+        if not filepaths:
+            return None
+        return min(zip(filepaths, statistics), key=lambda item: (item[1][0], item[1][History.LASTPLAYED] or 0.0))[0]
+
+    def weights(self, filepaths:list):
+        """Returns how fresh each file is: files played less often and longer ago
+            weigh more.
+            - Takes one parameter:
+                - filepaths as list of strings.
+            - Returns a list of floats.
+        """
+        now = time.time()
+        weights = []
+        with self._lock:
+            for filepath in filepaths:
+                plays, skips, triggers, lastPlayed = self._statistics.get(filepath, (0, 0, 0, None))
+                freshness = 1.0
+                if lastPlayed is not None:
+                    freshness = min(max((now-lastPlayed)/History.FRESHNESS, History.MINFRESHNESS), 1.0)
+                weights.append(freshness/(1+plays+skips))
+        return weights
+
+    def chooseFresh(self, filepaths:list, generator:random.Random=random):
+        """Pick a file at random, favouring the fresh ones.
+            - Takes two parameters:
+                - filepaths as list of strings, not empty.
+                - generator as random.Random, the random module by default.
+            - Returns the index of the file chosen as integer.
+        """
+        return generator.choices(range(len(filepaths)), self.weights(filepaths))[0]
+
+    def close(self):
+        """Stop the worker thread and compact the history, unless it couldn't be read.
+            - Takes no parameter.
+            - Returns nothing.
+        """
+        self._stopped.set()
+        self._worker.join()
+        if self._loaded :
+            try:
+                self._compact()
+            except OSError as error:
+                print('WARNING - the play history could not be written: {}'.format(error))
+
+    def _count(self, event:str, filepath:str, when:float):
+        """Add an event to the statistics, the lock being held."""
+        statistics = self._statistics.get(filepath)
+        if statistics is None:
+            statistics = self._statistics[filepath] = [0, 0, 0, None]
+
+        statistics[History.COLUMNS[event]] += 1
+        if event != History.SKIP:
+            statistics[History.LASTPLAYED] = max(statistics[History.LASTPLAYED] or 0.0, when)
+
+    def _logPath(self, generation:int):
+        return os.path.join(self.folder, '{}{}'.format(generation, History.LOGEXTENSION))
+
+    def _load(self):
+        """Read the compacted statistics and replay the logs written since, adding
+            them to the events already counted by this session.
+        """
+        generation = 0
+        statistics = {}
+        try:
+            with open(os.path.join(self.folder, History.STATISTICSFILENAME), 'r', encoding='utf-8') as statisticsFile:
+                data = json.load(statisticsFile)
+            generation = data["generation"]
+            statistics = data["statistics"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+        logs = []
+        if os.path.isdir(self.folder):
+            for filename in os.listdir(self.folder):
+                name, extension = os.path.splitext(filename)
+                if extension == History.LOGEXTENSION and name.isdigit():
+                    logs.append(int(name))
+
+        #Logs older than the statistics were compacted but not deleted yet
+        events = 0
+        with self._lock:
+            for filepath, values in statistics.items():
+                live = self._statistics.setdefault(filepath, [0, 0, 0, None])
+                for column in History.COLUMNS.values():
+                    live[column] += values[column]
+                if values[History.LASTPLAYED] is not None:
+                    live[History.LASTPLAYED] = max(live[History.LASTPLAYED] or 0.0, values[History.LASTPLAYED])
+
+            for logGeneration in sorted(logs):
+                if logGeneration < generation:
+                    os.remove(self._logPath(logGeneration))
+                    continue
+
+                with open(self._logPath(logGeneration), 'r', encoding='utf-8') as logFile:
+                    for line in logFile:
+                        try:
+                            when, event, filepath = json.loads(line)
+                        except ValueError:
+                            #Last line cut by a crash
+                            continue
+                        self._count(event, filepath, when)
+                        events += 1
+
+            self._generation = max([generation] + logs)
+            self._logEvents = events
+
+    def _write(self):
+        """Append the queued events to the current log."""
+        with self._lock:
+            events = list(self._queue)
+            self._queue.clear()
+            generation = self._generation
+
+        if not events:
+            return
+
+        os.makedirs(self.folder, exist_ok=True)
+        with open(self._logPath(generation), 'a', encoding='utf-8') as logFile:
+            logFile.write(''.join(json.dumps(event)+'\n' for event in events))
+        self._logEvents += len(events)
+
+    def _compact(self):
+        """Replace the logs with the statistics of every file. New events go to a
+            new log, so that a crash at any moment never counts an event twice.
+        """
+        with self._lock:
+            events = list(self._queue)
+            self._queue.clear()
+            statistics = {filepath: list(values) for filepath, values in self._statistics.items()}
+            generation = self._generation
+            self._generation += 1
+
+        os.makedirs(self.folder, exist_ok=True)
+        if events:
+            with open(self._logPath(generation), 'a', encoding='utf-8') as logFile:
+                logFile.write(''.join(json.dumps(event)+'\n' for event in events))
+
+        statisticsPath = os.path.join(self.folder, History.STATISTICSFILENAME)
+        with open(statisticsPath + '.tmp', 'w', encoding='utf-8') as statisticsFile:
+            json.dump({"generation": generation+1, "statistics": statistics}, statisticsFile)
+        os.replace(statisticsPath + '.tmp', statisticsPath)
+
+        if os.path.isfile(self._logPath(generation)):
+            os.remove(self._logPath(generation))
+        self._logEvents = 0
+
+    def _run(self):
+        """Load the history, then write the events every WRITEINTERVAL seconds."""
+        try:
+            self._load()
+            self._loaded = True
+        except OSError as error:
+            #Writing would mix the events with logs never read, and compacting would lose them
+            print('WARNING - the play history could not be read, this session is not recorded: {}'.format(error))
+
+        while not self._stopped.wait(History.WRITEINTERVAL):
+            if not self._loaded :
+                with self._lock:
+                    self._queue.clear()
+                continue
+            try:
+                self._write()
+                if self._logEvents >= History.COMPACTEVENTS:
+                    self._compact()
+            except OSError as error:
+                print('WARNING - the play history could not be written: {}'.format(error))
@@ -0,0 +1,107 @@
+#---------------------------------
+#Author: Chappuis Anthony
+#
+#Show a pop-up window to set how the sound effects lower the music.
+#
+#Application: DragonShout music sampler
+#Last Edited: October 19th 2026
+#---------------------------------
+
+from classes.interface import MainWindow
+from classes.ressourcesFilepath import Stylesheets
+from classes.ressourcesCache import RessourcesCache
+from classes.multimedia.Ducker import Ducker
+
+from PyQt5.QtWidgets import QDialog, QPushButton, QGridLayout, QLabel, QCheckBox, QDoubleSpinBox
+from PyQt5.Qt import Qt
+
+class DuckingDialogBox(QDialog):
+
+    def __init__(self, mainWindow:MainWindow, ducking:dict):
+        super().__init__()
+
+        self.mainWindow = mainWindow
+        self.okOrNot = False
+        self.ducking = ducking
+
+        self.setStyleSheet(RessourcesCache.stylesheet(Stylesheets.globalStyle))
+
+        #window title and icon
+        self.setWindowIcon(RessourcesCache.icon(MainWindow.MainWindow.APPLICATIONICONPATH))
+        self.setWindowTitle(self.mainWindow.text.localisation('dialogBoxes','ducking','caption'))
+
+        self.enabledSelector = QCheckBox(self.mainWindow.text.localisation('dialogBoxes','ducking','question'))
+        self.enabledSelector.setChecked(ducking["enabled"])
+
+        self.thresholdLabel = QLabel(self.mainWindow.text.localisation('dialogBoxes','ducking','threshold'))
+        self.thresholdSelector = self.valueSelector(Ducker.MINTHRESHOLD, 0.0, 1, ducking["threshold"])
+        self.depthLabel = QLabel(self.mainWindow.text.localisation('dialogBoxes','ducking','depth'))
+        self.depthSelector = self.valueSelector(0.0, Ducker.MAXDEPTH, 1, ducking["depth"])
+        self.attackLabel = QLabel(self.mainWindow.text.localisation('dialogBoxes','ducking','attack'))
+        self.attackSelector = self.valueSelector(0.0, Ducker.MAXTIME, 3, ducking["attack"])
+        self.releaseLabel = QLabel(self.mainWindow.text.localisation('dialogBoxes','ducking','release'))
+        self.releaseSelector = self.valueSelector(0.0, Ducker.MAXTIME, 3, ducking["release"])
+
+        #control buttons
+        self.OkButton = QPushButton(self.mainWindow.text.localisation('buttons','ok','caption'))
+        self.OkButton.clicked.connect(lambda *args: self.closeDialog(True))
+
+        self.CancelButton = QPushButton(self.mainWindow.text.localisation('buttons','cancel','caption'))
+        self.CancelButton.clicked.connect(lambda *args: self.closeDialog(False))
+
+        self.layout = QGridLayout()
+        self.layout.setAlignment(Qt.AlignHCenter | Qt.AlignVCenter)
+        self.layout.addWidget(self.enabledSelector,0,0,1,2)
+        self.layout.addWidget(self.thresholdLabel,1,0)
+        self.layout.addWidget(self.thresholdSelector,1,1)
+        self.layout.addWidget(self.depthLabel,2,0)
+        self.layout.addWidget(self.depthSelector,2,1)
+        self.layout.addWidget(self.attackLabel,3,0)
+        self.layout.addWidget(self.attackSelector,3,1)
+        self.layout.addWidget(self.releaseLabel,4,0)
+        self.layout.addWidget(self.releaseSelector,4,1)
+        self.layout.addWidget(self.OkButton,5,0)
+        self.layout.addWidget(self.CancelButton,5,1)
+        self.setLayout(self.layout)
+
+    def valueSelector(self, minimum:float, maximum:float, decimals:int, value:float):
+        """Create a spin box for a setting.
+            Takes four parameters:
+            - minimum as float.
+            - maximum as float.
+            - decimals as integer.
+            - value as float.
+            Returns a QDoubleSpinBox.
+        """
+        selector = QDoubleSpinBox()
+        selector.setRange(minimum, maximum)
+        selector.setDecimals(decimals)
+        selector.setSingleStep(10**-decimals if decimals > 1 else 1.0)
+        selector.setValue(value)
+        return selector
+
+    def getItems(self):
+        """Opens the ducking dialog box locking the window and await for user inputs.
+            Takes no parameter.
+            Returns:
+            - ducking as dictionnary.
+            - okOrNot as boolean.
+        """
+        self.exec()
+        return self.ducking, self.okOrNot
+
+    def closeDialog(self, okOrNot:bool):
+        """Close the dialog.
+            Takes one parameter:
+            - okOrNot as boolean.
+            Returns nothing.
+        """
+        self.okOrNot = okOrNot
+
+        if okOrNot :
+            self.ducking = {"enabled":      self.enabledSelector.isChecked(),
+                            "threshold":    self.thresholdSelector.value(),
+                            "depth":        self.depthSelector.value(),
+                            "attack":       self.attackSelector.value(),
+                            "release":      self.releaseSelector.value()}
+        self.close()
@@ -2,6 +2,14 @@
 #Author: Chappuis Anthony
 #
 #Class responsible for main window of the application
+#The window is shown first: the audio engine, the widgets and the last
+#library are set up once it has been painted, one step per event loop
+#iteration. The layout, volumes and library of the previous session are
+#restored and its most used pads and themes are prepared first. Plays,
+#skips and pad triggers are kept in the play history. The search index of
+#the library is built when it is shown and updated by the widgets editing it.
+#Its files are then compared by content on a worker thread, so that the
+#copies of a sound are read and decoded once.
 #
 #Application: DragonShout music sampler
 #Last Edited: Joly 26th 2018
@@ -10,56 +18,301 @@
 import os
 
 from classes.interface.Text import Text
-from classes.interface.Playlist import Playlist
-from classes.interface.Themes import Themes
-from classes.interface.Sampler import Sampler
-from classes.ressourcesFilepath import Stylesheets
+from classes.ressourcesCache import RessourcesCache
+from classes.startupTimer import StartupTimer
+from classes.session import Session
+from classes.history import History
+from classes.contentIndex import ContentIndex
 
 from classes.library.Library import Library
+from classes.library.SampleSet import SampleSet
+from classes.library.SearchIndex import SearchIndex
 
 from PyQt5 import Qt, QtGui
-from PyQt5.QtCore import QFileInfo, QStandardPaths
+from PyQt5.QtCore import QFileInfo, QStandardPaths, QTimer, QRunnable, QThreadPool, QByteArray, pyqtSignal
 from PyQt5.QtGui import QIcon, QFont
 from PyQt5.QtWidgets import (QMainWindow, QApplication, QAction, qApp,
     QHBoxLayout, QSplitter, QWidget, QListWidget, QLabel,
     QPushButton, QVBoxLayout, QGridLayout, QFileDialog, QMessageBox)
 
+class LibraryJob(QRunnable):
+
+    def __init__(self, mainWindow:QMainWindow, filepath:str):
+        super().__init__()
+        self.mainWindow = mainWindow
+        self.filepath = filepath
+
+    def run(self):
+        """Read the library file and give it back to the main window.
+            - Takes no parameter.
+            - Returns nothing.
+        """
+        self.mainWindow.libraryLoaded.emit(self.filepath, Library.load(self.filepath))
+
+class SearchIndexJob(QRunnable):
+
+    def __init__(self, mainWindow:QMainWindow, library:Library):
+        super().__init__()
+        self.mainWindow = mainWindow
+        self.library = library
+
+    def run(self):
+        """Index the library and give the index back to the main window.
+            - Takes no parameter.
+            - Returns nothing.
+        """
+        searchIndex = SearchIndex()
+        searchIndex.index_library(self.library)
+        self.mainWindow.searchIndexBuilt.emit(self.library, searchIndex)
+
 class MainWindow(QMainWindow):
 
     SUPPORTEDLIBRARYFILES = '*.json'
     APPLICATIONICONPATH = 'dragonShout.png'
     APPLICATIONNAME = 'Dragon Shout'
 
+    #Emitted from a worker thread with the filepath and the library read, False if it can't be read
+    libraryLoaded = pyqtSignal(str, object)
+
+    #Emitted from a worker thread with the library whose files were compared by content
+    contentsScanned = pyqtSignal(object)
+
+    #Emitted from a worker thread with a library and its search index
+    searchIndexBuilt = pyqtSignal(object, object)
+
+    #Emitted once the startup is over
+    startupFinished = pyqtSignal()
+
     def __init__(self,application:QApplication):
         super().__init__()
 
-        #Global style sheet
-        styleSheet = open(Stylesheets.globalStyle,'r', encoding='utf-8').read()
-        self.setStyleSheet(styleSheet)
+        self.application = application
+        self.painted = False
+
+        #Global style sheet, also holding the style of every widget state
+        self.setStyleSheet(RessourcesCache.applicationStyleSheet())
 
         #Window decoration
         self.setWindowTitle(MainWindow.APPLICATIONNAME)
-        self.setWindowIcon(QIcon(MainWindow.APPLICATIONICONPATH))
+        self.setWindowIcon(RessourcesCache.icon(MainWindow.APPLICATIONICONPATH))
 
         #Variable and CONSTANTS
+        Session.load()
         self.text = Text()
-
         self.loadLibrary()
+        self.libraryLoaded.connect(lambda filepath, library: self.lastLibraryLoaded(filepath, library))
+        application.aboutToQuit.connect(lambda: self.saveSession())
+
+        self.menuBar()
+
+        self.setGUI()
+        if Session.value('geometry'):
+            self.restoreGeometry(self.layoutState('geometry'))
+
+        StartupTimer.mark(StartupTimer.WINDOW)
+        self.show()
+
+    def paintEvent(self, event:QtGui.QPaintEvent):
+        """Start the rest of the application once the window has been painted."""
+        super().paintEvent(event)
+
+        if not self.painted :
+            self.painted = True
+            StartupTimer.mark(StartupTimer.FIRSTPAINT)
+            QTimer.singleShot(0, lambda: self.startMedia())
+
+    def startMedia(self):
+        """Create the audio engine and the caches feeding it.
+            Takes no parameter.
+        """
+        from classes.multimedia.Prefetcher import Prefetcher
+        from classes.multimedia.AudioEngine import AudioEngine
+        from classes.multimedia.SampleCache import SampleCache
+
+        self.contents = ContentIndex()
+        self.contentsScanned.connect(lambda library: self.reportDuplicates(library))
+        self.prefetcher = Prefetcher(contents=self.contents)
+        self.audioEngine = AudioEngine()
+        self.samples = SampleCache(self.audioEngine.mixer.sampleRate, contents=self.contents)
+        self.history = History()
+        self.application.aboutToQuit.connect(self.audioEngine.shutdown)
+        self.application.aboutToQuit.connect(self.history.close)
+
+        StartupTimer.mark(StartupTimer.MEDIA)
+        QTimer.singleShot(0, lambda: self.startWidgets())
+
+    def startWidgets(self):
+        """Create the themes, playlist, sampler, scenes and sequences and show them.
+            Takes no parameter.
+        """
+        from classes.interface.Playlist import Playlist
+        from classes.interface.Themes import Themes
+        from classes.interface.Sampler import Sampler
+        from classes.interface.Scenes import Scenes
+        from classes.interface.Sequences import Sequences
+        from classes.interface.SearchBox import SearchBox
+        from classes.thumbnailCache import ThumbnailCache
+
+        RessourcesCache.preload()
+        self.thumbnails = ThumbnailCache()
+        self.searchIndex = SearchIndex()
+        self.searchIndexBuilt.connect(lambda library, searchIndex: self.receiveSearchIndex(library, searchIndex))
 
         self.sampler = Sampler(self)
+        self.library.sample_set = self.sampler.sampleSet
         self.themes = Themes(self)
         self.playlist = Playlist(self)
+        self.scenes = Scenes(self)
+        self.sequences = Sequences(self)
+        self.searchBox = SearchBox(self)
 
-        self.menuBar()
+        self.playlist.volumeSlider.setValue(Session.value('musicVolume', self.playlist.volumeSlider.value()))
+        self.sampler.volumeSlider.setValue(Session.value('samplerVolume', self.sampler.volumeSlider.value()))
+        self.sampler.padTriggered.connect(lambda bank, row, column: self.padTriggered(bank, row, column))
+        self.application.aboutToQuit.connect(lambda: self.logLatencies())
 
-        self.setGUI()
+        self.addPanels()
+        for action in self.libraryActions:
+            action.setEnabled(True)
 
-        self.show()
+        StartupTimer.mark(StartupTimer.WIDGETS)
+        QTimer.singleShot(0, lambda: self.reopenLastLibrary())
+
+    def reopenLastLibrary(self):
+        """Read the library used last time on a worker thread.
+            Takes no parameter.
+        """
+        filepath = Session.value('library', '')
+        if not os.path.isfile(filepath):
+            self.finishStartup()
+            return
+
+        self.statusBar().showMessage(self.text.localisation('labels','openingLibrary','caption'))
+        QThreadPool.globalInstance().start(LibraryJob(self, filepath))
+
+    def lastLibraryLoaded(self, filepath:str, library:Library):
+        """Show the library read on a worker thread, unless the user opened another one meanwhile.
+            Takes two parameters:
+            - filepath as string.
+            - library as Library object or False if the file can't be read.
+        """
+        if library and not self.library.filepath :
+            self.library = library
+            self.showLibrary()
+        self.finishStartup()
+
+    def finishStartup(self):
+        """Called when every startup phase is over.
+            Takes no parameter.
+        """
+        StartupTimer.mark(StartupTimer.LIBRARY)
+        self.statusBar().showMessage(self.text.localisation('labels','ready','caption'))
+        self.startupFinished.emit()
+
+    def saveLastLibrary(self, filepath:str):
+        """Remember the library to reopen at the next launch.
+            Takes one parameter:
+            - filepath as string.
+        """
+        Session.setValue('library', os.path.abspath(filepath))
+        Session.save()
+
+    def layoutState(self, key:str):
+        """Returns a window or splitter state stored in the session.
+            Takes one parameter:
+            - key as string.
+        """
+        return QByteArray.fromBase64(Session.value(key, '').encode('ascii'))
+
+    def padTriggered(self, bank:int, row:int, column:int):
+        """Count a pad trigger in the session and in the play history.
+            Takes three parameters:
+            - bank as integer.
+            - row as integer.
+            - column as integer.
+        """
+        Session.countPad(self.library.filepath, bank, row, column)
+        pad = self.sampler.sampleSet.get_pad(bank, row, column)
+        if pad :
+            self.history.record(History.TRIGGER, pad.filepaths[0])
+
+    def receiveSearchIndex(self, library:Library, searchIndex:SearchIndex):
+        """Search the library with the index built on a worker thread, unless another
+            library was opened meanwhile.
+            Takes two parameters:
+            - library as Library object, the one indexed.
+            - searchIndex as SearchIndex object.
+        """
+        if library is not self.library :
+            return
+
+        self.searchIndex.replay_changes(searchIndex)
+        self.searchIndex = searchIndex
+        self.searchBox.search(self.searchBox.searchField.text())
+
+    def logLatencies(self):
+        """Print how long the tracks played took to start and the open latencies of
+            their files, cold and once read ahead.
+            Takes no parameter.
+        """
+        for filepath, load, requestedWarm, cold, warm in self.playlist.musicPlayer.latencyReport():
+            state = 'read ahead' if requestedWarm else 'not read ahead'
+            if cold is not None:
+                state += ', opened in {:.1f} ms cold and {:.1f} ms warm'.format(cold, warm)
+            print('Track started in {:.0f} ms ({}): {}'.format(load, state, filepath))
+
+    def reportDuplicates(self, library:Library):
+        """Show what the copies of the same sounds in the library no longer cost.
+            Takes one parameter:
+            - library as Library object, the one compared by content.
+        """
+        if library is not self.library :
+            return
+
+        durations = {location: track.duration for theme in library.categories for track in theme.tracks for location in track.get_locations()}
+        report = self.contents.report(durations, self.audioEngine.mixer.sampleRate)
+        if report["duplicateFiles"] :
+            self.statusBar().showMessage(self.text.localisation('labels','duplicates','caption').format(
+                report["duplicateFiles"], report["savedBytes"]/1024**2, max(report["savedCacheBytes"], self.samples.savedBytes())/1024**2))
+
+    def saveSession(self):
+        """Store the layout, the volumes and the scene applied before quitting.
+            Takes no parameter.
+        """
+        Session.setValue('geometry', bytes(self.saveGeometry().toBase64()).decode('ascii'))
+
+        #The widgets don't exist if the application quits during the startup
+        if hasattr(self, 'scenes'):
+            Session.setValue('mainSplitter', bytes(self.mainSplitter.saveState().toBase64()).decode('ascii'))
+            Session.setValue('themesSplitter', bytes(self.themesSplitter.saveState().toBase64()).decode('ascii'))
+            Session.setValue('musicVolume', self.playlist.volumeSlider.value())
+            Session.setValue('samplerVolume', self.sampler.volumeSlider.value())
+            if self.library.filepath and self.scenes.currentScene :
+                Session.libraryState(self.library.filepath)['scene'] = self.scenes.currentScene
+
+        Session.save()
+
+    def warmCaches(self):
+        """Decode the most used pads of the library and read the first tracks of its
+            most used themes ahead of time, before any other sound, the most used first.
+            Takes no parameter.
+        """
+        from classes.multimedia.Prefetcher import Prefetcher
+
+        filepath = self.library.filepath
+        sampleSet = self.library.sample_set
+
+        if sampleSet is not None:
+            pads = [sampleSet.get_pad(*place) for place in Session.mostUsedPads(filepath)]
+            self.samples.prepare([soundFile for pad in pads if pad for soundFile in pad.get_sound_files()])
+
+        themes = [self.library.get_category(name) for name in Session.mostUsedThemes(filepath)]
+        self.prefetcher.prefetch([location for theme in themes if theme for track in theme.tracks[:Session.HINTTRACKS] for location in track.get_locations()], Prefetcher.HINT)
 
     def setGUI(self):
         """Generates the main window user interface"""
         #Creating status bar
-        self.statusBar().showMessage('Ready')
+        self.statusBar().showMessage(self.text.localisation('labels','loading','caption'))
 
         #Creating menu bar
         self.menuBar().clear()
@@ -75,6 +328,7 @@ class MainWindow(QMainWindow):
         action.triggered.connect(lambda *args: self.load())
 
         fileMenu.addAction(action)
+        self.libraryActions = [action]
 
         action = QAction(QIcon('save.png'), self.text.localisation('menuEntries','save','caption'), self)
         action.setShortcut('Ctrl+s')
@@ -82,6 +336,11 @@ class MainWindow(QMainWindow):
         action.triggered.connect(lambda *args: self.save())
 
         fileMenu.addAction(action)
+        self.libraryActions.append(action)
+
+        #Loading and saving need the widgets, created after the first paint
+        for action in self.libraryActions:
+            action.setEnabled(False)
 
         action = QAction(QIcon('exit.png'), self.text.localisation('menuEntries','exit','caption'), self)
         action.setShortcut('Ctrl+q')
@@ -102,22 +361,42 @@ class MainWindow(QMainWindow):
         #     action.triggered.connect(lambda *args: self.changeLanguage(self.sender().text()))
         #     languageMenu.addAction(action)
 
+        #Shown until the widgets are created
+        loadingLabel = QLabel(self.text.localisation('labels','loading','caption'))
+        loadingLabel.setAlignment(Qt.Qt.AlignCenter)
+        self.setCentralWidget(loadingLabel)
+
+    def addPanels(self):
+        """Place the themes, playlist and sampler in the window"""
         #Splitter containing all other elements of MainWindow
         #----------------------------------------------------
         mainHorizontalSplitter = QSplitter()
         windowWidth = self.geometry().width()
 
-        #Theme selection and controls
-        mainHorizontalSplitter.addWidget(self.themes)
+        #Scenes, sequences, theme selection and controls
+        themesVerticalSplitter = QSplitter(Qt.Qt.Vertical)
+        themesVerticalSplitter.addWidget(self.scenes)
+        themesVerticalSplitter.addWidget(self.sequences)
+        themesVerticalSplitter.addWidget(self.themes)
+        mainHorizontalSplitter.addWidget(themesVerticalSplitter)
+        self.themesSplitter = themesVerticalSplitter
 
         #Playlist
         mainHorizontalSplitter.addWidget(self.playlist)
 
         #Sampler
         mainHorizontalSplitter.addWidget(self.sampler)
+        self.mainSplitter = mainHorizontalSplitter
+
+        #Sizes chosen during the previous session
+        if Session.value('mainSplitter'):
+            self.mainSplitter.restoreState(self.layoutState('mainSplitter'))
+        if Session.value('themesSplitter'):
+            self.themesSplitter.restoreState(self.layoutState('themesSplitter'))
 
-        #adding the splitter containing the main elements to the window
-        genericLayout = QHBoxLayout()
+        #adding the search box and the splitter containing the main elements to the window
+        genericLayout = QVBoxLayout()
+        genericLayout.addWidget(self.searchBox)
         genericLayout.addWidget(mainHorizontalSplitter)
         centralWidget = QWidget(self)
         centralWidget.setLayout(genericLayout)
@@ -131,21 +410,20 @@ class MainWindow(QMainWindow):
 
     def loadLibrary(self,filepath:str=''):
         """Loads an existing library or creates a new one"""
-        if os.path.isfile(filepath) and Library.load(self,filepath):
-        	self.library = Library.load(self,filepath)
-        elif os.path.isfile(filepath) and not Library.load(filepath):
+        library = Library.load(filepath) if os.path.isfile(filepath) else False
+        if library :
+        	self.library = library
+        elif os.path.isfile(filepath):
             QMessageBox(QMessageBox.Warning,self.text.localisation('messageBoxes','loadLibrary','title'),self.text.localisation('messageBoxes','loadLibrary','caption')).exec()
         else:
-            self.library = Library(self,"new_library","")
+            self.library = Library("new_library","")
+        return bool(library)
 
-    def loadSampler(self,filepath:str=''):
-        """Loads an existing sampleSet or creates a new one"""
-        if os.path.isfile(filepath) and self.sampler.load(filepath,'test'):
-        	self.sampler.load(filepath)
-        elif os.path.isfile(filepath) and not Sampler.load(filepath):
-            QMessageBox(QMessageBox.Warning,self.text.localisation('messageBoxes','loadLibrary','title'),self.text.localisation('messageBoxes','loadLibrary','caption')).exec()
-        else:
-            self.sampler = Sampler(self)
+    def loadSampler(self):
+        """Shows the sample set of the library, or a new one if it has none"""
+        if self.library.sample_set is None:
+            self.library.sample_set = SampleSet()
+        self.sampler.setSampleSet(self.library.sample_set)
 
     def renameTheme(self,themeName:str):
         """Modify the name of the theme.
@@ -170,13 +448,35 @@ class MainWindow(QMainWindow):
         if ok :
             libraryName = QFileInfo(filepath).fileName()
             self.library.name = libraryName
+            self.library.sample_set = self.sampler.sampleSet
             self.library.save(filepath)
+            self.saveLastLibrary(filepath)
 
     def load(self):
         homeFolderPath = QStandardPaths.locate(QStandardPaths.HomeLocation, '', QStandardPaths.LocateDirectory)
         filepath, ok = QFileDialog().getOpenFileName(self,'test',os.path.expanduser(homeFolderPath),MainWindow.SUPPORTEDLIBRARYFILES)
         if ok :
-            self.loadLibrary(filepath)
-            self.loadSampler(filepath)
-            self.themes.setThemes()
-            self.playlist.reset()
+            if self.loadLibrary(filepath):
+                self.saveLastLibrary(filepath)
+            self.showLibrary()
+
+    def showLibrary(self):
+        """Show the themes, sample set, scenes and sequences of the library"""
+        self.warmCaches()
+        self.loadSampler()
+        library = self.library
+
+        #Large libraries take seconds to index: the index is built on a worker thread,
+        #the changes made meanwhile being applied to it once built
+        self.searchIndex = SearchIndex()
+        self.searchIndex.record_changes()
+        QThreadPool.globalInstance().start(SearchIndexJob(self, library))
+
+        self.contents.scanInBackground(ContentIndex.libraryFiles(library), lambda: self.contentsScanned.emit(library))
+        self.themes.setThemes()
+        self.playlist.reset()
+        self.scenes.setScenes()
+        self.sequences.setSequences()
+
+        if self.library.filepath :
+            self.scenes.showScene(Session.libraryState(self.library.filepath)['scene'])
@@ -8,23 +8,32 @@
 #---------------------------------
 
 import os
-import random
+from collections import deque
 
 from classes.interface import MainWindow
 from classes.library.Library import Library
 from classes.library.Track import Track
+from classes.library.StemTrack import StemTrack
+from classes.library.Category import Category
 from classes.multimedia.MusicPlayer import MusicPlayer
-from classes.ressourcesFilepath import Stylesheets
+from classes.multimedia.SegmentVoice import SegmentVoice
+from classes.interface.SegmentsDialogBox import SegmentsDialogBox
+from classes.interface.PlaylistModel import PlaylistModel
+from classes.interface.PlaylistView import PlaylistView
 from classes.ressourcesFilepath import Images
+from classes.ressourcesCache import RessourcesCache
+from classes.history import History
 
 from PyQt5 import Qt
-from PyQt5.QtCore import QFileInfo, QUrl, QTimer, QStandardPaths
-from PyQt5.QtGui import QIcon
-from PyQt5.QtMultimedia import QMediaContent
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QListWidget, QPushButton, QFileDialog, QAbstractItemView, QShortcut, QProgressBar, QSlider
+from PyQt5.QtCore import QFileInfo, QTimer, QStandardPaths, QItemSelectionModel
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QFileDialog, QShortcut, QProgressBar, QSlider, QInputDialog
 
 class Playlist(QWidget):
 
+    #Number of upcoming tracks warmed in the page cache, and decoded ahead of time
+    PREFETCHCOUNT = 3
+    DECODECOUNT = 1
+
     def __init__(self,mainWindow:MainWindow):
         super().__init__()
 
@@ -33,6 +42,9 @@ class Playlist(QWidget):
         self.label = ''
         self.musicPlayer = MusicPlayer(mainWindow)
         self.repeat = False
+        self.currentTrack = None
+        #(theme, track) tuples played before the next track of the list
+        self.queue = deque()
 
         #Label of the tracklist
         playlistVerticalLayout = QVBoxLayout()
@@ -41,9 +53,10 @@ class Playlist(QWidget):
         playlistVerticalLayout.addWidget(self.label)
 
         #tracklist
-        self.trackList = QListWidget()
-        self.trackList.itemSelectionChanged.connect(lambda *args: self.toggleSuppressButton())
-        self.trackList.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.playlistModel = PlaylistModel()
+        self.trackList = PlaylistView()
+        self.trackList.setModel(self.playlistModel)
+        self.trackList.selectionModel().selectionChanged.connect(lambda *args: self.toggleSuppressButton())
         playlistVerticalLayout.addWidget(self.trackList)
 
         #Duration bar
@@ -65,7 +78,7 @@ class Playlist(QWidget):
 
         #play button
         self.playButton = QPushButton()
-        self.playButton.setIcon(QIcon(Images.playIcon))
+        self.playButton.setIcon(RessourcesCache.icon(Images.playIcon))
         self.playButtonShortcut = QShortcut(Qt.Qt.Key_Space,self.mainWindow)
         self.playButtonShortcut.activated.connect(lambda *args: self.playButton.animateClick())
         self.playButton.setMinimumWidth(50)
@@ -84,9 +97,30 @@ class Playlist(QWidget):
         self.removeMusicButton.setEnabled(False)
         tracklistControlLayout.addWidget(self.removeMusicButton)
 
+        #add stems button
+        self.addStemsButton = QPushButton(self.mainWindow.text.localisation('buttons','addStems','caption'))
+        self.addStemsButton.setToolTip(self.mainWindow.text.localisation('buttons','addStems','toolTip'))
+        self.addStemsButton.clicked.connect(lambda *args: self.addStemsToList())
+        self.addStemsButton.setEnabled(False)
+        tracklistControlLayout.addWidget(self.addStemsButton)
+
+        #tags button
+        self.tagsButton = QPushButton(self.mainWindow.text.localisation('buttons','tags','caption'))
+        self.tagsButton.setToolTip(self.mainWindow.text.localisation('buttons','tags','toolTip'))
+        self.tagsButton.clicked.connect(lambda *args: self.editTags())
+        self.tagsButton.setEnabled(False)
+        tracklistControlLayout.addWidget(self.tagsButton)
+
+        #segments button
+        self.segmentsButton = QPushButton(self.mainWindow.text.localisation('buttons','segments','caption'))
+        self.segmentsButton.setToolTip(self.mainWindow.text.localisation('buttons','segments','toolTip'))
+        self.segmentsButton.clicked.connect(lambda *args: self.editSegments())
+        self.segmentsButton.setEnabled(False)
+        tracklistControlLayout.addWidget(self.segmentsButton)
+
         #stop button
         self.stopButton = QPushButton()
-        self.stopButton.setIcon(QIcon(Images.stopIcon))
+        self.stopButton.setIcon(RessourcesCache.icon(Images.stopIcon))
         self.stopButton.setMinimumWidth(50)
         self.stopButton.clicked.connect(lambda *args: self.stopMusic())
         tracklistControlLayout.addWidget(self.stopButton)
@@ -107,45 +141,87 @@ class Playlist(QWidget):
 
         #Repeat control
         self.repeatToggleButton = QPushButton()
-        self.repeatToggleButton.setIcon(QIcon(Images.repeatIcon))
+        self.repeatToggleButton.setIcon(RessourcesCache.icon(Images.repeatIcon))
         self.repeatToggleButton.clicked.connect(lambda *args: self.toggleRepeat())
 
         tracklistControlLayout.addWidget(self.repeatToggleButton)
+
+        #Transition control: wait for the next bar or play the outro right away
+        self.outroToggleButton = QPushButton(self.mainWindow.text.localisation('buttons','outroTransition','caption'))
+        self.outroToggleButton.setToolTip(self.mainWindow.text.localisation('buttons','outroTransition','toolTip'))
+        self.outroToggleButton.clicked.connect(lambda *args: self.toggleTransition())
+        tracklistControlLayout.addWidget(self.outroToggleButton)
+
+        #Music effects
+        self.muffleToggleButton = QPushButton(self.mainWindow.text.localisation('buttons','muffle','caption'))
+        self.muffleToggleButton.setToolTip(self.mainWindow.text.localisation('buttons','muffle','toolTip'))
+        self.muffleToggleButton.clicked.connect(lambda *args: self.toggleMuffle())
+        tracklistControlLayout.addWidget(self.muffleToggleButton)
+
+        self.reverbToggleButton = QPushButton(self.mainWindow.text.localisation('buttons','reverb','caption'))
+        self.reverbToggleButton.setToolTip(self.mainWindow.text.localisation('buttons','reverb','toolTip'))
+        self.reverbToggleButton.clicked.connect(lambda *args: self.toggleReverb())
+        tracklistControlLayout.addWidget(self.reverbToggleButton)
         tracklistControlLayout.addWidget(volumeControlWidget)
 
         controlsWidget.setLayout(tracklistControlLayout)
         playlistVerticalLayout.addWidget(controlsWidget)
 
+        #Intensity of the stem tracks
+        intensityLayout = QHBoxLayout()
+        intensityLabel = QLabel(self.mainWindow.text.localisation('labels','intensity','caption'))
+        intensityLabel.setToolTip(self.mainWindow.text.localisation('labels','intensity','toolTip'))
+        self.intensitySlider = QSlider(Qt.Qt.Horizontal)
+        self.intensitySlider.setMinimum(0)
+        self.intensitySlider.setMaximum(MusicPlayer.MaxIntensity)
+        self.intensitySlider.setValue(MusicPlayer.MaxIntensity)
+        self.intensitySlider.valueChanged.connect(lambda value: self.musicPlayer.setIntensity(value))
+        intensityLayout.addWidget(intensityLabel)
+        intensityLayout.addWidget(self.intensitySlider)
+
+        intensityWidget = QWidget()
+        intensityWidget.setLayout(intensityLayout)
+        playlistVerticalLayout.addWidget(intensityWidget)
+
 
         #set playlist layout
         self.setLayout(playlistVerticalLayout)
 
-    def setList(self,text:str='', tracks:dict=None):
-        """Update the tracklist with the provided list of tracks and
-            sets the track list label to specified text. Also plays a track of the theme at random if
+    def setList(self, category:Category, autoPlay:bool=True):
+        """Update the tracklist with the tracks of the provided category and
+            sets the track list label to its name. Also plays a track of the theme at random if
             theme selection occurs while the music player is active.
             Takes two parameters:
-            - text as string
-            - list of tracks as a dictionnary of track objects
+            - category as Category object
+            - autoPlay as boolean, False to leave the choice of the track to the caller
         """
-        self.label.setText(text)
-        self.trackList.clear()
-        self.tracks = tracks
+        self.label.setText(category.name)
+        self.tracks = category.tracks
+        self.playlistModel.setCategory(category)
 
-        for track in tracks:
-            self.trackList.addItem(track.name)
-
-        self.addMusicButton.setEnabled(True)
+        #The tracks of a smart theme are chosen by their tags
+        self.addMusicButton.setEnabled(not category.query)
+        self.addStemsButton.setEnabled(not category.query)
+        self.toggleSuppressButton()
 
         #Launch a random track if the music player is active.
-        if self.musicPlayer.isPlaying():
+        if not autoPlay:
+            return
+        elif self.musicPlayer.isPlaying():
             self.playMusicAtRandom()
+        else:
+            self.mainWindow.prefetcher.prefetch([location for track in self.tracks[:Playlist.PREFETCHCOUNT] for location in track.get_locations()])
 
     def initiateDurationBar(self, duration:int):
         """Set the duration bar and start/restart a timer to display progression.
             Takes one parameter:
             - duration as integer (in msec).
         """
+        track = self.currentTrack
+        if track and track.duration != duration and track in self.tracks :
+            track.duration = duration
+            self.playlistModel.rowChanged(self.tracks.index(track))
+
         self.resetDurationBar()
         self.durationBar.setMaximum(duration)
         self.durationBar.setValue(0)
@@ -175,94 +251,231 @@ class Playlist(QWidget):
         musicFolderPath = QStandardPaths.locate(QStandardPaths.MusicLocation, '', QStandardPaths.LocateDirectory)
         filesList, ok = QFileDialog().getOpenFileNames(self,self.mainWindow.text.localisation('dialogBoxes','addMusic','caption'),os.path.expanduser(musicFolderPath),"*.mp3 *.wav *.ogg *.flac *.wma *.aiff *.m4a")
         if ok :
+            newTracks = []
             for filePath in filesList :
                 name = QFileInfo(filePath).fileName()
-                self.tracks.append(Track(name,filePath))
-                self.trackList.addItem(name)
+                newTracks.append(Track(name,filePath))
+            self.appendTracks(newTracks)
+
+    def addStemsToList(self):
+        """Calls a file dialog to choose the stems of a new track, the first one
+            being always heard and the next ones joining as the intensity rises.
+            Takes no parameter.
+        """
+        musicFolderPath = QStandardPaths.locate(QStandardPaths.MusicLocation, '', QStandardPaths.LocateDirectory)
+        filesList, ok = QFileDialog().getOpenFileNames(self,self.mainWindow.text.localisation('buttons','addStems','toolTip'),os.path.expanduser(musicFolderPath),"*.mp3 *.wav *.ogg *.flac *.wma *.aiff *.m4a")
+        if ok and filesList :
+            name = QFileInfo(filesList[0]).completeBaseName()
+            self.appendTracks([StemTrack.from_locations(name,filesList)])
+
+    def appendTracks(self, tracks:list):
+        """Add tracks at the end of the theme shown, the files already in the library
+            being added as the same track.
+            Takes one parameter:
+            - tracks as list of Track objects.
+        """
+        category = self.playlistModel.category
+        tagIndex = self.mainWindow.library.tag_index
+
+        tracks = [tagIndex.shared_track(track) for track in tracks]
+        self.playlistModel.appendTracks(tracks)
+        for track in tracks :
+            tagIndex.add_track(category, track)
+            self.mainWindow.searchIndex.add_track(category, track)
+
+    def currentRow(self):
+        """Returns the row of the selected track or -1 if none is selected.
+            Takes no parameter.
+        """
+        index = self.trackList.currentIndex()
+        if index.isValid():
+            return index.row()
+        return -1
+
+    def setCurrentRow(self, row:int):
+        """Select the track at the given row.
+            Takes one parameter:
+            - row as integer.
+        """
+        index = self.playlistModel.index(row)
+        self.trackList.setCurrentIndex(index)
+        self.trackList.scrollTo(index)
 
     def playNextMedia(self):
-        """Select the next media of the list and gives it to the player.
+        """Select the next media of the list and gives it to the player, the
+            queued tracks first.
             Takes no parameter.
         """
+        while self.queue :
+            theme, track = self.queue.popleft()
+            #Tracks removed since they were queued are passed
+            if track in theme.tracks :
+                self.playTrackOfTheme(theme, track)
+                return
 
         #Check if repeat button is active
         if self.repeat :
-            nextRow = self.trackList.currentRow()
+            nextRow = self.currentRow()
         else:
-            nextRow = self.trackList.currentRow()+1
+            nextRow = self.currentRow()+1
 
-        maxRow = self.trackList.count()
+        maxRow = self.playlistModel.rowCount()
 
         #Restart at top of the list if the end is reached
         if nextRow >= maxRow :
             nextRow = 0
 
-        self.trackList.setCurrentRow(nextRow)
+        self.setCurrentRow(nextRow)
         self.playMusic()
 
     def removeMusicFromList(self):
-        """Remove the selected music from the tracklist.
+        """Remove the selected musics from the tracklist and its category.
             Takes no parameter.
         """
-        track = self.trackList.currentItem()
-        category = self.label.text()
-        library = self.mainWindow.library
-
-        #Parsing library to find current category
-        for libCategory in library.categories :
-            if libCategory.name == category :
-                #Parsing category to find the selected track
-                for libTrack in libCategory.tracks :
-                    if libTrack.name == track.text() :
-                        #Delete the track in the category
-                        libCategory.remove_track(libTrack)
-                        #Delete the list entry
-                        for item in self.trackList.selectedItems():
-                            self.trackList.takeItem(self.trackList.row(item))
+        category = self.playlistModel.category
+        tagIndex = self.mainWindow.library.tag_index
+
+        #The model shares the category's track list
+        rows = self.trackList.selectedRows()
+        tracks = [self.playlistModel.track(row) for row in rows]
+        currentRow = self.currentRow()
+        currentTrack = self.playlistModel.track(currentRow)
+        self.playlistModel.removeTrackRows(rows)
+
+        #Removing several rows resets the model: the next track follows the current one again
+        if currentTrack in self.tracks :
+            currentRow = self.tracks.index(currentTrack)
+        elif currentRow >= 0 :
+            currentRow -= len([row for row in set(rows) if row <= currentRow])
+        if currentRow >= 0 :
+            self.trackList.selectionModel().setCurrentIndex(self.playlistModel.index(currentRow), QItemSelectionModel.NoUpdate)
+
+        #Tracks listed by other themes stay found by the search
+        for track in tracks :
+            tagIndex.remove_track(category, track)
+            themes = tagIndex.get_themes(track)
+            if themes :
+                self.mainWindow.searchIndex.add_track(themes[0], track)
+            else:
+                self.mainWindow.searchIndex.remove(track)
+        self.toggleSuppressButton()
 
     def toggleSuppressButton(self):
         """(De)activate the suppress button.
             Takes no parameter.
         """
-        if self.trackList.currentItem():
+        category = self.playlistModel.category
+        if self.trackList.selectionModel().hasSelection() and category and not category.query:
             self.removeMusicButton.setEnabled(True)
         else :
             self.removeMusicButton.setEnabled(False)
 
+        self.tagsButton.setEnabled(self.trackList.selectionModel().hasSelection())
+
+        self.segmentsButton.setEnabled(len(self.trackList.selectedRows()) == 1)
+
+    def editSegments(self):
+        """Show the segments dialog for the selected track and store its markers.
+            Takes no parameter.
+        """
+        rows = self.trackList.selectedRows()
+        track = self.playlistModel.track(rows[0]) if len(rows) == 1 else None
+
+        if track :
+            segments, ok = SegmentsDialogBox(self.mainWindow, track).getItems()
+            if ok :
+                track.segments = segments
+                self.mainWindow.library.tag_index.update_track(track)
+                self.playlistModel.rowChanged(rows[0])
+
+    def editTags(self):
+        """Ask the tags of the selected tracks, the smart themes following at once.
+            Takes no parameter.
+        """
+        tracks = [self.playlistModel.track(row) for row in self.trackList.selectedRows()]
+        if not tracks :
+            return
+
+        tags, ok = QInputDialog.getText(self, self.mainWindow.text.localisation('dialogBoxes','tags','caption'),
+                                        self.mainWindow.text.localisation('dialogBoxes','tags','question'), text=', '.join(tracks[0].tags))
+        if not ok :
+            return
+
+        tagIndex = self.mainWindow.library.tag_index
+        for track in tracks :
+            tagIndex.set_tags(track, tags.split(','))
+            themes = tagIndex.get_themes(track)
+            if themes :
+                self.mainWindow.searchIndex.add_track(themes[0], track)
+
+        #A smart theme shown may have gained or lost tracks
+        category = self.playlistModel.category
+        if category.query :
+            self.setList(category, autoPlay=False)
+
     def reset(self):
         """Empty the playlist widget and reset the title label.
             Takes no parameter
         """
         self.label.setText(self.mainWindow.text.localisation('labels','playlistLabel','caption'))
-        self.trackList.clear()
+        self.playlistModel.setCategory(None)
+        self.tracks = self.playlistModel.tracks
         self.addMusicButton.setEnabled(False)
+        self.addStemsButton.setEnabled(False)
 
     def playMusic(self):
         """Send the selected file to the music player.
             Takes no parameter.
         """
-        if self.trackList.currentItem():
-            found = False
-            selectedItem = self.trackList.currentItem().text()
+        row = self.currentRow()
+        track = self.playlistModel.track(row)
+
+        if track :
+            self.recordPlay(track)
+            track.playCount += 1
+            self.currentTrack = track
+            self.playlistModel.rowChanged(row)
 
-            for track in self.tracks :
-                if track.name == selectedItem :
-                    filepath = track.location
-                    found = True
+            self.musicPlayer.changeMusic(track)
+            self.prefetchUpcomingTracks()
 
-            if found:
-                fileUrl = QUrl.fromLocalFile(filepath)
-                media = QMediaContent(fileUrl)
-                self.musicPlayer.changeMusic(media)
+    def prefetchUpcomingTracks(self):
+        """Ask the prefetcher to warm the tracks that playNextMedia() will pick next.
+            Takes no parameter.
+        """
+        numberOfTracks = len(self.tracks)
+        if numberOfTracks == 0 or self.repeat :
+            return
+
+        currentRow = self.currentRow()
+        upcomingTracks = []
+        for offset in range(1, min(Playlist.PREFETCHCOUNT, numberOfTracks-1)+1) :
+            upcomingTracks.append(self.tracks[(currentRow+offset) % numberOfTracks])
+
+        self.mainWindow.prefetcher.prefetch([location for track in upcomingTracks for location in track.get_locations()])
+        self.mainWindow.samples.prepareMusic([location for track in upcomingTracks[:Playlist.DECODECOUNT] for location in track.get_locations()])
+
+    def recordPlay(self, track:Track):
+        """Add a play of a track to the history, and a skip of the track it
+            replaces if that one was still playing.
+            Takes one parameter:
+            - track as Track object.
+        """
+        previousTrack = self.musicPlayer.currentTrack
+        if previousTrack and previousTrack is not track :
+            self.mainWindow.history.record(History.SKIP, previousTrack.location)
+        self.mainWindow.history.record(History.PLAY, track.location)
 
     def playMusicAtRandom(self):
-        """Choose randomly a track to play.
+        """Choose randomly a track to play, favouring the ones played less often
+            and longer ago.
             Takes no parameter
         """
-        numberOfTracks = len(self.tracks)
-        randomTrackNumber = random.randrange(0,numberOfTracks-1)
+        if not self.tracks :
+            return
+        randomTrackNumber = self.mainWindow.history.chooseFresh([track.location for track in self.tracks])
 
-        self.trackList.setCurrentRow(randomTrackNumber)
+        self.setCurrentRow(randomTrackNumber)
         self.playMusic()
 
     def stopMusic(self):
@@ -279,8 +492,100 @@ class Playlist(QWidget):
         """
         if self.repeat :
             self.repeat = False
-            self.repeatToggleButton.setStyleSheet("")
         else:
             self.repeat = True
-            styleSheet = open(Stylesheets.activeToggleButtons,'r', encoding='utf-8').read()
-            self.repeatToggleButton.setStyleSheet(styleSheet)
+
+        RessourcesCache.setProperty(self.repeatToggleButton, 'active', self.repeat)
+
+    def toggleTransition(self):
+        """Toggle between waiting for the next bar and jumping to the outro when a
+            track with segments is replaced.
+            Takes no parameter.
+            Returns nothing.
+        """
+        if self.musicPlayer.transition == SegmentVoice.OUTRO :
+            self.musicPlayer.setTransition(SegmentVoice.BOUNDARY)
+        else:
+            self.musicPlayer.setTransition(SegmentVoice.OUTRO)
+
+        RessourcesCache.setProperty(self.outroToggleButton, 'active', self.musicPlayer.transition == SegmentVoice.OUTRO)
+
+    def toggleMuffle(self):
+        """Toggle the low pass filter making the music sound heard through a wall.
+            Takes no parameter.
+            Returns nothing.
+        """
+        self.setMuffled(not self.musicPlayer.muffled)
+
+    def toggleReverb(self):
+        """Toggle the reverb making the music sound played in a cave.
+            Takes no parameter.
+            Returns nothing.
+        """
+        self.setReverb(not self.musicPlayer.reverb)
+
+    def setMuffled(self, muffled:bool):
+        """Switch the low pass filter of the music on or off.
+            Takes one parameter:
+            - muffled as boolean.
+        """
+        self.musicPlayer.setMuffled(muffled)
+        RessourcesCache.setProperty(self.muffleToggleButton, 'active', muffled)
+
+    def setReverb(self, reverb:bool):
+        """Switch the reverb of the music on or off.
+            Takes one parameter:
+            - reverb as boolean.
+        """
+        self.musicPlayer.setReverb(reverb)
+        RessourcesCache.setProperty(self.reverbToggleButton, 'active', reverb)
+
+    def adoptTrack(self, track:Track, voiceId:int):
+        """Show a track started by the scheduler as the one playing.
+            Takes two parameters:
+            - track as Track object.
+            - voiceId as integer.
+        """
+        if track in self.tracks:
+            row = self.tracks.index(track)
+            self.setCurrentRow(row)
+            self.recordPlay(track)
+            track.playCount += 1
+            self.currentTrack = track
+            self.playlistModel.rowChanged(row)
+
+        self.musicPlayer.adoptMusic(track, voiceId)
+        self.prefetchUpcomingTracks()
+
+    def playTrack(self, track:Track):
+        """Select a track of the tracklist and play it.
+            Takes one parameter:
+            - track as Track object.
+        """
+        if track in self.tracks:
+            self.setCurrentRow(self.tracks.index(track))
+            self.playMusic()
+
+    def playTrackOfTheme(self, theme:Category, track:Track):
+        """Show a theme without starting a track of its own and play one of its tracks.
+            Takes two parameters:
+            - theme as Category object.
+            - track as Track object.
+        """
+        if self.playlistModel.category is not theme :
+            self.setList(theme, autoPlay=False)
+        self.playTrack(track)
+
+    def queueTrack(self, theme:Category, track:Track):
+        """Play a track after the one playing, or right away if nothing is playing.
+            Takes two parameters:
+            - theme as Category object.
+            - track as Track object.
+        """
+        if not self.musicPlayer.isPlaying():
+            self.playTrackOfTheme(theme, track)
+            return
+
+        self.queue.append((theme, track))
+        self.mainWindow.statusBar().showMessage(self.mainWindow.text.localisation('labels','queued','caption').format(track.name, len(self.queue)))
+        self.mainWindow.prefetcher.prefetch(track.get_locations())
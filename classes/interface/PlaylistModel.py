@@ -0,0 +1,166 @@
+#---------------------------------
+#Author: Chappuis Anthony
+#
+#Model exposing the tracks of a category to the playlist view.
+#It works directly on the category's list of tracks so that no data is
+#duplicated and the view only queries the rows it displays. Batched edits
+#are applied to the category in a single pass.
+#
+#Application: DragonShout music sampler
+#Last Edited: October 19th 2026
+#---------------------------------
+
+from bisect import bisect_left
+
+from classes.library.Category import Category
+
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QVariant
+
+class PlaylistModel(QAbstractListModel):
+
+    #Data roles
+    DurationRole = Qt.UserRole + 1
+    PlayCountRole = Qt.UserRole + 2
+    TrackRole = Qt.UserRole + 3
+
+    def __init__(self):
+        super().__init__()
+        self.category = None
+        self.tracks = []
+
+    def setCategory(self, category:Category=None):
+        """Make the model work on the tracks of another category. The list is not
+            copied: the model and the category share it.
+            - Takes one parameter:
+                - category as Category object or None to empty the model.
+            - Returns nothing.
+        """
+        self.beginResetModel()
+        self.category = category
+        if category :
+            self.tracks = category.tracks
+        else:
+            self.tracks = []
+        self.endResetModel()
+
+    def rowCount(self, parent:QModelIndex=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.tracks)
+
+    def data(self, index:QModelIndex, role:int=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.tracks):
+            return QVariant()
+
+        track = self.tracks[index.row()]
+
+        if role == Qt.DisplayRole:
+            return track.name
+        elif role == Qt.ToolTipRole:
+            if track.tags :
+                return '{}\n{}'.format(track.location, ', '.join(track.tags))
+            return track.location
+        elif role == PlaylistModel.DurationRole:
+            return track.duration
+        elif role == PlaylistModel.PlayCountRole:
+            return track.playCount
+        elif role == PlaylistModel.TrackRole:
+            return track
+
+        return QVariant()
+
+    def flags(self, index:QModelIndex):
+        if not index.isValid():
+            #Drops between rows land on the root index
+            return Qt.ItemIsDropEnabled
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsDragEnabled
+
+    def supportedDropActions(self):
+        return Qt.MoveAction
+
+    def track(self, row:int):
+        """Returns the track displayed at the given row.
+            - Takes one parameter:
+                - row as integer.
+            - Returns a Track object or None.
+        """
+        if 0 <= row < len(self.tracks):
+            return self.tracks[row]
+        return None
+
+    def appendTracks(self, tracks:list):
+        """Add tracks at the end of the list.
+            - Takes one parameter:
+                - tracks as list of Track objects.
+            - Returns nothing.
+        """
+        if not tracks:
+            return
+
+        first = len(self.tracks)
+        self.beginInsertRows(QModelIndex(), first, first+len(tracks)-1)
+        self.tracks.extend(tracks)
+        self.endInsertRows()
+
+    def removeTrackRows(self, rows:list):
+        """Remove the tracks at the given rows from the category in a single pass.
+            - Takes one parameter:
+                - rows as list of integers.
+            - Returns nothing.
+        """
+        rows = [row for row in set(rows) if 0 <= row < len(self.tracks)]
+        if not rows or not self.category:
+            return
+
+        if len(rows) == 1:
+            self.beginRemoveRows(QModelIndex(), rows[0], rows[0])
+            self.category.remove_tracks(rows)
+            self.endRemoveRows()
+        else:
+            #A reset costs O(visible rows) with uniform item sizes whereas one
+            #signal per removed range would cost O(ranges*tracks)
+            self.beginResetModel()
+            self.category.remove_tracks(rows)
+            self.endResetModel()
+
+    def moveTrackRows(self, rows:list, destination:int):
+        """Move the tracks at the given rows before the destination row.
+            - Takes two parameters:
+                - rows as list of integers.
+                - destination as integer.
+            - Returns the new row of the first moved track or -1 if nothing moved.
+        """
+        moved = sorted(set(row for row in rows if 0 <= row < len(self.tracks)))
+        if not moved or not self.category:
+            return -1
+
+        #A layout change keeps the current index and the selection on their tracks
+        self.layoutAboutToBeChanged.emit()
+        firstRow = self.category.move_tracks(moved, destination)
+
+        persistentIndexes = self.persistentIndexList()
+        newIndexes = []
+        for index in persistentIndexes:
+            row = index.row()
+            position = bisect_left(moved, row)
+            if position < len(moved) and moved[position] == row:
+                row = firstRow + position
+            else:
+                row -= position
+                if row >= firstRow:
+                    row += len(moved)
+            newIndexes.append(self.index(row))
+        self.changePersistentIndexList(persistentIndexes, newIndexes)
+        self.layoutChanged.emit()
+
+        return firstRow
+
+    def rowChanged(self, row:int):
+        """Notify the views that the data of a track changed (duration, play count...).
+            - Takes one parameter:
+                - row as integer.
+            - Returns nothing.
+        """
+        if 0 <= row < len(self.tracks):
+            index = self.index(row)
+            self.dataChanged.emit(index, index)
@@ -0,0 +1,85 @@
+#---------------------------------
+#Author: Chappuis Anthony
+#
+#List view used by the playlist. It allows selecting several tracks and
+#reordering them by drag and drop, the move being applied to the category in
+#a single pass by the PlaylistModel.
+#
+#Application: DragonShout music sampler
+#Last Edited: October 19th 2026
+#---------------------------------
+
+from PyQt5.QtCore import Qt, QItemSelection, QItemSelectionModel
+from PyQt5.QtGui import QDropEvent
+from PyQt5.QtWidgets import QListView, QAbstractItemView
+
+class PlaylistView(QListView):
+
+    def __init__(self):
+        super().__init__()
+
+        self.setUniformItemSizes(True)
+        self.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.setDragEnabled(True)
+        self.setAcceptDrops(True)
+        self.setDropIndicatorShown(True)
+        self.setDragDropMode(QAbstractItemView.InternalMove)
+        self.setDefaultDropAction(Qt.MoveAction)
+
+    def selectedRows(self):
+        """Returns the selected rows in ascending order.
+            - Takes no parameter.
+            - Returns a list of integers.
+        """
+        return sorted(index.row() for index in self.selectionModel().selectedRows())
+
+    def dropRow(self, event:QDropEvent):
+        """Returns the row before which the dragged tracks should be inserted.
+            - Takes one parameter:
+                - event as QDropEvent.
+            - Returns an integer.
+        """
+        index = self.indexAt(event.pos())
+        if not index.isValid():
+            return self.model().rowCount()
+
+        if event.pos().y() > self.visualRect(index).center().y():
+            return index.row()+1
+        return index.row()
+
+    def dropEvent(self, event:QDropEvent):
+        """Move the selected tracks where they are dropped.
+            - Takes one parameter:
+                - event as QDropEvent.
+            - Returns nothing.
+        """
+        if event.source() is not self:
+            event.ignore()
+            return
+
+        rows = self.selectedRows()
+        firstRow = self.model().moveTrackRows(rows, self.dropRow(event))
+
+        self.stopAutoScroll()
+        self.setState(QAbstractItemView.NoState)
+        self.viewport().update()
+
+        if firstRow >= 0:
+            self.selectRows(firstRow, firstRow+len(rows)-1)
+
+        #The tracks are already moved: a copy action prevents the view from
+        #removing the dragged rows afterwards
+        event.setDropAction(Qt.CopyAction)
+        event.accept()
+
+    def selectRows(self, firstRow:int, lastRow:int):
+        """Select a contiguous range of rows and make the first one current.
+            - Takes two parameters:
+                - firstRow as integer.
+                - lastRow as integer.
+            - Returns nothing.
+        """
+        model = self.model()
+        selection = QItemSelection(model.index(firstRow), model.index(lastRow))
+        self.selectionModel().select(selection, QItemSelectionModel.ClearAndSelect)
+        self.selectionModel().setCurrentIndex(model.index(firstRow), QItemSelectionModel.NoUpdate)
@@ -2,7 +2,7 @@
 #Author: Chappuis Anthony
 #
 #Show a pop-up window to select sound and icon file for
-# a sample button
+# a sample button. Selecting several files creates a variation pad.
 #
 #Application: DragonShout music sampler
 #Last Edited: Jula 26th 2018
@@ -12,45 +12,111 @@ import os
 
 from classes.interface import MainWindow
 from classes.ressourcesFilepath import Stylesheets, Images
+from classes.ressourcesCache import RessourcesCache
+from classes.multimedia.Panner import Panner
 
-from PyQt5.QtWidgets import QDialog, QPushButton, QGridLayout, QLineEdit, QLabel, QFileDialog
-from PyQt5.QtGui import QIcon
+from PyQt5.QtWidgets import QDialog, QPushButton, QGridLayout, QLineEdit, QLabel, QFileDialog, QComboBox, QDoubleSpinBox, QCheckBox
 from PyQt5.QtCore import QSize, QFileInfo, QStandardPaths
 from PyQt5.Qt import Qt
 
 class SampleButtonDialogBox(QDialog):
 
 
-    def __init__(self, mainWindow:MainWindow, samplePath:str='...', sampleIconPath:str='notset'):
+    def __init__(self, mainWindow:MainWindow, samplePath:str='...', sampleIconPath:str='notset', samplePaths:list=None,
+                    variationMode:str='roundRobin', pitchVariation:float=0.0, gainVariation:float=0.0,
+                    loop:bool=False, loopStart:float=None, loopEnd:float=None, loopCrossfade:float=0.02,
+                    pan:float=0.0, panVariation:float=0.0, location:tuple=None):
         super().__init__()
 
         self.mainWindow = mainWindow
         self.okOrNot = False
 
-        styleSheet = open(Stylesheets.globalStyle,'r', encoding='utf-8').read()
-        self.setStyleSheet(styleSheet)
+        self.setStyleSheet(RessourcesCache.stylesheet(Stylesheets.globalStyle))
 
         #parameters defaulting
         if sampleIconPath == 'notset' or not isinstance(sampleIconPath, str):
             sampleIconPath = Images.defaultButtonIcon
 
         #window title and icon
-        self.setWindowIcon(QIcon(MainWindow.MainWindow.APPLICATIONICONPATH))
+        self.setWindowIcon(RessourcesCache.icon(MainWindow.MainWindow.APPLICATIONICONPATH))
         self.setWindowTitle(self.mainWindow.text.localisation('dialogBoxes','newSample','caption'))
 
-        #sample filepath
+        #sample filepaths, the first one being the main sample
         self.samplePath = samplePath
+        self.samplePaths = list(samplePaths or [samplePath])
         self.sampleFileSelectLabel = QLabel(self.mainWindow.text.localisation('dialogBoxes','newSample','question'))
 
-        self.sampleFileSelectButton = QPushButton(QFileInfo(samplePath).fileName())
+        self.sampleFileSelectButton = QPushButton()
         self.sampleFileSelectButton.clicked.connect(lambda *args: self.getNewFilePath())
+        self.showFilePaths()
+
+        #variations
+        self.variationMode = variationMode
+        self.pitchVariation = pitchVariation
+        self.gainVariation = gainVariation
+
+        self.variationModeLabel = QLabel(self.mainWindow.text.localisation('dialogBoxes','variations','question'))
+        self.variationModeSelector = QComboBox()
+        self.variationModeSelector.addItem(self.mainWindow.text.localisation('dialogBoxes','variations','roundRobin'), 'roundRobin')
+        self.variationModeSelector.addItem(self.mainWindow.text.localisation('dialogBoxes','variations','random'), 'random')
+        self.variationModeSelector.setCurrentIndex(max(0, self.variationModeSelector.findData(variationMode)))
+
+        self.pitchVariationLabel = QLabel(self.mainWindow.text.localisation('dialogBoxes','variations','pitch'))
+        self.pitchVariationSelector = QDoubleSpinBox()
+        self.pitchVariationSelector.setRange(0.0, 12.0)
+        self.pitchVariationSelector.setSingleStep(0.5)
+        self.pitchVariationSelector.setValue(pitchVariation)
+
+        self.gainVariationLabel = QLabel(self.mainWindow.text.localisation('dialogBoxes','variations','gain'))
+        self.gainVariationSelector = QDoubleSpinBox()
+        self.gainVariationSelector.setRange(0.0, 24.0)
+        self.gainVariationSelector.setSingleStep(0.5)
+        self.gainVariationSelector.setValue(gainVariation)
+
+        #loop, the lowest value of the loop points meaning automatic
+        self.loop = loop
+        self.loopStart = loopStart
+        self.loopEnd = loopEnd
+        self.loopCrossfade = loopCrossfade
+
+        self.loopSelector = QCheckBox(self.mainWindow.text.localisation('dialogBoxes','loop','question'))
+        self.loopSelector.setChecked(loop)
+
+        self.loopStartLabel = QLabel(self.mainWindow.text.localisation('dialogBoxes','loop','start'))
+        self.loopStartSelector = self.loopPointSelector(loopStart)
+        self.loopEndLabel = QLabel(self.mainWindow.text.localisation('dialogBoxes','loop','end'))
+        self.loopEndSelector = self.loopPointSelector(loopEnd)
+
+        self.loopCrossfadeLabel = QLabel(self.mainWindow.text.localisation('dialogBoxes','loop','crossfade'))
+        self.loopCrossfadeSelector = QDoubleSpinBox()
+        self.loopCrossfadeSelector.setRange(0.0, 1.0)
+        self.loopCrossfadeSelector.setDecimals(3)
+        self.loopCrossfadeSelector.setSingleStep(0.01)
+        self.loopCrossfadeSelector.setValue(loopCrossfade)
+
+        #stereo placement
+        self.pan = pan
+        self.panVariation = panVariation
+        self.location = location
+
+        self.panLabel = QLabel(self.mainWindow.text.localisation('dialogBoxes','panning','pan'))
+        self.panSelector = self.placementSelector(-1.0, 1.0, 0.1, pan)
+        self.panVariationLabel = QLabel(self.mainWindow.text.localisation('dialogBoxes','panning','variation'))
+        self.panVariationSelector = self.placementSelector(0.0, 1.0, 0.1, panVariation)
+
+        self.locationSelector = QCheckBox(self.mainWindow.text.localisation('dialogBoxes','panning','positional'))
+        self.locationSelector.setChecked(location is not None)
+        self.locationXLabel = QLabel(self.mainWindow.text.localisation('dialogBoxes','panning','x'))
+        self.locationXSelector = self.placementSelector(-Panner.MAXDISTANCE, Panner.MAXDISTANCE, 0.5, location[0] if location else 0.0)
+        self.locationYLabel = QLabel(self.mainWindow.text.localisation('dialogBoxes','panning','y'))
+        self.locationYSelector = self.placementSelector(-Panner.MAXDISTANCE, Panner.MAXDISTANCE, 0.5, location[1] if location else Panner.REFERENCEDISTANCE)
 
         #icon
         self.sampleIconButtonLabel = QLabel(self.mainWindow.text.localisation('dialogBoxes','newIcon','question'))
         self.iconPath = sampleIconPath
 
         self.sampleIconButton = QPushButton()
-        self.sampleIconButton.setIcon(QIcon(self.iconPath))
+        self.mainWindow.thumbnails.setIcon(self.sampleIconButton, self.iconPath)
         self.sampleIconButton.setIconSize(QSize(100,100))
         self.sampleIconButton.setFlat(True)
         self.sampleIconButton.clicked.connect(lambda *args: self.getNewIcon())
@@ -68,8 +134,30 @@ class SampleButtonDialogBox(QDialog):
         self.layout.addWidget(self.sampleFileSelectButton,0,1)
         self.layout.addWidget(self.sampleIconButtonLabel,1,0)
         self.layout.addWidget(self.sampleIconButton,1,1)
-        self.layout.addWidget(self.OkButton,2,0)
-        self.layout.addWidget(self.CancelButton,2,1)
+        self.layout.addWidget(self.variationModeLabel,2,0)
+        self.layout.addWidget(self.variationModeSelector,2,1)
+        self.layout.addWidget(self.pitchVariationLabel,3,0)
+        self.layout.addWidget(self.pitchVariationSelector,3,1)
+        self.layout.addWidget(self.gainVariationLabel,4,0)
+        self.layout.addWidget(self.gainVariationSelector,4,1)
+        self.layout.addWidget(self.loopSelector,5,0,1,2)
+        self.layout.addWidget(self.loopStartLabel,6,0)
+        self.layout.addWidget(self.loopStartSelector,6,1)
+        self.layout.addWidget(self.loopEndLabel,7,0)
+        self.layout.addWidget(self.loopEndSelector,7,1)
+        self.layout.addWidget(self.loopCrossfadeLabel,8,0)
+        self.layout.addWidget(self.loopCrossfadeSelector,8,1)
+        self.layout.addWidget(self.panLabel,9,0)
+        self.layout.addWidget(self.panSelector,9,1)
+        self.layout.addWidget(self.panVariationLabel,10,0)
+        self.layout.addWidget(self.panVariationSelector,10,1)
+        self.layout.addWidget(self.locationSelector,11,0,1,2)
+        self.layout.addWidget(self.locationXLabel,12,0)
+        self.layout.addWidget(self.locationXSelector,12,1)
+        self.layout.addWidget(self.locationYLabel,13,0)
+        self.layout.addWidget(self.locationYSelector,13,1)
+        self.layout.addWidget(self.OkButton,14,0)
+        self.layout.addWidget(self.CancelButton,14,1)
         self.setLayout(self.layout)
 
     def getItems(self):
@@ -93,11 +181,58 @@ class SampleButtonDialogBox(QDialog):
         filepath, ok = QFileDialog.getOpenFileName(self,self.mainWindow.text.localisation('dialogBoxes','newIcon','question'),os.path.expanduser(picturesFolderPath),"*.jpg *.jpeg *.ico *.png")
 
         if ok :
-            self.sampleIconButton.setIcon(QIcon(filepath))
+            self.mainWindow.thumbnails.setIcon(self.sampleIconButton, filepath)
             self.iconPath = filepath
 
+    def placementSelector(self, minimum:float, maximum:float, step:float, value:float):
+        """Create a spin box for a stereo placement setting.
+            Takes four parameters:
+            - minimum as float.
+            - maximum as float.
+            - step as float.
+            - value as float.
+            Returns a QDoubleSpinBox.
+        """
+        selector = QDoubleSpinBox()
+        selector.setRange(minimum, maximum)
+        selector.setSingleStep(step)
+        selector.setValue(value)
+        return selector
+
+    def loopPointSelector(self, value:float):
+        """Create a spin box for a loop point in seconds, showing 'Auto' when the
+            point is found automatically.
+            Takes one parameter:
+            - value as float or None.
+            Returns a QDoubleSpinBox.
+        """
+        selector = QDoubleSpinBox()
+        selector.setRange(-0.001, 24*3600.0)
+        selector.setDecimals(3)
+        selector.setSingleStep(0.01)
+        selector.setSpecialValueText(self.mainWindow.text.localisation('dialogBoxes','loop','auto'))
+        selector.setValue(selector.minimum() if value is None else value)
+        return selector
+
+    def loopPoint(self, selector:QDoubleSpinBox):
+        """Returns the loop point chosen in a spin box, None for automatic."""
+        if selector.value() == selector.minimum():
+            return None
+        return selector.value()
+
+    def showFilePaths(self):
+        """Show the selected file name, or the number of variations.
+            Takes no parameter.
+            Returns nothing.
+        """
+        if len(self.samplePaths) > 1:
+            self.sampleFileSelectButton.setText(self.mainWindow.text.localisation('dialogBoxes','variations','files').format(len(self.samplePaths)))
+        else:
+            self.sampleFileSelectButton.setText(QFileInfo(self.samplePath).fileName())
+
     def getNewFilePath(self):
-        """Opens a filesystem dialog to choose a new effect file for the sample.
+        """Opens a filesystem dialog to choose the effect files for the sample.
+            Several files can be chosen to create variations.
             Takes no parameter.
             Returns nothing.
         """
@@ -106,11 +241,12 @@ class SampleButtonDialogBox(QDialog):
         else:
             filepath = QStandardPaths.locate(QStandardPaths.MusicLocation, '', QStandardPaths.LocateDirectory)
 
-        filepath, ok = QFileDialog.getOpenFileName(self,self.mainWindow.text.localisation('dialogBoxes','newSample','question'),os.path.expanduser(filepath),"*.mp3 *.wav *.flac *.aac")
+        filepaths, ok = QFileDialog.getOpenFileNames(self,self.mainWindow.text.localisation('dialogBoxes','newSample','question'),os.path.expanduser(filepath),"*.mp3 *.wav *.flac *.aac")
 
-        if ok :
-            self.samplePath = filepath
-            self.sampleFileSelectButton.setText(QFileInfo(filepath).fileName())
+        if ok and filepaths :
+            self.samplePath = filepaths[0]
+            self.samplePaths = filepaths
+            self.showFilePaths()
 
     def closeDialog(self, okOrNot:bool):
         """Close the dialog.
@@ -119,4 +255,17 @@ class SampleButtonDialogBox(QDialog):
             Returns nothing.
         """
         self.okOrNot = okOrNot
+        self.variationMode = self.variationModeSelector.currentData()
+        self.pitchVariation = self.pitchVariationSelector.value()
+        self.gainVariation = self.gainVariationSelector.value()
+        self.loop = self.loopSelector.isChecked()
+        self.loopStart = self.loopPoint(self.loopStartSelector)
+        self.loopEnd = self.loopPoint(self.loopEndSelector)
+        self.loopCrossfade = self.loopCrossfadeSelector.value()
+        self.pan = self.panSelector.value()
+        self.panVariation = self.panVariationSelector.value()
+        if self.locationSelector.isChecked():
+            self.location = (self.locationXSelector.value(), self.locationYSelector.value())
+        else:
+            self.location = None
         self.close()
@@ -2,22 +2,32 @@
 #Author: Chappuis Anthony
 #
 #This class manage the buttons of the sampler function.
+#Pads are organised in banks, each bank being a sparse grid of any size.
+#The buttons of a bank are built from its SampleBank when it is first used.
 #
 #Application: DragonShout music sampler
 #Last Edited: February 03rd 2018
 #---------------------------------
 
-import json
-
 from classes.interface import MainWindow
-from classes.ressourcesFilepath import Stylesheets
+from classes.ressourcesCache import RessourcesCache
 from classes.interface.SoundEffect import SoundEffect
+from classes.interface.SamplerGrid import SamplerGrid
 from classes.interface.SampleButtonDialogBox import SampleButtonDialogBox
+from classes.interface.DuckingDialogBox import DuckingDialogBox
+from classes.multimedia.Ducker import Ducker
+from classes.multimedia.Mixer import Mixer
+from classes.multimedia.Playback import Playback
+from classes.multimedia.Prefetcher import Prefetcher
+from classes.library.Pad import Pad
+from classes.library.SampleSet import SampleSet
+from classes.library.SampleBank import SampleBank
 
 from PyQt5 import Qt
-from PyQt5.QtCore import QUrl
+from PyQt5.QtCore import QTimer, pyqtSignal
 
-from PyQt5.QtWidgets import QWidget, QGridLayout, QPushButton, QVBoxLayout, QHBoxLayout, QSlider
+from PyQt5.QtWidgets import (QWidget, QPushButton, QVBoxLayout, QHBoxLayout, QSlider,
+    QComboBox, QSpinBox, QStackedWidget, QScrollArea)
 
 class Sampler(QWidget):
 
@@ -30,19 +40,32 @@ class Sampler(QWidget):
     MINVOLUME = 0
     MAXVOLUME = 100
 
+    #Grid sizes
+    DEFAULTROWS = SampleBank.DEFAULT_ROWS
+    DEFAULTCOLUMNS = SampleBank.DEFAULT_COLUMNS
+    MAXGRIDSIZE = 64
+
+    #Emitted with the bank, row and column of a pad played by the user
+    padTriggered = pyqtSignal(int, int, int)
+
+    #Music ducking applied by the audio engine while sound effects play
+    DEFAULTDUCKING = {"enabled": True, "threshold": Ducker.THRESHOLD, "depth": Ducker.DEPTH,
+                        "attack": Ducker.ATTACK, "release": Ducker.RELEASE}
+
     def __init__(self, mainWindow:MainWindow):
         super().__init__()
 
         self.mainWindow = mainWindow
 
-        self.lastRowIndex = 9
-
         self.samplerMode = Sampler.PLAYMODE
+        self.volume = int(Sampler.MAXVOLUME/2)
+        self.ducking = dict(Sampler.DEFAULTDUCKING)
+        self.sampleSet = SampleSet()
 
-        self.MAXBUTTONPERROW = 6
-
-        #Grid layout
-        self.sampleButtonsGridLayout = self.constructGrid()
+        #Each bank is a dictionnary: {'model', 'grid', 'built'}, 'model' being the
+        #SampleBank shown by the grid and 'built' False until its buttons exist.
+        self.banks = []
+        self.currentBank = 0
 
         #Main layout
         self.mainLayout = QVBoxLayout()
@@ -50,8 +73,10 @@ class Sampler(QWidget):
         self.setLayout(self.mainLayout)
 
         self.populateMainLayout()
-        self.changeVolume(int(Sampler.MAXVOLUME/2))
 
+        self.addBank()
+        self.changeVolume(self.volume)
+        self.setDucking(self.ducking)
 
     def populateMainLayout(self):
         """Used to place the various widget of this module on the main layout.
@@ -60,63 +85,14 @@ class Sampler(QWidget):
         """
         #Control buttons
         self.addControlButtons()
+        self.addBankControls()
 
-        #Sample buttons grid layout
-        self.buttonGrid = QWidget()
-        self.buttonGrid.setLayout(self.sampleButtonsGridLayout)
-        self.mainLayout.addWidget(self.buttonGrid)
+        #One grid per bank, switching bank only changes the visible page
+        self.bankStack = QStackedWidget()
+        self.mainLayout.addWidget(self.bankStack)
 
         self.mainLayout.addStretch(1)
 
-    def constructGrid(self, sampleSet:list=None):
-        """Constructs the buttons' grid according to the self.sampleButtons property
-            - Takes no parameter.
-            - Returns a QGridLayout containing the sample buttons.
-        """
-        gridLayout = QGridLayout()
-        self.sampleButtons = [[]]
-
-
-        #If a sample set is provided = create buttons according to the sample set
-        if sampleSet != None :
-            #Creating all objects from the sample set
-            soundEffects = []
-            for sampleJSON in sampleSet:
-                soundEffect = SoundEffect.unserialize(self.mainWindow,sampleJSON)
-                soundEffect.clicked.connect(lambda *args: self.clickOnSoundEffect(self.sender()))
-                soundEffects.append(soundEffect)
-
-            row = 0
-            while row <= self.lastRowIndex:
-                column = 0
-                while column < self.MAXBUTTONPERROW:
-                    #Place each object on the grids
-                    for soundEffect in soundEffects:
-                        buttonRow = soundEffect.coordinates[0]
-                        buttonColumn = soundEffect.coordinates[1]
-                        if buttonRow == row and buttonColumn == column:
-                            gridLayout.addWidget(soundEffect,row,column)
-                            self.sampleButtons[row].append(soundEffect)
-                    column += 1
-                self.sampleButtons.append([])
-                row += 1
-
-        #if no sample set is provided = creates only default buttons
-        else:
-            row = 0
-            while row <= self.lastRowIndex:
-                column = 0
-                while column < self.MAXBUTTONPERROW:
-                    sampleButton = SoundEffect(self.mainWindow,SoundEffect.NEWEFFECTBUTTON,(row,column))
-                    sampleButton.clicked.connect(lambda *args: self.clickOnSoundEffect(self.sender()))
-                    self.sampleButtons[row].append(sampleButton)
-                    gridLayout.addWidget(sampleButton,row,column)
-                    column += 1
-                self.sampleButtons.append([])
-                row += 1
-
-        return gridLayout
-
     def addControlButtons(self):
         """Add the the control buttons to the interface.
             - Takes no parameter.
@@ -130,81 +106,247 @@ class Sampler(QWidget):
         self.toggleDeleteModeButton = QPushButton(self.mainWindow.text.localisation('buttons','samplerDeleteButton','caption'))
         self.toggleDeleteModeButton.clicked.connect(lambda *args: self.toggleMode(Sampler.DELETEMODE))
 
+        #Ducking settings button
+        duckingButton = QPushButton(self.mainWindow.text.localisation('buttons','ducking','caption'))
+        duckingButton.setToolTip(self.mainWindow.text.localisation('buttons','ducking','toolTip'))
+        duckingButton.clicked.connect(lambda *args: self.editDucking())
+
         #Add to layout
         controlLayout = QHBoxLayout()
         controlLayout.addWidget(self.toggleEditModeButton)
         controlLayout.addWidget(self.toggleDeleteModeButton)
+        controlLayout.addWidget(duckingButton)
 
         #Volume control
         self.volumeSlider = QSlider(Qt.Qt.Vertical)
         self.volumeSlider.setMinimum(Sampler.MINVOLUME)
         self.volumeSlider.setMaximum(Sampler.MAXVOLUME)
         self.volumeSlider.setTickPosition(QSlider.TicksBelow)
+        self.volumeSlider.setValue(self.volume)
         self.volumeSlider.valueChanged.connect(lambda *args: self.changeVolume(self.sender().value()))
-        self.volumeSlider.setValue(int(Sampler.MAXVOLUME/2))
         controlLayout.addWidget(self.volumeSlider)
 
         controlWidget = QWidget()
         controlWidget.setLayout(controlLayout)
         self.mainLayout.addWidget(controlWidget)
 
+    def addBankControls(self):
+        """Add the bank selector, the new bank button and the grid size controls.
+            - Takes no parameter.
+            - Returns nothing.
+        """
+        self.bankSelector = QComboBox()
+        self.bankSelector.setToolTip(self.mainWindow.text.localisation('labels','bank','toolTip'))
+        self.bankSelector.currentIndexChanged.connect(lambda index: self.selectBank(index))
+
+        newBankButton = QPushButton(self.mainWindow.text.localisation('buttons','newBank','caption'))
+        newBankButton.setToolTip(self.mainWindow.text.localisation('buttons','newBank','toolTip'))
+        newBankButton.clicked.connect(lambda *args: self.addBank())
+
+        self.rowsSelector = QSpinBox()
+        self.rowsSelector.setRange(1, Sampler.MAXGRIDSIZE)
+        self.rowsSelector.setToolTip(self.mainWindow.text.localisation('labels','gridRows','toolTip'))
+        self.rowsSelector.valueChanged.connect(lambda *args: self.resizeCurrentGrid())
+
+        self.columnsSelector = QSpinBox()
+        self.columnsSelector.setRange(1, Sampler.MAXGRIDSIZE)
+        self.columnsSelector.setToolTip(self.mainWindow.text.localisation('labels','gridColumns','toolTip'))
+        self.columnsSelector.valueChanged.connect(lambda *args: self.resizeCurrentGrid())
+
+        bankLayout = QHBoxLayout()
+        bankLayout.addWidget(self.bankSelector, 1)
+        bankLayout.addWidget(newBankButton)
+        bankLayout.addWidget(self.rowsSelector)
+        bankLayout.addWidget(self.columnsSelector)
+
+        bankWidget = QWidget()
+        bankWidget.setLayout(bankLayout)
+        self.mainLayout.addWidget(bankWidget)
+
+    def addBank(self, model:SampleBank=None):
+        """Add a bank to the sampler. Its pads are only created when the bank is
+            built, either when selected or in the background.
+            - Takes one parameter:
+                - model as SampleBank object of the sample set, None to add an empty bank.
+            - Returns the bank as dictionnary.
+        """
+        if model is None:
+            model = self.sampleSet.add_bank()
+
+        if model.name == '':
+            model.name = self.mainWindow.text.localisation('labels','bank','caption')+' '+str(len(self.banks)+1)
+
+        grid = SamplerGrid(model.rows, model.columns)
+        grid.emptyCellClicked.connect(lambda row, column: self.addSampleButton((row, column)))
+
+        scrollArea = QScrollArea()
+        scrollArea.setWidgetResizable(True)
+        scrollArea.setWidget(grid)
+
+        bank = {'model': model, 'grid': grid, 'built': not model.pads}
+        self.banks.append(bank)
+        self.bankStack.addWidget(scrollArea)
+        self.bankSelector.addItem(model.name)
+
+        #Pads are likely to be hit at any moment: warm all of them
+        self.mainWindow.prefetcher.prefetch([filepath for pad in model.pads for filepath in pad.get_sound_files()], Prefetcher.BULK)
+
+        return bank
+
+    def buildBank(self, bank:dict):
+        """Create the pads of a bank which have not been created yet.
+            - Takes one parameter:
+                - bank as dictionnary.
+            - Returns nothing.
+        """
+        if bank['built']:
+            return
+        bank['built'] = True
+
+        for pad in list(bank['model'].pads):
+            self.addPad(bank, SoundEffect(self.mainWindow, pad))
+
+    def buildPendingBanks(self):
+        """Build the next bank still waiting for its pads, one bank per event loop
+            iteration so that the interface stays responsive.
+            - Takes no parameter.
+            - Returns nothing.
+        """
+        for bank in self.banks:
+            if not bank['built']:
+                self.buildBank(bank)
+                QTimer.singleShot(0, lambda: self.buildPendingBanks())
+                return
+
+    def selectBank(self, index:int):
+        """Show the pads of another bank.
+            - Takes one parameter:
+                - index as integer.
+            - Returns nothing.
+        """
+        if not 0 <= index < len(self.banks):
+            return
+
+        bank = self.banks[index]
+        self.buildBank(bank)
+
+        self.currentBank = index
+        self.sampleSet.current_bank = index
+        self.bankStack.setCurrentIndex(index)
+
+        if self.bankSelector.currentIndex() != index:
+            self.bankSelector.setCurrentIndex(index)
+
+        grid = bank['grid']
+        self.rowsSelector.blockSignals(True)
+        self.columnsSelector.blockSignals(True)
+        self.rowsSelector.setValue(grid.rows)
+        self.columnsSelector.setValue(grid.columns)
+        self.rowsSelector.blockSignals(False)
+        self.columnsSelector.blockSignals(False)
+
+    def resizeCurrentGrid(self):
+        """Apply the grid size controls to the current bank.
+            - Takes no parameter.
+            - Returns nothing.
+        """
+        bank = self.banks[self.currentBank]
+        bank['grid'].setGridSize(self.rowsSelector.value(), self.columnsSelector.value())
+        bank['model'].rows = bank['grid'].rows
+        bank['model'].columns = bank['grid'].columns
+
+    def addPad(self, bank:dict, soundEffect:SoundEffect):
+        """Place a sound effect on the grid of a bank, store its pad in the bank and
+            connect it to the sampler.
+            - Takes two parameters:
+                - bank as dictionnary.
+                - soundEffect as SoundEffect object.
+            - Returns nothing.
+        """
+        soundEffect.clicked.connect(lambda *args: self.clickOnSoundEffect(self.sender()))
+
+        bank['model'].set_pad(soundEffect.pad)
+        replacedPad = bank['grid'].setPad(soundEffect)
+        if replacedPad :
+            replacedPad.stop()
+            replacedPad.deleteLater()
+
+    def pads(self):
+        """Returns every pad of every built bank.
+            - Takes no parameter.
+            - Returns a list of SoundEffect objects.
+        """
+        return [soundEffect for bank in self.banks for soundEffect in bank['grid'].pads.values()]
+
+    def activeLoops(self):
+        """Returns the looping pads playing as [bank, row, column] lists.
+            - Takes no parameter.
+            - Returns a list.
+        """
+        return [[index, row, column] for index, bank in enumerate(self.banks)
+                for (row, column), soundEffect in bank['grid'].pads.items() if soundEffect.pad.loop and soundEffect.isPlaying()]
+
+    def loopPads(self, loops:list):
+        """Returns the looping pads at the given places, building their banks if needed.
+            - Takes one parameter:
+                - loops as list of [bank, row, column] lists.
+            - Returns a list of SoundEffect objects.
+        """
+        soundEffects = []
+        for index, row, column in loops:
+            soundEffect = self.pad(index, row, column)
+            if soundEffect and soundEffect.pad.loop :
+                soundEffects.append(soundEffect)
+        return soundEffects
+
+    def setActiveLoops(self, loops:list):
+        """Start the looping pads at the given places and stop the other ones.
+            - Takes one parameter:
+                - loops as list of [bank, row, column] lists.
+            - Returns nothing.
+        """
+        wanted = self.loopPads(loops)
+
+        for soundEffect in self.pads():
+            if soundEffect.pad.loop and soundEffect.isPlaying() and soundEffect not in wanted:
+                soundEffect.stop()
+
+        for soundEffect in wanted:
+            if not soundEffect.isPlaying():
+                soundEffect.playOrStop()
+
     def toggleMode(self, samplerMode:int):
         """Activate or deactivate different mode for the sampler.
             - Takes one parameter:
                 - samplerMode as One of the Sampler constants: PLAYMODE, EDITMODE, DELETEMODE.
             - Returns nothing.
         """
-        if samplerMode == Sampler.EDITMODE:
-            #Checks if Edit mode is already active
-            if self.samplerMode == Sampler.EDITMODE:
-                #Deactivate Edit mode and returns to Play mode
-                self.samplerMode = Sampler.PLAYMODE
-                self.toggleEditModeButton.setStyleSheet(None)
-                self.toggleDeleteModeButton.setStyleSheet(None)
-            else:
-                #Activate Edit mode
-                self.samplerMode = samplerMode
-                styleSheet = open(Stylesheets.activeToggleButtons,'r', encoding='utf-8').read()
-                self.toggleEditModeButton.setStyleSheet(styleSheet)
-                self.toggleDeleteModeButton.setStyleSheet(None)
-
-        elif samplerMode == Sampler.DELETEMODE:
-            #Checks if Delete mode is already active
-            if self.samplerMode == Sampler.DELETEMODE:
-                #Deactivate Delete mode and returns to Play mode
-                self.samplerMode = Sampler.PLAYMODE
-                self.toggleEditModeButton.setStyleSheet(None)
-                self.toggleDeleteModeButton.setStyleSheet(None)
-            else:
-                #Activate Delete mode
-                self.samplerMode = samplerMode
-                styleSheet = open(Stylesheets.activeToggleButtons,'r', encoding='utf-8').read()
-                self.toggleEditModeButton.setStyleSheet(None)
-                self.toggleDeleteModeButton.setStyleSheet(styleSheet)
-
-        else:
+        #Selecting the active mode again returns to Play mode
+        if samplerMode == self.samplerMode or samplerMode not in (Sampler.EDITMODE, Sampler.DELETEMODE):
             self.samplerMode = Sampler.PLAYMODE
-            self.toggleEditModeButton.setStyleSheet(None)
-            self.toggleDeleteButton.setStyleSheet(None)
+        else:
+            self.samplerMode = samplerMode
+
+        RessourcesCache.setProperty(self.toggleEditModeButton, 'active', self.samplerMode == Sampler.EDITMODE)
+        RessourcesCache.setProperty(self.toggleDeleteModeButton, 'active', self.samplerMode == Sampler.DELETEMODE)
 
     def addSampleButton(self, coordinates:tuple):
-        """Show the Sample button dialog to transform a default button into a soundEffect button.
-            - Takes no parameter.
+        """Show the Sample button dialog to create a soundEffect button on an empty cell
+            of the current bank.
+            - Takes one parameter:
+                - coordinates as (row, column) tuple.
             - Returns nothing.
         """
-        #Check if the last row is full according to self.MAXBUTTONPERROW.
-        #It begins a new row if necessary
-        path,icon, ok = SampleButtonDialogBox(self.mainWindow).getItems()
+        dialog = SampleButtonDialogBox(self.mainWindow)
+        path,icon, ok = dialog.getItems()
 
         if ok :
-            row = coordinates[0]
-            column = coordinates[1]
+            self.mainWindow.prefetcher.prefetch(dialog.samplePaths)
 
-            sampleButton = SoundEffect(self.mainWindow,SoundEffect.SOUNDEFFECTBUTTON,(row,column),path,icon)
-            sampleButton.clicked.connect(lambda *args: self.clickOnSoundEffect(self.sender()))
-            self.sampleButtonsGridLayout.itemAtPosition(row,column).widget().setParent(None)
-            self.sampleButtonsGridLayout.addWidget(sampleButton,row,column)
-            self.sampleButtons[row][column] = sampleButton
+            pad = Pad(coordinates, dialog.samplePaths or [path], icon, dialog.variationMode, dialog.pitchVariation, dialog.gainVariation,
+                        dialog.loop, dialog.loopStart, dialog.loopEnd, dialog.loopCrossfade, dialog.pan, dialog.panVariation, dialog.location)
+            self.addPad(self.banks[self.currentBank], SoundEffect(self.mainWindow, pad))
+            self.mainWindow.searchIndex.add_pad(self.currentBank, pad)
 
     def removeSampleButton(self, soundEffect:SoundEffect):
         """Remove a sample button, require the Delete mode.
@@ -212,14 +354,14 @@ class Sampler(QWidget):
                 - sampleButton as SoundEffect object.
             - Returns nothing.
         """
-        row = soundEffect.coordinates[0]
-        column = soundEffect.coordinates[1]
-
-        sampleButton = SoundEffect(self.mainWindow, SoundEffect.NEWEFFECTBUTTON,(row,column))
-        sampleButton.clicked.connect(lambda *args: self.clickOnSoundEffect(self.sender()))
-        self.sampleButtonsGridLayout.itemAtPosition(row,column).widget().setParent(None)
-        self.sampleButtonsGridLayout.addWidget(sampleButton,row,column)
-        self.sampleButtons[row][column] = sampleButton
+        for bank in self.banks:
+            if bank['grid'].pads.get(soundEffect.pad.coordinates) is soundEffect:
+                bank['grid'].takePad(soundEffect.pad.coordinates)
+                bank['model'].remove_pad(soundEffect.pad.coordinates)
+                self.mainWindow.searchIndex.remove(soundEffect.pad)
+                soundEffect.stop()
+                soundEffect.deleteLater()
+                return
 
     def editSampleButton(self, soundEffect:SoundEffect):
         """Edit a sample button.
@@ -227,12 +369,26 @@ class Sampler(QWidget):
                 - sampleButton as SoundEffect object.
             - Returns nothing.
         """
-        filepath,iconPath,ok = SampleButtonDialogBox(self.mainWindow,soundEffect.filepath,soundEffect.iconPath).getItems()
+        pad = soundEffect.pad
+        dialog = SampleButtonDialogBox(self.mainWindow,pad.get_filepath(),pad.icon_path,pad.filepaths,
+                                        pad.variation_mode,pad.pitch_variation,pad.gain_variation,
+                                        pad.loop,pad.loop_start,pad.loop_end,pad.loop_crossfade,
+                                        pad.pan,pad.pan_variation,pad.location)
+        filepath,iconPath,ok = dialog.getItems()
 
         if ok :
-            soundEffect.changeFile(filepath)
+            self.mainWindow.prefetcher.prefetch(dialog.samplePaths)
+            soundEffect.stop()
+            soundEffect.changeFiles(dialog.samplePaths)
+            soundEffect.setRandomization(dialog.variationMode, dialog.pitchVariation, dialog.gainVariation)
+            soundEffect.setLoop(dialog.loop, dialog.loopStart, dialog.loopEnd, dialog.loopCrossfade)
+            soundEffect.setPanning(dialog.pan, dialog.panVariation, dialog.location)
             soundEffect.changeIcon(iconPath)
 
+            for index, bank in enumerate(self.banks):
+                if bank['grid'].pads.get(pad.coordinates) is soundEffect:
+                    self.mainWindow.searchIndex.add_pad(index, pad)
+
     def clickOnSoundEffect(self, soundEffect:SoundEffect):
         """Called when a soundEffect button is clicked.
             - Takes one parameter:
@@ -240,67 +396,100 @@ class Sampler(QWidget):
             - Returns nothing.
         """
         #Checks sampler's mode
-        if soundEffect.buttonType == SoundEffect.SOUNDEFFECTBUTTON:
-            if self.samplerMode == Sampler.EDITMODE:
-                self.editSampleButton(soundEffect)
-
-            elif self.samplerMode == Sampler.DELETEMODE:
-                self.removeSampleButton(soundEffect)
-
-            else :
-                soundEffect.playOrStop()
+        if self.samplerMode == Sampler.EDITMODE:
+            self.editSampleButton(soundEffect)
+
+        elif self.samplerMode == Sampler.DELETEMODE:
+            self.removeSampleButton(soundEffect)
+
+        else :
+            soundEffect.playOrStop()
+            #Only triggers are reported, not the pads being stopped
+            for index, bank in enumerate(self.banks):
+                if soundEffect.isPlaying() and bank['grid'].pads.get(soundEffect.pad.coordinates) is soundEffect:
+                    self.padTriggered.emit(index, *soundEffect.pad.coordinates)
+
+    def pad(self, index:int, row:int, column:int):
+        """Returns the pad at a place, building its bank if needed.
+            - Takes three parameters:
+                - index as integer, bank index.
+                - row as integer.
+                - column as integer.
+            - Returns a SoundEffect object or None.
+        """
+        if not 0 <= index < len(self.banks):
+            return None
 
-        else: #Any other cases defaults to prompting the new sample button dialog.
-            self.addSampleButton(soundEffect.coordinates)
+        bank = self.banks[index]
+        self.buildBank(bank)
+        return bank['grid'].pads.get((row, column))
 
     def changeVolume(self, newVolume:int):
-        """Used to change all the soundEffects volume.
+        """Used to change all the soundEffects volume: the gain of the effects bus,
+            also faded by the sequences.
             - Takes one parameter:
                 - newVolume as integer.
             - Returns nothing.
         """
-        for row in self.sampleButtons:
-            for soundEffect in row:
-                if soundEffect.buttonType == SoundEffect.SOUNDEFFECTBUTTON:
-                    soundEffect.mediaPlayer.setVolume(newVolume)
+        self.volume = newVolume
+        self.mainWindow.audioEngine.setBusGain(Mixer.EFFECTSBUS, newVolume/Sampler.MAXVOLUME, Playback.VOLUMEFADEDURATION)
 
-    def load(self, filepath: str='',loadType:str="run"):
-        """Used to load a sample set from the hard drive (JSON).
+    def setDucking(self, ducking:dict):
+        """Change how the sound effects lower the music.
             - Takes one parameter:
-                - filepath as string
-            - Returns:
-                - False as boolean or sampleSet as list.
+                - ducking as dictionnary: enabled, threshold, depth, attack and release.
+            - Returns nothing.
         """
-        try:
-            with open(filepath, "r", encoding="utf-8") as json_file:
-                completeJSON = json.load(json_file)
+        self.ducking = dict(Sampler.DEFAULTDUCKING, **ducking)
+        self.sampleSet.ducking = self.ducking
+        self.mainWindow.audioEngine.setDucking(self.ducking["enabled"], self.ducking["threshold"], self.ducking["depth"],
+                                                self.ducking["attack"], self.ducking["release"])
 
-            sampleSet = completeJSON["SampleSet"]
+    def editDucking(self):
+        """Open the ducking settings.
+            - Takes no parameter.
+            - Returns nothing.
+        """
+        ducking, ok = DuckingDialogBox(self.mainWindow, self.ducking).getItems()
+        if ok :
+            self.setDucking(ducking)
 
-            if loadType == "run":
-                newButtonGrid = QWidget()
-                newButtonsGridLayout = self.constructGrid(sampleSet)
-                newButtonGrid.setLayout(newButtonsGridLayout)
-                oldButtonGrid = self.mainLayout.replaceWidget(self.buttonGrid,newButtonGrid)
+    def reset(self):
+        """Remove every bank and its pads.
+            - Takes no parameter.
+            - Returns nothing.
+        """
+        for soundEffect in self.pads():
+            soundEffect.stop()
 
-                oldButtonGrid.widget().setParent(None)
-                self.buttonGrid = newButtonGrid
-                self.sampleButtonsGridLayout = newButtonsGridLayout
+        self.bankSelector.blockSignals(True)
+        self.bankSelector.clear()
+        self.bankSelector.blockSignals(False)
 
-            elif loadType == "test":
-                return True
-        except :
-            return False
+        while self.bankStack.count():
+            page = self.bankStack.widget(0)
+            self.bankStack.removeWidget(page)
+            page.deleteLater()
 
-    def serialize(self):
-        """Used to serialize instance data to JSON format.
-            - Takes no parameter.
-            - Returns instance data as dictionnary.
+        self.banks = []
+        self.currentBank = 0
+
+    def setSampleSet(self, sampleSet:SampleSet):
+        """Show the banks of a sample set, which is then edited by the sampler. The
+            current bank is built right away, the other ones in the background.
+            - Takes one parameter:
+                - sampleSet as SampleSet object.
+            - Returns nothing.
         """
+        self.reset()
+        self.sampleSet = sampleSet
+
+        for model in sampleSet.banks:
+            self.addBank(model)
 
-        sampleButtons_list = []
-        for row in self.sampleButtons:
-            for sampleButton in row:
-                sampleButtons_list.append(sampleButton.serialize())
+        if not self.banks:
+            self.addBank()
 
-        return sampleButtons_list
+        self.selectBank(min(sampleSet.current_bank, len(self.banks)-1))
+        self.setDucking(sampleSet.ducking)
+        QTimer.singleShot(0, lambda: self.buildPendingBanks())
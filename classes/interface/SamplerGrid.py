@@ -0,0 +1,158 @@
+#---------------------------------
+#Author: Chappuis Anthony
+#
+#Grid of one bank of the sampler. Pads are stored sparsely by coordinates:
+#only populated cells own a SoundEffect widget, empty cells are painted and
+#report clicks so that a new pad can be created there.
+#
+#Application: DragonShout music sampler
+#Last Edited: October 19th 2026
+#---------------------------------
+
+from classes.interface.SoundEffect import SoundEffect
+from classes.ressourcesFilepath import Images
+from classes.ressourcesCache import RessourcesCache
+
+from PyQt5.QtCore import Qt, QSize, QRect, QPoint, pyqtSignal
+from PyQt5.QtGui import QColor, QPainter, QPaintEvent, QMouseEvent
+from PyQt5.QtWidgets import QWidget
+
+class SamplerGrid(QWidget):
+
+    #Geometry
+    CELLSIZE = 70
+    SPACING = 6
+    ICONSIZE = 24
+
+    #Colors matching the empty pad stylesheet
+    EMPTYBACKGROUND = QColor(58, 83, 124)
+    EMPTYBORDER = QColor(43, 61, 91)
+
+    #Emitted with the row and column of the clicked empty cell
+    emptyCellClicked = pyqtSignal(int, int)
+
+    def __init__(self, rows:int, columns:int):
+        super().__init__()
+
+        self.rows = rows
+        self.columns = columns
+
+        #(row, column) => SoundEffect
+        self.pads = {}
+
+        self.setMinimumSize(self.sizeHint())
+
+    def sizeHint(self):
+        step = SamplerGrid.CELLSIZE + SamplerGrid.SPACING
+        return QSize(self.columns*step + SamplerGrid.SPACING, self.rows*step + SamplerGrid.SPACING)
+
+    def cellRect(self, row:int, column:int):
+        """Returns the geometry of a cell.
+            - Takes two parameters:
+                - row as integer.
+                - column as integer.
+            - Returns a QRect.
+        """
+        step = SamplerGrid.CELLSIZE + SamplerGrid.SPACING
+        return QRect(SamplerGrid.SPACING + column*step, SamplerGrid.SPACING + row*step, SamplerGrid.CELLSIZE, SamplerGrid.CELLSIZE)
+
+    def cellAt(self, position:QPoint):
+        """Returns the coordinates of the cell under a position.
+            - Takes one parameter:
+                - position as QPoint.
+            - Returns a (row, column) tuple or None between cells.
+        """
+        step = SamplerGrid.CELLSIZE + SamplerGrid.SPACING
+        column = (position.x() - SamplerGrid.SPACING) // step
+        row = (position.y() - SamplerGrid.SPACING) // step
+
+        if 0 <= row < self.rows and 0 <= column < self.columns and self.cellRect(row, column).contains(position):
+            return (row, column)
+        return None
+
+    def setGridSize(self, rows:int, columns:int):
+        """Change the number of rows and columns. The grid never shrinks below its
+            populated pads.
+            - Takes two parameters:
+                - rows as integer.
+                - columns as integer.
+            - Returns nothing.
+        """
+        for row, column in self.pads:
+            rows = max(rows, row+1)
+            columns = max(columns, column+1)
+
+        self.rows = rows
+        self.columns = columns
+        self.setMinimumSize(self.sizeHint())
+        self.updateGeometry()
+        self.update()
+
+    def setPad(self, soundEffect:SoundEffect):
+        """Place a pad at its coordinates, replacing the pad already there.
+            - Takes one parameter:
+                - soundEffect as SoundEffect object.
+            - Returns the replaced SoundEffect or None.
+        """
+        coordinates = soundEffect.pad.coordinates
+        replacedPad = self.takePad(coordinates)
+
+        if coordinates[0] >= self.rows or coordinates[1] >= self.columns:
+            self.setGridSize(max(self.rows, coordinates[0]+1), max(self.columns, coordinates[1]+1))
+
+        soundEffect.setParent(self)
+        soundEffect.setGeometry(self.cellRect(*coordinates))
+        soundEffect.show()
+        self.pads[coordinates] = soundEffect
+
+        return replacedPad
+
+    def takePad(self, coordinates:tuple):
+        """Remove the pad at the given coordinates from the grid.
+            - Takes one parameter:
+                - coordinates as (row, column) tuple.
+            - Returns the removed SoundEffect or None.
+        """
+        soundEffect = self.pads.pop(tuple(coordinates), None)
+
+        if soundEffect :
+            soundEffect.hide()
+            soundEffect.setParent(None)
+            self.update(self.cellRect(*coordinates))
+
+        return soundEffect
+
+    def paintEvent(self, event:QPaintEvent):
+        """Paint the empty cells intersecting the area to refresh."""
+        painter = QPainter(self)
+        icon = RessourcesCache.icon(Images.addSampleButtonIcon)
+        area = event.rect()
+
+        step = SamplerGrid.CELLSIZE + SamplerGrid.SPACING
+        firstRow = max(0, area.top()//step)
+        lastRow = min(self.rows-1, area.bottom()//step)
+        firstColumn = max(0, area.left()//step)
+        lastColumn = min(self.columns-1, area.right()//step)
+
+        painter.setPen(SamplerGrid.EMPTYBORDER)
+        for row in range(firstRow, lastRow+1):
+            for column in range(firstColumn, lastColumn+1):
+                if (row, column) in self.pads:
+                    continue
+
+                rect = self.cellRect(row, column)
+                painter.fillRect(rect, SamplerGrid.EMPTYBACKGROUND)
+                painter.drawRect(rect.adjusted(0, 0, -1, -1))
+                iconRect = QRect(0, 0, SamplerGrid.ICONSIZE, SamplerGrid.ICONSIZE)
+                iconRect.moveCenter(rect.center())
+                icon.paint(painter, iconRect, Qt.AlignCenter)
+
+    def mouseReleaseEvent(self, event:QMouseEvent):
+        """Report clicks on empty cells."""
+        if event.button() == Qt.LeftButton:
+            cell = self.cellAt(event.pos())
+            if cell and cell not in self.pads:
+                self.emptyCellClicked.emit(*cell)
+                return
+
+        super().mouseReleaseEvent(event)
@@ -0,0 +1,212 @@
+#---------------------------------
+#Author: Chappuis Anthony
+#
+#Named snapshots of the table mood: music theme, sampler bank, volumes,
+#looping pads and music effects. The scenes likely to be chosen next are
+#prepared ahead of time and a scene is applied in a single audio block.
+#
+#Application: DragonShout music sampler
+#Last Edited: October 19th 2026
+#---------------------------------
+
+from classes.interface import MainWindow
+from classes.library.Scene import Scene
+
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QListWidget, QListWidgetItem, QInputDialog
+
+class Scenes(QWidget):
+
+    #Number of scenes around the current one prepared ahead of time
+    PRELOADDISTANCE = 1
+
+    def __init__(self, mainWindow:MainWindow):
+        super().__init__()
+
+        self.mainWindow = mainWindow
+
+        #Scene currently applied and scene name => track chosen for its next activation
+        self.currentScene = None
+        self.preparedTracks = {}
+
+        mainLayout = QVBoxLayout()
+        self.setLayout(mainLayout)
+
+        label = QLabel(self.mainWindow.text.localisation('labels','scenes','caption'))
+        label.setToolTip(self.mainWindow.text.localisation('labels','scenes','toolTip'))
+        mainLayout.addWidget(label)
+
+        #Scenes list: hovering a scene prepares it, clicking it applies it
+        self.scenesList = QListWidget()
+        self.scenesList.setMouseTracking(True)
+        self.scenesList.itemEntered.connect(lambda item: self.preload(self.mainWindow.library.get_scene(item.text())))
+        self.scenesList.itemClicked.connect(lambda item: self.activate(self.mainWindow.library.get_scene(item.text())))
+        mainLayout.addWidget(self.scenesList)
+
+        saveButton = QPushButton(self.mainWindow.text.localisation('buttons','saveScene','caption'))
+        saveButton.setToolTip(self.mainWindow.text.localisation('buttons','saveScene','toolTip'))
+        saveButton.clicked.connect(lambda *args: self.saveScene())
+
+        deleteButton = QPushButton(self.mainWindow.text.localisation('buttons','deleteScene','caption'))
+        deleteButton.setToolTip(self.mainWindow.text.localisation('buttons','deleteScene','toolTip'))
+        deleteButton.clicked.connect(lambda *args: self.deleteScene())
+
+        buttonsLayout = QHBoxLayout()
+        buttonsLayout.addWidget(saveButton)
+        buttonsLayout.addWidget(deleteButton)
+        mainLayout.addLayout(buttonsLayout)
+
+        self.setScenes()
+
+    def setScenes(self):
+        """Show the scenes of the library.
+            Takes no parameter.
+            Returns nothing.
+        """
+        self.preparedTracks = {}
+        self.currentScene = None
+
+        self.refreshList()
+        self.preloadNeighbours()
+
+    def capture(self, name:str):
+        """Take a snapshot of what is playing.
+            Takes one parameter:
+            - name as string.
+            Returns a Scene object.
+        """
+        playlist = self.mainWindow.playlist
+        sampler = self.mainWindow.sampler
+
+        theme = self.mainWindow.library.get_category(playlist.label.text())
+
+        return Scene(name, theme.name if theme else '', sampler.currentBank,
+                    playlist.volumeSlider.value(), sampler.volumeSlider.value(), sampler.activeLoops(),
+                    {"muffled": playlist.musicPlayer.muffled, "reverb": playlist.musicPlayer.reverb})
+
+    def saveScene(self):
+        """Ask a name and store the snapshot of what is playing in the library.
+            Takes no parameter.
+            Returns nothing.
+        """
+        name, ok = QInputDialog.getText(self, self.mainWindow.text.localisation('dialogBoxes','newScene','caption'),
+                                        self.mainWindow.text.localisation('dialogBoxes','newScene','question'))
+        if ok and name :
+            self.mainWindow.library.set_scene(self.capture(name))
+            self.currentScene = name
+            self.preparedTracks.pop(name, None)
+            self.refreshList()
+
+    def deleteScene(self):
+        """Remove the selected scene from the library.
+            Takes no parameter.
+            Returns nothing.
+        """
+        item = self.scenesList.currentItem()
+        if item :
+            self.mainWindow.library.remove_scene(item.text())
+            self.preparedTracks.pop(item.text(), None)
+            self.refreshList()
+
+    def refreshList(self):
+        """Show the scenes of the library again, keeping the prepared ones.
+            Takes no parameter.
+            Returns nothing.
+        """
+        self.scenesList.clear()
+        for scene in self.mainWindow.library.scenes:
+            self.scenesList.addItem(QListWidgetItem(scene.name))
+
+    def showScene(self, name:str):
+        """Select a scene in the list and prepare it without applying it, as the
+            scene used at the end of the previous session.
+            Takes one parameter:
+            - name as string.
+            Returns nothing.
+        """
+        scene = self.mainWindow.library.get_scene(name) if name else None
+        if not scene :
+            return
+
+        self.scenesList.setCurrentRow([scene.name for scene in self.mainWindow.library.scenes].index(name))
+        self.preload(scene)
+
+    def preload(self, scene:Scene):
+        """Prepare a scene so that applying it needs no decoding nor widget creation:
+            the track it will start is chosen and decoded, the bank and loops built.
+            Takes one parameter:
+            - scene as Scene object.
+            Returns nothing.
+        """
+        if not scene :
+            return
+
+        theme = self.mainWindow.library.get_category(scene.theme)
+        if theme and theme.tracks and scene.name not in self.preparedTracks:
+            self.preparedTracks[scene.name] = theme.tracks[self.mainWindow.history.chooseFresh([track.location for track in theme.tracks])]
+
+        track = self.preparedTracks.get(scene.name)
+        if track :
+            self.mainWindow.prefetcher.prefetch(track.get_locations())
+            self.mainWindow.samples.prepareMusic(track.get_locations())
+
+        sampler = self.mainWindow.sampler
+        if 0 <= scene.bank < len(sampler.banks):
+            sampler.buildBank(sampler.banks[scene.bank])
+
+        self.mainWindow.samples.prepare([filepath for soundEffect in sampler.loopPads(scene.loops) for filepath in soundEffect.pad.filepaths])
+
+    def preloadNeighbours(self):
+        """Prepare the scenes next to the current one in the list, the most likely
+            to be chosen next.
+            Takes no parameter.
+            Returns nothing.
+        """
+        scenes = self.mainWindow.library.scenes
+        names = [scene.name for scene in scenes]
+        if not scenes:
+            return
+
+        index = names.index(self.currentScene) if self.currentScene in names else 0
+        for offset in range(-Scenes.PRELOADDISTANCE, Scenes.PRELOADDISTANCE+1):
+            neighbour = scenes[(index+offset) % len(scenes)]
+            if neighbour.name != self.currentScene:
+                self.preload(neighbour)
+
+    def activate(self, scene:Scene):
+        """Apply a scene. Every change reaching the audio engine is applied at the
+            start of the same block.
+            Takes one parameter:
+            - scene as Scene object.
+            Returns nothing.
+        """
+        if not scene :
+            return
+
+        self.preload(scene)
+        track = self.preparedTracks.pop(scene.name, None)
+
+        playlist = self.mainWindow.playlist
+        sampler = self.mainWindow.sampler
+        theme = self.mainWindow.library.get_category(scene.theme)
+
+        mixer = self.mainWindow.audioEngine.mixer
+        mixer.beginBatch()
+        try:
+            if theme :
+                playlist.setList(theme, False)
+                #The music goes on if it already belongs to the theme
+                if track in theme.tracks and playlist.musicPlayer.getCurrentMedia() not in theme.tracks:
+                    playlist.playTrack(track)
+
+            playlist.volumeSlider.setValue(scene.music_volume)
+            playlist.setMuffled(scene.effects.get("muffled", False))
+            playlist.setReverb(scene.effects.get("reverb", False))
+
+            sampler.volumeSlider.setValue(scene.sampler_volume)
+            sampler.selectBank(scene.bank)
+            sampler.setActiveLoops(scene.loops)
+        finally:
+            mixer.endBatch()
+
+        self.currentScene = scene.name
+        self.preloadNeighbours()
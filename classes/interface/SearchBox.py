@@ -0,0 +1,107 @@
+#---------------------------------
+#Author: Chappuis Anthony
+#
+#Search box finding themes, tracks and sound effects of the library as the
+#user types, from the search index kept up to date by the other widgets.
+#Enter plays the chosen result, Shift+Enter queues a track after the one
+#playing.
+#
+#Application: DragonShout music sampler
+#Last Edited: October 19th 2026
+#---------------------------------
+
+import os
+
+from classes.interface import MainWindow
+from classes.library.SearchIndex import SearchIndex
+
+from PyQt5 import Qt
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLineEdit, QListWidget, QListWidgetItem, QShortcut, QApplication
+
+class SearchBox(QWidget):
+
+    #Number of results shown
+    MAXRESULTS = 20
+
+    def __init__(self, mainWindow:MainWindow):
+        super().__init__()
+
+        self.mainWindow = mainWindow
+
+        mainLayout = QVBoxLayout()
+        mainLayout.setContentsMargins(0, 0, 0, 0)
+        self.setLayout(mainLayout)
+
+        self.searchField = QLineEdit()
+        self.searchField.setPlaceholderText(self.mainWindow.text.localisation('labels','search','caption'))
+        self.searchField.setToolTip(self.mainWindow.text.localisation('labels','search','toolTip'))
+        self.searchField.setClearButtonEnabled(True)
+        self.searchField.textChanged.connect(lambda text: self.search(text))
+        self.searchField.returnPressed.connect(lambda: self.activate(self.resultsList.currentRow()))
+        mainLayout.addWidget(self.searchField)
+
+        self.searchShortcut = QShortcut(Qt.QKeySequence.Find, self.mainWindow)
+        self.searchShortcut.activated.connect(lambda *args: self.searchField.setFocus())
+
+        #Results, hidden while nothing is searched
+        self.resultsList = QListWidget()
+        self.resultsList.itemActivated.connect(lambda item: self.activate(self.resultsList.row(item)))
+        self.resultsList.hide()
+        mainLayout.addWidget(self.resultsList)
+
+    def search(self, query:str):
+        """Show the results of a query.
+            Takes one parameter:
+            - query as string.
+            Returns nothing.
+        """
+        self.resultsList.clear()
+        results = self.mainWindow.searchIndex.search(query, SearchBox.MAXRESULTS) if query.strip() else []
+
+        for kind, item, owner in results:
+            if kind == SearchIndex.THEME:
+                text = item.name
+                toolTip = item.name
+            elif kind == SearchIndex.TRACK:
+                text = '{} - {}'.format(item.name, owner.name)
+                toolTip = '\n'.join(item.get_locations())
+            else:
+                text = '{} - {} {}'.format(os.path.basename(item.get_filepath()), self.mainWindow.text.localisation('labels','bank','caption'), owner+1)
+                toolTip = '\n'.join(item.get_sound_files())
+
+            listItem = QListWidgetItem(text)
+            listItem.setToolTip(toolTip)
+            listItem.setData(Qt.Qt.UserRole, (kind, item, owner))
+            self.resultsList.addItem(listItem)
+
+        self.resultsList.setVisible(bool(results))
+        if results :
+            self.resultsList.setCurrentRow(0)
+
+    def activate(self, row:int):
+        """Play the result at a row, or queue it if Shift is held and it is a track.
+            Takes one parameter:
+            - row as integer.
+            Returns nothing.
+        """
+        listItem = self.resultsList.item(row)
+        if listItem is None:
+            return
+
+        kind, item, owner = listItem.data(Qt.Qt.UserRole)
+        queue = bool(QApplication.keyboardModifiers() & Qt.Qt.ShiftModifier)
+
+        if kind == SearchIndex.THEME:
+            if item in self.mainWindow.library.categories:
+                self.mainWindow.themes.selectTheme(self.mainWindow.library.categories.index(item))
+
+        elif kind == SearchIndex.TRACK:
+            if queue :
+                self.mainWindow.playlist.queueTrack(owner, item)
+            else:
+                self.mainWindow.playlist.playTrackOfTheme(owner, item)
+
+        else:
+            soundEffect = self.mainWindow.sampler.pad(owner, *item.coordinates)
+            if soundEffect :
+                self.mainWindow.sampler.clickOnSoundEffect(soundEffect)
@@ -0,0 +1,134 @@
+#---------------------------------
+#Author: Chappuis Anthony
+#
+#Show a pop-up window to detect or edit the segment markers of a track:
+#end of the intro, start of the outro and bar length.
+#
+#Application: DragonShout music sampler
+#Last Edited: October 19th 2026
+#---------------------------------
+
+from classes.interface import MainWindow
+from classes.library.Track import Track
+from classes.ressourcesFilepath import Stylesheets
+from classes.ressourcesCache import RessourcesCache
+from classes.multimedia.SoundDecoder import SoundDecoder
+from classes.multimedia.SegmentDetector import SegmentDetector
+
+from PyQt5.QtWidgets import QDialog, QPushButton, QGridLayout, QLabel, QCheckBox, QDoubleSpinBox, QApplication
+from PyQt5.Qt import Qt
+
+class SegmentsDialogBox(QDialog):
+
+    def __init__(self, mainWindow:MainWindow, track:Track):
+        super().__init__()
+
+        self.mainWindow = mainWindow
+        self.track = track
+        self.okOrNot = False
+        self.segments = track.segments
+
+        self.setStyleSheet(RessourcesCache.stylesheet(Stylesheets.globalStyle))
+
+        #window title and icon
+        self.setWindowIcon(RessourcesCache.icon(MainWindow.MainWindow.APPLICATIONICONPATH))
+        self.setWindowTitle(self.mainWindow.text.localisation('dialogBoxes','segments','caption'))
+
+        segments = track.segments or {}
+
+        self.segmentsSelector = QCheckBox(self.mainWindow.text.localisation('dialogBoxes','segments','question'))
+        self.segmentsSelector.setChecked(bool(track.segments))
+
+        self.loopStartLabel = QLabel(self.mainWindow.text.localisation('dialogBoxes','segments','loopStart'))
+        self.loopStartSelector = self.timeSelector(segments.get("loopStart", 0.0))
+        self.loopEndLabel = QLabel(self.mainWindow.text.localisation('dialogBoxes','segments','loopEnd'))
+        self.loopEndSelector = self.timeSelector(segments.get("loopEnd", track.duration/1000))
+        self.barLengthLabel = QLabel(self.mainWindow.text.localisation('dialogBoxes','segments','barLength'))
+        self.barLengthSelector = self.timeSelector(segments.get("barLength", 0.0))
+
+        self.detectButton = QPushButton(self.mainWindow.text.localisation('dialogBoxes','segments','detect'))
+        self.detectButton.clicked.connect(lambda *args: self.detectSegments())
+
+        #control buttons
+        self.OkButton = QPushButton(self.mainWindow.text.localisation('buttons','ok','caption'))
+        self.OkButton.clicked.connect(lambda *args: self.closeDialog(True))
+
+        self.CancelButton = QPushButton(self.mainWindow.text.localisation('buttons','cancel','caption'))
+        self.CancelButton.clicked.connect(lambda *args: self.closeDialog(False))
+
+        self.layout = QGridLayout()
+        self.layout.setAlignment(Qt.AlignHCenter | Qt.AlignVCenter)
+        self.layout.addWidget(self.segmentsSelector,0,0,1,2)
+        self.layout.addWidget(self.loopStartLabel,1,0)
+        self.layout.addWidget(self.loopStartSelector,1,1)
+        self.layout.addWidget(self.loopEndLabel,2,0)
+        self.layout.addWidget(self.loopEndSelector,2,1)
+        self.layout.addWidget(self.barLengthLabel,3,0)
+        self.layout.addWidget(self.barLengthSelector,3,1)
+        self.layout.addWidget(self.detectButton,4,0,1,2)
+        self.layout.addWidget(self.OkButton,5,0)
+        self.layout.addWidget(self.CancelButton,5,1)
+        self.setLayout(self.layout)
+
+    def timeSelector(self, value:float):
+        """Create a spin box for a marker in seconds.
+            Takes one parameter:
+            - value as float.
+            Returns a QDoubleSpinBox.
+        """
+        selector = QDoubleSpinBox()
+        selector.setRange(0.0, 24*3600.0)
+        selector.setDecimals(3)
+        selector.setSingleStep(0.1)
+        selector.setValue(value)
+        return selector
+
+    def getItems(self):
+        """Opens the segments dialog box locking the window and await for user inputs.
+            Takes no parameter.
+            Returns:
+            - segments as dictionnary or None if the track is played whole.
+            - okOrNot as boolean.
+        """
+        self.exec()
+        return self.segments, self.okOrNot
+
+    def detectSegments(self):
+        """Decode the track if needed and detect its markers.
+            Takes no parameter.
+            Returns nothing.
+        """
+        sampleRate = self.mainWindow.samples.sampleRate
+
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            buffer = self.mainWindow.samples.buffer(self.track.location)
+            if buffer is None:
+                buffer = SoundDecoder.decode(self.track.location, sampleRate)
+            segments = SegmentDetector.detect(buffer, sampleRate)
+        except (OSError, ValueError):
+            segments = None
+        finally:
+            QApplication.restoreOverrideCursor()
+
+        if segments :
+            self.segmentsSelector.setChecked(True)
+            self.loopStartSelector.setValue(segments["loopStart"])
+            self.loopEndSelector.setValue(segments["loopEnd"])
+            self.barLengthSelector.setValue(segments["barLength"])
+
+    def closeDialog(self, okOrNot:bool):
+        """Close the dialog.
+            Takes one parameter:
+            - okOrNot as boolean.
+            Returns nothing.
+        """
+        self.okOrNot = okOrNot
+
+        if not self.segmentsSelector.isChecked() or self.loopEndSelector.value() <= self.loopStartSelector.value():
+            self.segments = None
+        else:
+            self.segments = {"loopStart":   self.loopStartSelector.value(),
+                            "loopEnd":      self.loopEndSelector.value(),
+                            "barLength":    self.barLengthSelector.value()}
+        self.close()
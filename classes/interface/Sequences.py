@@ -0,0 +1,366 @@
+#---------------------------------
+#Author: Chappuis Anthony
+#
+#Scripted sequences of pad triggers, volume fades and theme changes. A
+#sequence is recorded from what the user plays and replayed on the audio
+#clock: every step is handed to the mixer scheduler at once so that it lands
+#on its exact frame whatever the load of the interface.
+#
+#Application: DragonShout music sampler
+#Last Edited: October 19th 2026
+#---------------------------------
+
+import time
+
+from classes.interface import MainWindow
+from classes.library.Sequence import Sequence
+from classes.multimedia.Mixer import Mixer
+from classes.multimedia.MusicPlayer import MusicPlayer
+from classes.ressourcesCache import RessourcesCache
+
+from PyQt5.QtGui import QFont
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QListWidget, QListWidgetItem, QInputDialog
+
+class Sequences(QWidget):
+
+    #Blocks between the start request and the first frame of a sequence, so
+    #that its steps reach the scheduler before they are due
+    STARTDELAY = 2
+
+    #Volume changes closer than this (in seconds) are recorded as one fade
+    FADECOALESCING = 0.5
+
+    def __init__(self, mainWindow:MainWindow):
+        super().__init__()
+
+        self.mainWindow = mainWindow
+
+        #Sequence being recorded and the time its recording started
+        self.recording = None
+        self.recordingStart = 0.0
+
+        #Sequence name => {'run', 'handles', 'voices'} of the sequences playing.
+        #'voices' holds the scheduled voices that haven't started yet.
+        self.running = {}
+        self.runs = 0
+
+        mainLayout = QVBoxLayout()
+        self.setLayout(mainLayout)
+
+        label = QLabel(self.mainWindow.text.localisation('labels','sequences','caption'))
+        label.setToolTip(self.mainWindow.text.localisation('labels','sequences','toolTip'))
+        mainLayout.addWidget(label)
+
+        #Sequences list: clicking a sequence starts or stops it
+        self.sequencesList = QListWidget()
+        self.sequencesList.itemClicked.connect(lambda item: self.toggle(item.text()))
+        mainLayout.addWidget(self.sequencesList)
+
+        self.recordButton = QPushButton(self.mainWindow.text.localisation('buttons','recordSequence','caption'))
+        self.recordButton.setToolTip(self.mainWindow.text.localisation('buttons','recordSequence','toolTip'))
+        self.recordButton.clicked.connect(lambda *args: self.toggleRecording())
+
+        deleteButton = QPushButton(self.mainWindow.text.localisation('buttons','deleteSequence','caption'))
+        deleteButton.setToolTip(self.mainWindow.text.localisation('buttons','deleteSequence','toolTip'))
+        deleteButton.clicked.connect(lambda *args: self.deleteSequence())
+
+        buttonsLayout = QHBoxLayout()
+        buttonsLayout.addWidget(self.recordButton)
+        buttonsLayout.addWidget(deleteButton)
+        mainLayout.addLayout(buttonsLayout)
+
+        #Recording sources
+        self.mainWindow.sampler.padTriggered.connect(lambda bank, row, column: self.recordPad(bank, row, column))
+        self.mainWindow.themes.themesDelegate.themeClicked.connect(lambda row: self.recordTheme(row))
+        self.mainWindow.playlist.volumeSlider.valueChanged.connect(lambda volume: self.recordFade(Mixer.MUSICBUS, volume))
+        self.mainWindow.sampler.volumeSlider.valueChanged.connect(lambda volume: self.recordFade(Mixer.EFFECTSBUS, volume))
+
+        self.mainWindow.audioEngine.eventDue.connect(lambda event: self.eventDue(event))
+
+        self.setSequences()
+
+    def setSequences(self):
+        """Show the sequences of the library, stopping the ones playing.
+            Takes no parameter.
+            Returns nothing.
+        """
+        for name in list(self.running):
+            self.stop(name)
+
+        self.recording = None
+        RessourcesCache.setProperty(self.recordButton, 'active', False)
+        self.refreshList()
+
+    def refreshList(self):
+        """Show the sequences of the library again, the playing ones in bold.
+            Takes no parameter.
+            Returns nothing.
+        """
+        self.sequencesList.clear()
+        for sequence in self.mainWindow.library.sequences:
+            item = QListWidgetItem(sequence.name)
+            if sequence.name in self.running:
+                font = QFont(item.font())
+                font.setBold(True)
+                item.setFont(font)
+            self.sequencesList.addItem(item)
+
+    def deleteSequence(self):
+        """Stop and remove the selected sequence from the library.
+            Takes no parameter.
+            Returns nothing.
+        """
+        item = self.sequencesList.currentItem()
+        if item :
+            name = item.text()
+            self.stop(name)
+            self.mainWindow.library.remove_sequence(name)
+            self.refreshList()
+
+    #Recording
+    def toggleRecording(self):
+        """Start recording a sequence, or end the recording and store it under a name.
+            Takes no parameter.
+            Returns nothing.
+        """
+        if self.recording is None:
+            self.recording = Sequence('')
+            self.recordingStart = time.perf_counter()
+            RessourcesCache.setProperty(self.recordButton, 'active', True)
+            return
+
+        sequence = self.recording
+        self.recording = None
+        RessourcesCache.setProperty(self.recordButton, 'active', False)
+
+        if not sequence.steps:
+            return
+
+        name, ok = QInputDialog.getText(self, self.mainWindow.text.localisation('dialogBoxes','newSequence','caption'),
+                                        self.mainWindow.text.localisation('dialogBoxes','newSequence','question'))
+        if ok and name :
+            sequence.name = name
+            self.stop(name)
+            self.mainWindow.library.set_sequence(sequence)
+            self.refreshList()
+
+    def recordingOffset(self):
+        """Returns the time elapsed since the start of the recording in seconds."""
+        return round(time.perf_counter() - self.recordingStart, 4)
+
+    def recordPad(self, bank:int, row:int, column:int):
+        """Record the trigger of a pad.
+            Takes three parameters:
+            - bank as integer, bank index.
+            - row as integer.
+            - column as integer.
+            Returns nothing.
+        """
+        if self.recording is not None:
+            self.recording.add_step(self.recordingOffset(), Sequence.PAD_STEP, bank=bank, row=row, column=column)
+
+    def recordTheme(self, row:int):
+        """Record a change of theme.
+            Takes one parameter:
+            - row as integer, row of the theme in the themes view.
+            Returns nothing.
+        """
+        theme = self.mainWindow.themes.themesModel.category(row)
+        if self.recording is not None and theme :
+            self.recording.add_step(self.recordingOffset(), Sequence.THEME_STEP, theme=theme.name)
+
+    def recordFade(self, bus:str, volume:int):
+        """Record a change of volume. The moves of a slider are merged in a single
+            fade as long as they follow each other closely.
+            Takes two parameters:
+            - bus as string, one of the Mixer bus constants.
+            - volume as integer, from MusicPlayer.MinVolume to MusicPlayer.MaxVolume.
+            Returns nothing.
+        """
+        if self.recording is None:
+            return
+
+        offset = self.recordingOffset()
+        for step in reversed(self.recording.steps):
+            if step["type"] == Sequence.FADE_STEP and step["bus"] == bus:
+                if offset - step["offset"] - step["duration"] <= Sequences.FADECOALESCING:
+                    step["volume"] = volume
+                    step["duration"] = round(offset - step["offset"], 4)
+                    return
+                break
+
+        self.recording.add_step(offset, Sequence.FADE_STEP, bus=bus, volume=volume, duration=0.0)
+
+    #Playback
+    def toggle(self, name:str):
+        """Start a sequence, or stop it if it is playing.
+            Takes one parameter:
+            - name as string.
+            Returns nothing.
+        """
+        if name in self.running:
+            self.stop(name)
+        else:
+            self.start(self.mainWindow.library.get_sequence(name))
+        self.refreshList()
+
+    def start(self, sequence:Sequence):
+        """Hand every step of a sequence over to the mixer scheduler. Pads and music
+            start on their exact frame, the interface follows when they are due.
+            Steps whose sound isn't decoded yet are triggered by the interface instead.
+            Takes one parameter:
+            - sequence as Sequence object.
+            Returns nothing.
+        """
+        if not sequence :
+            return
+
+        self.stop(sequence.name)
+
+        mixer = self.mainWindow.audioEngine.mixer
+        startClock = mixer.clock + Sequences.STARTDELAY*mixer.blockSize
+
+        self.runs += 1
+        run = {'run': self.runs, 'handles': [], 'voices': set()}
+        self.running[sequence.name] = run
+
+        for step in sequence.steps:
+            clock = startClock + mixer.frames(step["offset"])
+
+            if step["type"] == Sequence.PAD_STEP:
+                self.schedulePad(run, clock, step)
+            elif step["type"] == Sequence.FADE_STEP:
+                self.scheduleFade(run, clock, step)
+            elif step["type"] == Sequence.THEME_STEP:
+                self.scheduleTheme(run, clock, step)
+
+        endClock = startClock + mixer.frames(sequence.get_duration())
+        run['handles'].append(mixer.notify(endClock, ('end', run['run'], sequence.name)))
+
+    def schedulePad(self, run:dict, clock:int, step:dict):
+        """Schedule the trigger of a pad.
+            Takes three parameters:
+            - run as dictionnary, from self.running.
+            - clock as integer, mixer clock of the trigger.
+            - step as dictionnary.
+            Returns nothing.
+        """
+        soundEffect = self.mainWindow.sampler.pad(step["bank"], step["row"], step["column"])
+        if not soundEffect or not soundEffect.pad.get_sound_files():
+            return
+
+        mixer = self.mainWindow.audioEngine.mixer
+        voiceId = soundEffect.scheduleVoice(clock)
+        if voiceId is None:
+            self.mainWindow.samples.prepare(soundEffect.pad.filepaths)
+            run['handles'].append(mixer.notify(clock, ('lateSound', run['run'], soundEffect)))
+        else:
+            run['voices'].add(voiceId)
+            run['handles'].append(mixer.notify(clock, ('sound', run['run'], soundEffect, voiceId)))
+
+    def scheduleFade(self, run:dict, clock:int, step:dict):
+        """Schedule a change of volume of the music.
+            Takes three parameters:
+            - run as dictionnary, from self.running.
+            - clock as integer, mixer clock of the start of the fade.
+            - step as dictionnary.
+            Returns nothing.
+        """
+        mixer = self.mainWindow.audioEngine.mixer
+        fade = max(step["duration"], MusicPlayer.VolumeFadeDuration)
+        run['handles'].append(mixer.setBusGain(step["bus"], step["volume"]/MusicPlayer.MaxVolume, fade, clock))
+        run['handles'].append(mixer.notify(clock, ('fade', run['run'], step["bus"], step["volume"])))
+
+    def scheduleTheme(self, run:dict, clock:int, step:dict):
+        """Schedule a change of theme, choosing its track right away.
+            Takes three parameters:
+            - run as dictionnary, from self.running.
+            - clock as integer, mixer clock of the change.
+            - step as dictionnary.
+            Returns nothing.
+        """
+        theme = self.mainWindow.library.get_category(step["theme"])
+        if not theme or not theme.tracks:
+            return
+
+        mixer = self.mainWindow.audioEngine.mixer
+        track = theme.tracks[self.mainWindow.history.chooseFresh([track.location for track in theme.tracks])]
+        voiceId = self.mainWindow.playlist.musicPlayer.scheduleMusic(track, clock)
+        if voiceId is None:
+            self.mainWindow.samples.prepareMusic(track.get_locations())
+            run['handles'].append(mixer.notify(clock, ('lateTheme', run['run'], theme, track)))
+        else:
+            run['voices'].add(voiceId)
+            run['handles'].append(mixer.notify(clock, ('theme', run['run'], theme, track, voiceId)))
+
+    def stop(self, name:str):
+        """Cancel the steps of a sequence that haven't happened yet. Sounds already
+            started go on.
+            Takes one parameter:
+            - name as string.
+            Returns nothing.
+        """
+        run = self.running.pop(name, None)
+        if not run :
+            return
+
+        mixer = self.mainWindow.audioEngine.mixer
+        mixer.beginBatch()
+        try:
+            for handle in run['handles']:
+                if handle is not None:
+                    mixer.cancel(handle)
+            for voiceId in run['voices']:
+                mixer.stop(voiceId)
+        finally:
+            mixer.endBatch()
+
+    def eventDue(self, event):
+        """Make the interface follow a step the audio engine just reached.
+            Takes one parameter:
+            - event as tuple: (kind, run, arguments...).
+            Returns nothing.
+        """
+        if not isinstance(event, tuple) or len(event) < 2:
+            return
+
+        kind, runId = event[0], event[1]
+        run = next((run for run in self.running.values() if run['run'] == runId), None)
+        if run is None:
+            return
+
+        playlist = self.mainWindow.playlist
+        if kind == 'sound':
+            soundEffect, voiceId = event[2:]
+            run['voices'].discard(voiceId)
+            soundEffect.adoptVoice(voiceId)
+        elif kind == 'lateSound':
+            soundEffect = event[2]
+            if not soundEffect.isPlaying():
+                soundEffect.playOrStop()
+        elif kind == 'fade':
+            bus, volume = event[2:]
+            #The mixer is already fading the bus: only its slider and stored volume follow
+            if bus == Mixer.MUSICBUS:
+                slider = playlist.volumeSlider
+                playlist.musicPlayer.volume = volume
+            elif bus == Mixer.EFFECTSBUS:
+                slider = self.mainWindow.sampler.volumeSlider
+                self.mainWindow.sampler.volume = volume
+            else:
+                return
+            slider.blockSignals(True)
+            slider.setValue(volume)
+            slider.blockSignals(False)
+        elif kind == 'theme':
+            theme, track, voiceId = event[2:]
+            run['voices'].discard(voiceId)
+            playlist.setList(theme, False)
+            playlist.adoptTrack(track, voiceId)
+        elif kind == 'lateTheme':
+            theme, track = event[2:]
+            playlist.setList(theme, False)
+            playlist.playTrack(track)
+        elif kind == 'end':
+            self.running.pop(event[2], None)
+            self.refreshList()
@@ -3,126 +3,242 @@
 #
 #This class defines a sound effect object
 # It heritates from QPushButton.
+# It is the button of a Pad of the sample set: the pad holds the settings,
+# the button decodes its variations ahead of time and plays them through the
+# audio engine, once or in a loop.
 #
 #Application: DragonShout music sampler
 #Last Edited: November 29th 2017
 #---------------------------------
 
-from PyQt5.QtGui import QIcon
 from PyQt5.QtWidgets import QPushButton, QMessageBox
-from PyQt5.QtCore import QFileInfo, QUrl
-from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent
 
-from classes.interface.SampleButtonDialogBox import SampleButtonDialogBox
 from classes.interface import MainWindow
-from classes.ressourcesFilepath import Stylesheets, Images
+from classes.ressourcesCache import RessourcesCache
+from classes.library.Pad import Pad
+from classes.multimedia.Playback import Playback
 
 
 class SoundEffect(QPushButton):
-    #Button Types
-    NEWEFFECTBUTTON = 0
-    SOUNDEFFECTBUTTON = 1
+    #Pad states used by the stylesheets through the padState property
+    EMPTYSTATE = 'empty'
+    IDLESTATE = 'idle'
+    ACTIVESTATE = 'active'
 
-    #Class method
-    def unserialize(cls,mainWindow:MainWindow,data: dict):
-        """Used to unsrialize JSON data for SoundEffect instances
-            - Takes one parameter:
-                - data as dictionnary
-                - mainWindow as MainWindow
-            - Returns nothing
-        """
-        if "__class__" in data :
-            if data["__class__"] == "SoundEffect":
-                #creating SoundEffect instance
-                soundEffect_object = SoundEffect(mainWindow,data["buttonType"],data["coordinates"],data["filepath"],data["iconPath"])
-                return soundEffect_object
-            return data
-    unserialize = classmethod(unserialize)
+    #Fade out when a sound is stopped, in seconds
+    LOOPRELEASE = 0.05
 
     #constructor
-    def __init__(self, mainWindow:MainWindow, buttonType:int, coordinates:tuple, soundEffectFilePath:str='', iconPath:str=''):
+    def __init__(self, mainWindow:MainWindow, pad:Pad):
         super().__init__()
 
         self.mainWindow = mainWindow
-        self.coordinates = coordinates
-        self.buttonType = buttonType
-        self.filepath = ''
-
-        if buttonType == SoundEffect.SOUNDEFFECTBUTTON: #Creates a full sound effect Button
+        self.pad = pad
+        self.volume = 100
 
-            self.mediaPlayer = QMediaPlayer()
-            self.mediaPlayer.stateChanged.connect(lambda *args: self.playerStatusChanged())
+        #Voice playing in the audio engine and path of the sound to play as soon as it is decoded
+        self.voiceId = None
+        self.waitingPath = ''
 
-            self.changeFile(soundEffectFilePath)
-            self.changeStyleSheet()
+        self.mainWindow.audioEngine.voiceFinished.connect(self.voiceFinished)
+        self.mainWindow.samples.sampleReady.connect(self.sampleReady)
+        self.mainWindow.samples.sampleFailed.connect(self.sampleFailed)
 
-            #Verify if iconPath is an str item and defaults it if not.
-            if iconPath != '' and isinstance(iconPath, str) :
-                self.changeIcon(iconPath)
+        self.mainWindow.samples.prepare(self.pad.filepaths)
+        self.changeState(SoundEffect.IDLESTATE)
 
-        else: #Creates a default button to show effects availability on the interface
-            self.changeIcon(Images.addSampleButtonIcon)
-            self.changeStyleSheet(Stylesheets.defaultButtons)
+        #Verify if iconPath is an str item and defaults it if not.
+        if pad.icon_path != '' and isinstance(pad.icon_path, str) :
+            self.changeIcon(pad.icon_path)
 
     def changeIcon(self, iconPath:str):
-        self.iconPath = iconPath
-        self.setIcon(QIcon(iconPath))
+        self.pad.icon_path = iconPath
+        self.mainWindow.thumbnails.setIcon(self, iconPath)
 
     def changeFile(self, filepath:str):
-        """Change sound Effect file and loads it into the player.
+        """Change sound Effect file and decode it ahead of time.
             - Takes one parameter:
                 - filepath as str.
             - Returns nothing.
         """
-        self.filepath = filepath
-        media = QMediaContent(QUrl.fromLocalFile(self.filepath))
-        self.mediaPlayer.setMedia(media)
+        self.changeFiles([filepath])
 
-    def changeStyleSheet(self, styleSheetPath:str='Default'):
-        if styleSheetPath == 'Default':
-            styleSheet = open(Stylesheets.effectButtons,'r',encoding='utf-8').read()
-        else:
-            styleSheet = open(styleSheetPath,'r',encoding='utf-8').read()
+    def changeFiles(self, filepaths:list):
+        """Change the pool of variations, decoding each file ahead of time.
+            - Takes one parameter:
+                - filepaths as list of strings.
+            - Returns nothing.
+        """
+        self.pad.filepaths = filepaths
+        self.mainWindow.samples.prepare(self.pad.filepaths)
+
+    def setLoop(self, loop:bool, loopStart:float=None, loopEnd:float=None, loopCrossfade:float=Pad.LOOP_CROSSFADE):
+        """Turn the loop mode on or off.
+            - Takes four parameters:
+                - loop as boolean.
+                - loopStart as float in seconds, None to find it automatically.
+                - loopEnd as float in seconds, None to find it automatically.
+                - loopCrossfade as float in seconds.
+            - Returns nothing.
+        """
+        if self.pad.loop != bool(loop):
+            self.stop()
 
-        self.setStyleSheet(styleSheet)
+        self.pad.loop = loop
+        self.pad.loop_start = loopStart
+        self.pad.loop_end = loopEnd
+        self.pad.loop_crossfade = loopCrossfade
 
-    def playOrStop(self):
-        """Either start or stop the media player.
-            - Takes no parameter.
+    def createVoice(self, filepath:str):
+        """Create the voice of a trigger with the pad settings.
+            - Takes one parameter:
+                - filepath as string.
+            - Returns a Voice object or None if the sound isn't decoded yet.
+        """
+        buffer = self.mainWindow.samples.buffer(filepath)
+        if buffer is None:
+            return None
+
+        #Buffers are already decoded: randomization only changes the voice settings
+        return Playback.triggerVoice(self.pad, buffer, self.mainWindow.audioEngine.mixer.sampleRate, self.volume/100)
+
+    def startVoice(self, filepath:str):
+        """Start playing a sound, or wait for it to be decoded.
+            - Takes one parameter:
+                - filepath as string.
             - Returns nothing.
         """
-        if self.buttonType == SoundEffect.SOUNDEFFECTBUTTON:
-            if self.mediaPlayer.state() == QMediaPlayer.PlayingState:
-                self.mediaPlayer.stop()
-            else:
-                self.mediaPlayer.play()
+        voice = self.createVoice(filepath)
+        self.changeState(SoundEffect.ACTIVESTATE)
 
-        else:
-            print('WARNING - this is a default button, no sound file is attached to it')
+        if voice is None:
+            self.waitingPath = filepath
+            return
 
-    def playerStatusChanged(self):
-        """Handle player status changes.
-            - Takes no parameter.
+        self.waitingPath = ''
+        self.voiceId = self.mainWindow.audioEngine.play(voice)
+
+    def scheduleVoice(self, clock:int):
+        """Prepare the next trigger of the pad to start at a precise frame of the
+            audio engine. The pad shows it once adoptVoice() is called.
+            - Takes one parameter:
+                - clock as integer, mixer clock.
+            - Returns the voice id as integer or None if the sound isn't decoded yet.
+        """
+        voice = self.createVoice(self.pad.filepaths[self.pad.next_variation()])
+        if voice is None:
+            return None
+        return self.mainWindow.audioEngine.mixer.play(voice, clock)
+
+    def adoptVoice(self, voiceId:int):
+        """Show a voice started by the scheduler as the one of the pad.
+            - Takes one parameter:
+                - voiceId as integer.
+            - Returns nothing.
+        """
+        self.waitingPath = ''
+        self.voiceId = voiceId
+        self.changeState(SoundEffect.ACTIVESTATE)
+
+    def sampleReady(self, filepath:str):
+        """Start the sound waiting for its decoding.
+            - Takes one parameter:
+                - filepath as string.
             - Returns nothing.
         """
+        if self.waitingPath and filepath == self.waitingPath:
+            self.startVoice(filepath)
 
-        #Player encountered an error relative to the loaded media
-        if self.mediaPlayer.mediaStatus() == QMediaPlayer.InvalidMedia:
+    def sampleFailed(self, filepath:str):
+        """Warn the user that the sound waiting to be played can't be decoded.
+            - Takes one parameter:
+                - filepath as string.
+            - Returns nothing.
+        """
+        if self.waitingPath and filepath == self.waitingPath:
+            self.waitingPath = ''
+            self.changeState(SoundEffect.IDLESTATE)
             QMessageBox(QMessageBox.Critical,self.mainWindow.text.localisation('messageBoxes','loadMedia','title'),self.mainWindow.text.localisation('messageBoxes','loadMedia','caption')).exec()
 
-        if self.mediaPlayer.state() == QMediaPlayer.PlayingState:
-            self.changeStyleSheet(Stylesheets.activeEffectButtons)
+    def voiceFinished(self, voiceId:int):
+        """Called by the audio engine when a voice ended.
+            - Takes one parameter:
+                - voiceId as integer.
+            - Returns nothing.
+        """
+        if voiceId == self.voiceId:
+            self.voiceId = None
+            self.changeState(SoundEffect.IDLESTATE)
+
+    def setRandomization(self, variationMode:str, pitchVariation:float=0.0, gainVariation:float=0.0):
+        """Define how variations are picked and how much each trigger is randomized.
+            - Takes three parameters:
+                - variationMode as one of the Pad constants: ROUND_ROBIN, RANDOM.
+                - pitchVariation as float, maximum pitch change in semitones (0 to disable).
+                - gainVariation as float, maximum attenuation in decibels (0 to disable).
+            - Returns nothing.
+        """
+        self.pad.variation_mode = variationMode
+        self.pad.pitch_variation = pitchVariation
+        self.pad.gain_variation = gainVariation
+
+    def setPanning(self, pan:float=0.0, panVariation:float=0.0, location:tuple=None):
+        """Place the pad in the stereo field.
+            - Takes three parameters:
+                - pan as float, from -1 (left) to 1 (right).
+                - panVariation as float, maximum random pan change of each trigger.
+                - location as (x, y) tuple in meters around the listener or None.
+                When given, it replaces the pan.
+            - Returns nothing.
+        """
+        self.pad.pan = pan
+        self.pad.pan_variation = panVariation
+        self.pad.location = location
 
-        elif self.mediaPlayer.state() == QMediaPlayer.StoppedState:
-            self.changeStyleSheet(Stylesheets.effectButtons)
+        if self.voiceId is not None:
+            self.mainWindow.audioEngine.setVoicePanning(self.voiceId, self.pad.pan, self.pad.location)
 
-    def serialize(self):
-        """Used to serialize instance data to JSON format.
+    def setVolume(self, volume:int):
+        """Change the volume of the pad.
+            - Takes one parameter:
+                - volume as integer.
+            - Returns nothing.
+        """
+        self.volume = volume
+
+        if self.voiceId is not None:
+            self.mainWindow.audioEngine.setVoiceGain(self.voiceId, volume/100, SoundEffect.LOOPRELEASE)
+
+    def stop(self):
+        """Stop the pad with a short fade out.
+            - Takes no parameter.
+            - Returns nothing.
+        """
+        if self.voiceId is not None or self.waitingPath:
+            if self.voiceId is not None:
+                self.mainWindow.audioEngine.stop(self.voiceId, SoundEffect.LOOPRELEASE)
+            self.voiceId = None
+            self.waitingPath = ''
+            self.changeState(SoundEffect.IDLESTATE)
+
+    def isPlaying(self):
+        """Returns True if the pad is playing or about to."""
+        return self.voiceId is not None or self.waitingPath != ''
+
+    def changeState(self, state:str):
+        """Change the pad state shown by the stylesheet without any file access.
+            - Takes one parameter:
+                - state as one of the SoundEffect constants: EMPTYSTATE, IDLESTATE, ACTIVESTATE.
+            - Returns nothing.
+        """
+        RessourcesCache.setProperty(self, 'padState', state)
+
+    def playOrStop(self):
+        """Either start or stop the pad.
             - Takes no parameter.
-            - Returns instance data as dictionnary.
+            - Returns nothing.
         """
-        return {"__class__":    "SoundEffect",
-                "coordinates":  self.coordinates,
-                "buttonType":   self.buttonType,
-                "filepath":     self.filepath,
-                "iconPath":     self.iconPath}
+        if self.isPlaying():
+            self.stop()
+        else:
+            self.startVoice(self.pad.filepaths[self.pad.next_variation()])
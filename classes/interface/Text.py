@@ -10,6 +10,8 @@
 
 import os
 
+from classes.session import Session
+
 class Text():
     LanguageFilePath = 'lang.txt'
     SupportedLanguages = {  'French' : {'caption':'Français','icon':'ressources/interface/France.png'},
@@ -33,17 +35,19 @@ class Text():
 
     def loadLanguage(self):
         """Used to define the language of the application by retrieving the info stored in
-            lang.txt which is located in the application root directory.
+            the session, or in lang.txt for the versions without session.
             Takes no parameter.
             Returns nothing.
         """
-        #Check if the language file exist and create it if necessary
-        if os.path.isfile(Text.LanguageFilePath) :
-            languageFile = open(Text.LanguageFilePath,'r', encoding='utf-8')
-            language = str.rstrip(languageFile.read())
-        else:
-            language = Text.SupportedLanguages['English']['caption']
+        language = Session.value('language')
+
+        #Check if the language file of the previous versions exist
+        if language is None and os.path.isfile(Text.LanguageFilePath) :
+            with open(Text.LanguageFilePath,'r', encoding='utf-8') as languageFile:
+                language = str.rstrip(languageFile.read())
             self.saveLanguage(language)
+        elif language is None:
+            language = Text.SupportedLanguages['English']['caption']
 
 
         #Defaults to english if the language is not recognized as a supported language
@@ -53,16 +57,12 @@ class Text():
             self.language = Text.SupportedLanguages['English']['caption']
 
     def saveLanguage(self, language:str):
-        """Save the chosen language in lang.txt at the Text.LanguageFilePath location.
+        """Save the chosen language in the session.
             Takes one parameter:
             - language as str (Use Text.SupportedLanguages['...'] to ensure compatibility).
         """
-        if not(os.path.isfile(Text.LanguageFilePath)) :
-            open(Text.LanguageFilePath,'x', encoding='utf-8')
-
-        languageFile = open(Text.LanguageFilePath, 'w', encoding='utf-8')
-        languageFile.write(language)
-        languageFile.close()
+        Session.setValue('language', language)
+        Session.save()
 
 
     def localisation(self,elementType:str,elementName:str,textType:str = 'caption'):
@@ -84,7 +84,19 @@ class Text():
                 'cancel' : {'caption':'Cancel'},
                 'addSample': {'caption':'Add an effect','toolTip':"Add a new effect button to the sampler"},
                 'samplerEditButton': {'caption':'Edit','toolTip':'Activate edit mode to change a sound effect. Click againg to deactivate.'},
-                'samplerDeleteButton': {'caption':'Delete','toolTip':'Activate delete mode to suppress sound effects. Click again to deactivate.'}
+                'samplerDeleteButton': {'caption':'Delete','toolTip':'Activate delete mode to suppress sound effects. Click again to deactivate.'},
+                'newBank': {'caption':'New bank','toolTip':'Add a new bank of sound effects to the sampler'},
+                'segments': {'caption':'Segments','toolTip':'Set the intro, loop and outro of the selected track'},
+                'addStems': {'caption':'Add stems','toolTip':'Choose the stems of a new track, from the base layer to the most intense one'},
+                'outroTransition': {'caption':'Outro now','toolTip':'Play the outro right away when changing theme instead of waiting for the next bar'},
+                'ducking': {'caption':'Ducking','toolTip':'Set how much the sound effects lower the music'},
+                'tags': {'caption':'Tags','toolTip':'Set the tags of the selected tracks, used by the smart themes'},
+                'saveScene': {'caption':'Save scene','toolTip':'Save the theme, bank, volumes, loops and effects as a scene'},
+                'deleteScene': {'caption':'Delete scene','toolTip':'Delete the selected scene'},
+                'recordSequence': {'caption':'Record','toolTip':'Record the pads, theme changes and music volume as a sequence'},
+                'deleteSequence': {'caption':'Delete sequence','toolTip':'Delete the selected sequence'},
+                'muffle': {'caption':'Muffled','toolTip':'Make the music sound heard through a wall'},
+                'reverb': {'caption':'Cave','toolTip':'Add a cave reverb to the music'}
             }
 
             menus = {
@@ -103,7 +115,8 @@ class Text():
                 'deleteTheme': {'caption':'Do you really want to delete this theme ?', 'title':'Delete '},
                 'loadLibrary': {'caption':'Please load a valid DragonShout library !', 'title':'Invalid file'},
                 'saveLanguage': {'caption':'Restart the application to apply changes','title':'Language changed'},
-                'loadMedia': {'caption':"Player encountered an error relative to the loaded music. Check that your file is supported by your operating system.",'title':'Missing codec or invalid file'}
+                'loadMedia': {'caption':"Player encountered an error relative to the loaded music. Check that your file is supported by your operating system.",'title':'Missing codec or invalid file'},
+                'invalidQuery': {'caption':'The tags query is not valid: ','title':'Smart theme'}
             }
 
             dialogBoxes = {
@@ -111,13 +124,37 @@ class Text():
                 'newSample': {'caption':'New sound effect','toolTip':'Choose a new sound effect','question':'Choose a new sound effect :'},
                 'addMusic': {'caption':'Choose a track to add to this theme','toolTip':'Navigate the drive for a track to add to the theme'},
                 'saveLibrary': {'title':'Save your work'},
-                'newIcon': {'question':'Change the icon :'}
+                'newIcon': {'question':'Change the icon :'},
+                'variations': {'question':'Variations :','roundRobin':'Round robin','random':'Random without repeat',
+                                'pitch':'Random pitch (semitones) :','gain':'Random attenuation (dB) :','files':'{} variations'},
+                'segments': {'caption':'Track segments','question':'Play the intro, loop the main section and end with the outro',
+                                'loopStart':'End of the intro (s) :','loopEnd':'Start of the outro (s) :','barLength':'Bar length (s) :','detect':'Detect'},
+                'loop': {'question':'Loop the sound','start':'Loop start (s) :','end':'Loop end (s) :','crossfade':'Loop crossfade (s) :','auto':'Auto'},
+                'newScene': {'caption':'New scene','question':'Enter the scene name :'},
+                'newSequence': {'caption':'New sequence','question':'Enter the sequence name :'},
+                'panning': {'pan':'Pan (-1 left, 1 right) :','variation':'Pan variation :','positional':'Place the sound around the listener',
+                                'x':'Left/right position (m) :','y':'Front position (m) :'},
+                'ducking': {'caption':'Music ducking','question':'Lower the music while sound effects play','threshold':'Threshold (dB) :',
+                                'depth':'Depth (dB) :','attack':'Attack (s) :','release':'Release (s) :'},
+                'smartTheme': {'question':'Smart theme tags :','toolTip':'Play the tracks whose tags match, for instance: forest and (night or not combat). Leave empty for a usual theme'},
+                'tags': {'caption':'Tags','question':'Tags separated by commas :'}
             }
 
             labels = {
                 'scenes' : { 'caption': 'Scenes','toolTip':'List of musical scenes'},
+                'sequences' : { 'caption': 'Sequences','toolTip':'Recorded sequences, click one to start or stop it'},
                 'playlistLabel' : {'caption': 'Select a theme to play','toolTip':'Shows the playlist of the selected theme'},
-                'chooseThemeFirst': {'caption': 'Choose or create a theme first'}
+                'chooseThemeFirst': {'caption': 'Choose or create a theme first'},
+                'bank': {'caption': 'Bank','toolTip':'Select the bank of sound effects to show'},
+                'gridRows': {'caption': 'Rows','toolTip':'Number of rows of the current bank'},
+                'gridColumns': {'caption': 'Columns','toolTip':'Number of columns of the current bank'},
+                'intensity': {'caption': 'Intensity','toolTip':'Brings in the stems of the current track'},
+                'loading': {'caption': 'Loading...'},
+                'openingLibrary': {'caption': 'Opening the last library...'},
+                'ready': {'caption': 'Ready'},
+                'search': {'caption': 'Search (Ctrl+F)','toolTip':'Find themes, tracks and sound effects. Enter plays the result, Shift+Enter queues a track'},
+                'queued': {'caption': '{} queued ({} waiting)'},
+                'duplicates': {'caption': '{} duplicate files read once: {:.1f} MB on disk, {:.1f} MB of decoded sound'}
             }
 
         #French
@@ -131,7 +168,19 @@ class Text():
                 'cancel' : {'caption':'Annuler'},
                 'addSample': {'caption':'Ajouter un effet','toolTip':"Ajouter un nouveau bouton d'effet au sampler"},
                 'samplerEditButton': {'caption':'Modifier','toolTip':'Active le mode édition pour modifier les effets sonores. Cliquer à nouveau pour désactiver'},
-                'samplerDeleteButton': {'caption':'Supprimer','toolTip':'Active le mode suppression pour retirer les effets sonores. Cliquer à nouveau pour désactiver'}
+                'samplerDeleteButton': {'caption':'Supprimer','toolTip':'Active le mode suppression pour retirer les effets sonores. Cliquer à nouveau pour désactiver'},
+                'newBank': {'caption':'Nouvelle banque','toolTip':"Ajouter une nouvelle banque d'effets sonores au sampler"},
+                'segments': {'caption':'Segments','toolTip':"Définir l'intro, la boucle et l'outro du morceau sélectionné"},
+                'addStems': {'caption':'Ajouter des pistes','toolTip':"Choisir les pistes d'un nouveau morceau, de la base à la plus intense"},
+                'outroTransition': {'caption':'Outro immédiate','toolTip':"Jouer l'outro dès le changement de thème au lieu d'attendre la mesure suivante"},
+                'ducking': {'caption':'Atténuation','toolTip':'Régler de combien les effets sonores baissent la musique'},
+                'tags': {'caption':'Étiquettes','toolTip':'Définir les étiquettes des morceaux sélectionnés, utilisées par les thèmes intelligents'},
+                'saveScene': {'caption':'Enregistrer la scène','toolTip':'Enregistrer le thème, la banque, les volumes, les boucles et les effets comme une scène'},
+                'deleteScene': {'caption':'Supprimer la scène','toolTip':'Supprimer la scène sélectionnée'},
+                'recordSequence': {'caption':'Enregistrer','toolTip':'Enregistrer les pads, changements de thème et volume de la musique comme une séquence'},
+                'deleteSequence': {'caption':'Supprimer la séquence','toolTip':'Supprimer la séquence sélectionnée'},
+                'muffle': {'caption':'Étouffée','toolTip':"Donner l'impression d'entendre la musique à travers un mur"},
+                'reverb': {'caption':'Caverne','toolTip':"Ajouter une réverbération de caverne à la musique"}
             }
 
             menus =  {
@@ -150,7 +199,8 @@ class Text():
                 'deleteTheme': {'caption':'Voulez vous vraiment supprimer le thème ?', 'title':'Supprimer '},
                 'loadLibrary': {'caption':'Veillez charger une librairie DragonShout valide !', 'title':'Fichier invalide'},
                 'saveLanguage': {'caption':"Redémarrer l'application pour appliquer le changement.",'title':'Langue changée'},
-                'loadMedia': {'caption':"Le lecteur a rencontré une erreur en chargeant la musique. Vérifier que le fichier est pris en charge par votre système d'exploitation.",'title':'Codec manquant ou fichier invalide'}
+                'loadMedia': {'caption':"Le lecteur a rencontré une erreur en chargeant la musique. Vérifier que le fichier est pris en charge par votre système d'exploitation.",'title':'Codec manquant ou fichier invalide'},
+                'invalidQuery': {'caption':"La requête d'étiquettes n'est pas valide : ",'title':'Thème intelligent'}
             }
 
             dialogBoxes = {
@@ -158,13 +208,37 @@ class Text():
                 'newSample': {'caption':'Nouvel effet sonore','toolTip':'Choisir un nouvel effet sonore','question':'Sélectionner un nouvel effet sonore :'},
                 'addMusic': {'caption':'Choisir un morceau à ajouter au thème','toolTip':"Parcours le disque à la recherche d'un morceau à ajouter au thème"},
                 'saveLibrary': {'title':'Sauver votre travail'},
-                'newIcon': {'question':"Changer l'icone :"}
+                'newIcon': {'question':"Changer l'icone :"},
+                'variations': {'question':'Variations :','roundRobin':'À tour de rôle','random':'Aléatoire sans répétition',
+                                'pitch':'Hauteur aléatoire (demi-tons) :','gain':'Atténuation aléatoire (dB) :','files':'{} variations'},
+                'segments': {'caption':'Segments du morceau','question':"Jouer l'intro, boucler la partie principale et finir par l'outro",
+                                'loopStart':"Fin de l'intro (s) :",'loopEnd':"Début de l'outro (s) :",'barLength':'Durée de la mesure (s) :','detect':'Détecter'},
+                'loop': {'question':'Jouer en boucle','start':'Début de boucle (s) :','end':'Fin de boucle (s) :','crossfade':'Fondu de boucle (s) :','auto':'Auto'},
+                'newScene': {'caption':'Nouvelle scène','question':'Entrer le nom de la scène :'},
+                'newSequence': {'caption':'Nouvelle séquence','question':'Entrer le nom de la séquence :'},
+                'panning': {'pan':'Panoramique (-1 gauche, 1 droite) :','variation':'Variation du panoramique :','positional':"Placer le son autour de l'auditeur",
+                                'x':'Position gauche/droite (m) :','y':'Position avant (m) :'},
+                'ducking': {'caption':'Atténuation de la musique','question':'Baisser la musique pendant les effets sonores','threshold':'Seuil (dB) :',
+                                'depth':'Profondeur (dB) :','attack':'Attaque (s) :','release':'Relâchement (s) :'},
+                'smartTheme': {'question':'Étiquettes du thème intelligent :','toolTip':"Joue les morceaux dont les étiquettes correspondent, par exemple : forest and (night or not combat). Laisser vide pour un thème habituel"},
+                'tags': {'caption':'Étiquettes','question':'Étiquettes séparées par des virgules :'}
             }
 
             labels = {
                 'scenes' : { 'caption': 'Scènes','toolTip':'Liste des scènes musicales'},
+                'sequences' : { 'caption': 'Séquences','toolTip':'Séquences enregistrées, cliquer sur une séquence pour la lancer ou l\'arrêter'},
                 'playlistLabel' : {'caption': 'Sélectionne un thème à jouer ','toolTip':'Montre la liste de lecture du thème sélectionné'},
-                'chooseThemeFirst': {'caption': "Il faut d'abord choisir ou créer un thème"}
+                'chooseThemeFirst': {'caption': "Il faut d'abord choisir ou créer un thème"},
+                'bank': {'caption': 'Banque','toolTip':"Choisir la banque d'effets sonores à afficher"},
+                'gridRows': {'caption': 'Lignes','toolTip':'Nombre de lignes de la banque actuelle'},
+                'gridColumns': {'caption': 'Colonnes','toolTip':'Nombre de colonnes de la banque actuelle'},
+                'intensity': {'caption': 'Intensité','toolTip':'Fait entrer les pistes du morceau en cours'},
+                'loading': {'caption': 'Chargement...'},
+                'openingLibrary': {'caption': 'Ouverture de la dernière librairie...'},
+                'ready': {'caption': 'Prêt'},
+                'search': {'caption': 'Rechercher (Ctrl+F)','toolTip':"Trouve les thèmes, morceaux et effets sonores. Entrée joue le résultat, Maj+Entrée met un morceau en attente"},
+                'queued': {'caption': '{} en attente ({} en tout)'},
+                'duplicates': {'caption': '{} fichiers en double lus une seule fois : {:.1f} Mo sur le disque, {:.1f} Mo de son décodé'}
             }
 
 
@@ -2,6 +2,7 @@
 #Author: Chappuis Anthony
 #
 #Handle the dialogbox used when adding a new theme button to the application
+#A theme given a tags query is a smart theme, playing the matching tracks
 #
 #Application: DragonShout music sampler
 #Last Edited: July 26th 2018b
@@ -11,22 +12,21 @@ import os
 
 from classes.interface import MainWindow
 from classes.ressourcesFilepath import Stylesheets, Images
+from classes.ressourcesCache import RessourcesCache
 
 from PyQt5.QtWidgets import QDialog, QPushButton, QGridLayout, QLineEdit, QLabel, QFileDialog
-from PyQt5.QtGui import QIcon
 from PyQt5.QtCore import QSize, QStandardPaths
 from PyQt5.Qt import Qt
 
 class ThemeButtonDialogBox(QDialog):
 
-    def __init__(self, mainWindow:MainWindow, themeName:str='notset', themeIconPath:str='notset'):
+    def __init__(self, mainWindow:MainWindow, themeName:str='notset', themeIconPath:str='notset', themeQuery:str=''):
         super().__init__()
 
         self.mainWindow = mainWindow
         self.okOrNot = False
 
-        styleSheet = open(Stylesheets.globalStyle,'r', encoding='utf-8').read()
-        self.setStyleSheet(styleSheet)
+        self.setStyleSheet(RessourcesCache.stylesheet(Stylesheets.globalStyle))
 
         #parameters defaulting
         if themeName == 'notset' or not isinstance(themeName, str):
@@ -36,7 +36,7 @@ class ThemeButtonDialogBox(QDialog):
             themeIconPath = Images.defaultButtonIcon
 
         #window title and icon
-        self.setWindowIcon(QIcon(MainWindow.MainWindow.APPLICATIONICONPATH))
+        self.setWindowIcon(RessourcesCache.icon(MainWindow.MainWindow.APPLICATIONICONPATH))
         self.setWindowTitle(self.mainWindow.text.localisation('dialogBoxes','newTheme','caption'))
 
         #Theme name
@@ -48,11 +48,16 @@ class ThemeButtonDialogBox(QDialog):
         self.iconPath = themeIconPath
 
         self.themeIconButton = QPushButton()
-        self.themeIconButton.setIcon(QIcon(self.iconPath))
+        self.mainWindow.thumbnails.setIcon(self.themeIconButton, self.iconPath)
         self.themeIconButton.setIconSize(QSize(100,100))
         self.themeIconButton.setFlat(True)
         self.themeIconButton.clicked.connect(lambda *args: self.getNewIcon())
 
+        #tags query of a smart theme
+        self.themeQueryLabel = QLabel(self.mainWindow.text.localisation('dialogBoxes','smartTheme','question'))
+        self.themeQuery = QLineEdit(themeQuery)
+        self.themeQuery.setToolTip(self.mainWindow.text.localisation('dialogBoxes','smartTheme','toolTip'))
+
         #control buttons
         self.OkButton = QPushButton(self.mainWindow.text.localisation('buttons','ok','caption'))
         self.OkButton.clicked.connect(lambda *args: self.closeDialog(True))
@@ -66,8 +71,10 @@ class ThemeButtonDialogBox(QDialog):
         self.layout.addWidget(self.themeName,0,1)
         self.layout.addWidget(self.themeIconButtonLabel,1,0)
         self.layout.addWidget(self.themeIconButton,1,1)
-        self.layout.addWidget(self.OkButton,2,0)
-        self.layout.addWidget(self.CancelButton,2,1)
+        self.layout.addWidget(self.themeQueryLabel,2,0)
+        self.layout.addWidget(self.themeQuery,2,1)
+        self.layout.addWidget(self.OkButton,3,0)
+        self.layout.addWidget(self.CancelButton,3,1)
         self.setLayout(self.layout)
 
     def getItems(self):
@@ -76,10 +83,11 @@ class ThemeButtonDialogBox(QDialog):
             Returns:
             - themeName as string.
             - iconPath as string.
+            - query as string, empty for a usual theme.
             - okOrNot as boolean.
         """
         self.exec()
-        return self.themeName.text(), self.iconPath, self.okOrNot
+        return self.themeName.text(), self.iconPath, self.themeQuery.text().strip(), self.okOrNot
 
     def getNewIcon(self):
         """Opens a filesystem dialog to choose a new icon file for the theme.
@@ -92,7 +100,7 @@ class ThemeButtonDialogBox(QDialog):
         filepath, ok = QFileDialog.getOpenFileName(self,self.mainWindow.text.localisation('dialogBoxes','newIcon','question'),os.path.expanduser(picturesFolderPath),"*.jpg *.jpeg *.ico *.png")
 
         if ok :
-            self.themeIconButton.setIcon(QIcon(filepath))
+            self.mainWindow.thumbnails.setIcon(self.themeIconButton, filepath)
             self.iconPath = filepath
 
     def closeDialog(self, okOrNot:bool):
@@ -0,0 +1,137 @@
+#---------------------------------
+#Author: Chappuis Anthony
+#
+#Paints the rows of the themes view (icon, name, edit and remove buttons)
+#instead of creating widgets for every theme, and reports clicks on them.
+#
+#Application: DragonShout music sampler
+#Last Edited: October 19th 2026
+#---------------------------------
+
+from classes.ressourcesFilepath import Images
+from classes.ressourcesCache import RessourcesCache
+from classes.interface.ThemesModel import ThemesModel
+
+from PyQt5.QtCore import Qt, QSize, QRect, QEvent, QModelIndex, QAbstractItemModel, pyqtSignal
+from PyQt5.QtGui import QColor, QPainter, QPen
+from PyQt5.QtWidgets import QStyledItemDelegate, QStyleOptionViewItem
+
+class ThemeDelegate(QStyledItemDelegate):
+
+    #Geometry
+    ROWHEIGHT = 120
+    ICONSIZE = 100
+    MARGIN = 5
+    BORDER = 5
+    EDITWIDTH = 60
+    REMOVEWIDTH = 50
+
+    #Colors matching the application stylesheet
+    BACKGROUND = QColor(58, 83, 124)
+    DARKBORDER = QColor(43, 61, 91)
+    LIGHTBORDER = QColor(70, 100, 150)
+    DISABLEDBACKGROUND = QColor(94, 93, 110)
+    TEXT = QColor(Qt.white)
+    DISABLEDTEXT = QColor(Qt.gray)
+
+    #Emitted with the row of the clicked theme
+    themeClicked = pyqtSignal(int)
+    editClicked = pyqtSignal(int)
+    removeClicked = pyqtSignal(int)
+
+    def sizeHint(self, option:QStyleOptionViewItem, index:QModelIndex):
+        return QSize(option.rect.width(), ThemeDelegate.ROWHEIGHT)
+
+    def buttonRects(self, rect:QRect):
+        """Split a row in its three buttons.
+            - Takes one parameter:
+                - rect as QRect of the row.
+            - Returns three QRect: theme, edit and remove buttons.
+        """
+        inner = rect.adjusted(ThemeDelegate.MARGIN, ThemeDelegate.MARGIN, -ThemeDelegate.MARGIN, -ThemeDelegate.MARGIN)
+
+        removeRect = QRect(inner.right()-ThemeDelegate.REMOVEWIDTH+1, inner.top(), ThemeDelegate.REMOVEWIDTH, inner.height())
+        editRect = QRect(removeRect.left()-ThemeDelegate.MARGIN-ThemeDelegate.EDITWIDTH, inner.top(), ThemeDelegate.EDITWIDTH, inner.height())
+        themeRect = QRect(inner.left(), inner.top(), editRect.left()-ThemeDelegate.MARGIN-inner.left(), inner.height())
+
+        return themeRect, editRect, removeRect
+
+    def paintButton(self, painter:QPainter, rect:QRect, enabled:bool):
+        """Paint a button background with the same raised borders as the stylesheet.
+            - Takes three parameters:
+                - painter as QPainter.
+                - rect as QRect.
+                - enabled as boolean.
+            - Returns nothing.
+        """
+        if enabled:
+            painter.fillRect(rect, ThemeDelegate.BACKGROUND)
+            lightPen = QPen(ThemeDelegate.LIGHTBORDER, ThemeDelegate.BORDER)
+            darkPen = QPen(ThemeDelegate.DARKBORDER, ThemeDelegate.BORDER)
+        else:
+            painter.fillRect(rect, ThemeDelegate.DISABLEDBACKGROUND)
+            lightPen = darkPen = QPen(ThemeDelegate.DISABLEDBACKGROUND, ThemeDelegate.BORDER)
+
+        half = ThemeDelegate.BORDER//2
+        border = rect.adjusted(half, half, -half, -half)
+
+        painter.setPen(lightPen)
+        painter.drawLine(border.topLeft(), border.topRight())
+        painter.drawLine(border.topLeft(), border.bottomLeft())
+        painter.setPen(darkPen)
+        painter.drawLine(border.bottomLeft(), border.bottomRight())
+        painter.drawLine(border.topRight(), border.bottomRight())
+
+    def paint(self, painter:QPainter, option:QStyleOptionViewItem, index:QModelIndex):
+        enabled = index.data(ThemesModel.EnabledRole)
+        themeRect, editRect, removeRect = self.buttonRects(option.rect)
+
+        painter.save()
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+
+        #Only the theme button is disabled while the music player is fading
+        self.paintButton(painter, themeRect, enabled)
+        self.paintButton(painter, editRect, True)
+        self.paintButton(painter, removeRect, True)
+
+        #Theme button: icon followed by the theme name
+        iconSize = min(ThemeDelegate.ICONSIZE, themeRect.height()-2*ThemeDelegate.BORDER)
+        iconRect = QRect(themeRect.left()+2*ThemeDelegate.BORDER, themeRect.center().y()-iconSize//2, iconSize, iconSize)
+        icon = index.data(Qt.DecorationRole)
+        if icon:
+            icon.paint(painter, iconRect, Qt.AlignCenter)
+
+        if enabled:
+            painter.setPen(ThemeDelegate.TEXT)
+        else:
+            painter.setPen(ThemeDelegate.DISABLEDTEXT)
+
+        textRect = themeRect.adjusted(iconRect.right()-themeRect.left()+ThemeDelegate.MARGIN, 0, -ThemeDelegate.BORDER, 0)
+        name = painter.fontMetrics().elidedText(index.data(Qt.DisplayRole), Qt.ElideRight, textRect.width())
+        painter.drawText(textRect, Qt.AlignVCenter | Qt.AlignLeft, name)
+
+        #Edit and remove buttons
+        painter.setPen(ThemeDelegate.TEXT)
+        painter.drawText(editRect, Qt.AlignCenter, 'Edit')
+        deleteIcon = RessourcesCache.icon(Images.deleteButtonIcon)
+        deleteIcon.paint(painter, removeRect.adjusted(ThemeDelegate.BORDER*2, ThemeDelegate.BORDER*2, -ThemeDelegate.BORDER*2, -ThemeDelegate.BORDER*2), Qt.AlignCenter)
+
+        painter.restore()
+
+    def editorEvent(self, event:QEvent, model:QAbstractItemModel, option:QStyleOptionViewItem, index:QModelIndex):
+        """Find which button of the row has been clicked and emit the matching signal."""
+        if event.type() != QEvent.MouseButtonRelease or event.button() != Qt.LeftButton:
+            return False
+
+        themeRect, editRect, removeRect = self.buttonRects(option.rect)
+        position = event.pos()
+
+        if themeRect.contains(position):
+            if index.data(ThemesModel.EnabledRole):
+                self.themeClicked.emit(index.row())
+        elif editRect.contains(position):
+            self.editClicked.emit(index.row())
+        elif removeRect.contains(position):
+            self.removeClicked.emit(index.row())
+
+        return True
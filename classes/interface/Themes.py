@@ -8,12 +8,14 @@
 #---------------------------------
 
 from classes.interface import MainWindow
-from classes.interface.ThemeButtons import ThemeButtons
+from classes.interface.ThemesModel import ThemesModel
+from classes.interface.ThemeDelegate import ThemeDelegate
 from classes.interface.ThemeButtonDialogBox import ThemeButtonDialogBox
+from classes.session import Session
 
 from PyQt5 import Qt
-from PyQt5.QtWidgets import (QWidget, QPushButton, QVBoxLayout, QInputDialog,
-    QHBoxLayout, QMessageBox, QScrollArea)
+from PyQt5.QtWidgets import (QWidget, QPushButton, QVBoxLayout, QMessageBox,
+    QListView, QAbstractItemView)
 
 class Themes(QWidget):
 
@@ -21,7 +23,6 @@ class Themes(QWidget):
         super().__init__()
 
         self.mainWindow = mainWindow
-        self.themeButtons = []
 
         #Main layout
         self.mainLayout = QVBoxLayout()
@@ -31,21 +32,22 @@ class Themes(QWidget):
         #New theme button
         self.addNewThemeButton(self.mainLayout)
 
-        #theme buttons layout
-        self.themeButtonsLayout = QVBoxLayout()
-        self.themeButtonsLayout.setAlignment(Qt.Qt.AlignHCenter)
+        #Themes view: only the visible rows are painted
+        self.themesModel = ThemesModel(self.mainWindow)
+        self.themesDelegate = ThemeDelegate()
+        self.themesDelegate.themeClicked.connect(lambda row: self.selectTheme(row))
+        self.themesDelegate.editClicked.connect(lambda row: self.editTheme(row))
+        self.themesDelegate.removeClicked.connect(lambda row: self.deleteTheme(row))
 
-        #Theme buttons widget
-        themeButtonsWidget = QWidget()
-        themeButtonsWidget.setLayout(self.themeButtonsLayout)
+        self.themesView = QListView()
+        self.themesView.setUniformItemSizes(True)
+        self.themesView.setSelectionMode(QAbstractItemView.NoSelection)
+        self.themesView.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.themesView.setHorizontalScrollBarPolicy(Qt.Qt.ScrollBarAlwaysOff)
+        self.themesView.setModel(self.themesModel)
+        self.themesView.setItemDelegate(self.themesDelegate)
 
-        # Theme buttons scrolling area
-        self.scrollArea =  QScrollArea(self)
-        self.scrollArea.setWidgetResizable(True)
-        self.scrollArea.setHorizontalScrollBarPolicy(Qt.Qt.ScrollBarAlwaysOff)
-        self.scrollArea.setWidget(themeButtonsWidget)
-
-        self.mainLayout.addWidget(self.scrollArea)
+        self.mainLayout.addWidget(self.themesView)
 
     def addNewThemeButton(self, mainLayout:QVBoxLayout):
         """Add a button to add a new theme to the given layout.
@@ -59,51 +61,93 @@ class Themes(QWidget):
 
 
     def reset(self):
-        """Used to reset the themes layout by removing each childrens.
+        """Used to reset the themes view by removing every theme.
             Takes no parameter.
             Returns nothing.
         """
-        for i in reversed(range(self.themeButtonsLayout.count())):
-            self.themeButtonsLayout.itemAt(i).widget().setParent(None)
-            self.themeButtons = []
+        self.themesModel.setLibrary(self.mainWindow.library)
 
     def setThemes(self):
-        """Used to create the GUI elements for all existing themes.
+        """Used to show all existing themes of the library.
             Takes no parameter.
             Returns nothing.
         """
-        self.reset()
-        for theme in self.mainWindow.library.categories:
-            themeButton = ThemeButtons(theme.name, theme.iconPath, self.mainWindow)
-            self.themeButtonsLayout.addWidget(themeButton)
-            self.themeButtons.append(themeButton)
+        self.themesModel.setLibrary(self.mainWindow.library)
+
+    def selectTheme(self, row:int):
+        """Update the playlist with the music list of the selected theme.
+            Takes one parameter:
+            - row as integer
+        """
+        theme = self.themesModel.category(row)
+        if theme :
+            Session.countTheme(self.mainWindow.library.filepath, theme.name)
+            self.mainWindow.playlist.setList(theme)
+            self.mainWindow.playlist.toggleSuppressButton()
 
     def addTheme(self):
-        """Adds a new theme button to the theme main layout.
+        """Adds a new theme at the end of the themes view.
             Takes no parameter.
             Returns nothing.
         """
         ok = False
 
-        themeName, themeIconPath, ok = ThemeButtonDialogBox(self.mainWindow).getItems()
+        themeName, themeIconPath, themeQuery, ok = ThemeButtonDialogBox(self.mainWindow).getItems()
 
         if ok :
             if themeName == '' or not isinstance(themeName, str):
                 themeName = self.mainWindow.text.localisation('buttons','newTheme','caption')
-            self.mainWindow.library.add_category(themeName,themeIconPath)
+            try:
+                self.themesModel.addCategory(themeName,themeIconPath,themeQuery)
+            except ValueError as error:
+                self.invalidQuery(error)
 
-            #Theme widget
-            themeButtons = ThemeButtons(themeName, themeIconPath, self.mainWindow)
-            self.themeButtons.append(themeButtons)
-            self.themeButtonsLayout.addWidget(themeButtons)
+    def editTheme(self, row:int):
+        """Change the name and icon of a theme both in the UI and in the library.
+            Takes one parameter:
+            - row as integer
+        """
+        category = self.themesModel.category(row)
+        if not category :
+            return
 
-    def deleteTheme(self, themeName:str, themeButtons:ThemeButtons):
+        newThemeName, newThemeIconPath, newThemeQuery, ok = ThemeButtonDialogBox(self.mainWindow, category.name, category.iconPath or 'notset', category.query).getItems()
+
+        if ok :
+            #A usual theme keeps its tracks, a smart theme's ones follow its query
+            if newThemeQuery != category.query and (category.query or not category.tracks):
+                try:
+                    self.mainWindow.library.tag_index.set_query(category, newThemeQuery)
+                except ValueError as error:
+                    self.invalidQuery(error)
+
+            category.name = newThemeName
+            category.iconPath = newThemeIconPath
+            self.themesModel.rowChanged(row)
+            self.mainWindow.searchIndex.update_category(category)
+
+            if self.mainWindow.playlist.playlistModel.category is category:
+                self.mainWindow.playlist.setList(category, autoPlay=False)
+
+    def invalidQuery(self, error:ValueError):
+        """Tell the user why the tags query of a smart theme was refused.
+            Takes one parameter:
+            - error as ValueError.
+        """
+        QMessageBox(QMessageBox.Warning,self.mainWindow.text.localisation('messageBoxes','invalidQuery','title'),
+                    self.mainWindow.text.localisation('messageBoxes','invalidQuery','caption')+str(error)).exec()
+
+    def deleteTheme(self, row:int):
         """Delete the theme both in the UI and in the library.
-            Takes two parameter:
-            - themeName as string
-            - themeButtons object
+            Takes one parameter:
+            - row as integer
             Returns nothing.
         """
+        category = self.themesModel.category(row)
+        if not category :
+            return
+
+        themeName = category.name
         choice = QMessageBox(QMessageBox.Question,self.mainWindow.text.localisation('messageBoxes','deleteTheme','title')+themeName+' ?',
                                                     self.mainWindow.text.localisation('messageBoxes','deleteTheme','caption'),
                                                     QMessageBox.Yes | QMessageBox.No).exec()
@@ -113,23 +157,12 @@ class Themes(QWidget):
             if themeName == self.mainWindow.playlist.label.text():
                 self.mainWindow.playlist.reset()
 
-            if themeButtons in self.themeButtons :
-                self.themeButtons.remove(themeButtons)
-
-            if self.mainWindow.library.get_category(themeName) :
-                self.mainWindow.library.remove_category(themeName)
-                themeButtons.deleteLater()
+            self.themesModel.removeCategory(row)
 
     def toggleThemes(self, toggleType:bool):
-        """Used to disable or enable the themeButtons.
+        """Used to disable or enable the theme buttons.
             Takes one parameter:
             - toggleType as boolean.
             Returns nothing.
         """
-        for theme in self.themeButtons :
-            themeButton = theme.themeButton
-
-            if toggleType == True :
-                themeButton.setEnabled(True)
-            elif toggleType == False :
-                themeButton.setEnabled(False)
+        self.themesModel.setEnabled(toggleType)
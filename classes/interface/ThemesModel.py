@@ -0,0 +1,175 @@
+#---------------------------------
+#Author: Chappuis Anthony
+#
+#Model exposing the categories of the library to the themes view. Icons are
+#only requested for the rows being painted and edits only refresh the rows
+#they affect.
+#
+#Application: DragonShout music sampler
+#Last Edited: October 19th 2026
+#---------------------------------
+
+from classes.interface import MainWindow
+from classes.library.Library import Library
+from classes.library.TagIndex import TagIndex
+from classes.ressourcesFilepath import Images
+from classes.ressourcesCache import RessourcesCache
+
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QVariant
+
+class ThemesModel(QAbstractListModel):
+
+    #Data roles
+    IconPathRole = Qt.UserRole + 1
+    CategoryRole = Qt.UserRole + 2
+    EnabledRole = Qt.UserRole + 3
+
+    def __init__(self, mainWindow:MainWindow):
+        super().__init__()
+
+        self.mainWindow = mainWindow
+        self.categories = []
+        self.enabled = True
+
+        #iconPath => QIcon, filled when a row is painted
+        self.icons = {}
+
+        self.mainWindow.thumbnails.thumbnailReady.connect(lambda path: self.iconChanged(path))
+
+    def setLibrary(self, library:Library):
+        """Make the model work on the categories of another library.
+            - Takes one parameter:
+                - library as Library object.
+            - Returns nothing.
+        """
+        self.beginResetModel()
+        self.categories = library.categories
+        self.icons = {}
+        self.endResetModel()
+
+    def rowCount(self, parent:QModelIndex=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.categories)
+
+    def data(self, index:QModelIndex, role:int=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.categories):
+            return QVariant()
+
+        category = self.categories[index.row()]
+
+        if role == Qt.DisplayRole:
+            return category.name
+        elif role == Qt.DecorationRole:
+            return self.icon(category.iconPath)
+        elif role == Qt.ToolTipRole and category.query:
+            return category.query
+        elif role == ThemesModel.IconPathRole:
+            return category.iconPath
+        elif role == ThemesModel.CategoryRole:
+            return category
+        elif role == ThemesModel.EnabledRole:
+            return self.enabled
+
+        return QVariant()
+
+    def flags(self, index:QModelIndex):
+        return Qt.ItemIsEnabled
+
+    def icon(self, iconPath:str):
+        """Returns the icon of a theme. The thumbnail is requested the first time
+            the theme is painted and the default icon is used until it is ready.
+            - Takes one parameter:
+                - iconPath as string.
+            - Returns a QIcon.
+        """
+        if iconPath == '' or not isinstance(iconPath, str):
+            iconPath = Images.defaultButtonIcon
+
+        if iconPath in self.icons:
+            return self.icons[iconPath]
+
+        if iconPath in self.mainWindow.thumbnails.ressourcePaths:
+            icon = RessourcesCache.icon(iconPath)
+        else:
+            icon = self.mainWindow.thumbnails.icon(iconPath)
+
+        if icon is None:
+            return RessourcesCache.icon(Images.defaultButtonIcon)
+
+        self.icons[iconPath] = icon
+        return icon
+
+    def iconChanged(self, iconPath:str):
+        """Refresh the rows using an icon whose thumbnail just became available.
+            - Takes one parameter:
+                - iconPath as string.
+            - Returns nothing.
+        """
+        self.icons.pop(iconPath, None)
+        for row, category in enumerate(self.categories):
+            if category.iconPath == iconPath:
+                self.rowChanged(row)
+
+    def rowChanged(self, row:int):
+        """Notify the views that a theme has been edited.
+            - Takes one parameter:
+                - row as integer.
+            - Returns nothing.
+        """
+        if 0 <= row < len(self.categories):
+            index = self.index(row)
+            self.dataChanged.emit(index, index)
+
+    def category(self, row:int):
+        """Returns the category displayed at the given row.
+            - Takes one parameter:
+                - row as integer.
+            - Returns a Category object or None.
+        """
+        if 0 <= row < len(self.categories):
+            return self.categories[row]
+        return None
+
+    def addCategory(self, name:str, iconPath:str='', query:str=''):
+        """Add a new category at the end of the library.
+            - Takes three parameters:
+                - name as string.
+                - iconPath as string.
+                - query as string, the tags query of a smart theme.
+            - Returns nothing.
+            - Raises ValueError if the query is malformed.
+        """
+        row = len(self.categories)
+        #The query is checked before the row is announced
+        if query :
+            TagIndex.parse_query(query)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.mainWindow.library.add_category(name, iconPath, query)
+        self.endInsertRows()
+        self.mainWindow.searchIndex.add_category(self.categories[row])
+
+    def removeCategory(self, row:int):
+        """Remove the category at the given row from the library.
+            - Takes one parameter:
+                - row as integer.
+            - Returns nothing.
+        """
+        if 0 <= row < len(self.categories):
+            self.mainWindow.searchIndex.remove_category(self.categories[row])
+            self.mainWindow.library.forget_category(self.categories[row])
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self.categories[row]
+            self.endRemoveRows()
+
+    def setEnabled(self, enabled:bool):
+        """Enable or disable the theme buttons (used while fading).
+            - Takes one parameter:
+                - enabled as boolean.
+            - Returns nothing.
+        """
+        if self.enabled != enabled and self.categories:
+            self.enabled = enabled
+            self.dataChanged.emit(self.index(0), self.index(len(self.categories)-1))
+        else:
+            self.enabled = enabled
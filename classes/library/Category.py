@@ -13,11 +13,16 @@
 #						Attribut containing the name of the category
 #					_tracks as list
 #						Attribut containing the list of tracks for the category
+#					_query as string
+#						Attribut containing the tag query of a smart theme,
+#						whose tracks are the tracks of the library matching it,
+#						empty for the other themes
 #
 #Last edited: May 19th 2017
 ###############################################################################
 
 from classes.library.Track import Track
+from classes.library.StemTrack import StemTrack
 
 class Category:
 	"""Class Category:
@@ -28,6 +33,8 @@ class Category:
 			Attribut containing the name of the category
 		_tracks as list
 			Attribut containing the list of tracks for the category
+		_query as string
+			Attribut containing the tag query of a smart theme
 	"""
 
 	#class attribut
@@ -39,20 +46,27 @@ class Category:
 		return cls._category_number
 	get_category_number = classmethod(get_category_number)
 
-	def unserialize(cls,data: dict):
+	def unserialize(cls,data: dict,tracks: list=None):
 		"""Used to unserialize JSON data for Category instances
-		Takes one parameter:
+		Takes two parameters:
 		- data as dictionnary
+		- tracks as list of Track objects, the tracks of the library referenced by
+		their index in libraries storing each track once
 		"""
 		if "__class__" in data :
 			if data["__class__"] == "Category":
 				#Creating Category instance
-				category_object = Category(data["name"], data["iconPath"])
+				category_object = Category(data["name"], data["iconPath"], data.get("query", ""))
 
 				#unserializing tracks for this category
 				track_list = []
 				for track in data["tracks"]:
-					track_list.append(Track.unserialize(track))
+					if isinstance(track, int):
+						track_list.append(tracks[track])
+					elif track.get("__class__") == "StemTrack":
+						track_list.append(StemTrack.unserialize(track))
+					else:
+						track_list.append(Track.unserialize(track))
 				category_object.tracks = track_list
 
 				return category_object
@@ -60,10 +74,11 @@ class Category:
 	unserialize = classmethod(unserialize)
 
 	#constructor
-	def __init__(self,name: str, iconPath: str=''):
+	def __init__(self,name: str, iconPath: str='', query: str=''):
 		self._name = name
 		self._iconPath = iconPath
 		self._tracks = []
+		self._query = query
 		#Bumping category number
 		Category._category_number += 1
 
@@ -77,6 +92,8 @@ class Category:
 	def _get_tracks(self):
 		return self._tracks
 
+	def _get_query(self):
+		return self._query
 
 	#mutators
 	def _set_name(self,new_name: str):
@@ -88,6 +105,9 @@ class Category:
 	def _set_tracks(self,tracks: list):
 		self._tracks = tracks
 
+	def _set_query(self,new_query: str):
+		self._query = new_query
+
 	#destructors
 	def _del_name(self):
 		del self._name
@@ -98,6 +118,9 @@ class Category:
 	def _del_tracks(self):
 		del self._tracks
 
+	def _del_query(self):
+		del self._query
+
 	#help
 	def _help_name():
 		return "Contains the category name"
@@ -108,10 +131,14 @@ class Category:
 	def _help_tracks():
 		return "contains the list of tracks for the given category"
 
+	def _help_query():
+		return "Contains the tag query of a smart theme, empty for the other themes"
+
 	#properties
 	name = property(_get_name,		_set_name,		_del_name,		_help_name)
 	iconPath = property(_get_iconPath,		_set_iconPath,		_del_iconPath,		_help_iconPath)
 	tracks = property(_get_tracks,	_set_tracks,	_del_tracks,	_help_tracks)
+	query = property(_get_query,	_set_query,		_del_query,		_help_query)
 
 	#methods
 	def add_track(self,name: str,location: str):
@@ -122,6 +149,14 @@ class Category:
 		"""
 		self._tracks.append(Track(name,location))
 
+	def add_stem_track(self,name: str,locations: list):
+		"""Used to add a track made of synchronized stems to the category.
+		Takes two parameter:
+		- name as string
+		- locations as list of string, one file per stem
+		"""
+		self._tracks.append(StemTrack.from_locations(name,locations))
+
 	def remove_track(self,track: Track):
 		"""Used to remove a track from the category.
 		Takes one parameter:
@@ -129,15 +164,56 @@ class Category:
 		"""
 		self.tracks.remove(track)
 
-	def serialize(self):
-		"""Used to serialize instance datas to JSON format
-		Takes no parameter
+	def remove_tracks(self,indexes: list):
+		"""Used to remove several tracks from the category in a single pass.
+		The list object is kept so that views sharing it stay valid.
+		Takes one parameter:
+		- indexes as list of int
+		Returns the number of removed tracks.
+		"""
+		removed = set(indexes)
+		count = len(self._tracks)
+		self._tracks[:] = [track for index, track in enumerate(self._tracks) if index not in removed]
+		return count - len(self._tracks)
+
+	def move_tracks(self,indexes: list,destination: int):
+		"""Used to move several tracks to a new position in a single pass, keeping
+		their relative order.
+		Takes two parameters:
+		- indexes as list of int
+		- destination as int (index before which the tracks are inserted)
+		Returns the new index of the first moved track.
+		"""
+		moved = sorted(set(index for index in indexes if 0 <= index < len(self._tracks)))
+		movedSet = set(moved)
+		movedTracks = [self._tracks[index] for index in moved]
+
+		#Destination is expressed before the moved tracks are taken out
+		destination = min(max(destination,0),len(self._tracks))
+		destination -= len([index for index in moved if index < destination])
+
+		remaining = [track for index, track in enumerate(self._tracks) if index not in movedSet]
+		remaining[destination:destination] = movedTracks
+		self._tracks[:] = remaining
+		return destination
+
+	def serialize(self,track_indexes: dict=None):
+		"""Used to serialize instance datas to JSON format. The tracks of a smart
+		theme are found again from its query and are not saved.
+		Takes one parameter:
+		- track_indexes as dictionnary, the index of each track of the library by
+		identity, to reference the tracks instead of copying them
 		"""
 		track_list = []
-		for track in self.tracks:
-			track_list.append(track.serialize())
+		if not self.query:
+			for track in self.tracks:
+				if track_indexes is None:
+					track_list.append(track.serialize())
+				else:
+					track_list.append(track_indexes[id(track)])
 
 		return {"__class__": 	"Category",
 				"name":			self.name,
 				"iconPath":		self.iconPath,
+				"query":		self.query,
 				"tracks":		track_list}
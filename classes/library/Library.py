@@ -14,15 +14,29 @@
 #					Contains the list of categories (instances of Category class)
 #				_filepath as string
 #					Contains the path to the library file on the drive
+#				_scenes as list
+#					Contains the list of scene snapshots (instances of Scene class)
+#				_sequences as list
+#					Contains the list of scripted sequences (instances of Sequence class)
+#				_sample_set as SampleSet
+#					Contains the sample set saved along the library, None if there is none
+#				_tag_index as TagIndex
+#					Contains the index of the tracks and their tags, keeping the
+#					smart themes up to date and sharing the tracks added to
+#					several themes
 #
 #Last edited: January 31th 2018
 ###############################################################################
 import os
 import json
 
-from classes.interface import MainWindow
 from classes.library.Category import Category
-from classes.interface.Sampler import Sampler
+from classes.library.Scene import Scene
+from classes.library.Sequence import Sequence
+from classes.library.SampleSet import SampleSet
+from classes.library.TagIndex import TagIndex
+from classes.library.Track import Track
+from classes.library.StemTrack import StemTrack
 
 class Library:
 	"""Class Library:
@@ -33,42 +47,74 @@ class Library:
 			Contains the list of categories
 		_filepath as string
 			Contains the path to the library file on the drive
+		_scenes as list
+			Contains the list of scene snapshots
+		_sequences as list
+			Contains the list of scripted sequences
+		_sample_set as SampleSet
+			Contains the sample set saved along the library
+		_tag_index as TagIndex
+			Contains the index of the tracks and their tags
 	"""
 
-	def load(cls, mainWindow:MainWindow, filepath: str):
-		"""Used to load the library from the hard drive (JSON).
+	def load(cls, filepath: str):
+		"""Used to load the library and its sample set from the hard drive (JSON).
 		Takes one parameter:
 		- filepath as string
+		Returns a Library object or False if the file can't be read.
 		"""
 		try :
 			with open(filepath, "r", encoding="utf-8") as json_file:
 				completeJSON = json.load(json_file)
 
-			library_object = Library.unserialize(mainWindow,completeJSON["Library"])
+			library_object = Library.unserialize(completeJSON["Library"])
 			library_object.filepath = filepath
+			if completeJSON.get("SampleSet") is not None:
+				library_object.sample_set = SampleSet.unserialize(completeJSON["SampleSet"])
 			return library_object
 		except :
 			return False
 	load = classmethod(load)
 
 	#class method
-	def unserialize(cls,mainWindow:MainWindow, data: dict):
+	def unserialize(cls, data: dict):
 		"""Used to unserialize json data to set Library instance attributs and create Category
 		class instances.
-		Takes two parameters:
+		Takes one parameter:
 		- data as dictionnary
-		- filepath as string
 		"""
 		if "__class__" in data :
 			if data["__class__"] == "Library":
 				#creating Library instance
-				library_object = Library(mainWindow, data["name"],"")
+				library_object = Library(data["name"],"")
+
+				#unserializing the tracks, stored once for all the categories since October 2026
+				track_list = []
+				for track in data.get("tracks", []):
+					if track.get("__class__") == "StemTrack":
+						track_list.append(StemTrack.unserialize(track))
+					else:
+						track_list.append(Track.unserialize(track))
 
 				#unserializing categories for this library
 				category_list = []
 				for category in data["categories"]:
-					category_list.append(Category.unserialize(category))
+					category_list.append(Category.unserialize(category,track_list))
 				library_object.categories = category_list
+				library_object.share_tracks()
+				library_object.tag_index.index_library(library_object)
+
+				#unserializing scenes, absent from libraries saved before scenes existed
+				scene_list = []
+				for scene in data.get("scenes", []):
+					scene_list.append(Scene.unserialize(scene))
+				library_object.scenes = scene_list
+
+				#unserializing sequences
+				sequence_list = []
+				for sequence in data.get("sequences", []):
+					sequence_list.append(Sequence.unserialize(sequence))
+				library_object.sequences = sequence_list
 
 				return library_object
 
@@ -76,11 +122,14 @@ class Library:
 	unserialize = classmethod(unserialize)
 
 	#constructor
-	def __init__(self, mainWindow:MainWindow, name:str, filepath: str):
+	def __init__(self, name:str, filepath: str):
 		self._name			= name
 		self._filepath 		= filepath
 		self._categories 	= []
-		self.mainWindow = mainWindow
+		self._scenes 		= []
+		self._sequences 	= []
+		self._sample_set 	= None
+		self._tag_index 	= TagIndex()
 
 	#accessors
 	def _get_name(self):
@@ -92,6 +141,18 @@ class Library:
 	def _get_categories(self):
 		return self._categories
 
+	def _get_scenes(self):
+		return self._scenes
+
+	def _get_sequences(self):
+		return self._sequences
+
+	def _get_sample_set(self):
+		return self._sample_set
+
+	def _get_tag_index(self):
+		return self._tag_index
+
 	#mutators
 	def _set_name(self, new_name: str):
 		self._name 			= new_name
@@ -102,6 +163,18 @@ class Library:
 	def _set_categories(self,categories: list):
 		self._categories 	= categories
 
+	def _set_scenes(self,scenes: list):
+		self._scenes 		= scenes
+
+	def _set_sequences(self,sequences: list):
+		self._sequences 	= sequences
+
+	def _set_sample_set(self,sample_set: SampleSet):
+		self._sample_set 	= sample_set
+
+	def _set_tag_index(self,tag_index: TagIndex):
+		self._tag_index 	= tag_index
+
 	#destructors
 	def _del_name(self):
 		del self._name
@@ -112,6 +185,18 @@ class Library:
 	def _del_categories(self):
 		del self._categories
 
+	def _del_scenes(self):
+		del self._scenes
+
+	def _del_sequences(self):
+		del self._sequences
+
+	def _del_sample_set(self):
+		del self._sample_set
+
+	def _del_tag_index(self):
+		del self._tag_index
+
 	#help
 	def _help_name():
 		return "Contains the name of the library which also is the filename on the drive"
@@ -122,18 +207,40 @@ class Library:
 	def _help_categories():
 		return "Contains the list of categories"
 
+	def _help_scenes():
+		return "Contains the list of scene snapshots"
+
+	def _help_sequences():
+		return "Contains the list of scripted sequences"
+
+	def _help_sample_set():
+		return "Contains the sample set saved along the library, None if there is none"
+
+	def _help_tag_index():
+		return "Contains the index of the tracks and their tags, keeping the smart themes up to date"
+
 	#properties
 	name 		= property(_get_name,			_set_name,			_del_name,			_help_name)
 	filepath 	= property(_get_filepath,		_set_filepath,		_del_filepath,		_help_filepath)
 	categories 	= property(_get_categories,		_set_categories,	_del_categories,	_help_categories)
+	scenes 		= property(_get_scenes,			_set_scenes,		_del_scenes,		_help_scenes)
+	sequences 	= property(_get_sequences,		_set_sequences,		_del_sequences,		_help_sequences)
+	sample_set 	= property(_get_sample_set,		_set_sample_set,	_del_sample_set,	_help_sample_set)
+	tag_index 	= property(_get_tag_index,		_set_tag_index,		_del_tag_index,		_help_tag_index)
 
 	#methods
-	def add_category(self,name: str, iconPath: str=''):
+	def add_category(self,name: str, iconPath: str='', query: str=''):
 		"""Used to add a category to the library.
-		Takes one parameter:
+		Takes three parameters:
 		- name as string
+		- iconPath as string
+		- query as string, the tag query of a smart theme
+		Raises ValueError if the query is malformed.
 		"""
-		self._categories.append(Category(name,iconPath))
+		category = Category(name,iconPath,query)
+		if query:
+			self.tag_index.add_smart_theme(category)
+		self._categories.append(category)
 
 	def remove_category(self, name:str):
 		"""Used to remove a category from the library.
@@ -144,8 +251,58 @@ class Library:
 		category  = self.get_category(name)
 
 		if category :
+			self.forget_category(category)
 			self.categories.remove(category)
 
+	def forget_category(self,category: Category):
+		"""Used to remove the tracks of a category about to be removed from the
+		tag index, or to stop updating it if it is a smart theme.
+		Takes one parameter:
+		- category as Category object
+		Returns nothing.
+		"""
+		if category.query:
+			self.tag_index.remove_smart_theme(category)
+		else:
+			for track in category.tracks:
+				self.tag_index.remove_track(category,track)
+
+	def add_track(self,category: Category,track: Track):
+		"""Used to add a track at the end of a category, using the track of the
+		library playing the same files if there is one.
+		Takes two parameters:
+		- category as Category object, not a smart theme
+		- track as Track object
+		Returns the Track object added.
+		"""
+		track = self.tag_index.shared_track(track)
+		category.tracks.append(track)
+		self.tag_index.add_track(category,track)
+		return track
+
+	def share_tracks(self):
+		"""Used to replace the tracks playing the same files in several categories by
+		a single track, as libraries saved before October 2026 stored one copy per
+		category. Only the copies alike in everything but their play count, tags and
+		duration are replaced: a track renamed or cut in other segments in one
+		category stays apart. The play counts and tags of the copies are added up.
+		Takes no parameter.
+		Returns the number of copies replaced.
+		"""
+		shared = {}
+		replaced = 0
+		for category in self.categories:
+			if category.query:
+				continue
+			for index, track in enumerate(category.tracks):
+				existing = shared.setdefault(TagIndex.alike_key(track), track)
+				if existing is not track:
+					existing.playCount += track.playCount
+					existing.tags = existing.tags + track.tags
+					category.tracks[index] = existing
+					replaced += 1
+		return replaced
+
 	def get_category(self,name: str):
 		"""Used to get a specific category from the library.
 		Takes one parameter:
@@ -157,6 +314,70 @@ class Library:
 
 		return False
 
+	def set_scene(self,scene: Scene):
+		"""Used to add a scene to the library, replacing the scene with the same name.
+		Takes one parameter:
+		- scene as Scene object
+		Returns nothing.
+		"""
+		for index, existing_scene in enumerate(self._scenes):
+			if existing_scene.name == scene.name:
+				self._scenes[index] = scene
+				return
+
+		self._scenes.append(scene)
+
+	def remove_scene(self, name:str):
+		"""Used to remove a scene from the library.
+		Takes one paramter:
+		- name as string.
+		Returns nothing.
+		"""
+		self._scenes[:] = [scene for scene in self._scenes if scene.name != name]
+
+	def get_scene(self,name: str):
+		"""Used to get a specific scene from the library.
+		Takes one parameter:
+		- name as string
+		"""
+		for scene in self.scenes:
+			if scene.name == name:
+				return scene
+
+		return False
+
+	def set_sequence(self,sequence: Sequence):
+		"""Used to add a sequence to the library, replacing the sequence with the same name.
+		Takes one parameter:
+		- sequence as Sequence object
+		Returns nothing.
+		"""
+		for index, existing_sequence in enumerate(self._sequences):
+			if existing_sequence.name == sequence.name:
+				self._sequences[index] = sequence
+				return
+
+		self._sequences.append(sequence)
+
+	def remove_sequence(self, name:str):
+		"""Used to remove a sequence from the library.
+		Takes one paramter:
+		- name as string.
+		Returns nothing.
+		"""
+		self._sequences[:] = [sequence for sequence in self._sequences if sequence.name != name]
+
+	def get_sequence(self,name: str):
+		"""Used to get a specific sequence from the library.
+		Takes one parameter:
+		- name as string
+		"""
+		for sequence in self.sequences:
+			if sequence.name == name:
+				return sequence
+
+		return False
+
 	def gather_library(self):
 		"""Used to gather the categories and tracks for this library.
 		Takes no parameter
@@ -175,17 +396,15 @@ class Library:
 
 	#file handling
 	def save(self,filepath:str='./new_library.json'):
-		"""Used to save the library on the hard drive (JSON).
+		"""Used to save the library and its sample set on the hard drive (JSON).
 		Takes one parameters:
 		- filepath as string
 		"""
 		self.filepath = filepath
 
-		serial_library = self.serialize()
-		serial_sampler = self.mainWindow.sampler.serialize()
-
-		completeJSON = {"Library" : serial_library,
-		"SampleSet" : serial_sampler}
+		completeJSON = {"Library" : self.serialize()}
+		if self.sample_set is not None:
+			completeJSON["SampleSet"] = self.sample_set.serialize()
 
 		#if the file doesn't exist, create it
 		if not(os.path.isfile(filepath)):
@@ -202,10 +421,31 @@ class Library:
 		"""Used to serialize instance data to JSON format
 		toakes no parameter.
 		"""
+		#Each track is stored once and referenced by its index from its categories
+		track_list = []
+		track_indexes = {}
+		for category in self.categories:
+			if not category.query:
+				for track in category.tracks:
+					if id(track) not in track_indexes:
+						track_indexes[id(track)] = len(track_list)
+						track_list.append(track.serialize())
+
 		category_list = []
 		for category in self.categories:
-			category_list.append(category.serialize())
+			category_list.append(category.serialize(track_indexes))
+
+		scene_list = []
+		for scene in self.scenes:
+			scene_list.append(scene.serialize())
+
+		sequence_list = []
+		for sequence in self.sequences:
+			sequence_list.append(sequence.serialize())
 
 		return {"__class__": 	"Library",
 				"name":			self.name,
-				"categories":	category_list}
+				"tracks":		track_list,
+				"categories":	category_list,
+				"scenes":		scene_list,
+				"sequences":	sequence_list}
@@ -0,0 +1,413 @@
+###############################################################################
+#Author: 		Chappuis Anthony
+#Filename: 		Pad.py
+#Application: 	DragonShout
+#Date:			October 2026
+#Description:	Contain the class for the pads of the sample sets, without any
+#				widget: the sampler builds its buttons from them when a bank
+#				is shown and the offline renderer plays them directly.
+#
+#				Class Pad:
+#					_coordinates as tuple
+#						Attribut containing the (row, column) of the pad in its bank
+#					_filepaths as list
+#						Attribut containing the sound files, one per variation
+#					_icon_path as string
+#						Attribut containing the path to the icon of the pad
+#					_variation_mode as string
+#						Attribut containing how the variations are picked
+#					_pitch_variation as float
+#						Attribut containing the maximum random pitch change of
+#						a trigger in semitones
+#					_gain_variation as float
+#						Attribut containing the maximum random attenuation of
+#						a trigger in decibels
+#					_loop as boolean
+#						Attribut containing if the pad plays in a loop
+#					_loop_start as float
+#						Attribut containing the start of the loop in seconds,
+#						None to find it automatically
+#					_loop_end as float
+#						Attribut containing the end of the loop in seconds,
+#						None to find it automatically
+#					_loop_crossfade as float
+#						Attribut containing the crossfade of the loop in seconds
+#					_pan as float
+#						Attribut containing the pan from -1 (left) to 1 (right)
+#					_pan_variation as float
+#						Attribut containing the maximum random pan change of a
+#						trigger
+#					_location as tuple
+#						Attribut containing the (x, y) location in meters around
+#						the listener replacing the pan, or None
+#
+#Modifications:
+###############################################################################
+
+import random
+
+class Pad:
+	"""Class Pad:
+			_coordinates as tuple
+				Attribut containing the (row, column) of the pad in its bank
+			_filepaths as list
+				Attribut containing the sound files, one per variation
+			_icon_path as string
+				Attribut containing the path to the icon of the pad
+			_variation_mode as string
+				Attribut containing how the variations are picked
+			_pitch_variation as float
+				Attribut containing the maximum random pitch change in semitones
+			_gain_variation as float
+				Attribut containing the maximum random attenuation in decibels
+			_loop as boolean
+				Attribut containing if the pad plays in a loop
+			_loop_start as float
+				Attribut containing the start of the loop in seconds or None
+			_loop_end as float
+				Attribut containing the end of the loop in seconds or None
+			_loop_crossfade as float
+				Attribut containing the crossfade of the loop in seconds
+			_pan as float
+				Attribut containing the pan from -1 (left) to 1 (right)
+			_pan_variation as float
+				Attribut containing the maximum random pan change
+			_location as tuple
+				Attribut containing the (x, y) location in meters or None
+	"""
+
+	#class attribut
+	#Button type of the populated pads in the sample set files
+	SOUND_EFFECT_BUTTON = 1
+
+	#Variation modes
+	ROUND_ROBIN = "roundRobin"
+	RANDOM = "random"
+
+	#Randomization limits: pitch in semitones, gain in decibels
+	MAX_PITCH_VARIATION = 12.0
+	MAX_GAIN_VARIATION = 24.0
+	MAX_PAN_VARIATION = 1.0
+
+	#Loop crossfade in seconds and farthest location in meters
+	LOOP_CROSSFADE = 0.02
+	MAX_LOOP_CROSSFADE = 1.0
+	MAX_DISTANCE = 50.0
+
+	#class method
+	def unserialize(cls,data: dict):
+		"""Used to unserialize JSON data for Pad instances, stored as SoundEffect
+		to stay readable by the previous versions
+		Takes one parameter:
+		- data as dictionnary
+		"""
+		if "__class__" in data :
+			if data["__class__"] == "SoundEffect":
+				#Creating Pad instance
+				pad_object = Pad(data["coordinates"],data.get("filepaths") or [data.get("filepath","")],data.get("iconPath",""),
+								data.get("variationMode",Pad.ROUND_ROBIN),data.get("pitchVariation",0.0),data.get("gainVariation",0.0),
+								data.get("loop",False),data.get("loopStart"),data.get("loopEnd"),data.get("loopCrossfade",Pad.LOOP_CROSSFADE),
+								data.get("pan",0.0),data.get("panVariation",0.0),data.get("location"))
+				return pad_object
+			return data
+	unserialize = classmethod(unserialize)
+
+	#constructor
+	def __init__(self,coordinates: tuple,filepaths: list=None,icon_path: str='',variation_mode: str=ROUND_ROBIN,
+				pitch_variation: float=0.0,gain_variation: float=0.0,loop: bool=False,loop_start: float=None,
+				loop_end: float=None,loop_crossfade: float=LOOP_CROSSFADE,pan: float=0.0,pan_variation: float=0.0,
+				location: tuple=None):
+		self.coordinates = coordinates
+		self.filepaths = filepaths or []
+		self.icon_path = icon_path or ''
+		self.variation_mode = variation_mode
+		self.pitch_variation = pitch_variation
+		self.gain_variation = gain_variation
+		self.loop = loop
+		self.loop_start = loop_start
+		self.loop_end = loop_end
+		self.loop_crossfade = loop_crossfade
+		self.pan = pan
+		self.pan_variation = pan_variation
+		self.location = location
+
+		#Variation played last and variations left to play in random mode
+		self.last_variation = -1
+		self.shuffle_bag = []
+
+	#accessors
+	def _get_coordinates(self):
+		return self._coordinates
+
+	def _get_filepaths(self):
+		return self._filepaths
+
+	def _get_icon_path(self):
+		return self._icon_path
+
+	def _get_variation_mode(self):
+		return self._variation_mode
+
+	def _get_pitch_variation(self):
+		return self._pitch_variation
+
+	def _get_gain_variation(self):
+		return self._gain_variation
+
+	def _get_loop(self):
+		return self._loop
+
+	def _get_loop_start(self):
+		return self._loop_start
+
+	def _get_loop_end(self):
+		return self._loop_end
+
+	def _get_loop_crossfade(self):
+		return self._loop_crossfade
+
+	def _get_pan(self):
+		return self._pan
+
+	def _get_pan_variation(self):
+		return self._pan_variation
+
+	def _get_location(self):
+		return self._location
+
+	#mutators
+	def _set_coordinates(self,new_coordinates: tuple):
+		self._coordinates = tuple(new_coordinates)
+
+	def _set_filepaths(self,new_filepaths: list):
+		#A pad keeps at least one entry so that its first file can always be read
+		self._filepaths = [filepath for filepath in new_filepaths if filepath] or ['']
+		self.last_variation = -1
+		self.shuffle_bag = []
+
+	def _set_icon_path(self,new_icon_path: str):
+		self._icon_path = new_icon_path
+
+	def _set_variation_mode(self,new_variation_mode: str):
+		if new_variation_mode not in (Pad.ROUND_ROBIN, Pad.RANDOM):
+			new_variation_mode = Pad.ROUND_ROBIN
+		self._variation_mode = new_variation_mode
+		self.shuffle_bag = []
+
+	def _set_pitch_variation(self,new_pitch_variation: float):
+		self._pitch_variation = min(max(float(new_pitch_variation), 0.0), Pad.MAX_PITCH_VARIATION)
+
+	def _set_gain_variation(self,new_gain_variation: float):
+		self._gain_variation = min(max(float(new_gain_variation), 0.0), Pad.MAX_GAIN_VARIATION)
+
+	def _set_loop(self,new_loop: bool):
+		self._loop = bool(new_loop)
+
+	def _set_loop_start(self,new_loop_start: float):
+		self._loop_start = new_loop_start
+
+	def _set_loop_end(self,new_loop_end: float):
+		self._loop_end = new_loop_end
+
+	def _set_loop_crossfade(self,new_loop_crossfade: float):
+		self._loop_crossfade = min(max(float(new_loop_crossfade), 0.0), Pad.MAX_LOOP_CROSSFADE)
+
+	def _set_pan(self,new_pan: float):
+		self._pan = min(max(float(new_pan), -1.0), 1.0)
+
+	def _set_pan_variation(self,new_pan_variation: float):
+		self._pan_variation = min(max(float(new_pan_variation), 0.0), Pad.MAX_PAN_VARIATION)
+
+	def _set_location(self,new_location: tuple):
+		if new_location is not None:
+			new_location = tuple(min(max(float(value), -Pad.MAX_DISTANCE), Pad.MAX_DISTANCE) for value in new_location)
+		self._location = new_location
+
+	#destructors
+	def _del_coordinates(self):
+		del self._coordinates
+
+	def _del_filepaths(self):
+		del self._filepaths
+
+	def _del_icon_path(self):
+		del self._icon_path
+
+	def _del_variation_mode(self):
+		del self._variation_mode
+
+	def _del_pitch_variation(self):
+		del self._pitch_variation
+
+	def _del_gain_variation(self):
+		del self._gain_variation
+
+	def _del_loop(self):
+		del self._loop
+
+	def _del_loop_start(self):
+		del self._loop_start
+
+	def _del_loop_end(self):
+		del self._loop_end
+
+	def _del_loop_crossfade(self):
+		del self._loop_crossfade
+
+	def _del_pan(self):
+		del self._pan
+
+	def _del_pan_variation(self):
+		del self._pan_variation
+
+	def _del_location(self):
+		del self._location
+
+	#help
+	def _help_coordinates():
+		return "Contains the (row, column) of the pad in its bank"
+
+	def _help_filepaths():
+		return "Contains the sound files of the pad, one per variation"
+
+	def _help_icon_path():
+		return "Contains the path to the icon of the pad"
+
+	def _help_variation_mode():
+		return "Contains how the variations are picked: ROUND_ROBIN or RANDOM"
+
+	def _help_pitch_variation():
+		return "Contains the maximum random pitch change of a trigger in semitones"
+
+	def _help_gain_variation():
+		return "Contains the maximum random attenuation of a trigger in decibels"
+
+	def _help_loop():
+		return "Contains True if the pad plays in a loop"
+
+	def _help_loop_start():
+		return "Contains the start of the loop in seconds, None to find it automatically"
+
+	def _help_loop_end():
+		return "Contains the end of the loop in seconds, None to find it automatically"
+
+	def _help_loop_crossfade():
+		return "Contains the crossfade of the loop in seconds"
+
+	def _help_pan():
+		return "Contains the pan of the pad from -1 (left) to 1 (right)"
+
+	def _help_pan_variation():
+		return "Contains the maximum random pan change of a trigger"
+
+	def _help_location():
+		return "Contains the (x, y) location in meters around the listener replacing the pan, or None"
+
+	#properties
+	coordinates = property(_get_coordinates,		_set_coordinates,		_del_coordinates,		_help_coordinates)
+	filepaths = property(_get_filepaths,		_set_filepaths,		_del_filepaths,		_help_filepaths)
+	icon_path = property(_get_icon_path,		_set_icon_path,		_del_icon_path,		_help_icon_path)
+	variation_mode = property(_get_variation_mode,		_set_variation_mode,		_del_variation_mode,		_help_variation_mode)
+	pitch_variation = property(_get_pitch_variation,		_set_pitch_variation,		_del_pitch_variation,		_help_pitch_variation)
+	gain_variation = property(_get_gain_variation,		_set_gain_variation,		_del_gain_variation,		_help_gain_variation)
+	loop = property(_get_loop,		_set_loop,		_del_loop,		_help_loop)
+	loop_start = property(_get_loop_start,		_set_loop_start,		_del_loop_start,		_help_loop_start)
+	loop_end = property(_get_loop_end,		_set_loop_end,		_del_loop_end,		_help_loop_end)
+	loop_crossfade = property(_get_loop_crossfade,		_set_loop_crossfade,		_del_loop_crossfade,		_help_loop_crossfade)
+	pan = property(_get_pan,		_set_pan,		_del_pan,		_help_pan)
+	pan_variation = property(_get_pan_variation,		_set_pan_variation,		_del_pan_variation,		_help_pan_variation)
+	location = property(_get_location,		_set_location,		_del_location,		_help_location)
+
+	#methods
+	def get_filepath(self):
+		"""Used to get the first sound file of the pad.
+		Takes no parameter.
+		Returns a string, empty for a pad without sound.
+		"""
+		return self._filepaths[0]
+
+	def get_sound_files(self):
+		"""Used to get the sound files of the pad without the empty entries.
+		Takes no parameter.
+		Returns a list of strings.
+		"""
+		return [filepath for filepath in self._filepaths if filepath]
+
+	def next_variation(self,generator: random.Random=random):
+		"""Used to pick the variation of the next trigger: the next one in round robin
+		mode, or a random one that can't repeat until every variation has been played
+		in random mode.
+		Takes one parameter:
+		- generator as random.Random, the random module by default
+		Returns the variation index as integer.
+		"""
+		count = len(self._filepaths)
+		if count == 1:
+			variation = 0
+
+		elif self._variation_mode == Pad.ROUND_ROBIN:
+			variation = (self.last_variation + 1) % count
+
+		else:
+			if not self.shuffle_bag:
+				self.shuffle_bag = list(range(count))
+				generator.shuffle(self.shuffle_bag)
+				#Never play the same variation twice in a row across two bags
+				if self.shuffle_bag[-1] == self.last_variation:
+					self.shuffle_bag[0], self.shuffle_bag[-1] = self.shuffle_bag[-1], self.shuffle_bag[0]
+			variation = self.shuffle_bag.pop()
+
+		self.last_variation = variation
+		return variation
+
+	def trigger_rate(self,generator: random.Random=random):
+		"""Used to get the playback speed of a trigger according to the pitch randomization.
+		Loops always play at their original pitch.
+		Takes one parameter:
+		- generator as random.Random, the random module by default
+		Returns a float, 1.0 for the original pitch.
+		"""
+		if self._pitch_variation and not self._loop :
+			return 2**(generator.uniform(-self._pitch_variation, self._pitch_variation)/12)
+		return 1.0
+
+	def trigger_gain(self,generator: random.Random=random):
+		"""Used to get the gain factor of a trigger according to the gain randomization.
+		Takes one parameter:
+		- generator as random.Random, the random module by default
+		Returns a float between 0 and 1.
+		"""
+		if self._gain_variation :
+			return 10**(-generator.uniform(0, self._gain_variation)/20)
+		return 1.0
+
+	def trigger_pan(self,generator: random.Random=random):
+		"""Used to get the pan of a trigger according to the pan randomization.
+		Takes one parameter:
+		- generator as random.Random, the random module by default
+		Returns a float from -1 (left) to 1 (right).
+		"""
+		if self._pan_variation :
+			return min(max(self._pan + generator.uniform(-self._pan_variation, self._pan_variation), -1.0), 1.0)
+		return self._pan
+
+	def serialize(self):
+		"""Used to serialize instance datas to JSON format
+		Takes no parameter
+		"""
+		return {"__class__":		"SoundEffect",
+				"coordinates":		self.coordinates,
+				"buttonType":		Pad.SOUND_EFFECT_BUTTON,
+				"filepath":			self.get_filepath(),
+				"filepaths":		self.filepaths,
+				"variationMode":	self.variation_mode,
+				"pitchVariation":	self.pitch_variation,
+				"gainVariation":	self.gain_variation,
+				"loop":				self.loop,
+				"loopStart":		self.loop_start,
+				"loopEnd":			self.loop_end,
+				"loopCrossfade":	self.loop_crossfade,
+				"pan":				self.pan,
+				"panVariation":		self.pan_variation,
+				"location":			self.location,
+				"iconPath":			self.icon_path}
@@ -0,0 +1,164 @@
+###############################################################################
+#Author: 		Chappuis Anthony
+#Filename: 		SampleBank.py
+#Application: 	DragonShout
+#Date:			October 2026
+#Description:	Contain the class for the banks of the sample sets
+#
+#				Class SampleBank:
+#					_name as string
+#						Attribut containing the name of the bank
+#					_rows as int
+#						Attribut containing the number of rows of the grid
+#					_columns as int
+#						Attribut containing the number of columns of the grid
+#					_pads as dictionnary
+#						Attribut containing the populated pads (instances of
+#						Pad class) by (row, column), empty cells are not
+#						stored
+#
+#Modifications:
+###############################################################################
+
+from classes.library.Pad import Pad
+
+class SampleBank:
+	"""Class SampleBank:
+			_name as string
+				Attribut containing the name of the bank
+			_rows as int
+				Attribut containing the number of rows of the grid
+			_columns as int
+				Attribut containing the number of columns of the grid
+			_pads as dictionnary
+				Attribut containing the populated pads by (row, column)
+	"""
+
+	#class attribut
+	DEFAULT_ROWS = 10
+	DEFAULT_COLUMNS = 6
+
+	#class method
+	def unserialize(cls,data: dict):
+		"""Used to unserialize JSON data for SampleBank instances
+		Takes one parameter:
+		- data as dictionnary
+		"""
+		if "__class__" in data :
+			if data["__class__"] == "SampleBank":
+				#Creating SampleBank instance
+				bank_object = SampleBank(data["name"],data["rows"],data["columns"])
+
+				#Empty cells were stored as default buttons before the grid painted them
+				for pad in data["pads"]:
+					if pad.get("buttonType") == Pad.SOUND_EFFECT_BUTTON:
+						bank_object.set_pad(Pad.unserialize(pad))
+				return bank_object
+			return data
+	unserialize = classmethod(unserialize)
+
+	#constructor
+	def __init__(self,name: str='',rows: int=DEFAULT_ROWS,columns: int=DEFAULT_COLUMNS):
+		self._name = name
+		self._rows = rows
+		self._columns = columns
+		self._pads = {}
+
+	#accessors
+	def _get_name(self):
+		return self._name
+
+	def _get_rows(self):
+		return self._rows
+
+	def _get_columns(self):
+		return self._columns
+
+	def _get_pads(self):
+		return list(self._pads.values())
+
+	#mutators
+	def _set_name(self,new_name: str):
+		self._name = new_name
+
+	def _set_rows(self,new_rows: int):
+		self._rows = new_rows
+
+	def _set_columns(self,new_columns: int):
+		self._columns = new_columns
+
+	def _set_pads(self,new_pads: list):
+		self._pads = {pad.coordinates: pad for pad in new_pads}
+
+	#destructors
+	def _del_name(self):
+		del self._name
+
+	def _del_rows(self):
+		del self._rows
+
+	def _del_columns(self):
+		del self._columns
+
+	def _del_pads(self):
+		del self._pads
+
+	#help
+	def _help_name():
+		return "Contains the bank name"
+
+	def _help_rows():
+		return "Contains the number of rows of the grid"
+
+	def _help_columns():
+		return "Contains the number of columns of the grid"
+
+	def _help_pads():
+		return "Contains the populated pads of the bank"
+
+	#properties
+	name = property(_get_name,		_set_name,		_del_name,		_help_name)
+	rows = property(_get_rows,		_set_rows,		_del_rows,		_help_rows)
+	columns = property(_get_columns,		_set_columns,		_del_columns,		_help_columns)
+	pads = property(_get_pads,		_set_pads,		_del_pads,		_help_pads)
+
+	#methods
+	def get_pad(self,row: int,column: int):
+		"""Used to get the pad of a cell.
+		Takes two parameters:
+		- row as integer
+		- column as integer
+		Returns a Pad object or None for an empty cell.
+		"""
+		return self._pads.get((row, column))
+
+	def set_pad(self,pad: Pad):
+		"""Used to place a pad at its coordinates, replacing the pad already there and
+		growing the grid if needed.
+		Takes one parameter:
+		- pad as Pad object
+		Returns the replaced Pad object or None.
+		"""
+		replaced_pad = self.remove_pad(pad.coordinates)
+		self._pads[pad.coordinates] = pad
+		self._rows = max(self._rows, pad.coordinates[0]+1)
+		self._columns = max(self._columns, pad.coordinates[1]+1)
+		return replaced_pad
+
+	def remove_pad(self,coordinates: tuple):
+		"""Used to empty a cell.
+		Takes one parameter:
+		- coordinates as (row, column) tuple
+		Returns the removed Pad object or None.
+		"""
+		return self._pads.pop(tuple(coordinates), None)
+
+	def serialize(self):
+		"""Used to serialize instance datas to JSON format
+		Takes no parameter
+		"""
+		return {"__class__":	"SampleBank",
+				"name":			self.name,
+				"rows":			self.rows,
+				"columns":		self.columns,
+				"pads":			[pad.serialize() for pad in self.pads]}
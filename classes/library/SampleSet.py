@@ -0,0 +1,158 @@
+###############################################################################
+#Author: 		Chappuis Anthony
+#Filename: 		SampleSet.py
+#Application: 	DragonShout
+#Date:			October 2026
+#Description:	Contain the class for the sample sets saved along the libraries.
+#				It only holds data, so that sample sets can be loaded, checked
+#				and rendered without the interface.
+#
+#				Class SampleSet:
+#					_banks as list
+#						Attribut containing the banks of pads (instances of
+#						SampleBank class)
+#					_current_bank as int
+#						Attribut containing the index of the bank shown
+#					_ducking as dictionnary
+#						Attribut containing the ducking settings of the music:
+#						enabled, threshold, depth, attack and release. Missing
+#						settings use the audio engine defaults.
+#
+#Modifications:
+###############################################################################
+
+from classes.library.SampleBank import SampleBank
+
+class SampleSet:
+	"""Class SampleSet:
+			_banks as list
+				Attribut containing the banks of pads
+			_current_bank as int
+				Attribut containing the index of the bank shown
+			_ducking as dictionnary
+				Attribut containing the ducking settings of the music
+	"""
+
+	#class method
+	def unserialize(cls,data):
+		"""Used to unserialize JSON data for SampleSet instances
+		Takes one parameter:
+		- data as dictionnary, or as list for sample sets saved before banks existed
+		"""
+		if isinstance(data, list):
+			data = {"__class__": "SampleSet", "currentBank": 0,
+					"banks": [{"__class__": "SampleBank", "name": "", "rows": SampleBank.DEFAULT_ROWS,
+								"columns": SampleBank.DEFAULT_COLUMNS, "pads": data}]}
+
+		if "__class__" in data :
+			if data["__class__"] == "SampleSet":
+				#Creating SampleSet instance
+				sample_set_object = SampleSet(data.get("currentBank",0),data.get("ducking"))
+
+				bank_list = []
+				for bank in data["banks"]:
+					bank_list.append(SampleBank.unserialize(bank))
+				sample_set_object.banks = bank_list
+
+				return sample_set_object
+			return data
+	unserialize = classmethod(unserialize)
+
+	#constructor
+	def __init__(self,current_bank: int=0,ducking: dict=None):
+		self._banks = []
+		self._current_bank = current_bank
+		self._ducking = dict(ducking or {})
+
+	#accessors
+	def _get_banks(self):
+		return self._banks
+
+	def _get_current_bank(self):
+		return self._current_bank
+
+	def _get_ducking(self):
+		return self._ducking
+
+	#mutators
+	def _set_banks(self,new_banks: list):
+		self._banks = new_banks
+
+	def _set_current_bank(self,new_current_bank: int):
+		self._current_bank = new_current_bank
+
+	def _set_ducking(self,new_ducking: dict):
+		self._ducking = new_ducking
+
+	#destructors
+	def _del_banks(self):
+		del self._banks
+
+	def _del_current_bank(self):
+		del self._current_bank
+
+	def _del_ducking(self):
+		del self._ducking
+
+	#help
+	def _help_banks():
+		return "Contains the banks of pads"
+
+	def _help_current_bank():
+		return "Contains the index of the bank shown"
+
+	def _help_ducking():
+		return "Contains the ducking settings of the music"
+
+	#properties
+	banks = property(_get_banks,		_set_banks,		_del_banks,		_help_banks)
+	current_bank = property(_get_current_bank,		_set_current_bank,		_del_current_bank,		_help_current_bank)
+	ducking = property(_get_ducking,		_set_ducking,		_del_ducking,		_help_ducking)
+
+	#methods
+	def add_bank(self,name: str='',rows: int=SampleBank.DEFAULT_ROWS,columns: int=SampleBank.DEFAULT_COLUMNS):
+		"""Used to add an empty bank to the sample set.
+		Takes three parameters:
+		- name as string
+		- rows as integer
+		- columns as integer
+		Returns the SampleBank object.
+		"""
+		bank = SampleBank(name,rows,columns)
+		self._banks.append(bank)
+		return bank
+
+	def get_pad(self,bank: int,row: int,column: int):
+		"""Used to get the pad of a cell of a bank.
+		Takes three parameters:
+		- bank as integer, index of the bank
+		- row as integer
+		- column as integer
+		Returns a Pad object or None.
+		"""
+		if not 0 <= bank < len(self._banks):
+			return None
+		return self._banks[bank].get_pad(row,column)
+
+	def get_pads(self):
+		"""Used to get every pad of the sample set.
+		Takes no parameter.
+		Returns a list of (bank index, Pad object) tuples.
+		"""
+		return [(index, pad) for index, bank in enumerate(self._banks) for pad in bank.pads]
+
+	def get_sound_files(self):
+		"""Used to get the sound files of every pad.
+		Takes no parameter.
+		Returns a list of strings.
+		"""
+		return [filepath for bank in self._banks for pad in bank.pads for filepath in pad.get_sound_files()]
+
+	def serialize(self):
+		"""Used to serialize instance datas to JSON format
+		Takes no parameter
+		"""
+		return {"__class__":	"SampleSet",
+				"currentBank":	self.current_bank,
+				"ducking":		self.ducking,
+				"banks":		[bank.serialize() for bank in self.banks]}
@@ -0,0 +1,182 @@
+###############################################################################
+#Author: 		Chappuis Anthony
+#Filename: 		Scene.py
+#Application: 	DragonShout
+#Date:			October 2026
+#Description:	Contain the class for the scene snapshots
+#
+#				Class Scene:
+#					_name as string
+#						Attribut containing the name of the scene
+#					_theme as string
+#						Attribut containing the name of the category played
+#					_bank as int
+#						Attribut containing the index of the sampler bank shown
+#					_music_volume as int
+#						Attribut containing the volume of the music
+#					_sampler_volume as int
+#						Attribut containing the volume of the sound effects
+#					_loops as list
+#						Attribut containing the looping pads playing, each one
+#						as [bank, row, column]
+#					_effects as dictionnary
+#						Attribut containing the music effects switched on
+#
+#Modifications:
+###############################################################################
+
+class Scene:
+	"""Class Scene:
+			_name as string
+				Attribut containing the name of the scene
+			_theme as string
+				Attribut containing the name of the category played
+			_bank as int
+				Attribut containing the index of the sampler bank shown
+			_music_volume as int
+				Attribut containing the volume of the music
+			_sampler_volume as int
+				Attribut containing the volume of the sound effects
+			_loops as list
+				Attribut containing the looping pads playing, each one
+				as [bank, row, column]
+			_effects as dictionnary
+				Attribut containing the music effects switched on
+	"""
+
+	#class method
+	def unserialize(cls,data: dict):
+		"""Used to unserialize JSON data for Scene instances
+		Takes one parameter:
+		- data as dictionnary
+		"""
+		if "__class__" in data :
+			if data["__class__"] == "Scene":
+				#Creating Scene instance
+				scene_object = Scene(data["name"],data["theme"],data["bank"],data["musicVolume"],
+									data["samplerVolume"],data["loops"],data["effects"])
+				return scene_object
+			return data
+	unserialize = classmethod(unserialize)
+
+	#constructor
+	def __init__(self,name: str,theme: str='',bank: int=0,music_volume: int=50,sampler_volume: int=50,
+				loops: list=None,effects: dict=None):
+		self._name = name
+		self._theme = theme
+		self._bank = bank
+		self._music_volume = music_volume
+		self._sampler_volume = sampler_volume
+		self._loops = [list(loop) for loop in loops or []]
+		self._effects = dict(effects or {})
+
+	#accessors
+	def _get_name(self):
+		return self._name
+
+	def _get_theme(self):
+		return self._theme
+
+	def _get_bank(self):
+		return self._bank
+
+	def _get_music_volume(self):
+		return self._music_volume
+
+	def _get_sampler_volume(self):
+		return self._sampler_volume
+
+	def _get_loops(self):
+		return self._loops
+
+	def _get_effects(self):
+		return self._effects
+
+	#mutators
+	def _set_name(self,new_name: str):
+		self._name = new_name
+
+	def _set_theme(self,new_theme: str):
+		self._theme = new_theme
+
+	def _set_bank(self,new_bank: int):
+		self._bank = new_bank
+
+	def _set_music_volume(self,new_music_volume: int):
+		self._music_volume = new_music_volume
+
+	def _set_sampler_volume(self,new_sampler_volume: int):
+		self._sampler_volume = new_sampler_volume
+
+	def _set_loops(self,new_loops: list):
+		self._loops = new_loops
+
+	def _set_effects(self,new_effects: dict):
+		self._effects = new_effects
+
+	#destructors
+	def _del_name(self):
+		del self._name
+
+	def _del_theme(self):
+		del self._theme
+
+	def _del_bank(self):
+		del self._bank
+
+	def _del_music_volume(self):
+		del self._music_volume
+
+	def _del_sampler_volume(self):
+		del self._sampler_volume
+
+	def _del_loops(self):
+		del self._loops
+
+	def _del_effects(self):
+		del self._effects
+
+	#help
+	def _help_name():
+		return "Contains the scene name"
+
+	def _help_theme():
+		return "Contains the name of the category played by the scene"
+
+	def _help_bank():
+		return "Contains the index of the sampler bank shown by the scene"
+
+	def _help_music_volume():
+		return "Contains the volume of the music"
+
+	def _help_sampler_volume():
+		return "Contains the volume of the sound effects"
+
+	def _help_loops():
+		return "Contains the looping pads playing as [bank, row, column] lists"
+
+	def _help_effects():
+		return "Contains the music effects switched on, by name"
+
+	#properties
+	name = property(_get_name,		_set_name,		_del_name,		_help_name)
+	theme = property(_get_theme,		_set_theme,		_del_theme,		_help_theme)
+	bank = property(_get_bank,		_set_bank,		_del_bank,		_help_bank)
+	music_volume = property(_get_music_volume,		_set_music_volume,		_del_music_volume,		_help_music_volume)
+	sampler_volume = property(_get_sampler_volume,		_set_sampler_volume,		_del_sampler_volume,		_help_sampler_volume)
+	loops = property(_get_loops,		_set_loops,		_del_loops,		_help_loops)
+	effects = property(_get_effects,		_set_effects,		_del_effects,		_help_effects)
+
+	#methods
+	def serialize(self):
+		"""Used to serialize instance datas to JSON format
+		Takes no parameter
+		"""
+		return {"__class__": 		"Scene",
+				"name":				self.name,
+				"theme":			self.theme,
+				"bank":				self.bank,
+				"musicVolume":		self.music_volume,
+				"samplerVolume":	self.sampler_volume,
+				"loops":			self.loops,
+				"effects":			self.effects}
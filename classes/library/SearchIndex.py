@@ -0,0 +1,341 @@
+###############################################################################
+#Author: 		Chappuis Anthony
+#Filename: 		SearchIndex.py
+#Application: 	DragonShout
+#Date:			October 2026
+#Description:	Contain the class for the search index of a library
+#
+#				Class SearchIndex:
+#					_entries as dictionnary
+#						Attribut containing the indexed items by key: kind,
+#						item, owner (the theme of a track, the bank index of
+#						a pad) and the words of the item joined by spaces, so
+#						that a word is looked for in all of them at once
+#					_postings as dictionnary
+#						Attribut containing for each word the keys of the
+#						items using it
+#					_words as list
+#						Attribut containing the words in alphabetical order,
+#						to find the words starting with a prefix by bisection
+#					_trigrams as dictionnary
+#						Attribut containing for each trigram the words
+#						containing it, to find words by any part of them and
+#						words close to a misspelled one
+#					_changes as list or None
+#						Attribut containing the items added and removed since
+#						record_changes(), to apply them to an index built
+#						meanwhile
+#
+#Modifications:
+###############################################################################
+
+import re
+from bisect import bisect_left, insort
+
+class SearchIndex:
+	"""Class SearchIndex:
+			_entries as dictionnary
+				Attribut containing the indexed items by key
+			_postings as dictionnary
+				Attribut containing for each word the keys of the items using it
+			_words as list
+				Attribut containing the words in alphabetical order
+			_trigrams as dictionnary
+				Attribut containing for each trigram the words containing it
+			_changes as list or None
+				Attribut containing the items added and removed since record_changes()
+	"""
+
+	#class attribut
+	THEME = 'theme'
+	TRACK = 'track'
+	PAD = 'pad'
+
+	MAX_RESULTS = 50
+	#Part of trigrams a misspelled word must share with an indexed word
+	MIN_SIMILARITY = 0.5
+	#Words sampled to estimate how many items start with a term
+	ESTIMATE_SAMPLE = 32
+
+	_word_pattern = re.compile(r'[^\W_]+')
+
+	#class method
+	def tokenize(cls,text: str):
+		"""Used to split a text in lower case words, file paths included.
+		Takes one parameter:
+		- text as string
+		Returns a list of strings.
+		"""
+		return cls._word_pattern.findall(text.casefold())
+	tokenize = classmethod(tokenize)
+
+	def trigrams(cls,word: str):
+		"""Used to get the trigrams of a word.
+		Takes one parameter:
+		- word as string
+		Returns a set of strings.
+		"""
+		return set(word[index:index+3] for index in range(len(word)-2))
+	trigrams = classmethod(trigrams)
+
+	#constructor
+	def __init__(self):
+		self._entries = {}
+		self._postings = {}
+		self._words = []
+		self._trigrams = {}
+		self._bulk = False
+		self._changes = None
+
+	def __len__(self):
+		return len(self._entries)
+
+	#methods
+	def index_library(self,library):
+		"""Used to index every theme, track and pad of a library, forgetting the
+		items indexed before.
+		Takes one parameter:
+		- library as Library object
+		Returns nothing.
+		"""
+		self.__init__()
+
+		#The words are sorted once at the end rather than inserted one by one
+		self._bulk = True
+		for category in library.categories:
+			self.add_category(category)
+
+		if library.sample_set is not None:
+			for bank, pad in library.sample_set.get_pads():
+				self.add_pad(bank,pad)
+
+		self._bulk = False
+		self._words.sort()
+
+	def record_changes(self):
+		"""Used to keep the items added and removed from now on, while another index
+		of the library is built.
+		Takes no parameter.
+		Returns nothing.
+		"""
+		self._changes = []
+
+	def replay_changes(self,index):
+		"""Used to apply the changes recorded by this index to another one, built
+		while they were made.
+		Takes one parameter:
+		- index as SearchIndex object
+		Returns nothing.
+		"""
+		for change in self._changes or []:
+			if len(change) == 1:
+				index.remove(*change)
+			else:
+				index.add(*change)
+		self._changes = None
+
+	def add(self,item,kind: str,text: str,owner=None):
+		"""Used to index an item, replacing its previous entry.
+		Takes four parameters:
+		- item as any object, indexed by identity
+		- kind as string, one of the SearchIndex kinds
+		- text as string, the words to find the item by
+		- owner as any object, given back with the item in the results
+		Returns nothing.
+		"""
+		self.remove(item)
+		if self._changes is not None:
+			self._changes.append((item, kind, text, owner))
+
+		words = tuple(dict.fromkeys(SearchIndex.tokenize(text)))
+		key = id(item)
+		self._entries[key] = (kind, item, owner, ' '.join(words))
+
+		for word in words:
+			postings = self._postings.get(word)
+			if postings is None:
+				postings = self._postings[word] = {}
+				if self._bulk:
+					self._words.append(word)
+				else:
+					insort(self._words, word)
+				for trigram in SearchIndex.trigrams(word):
+					self._trigrams.setdefault(trigram, set()).add(word)
+			postings[key] = None
+
+	def remove(self,item):
+		"""Used to remove an item from the index.
+		Takes one parameter:
+		- item as any object
+		Returns nothing.
+		"""
+		if self._changes is not None:
+			self._changes.append((item,))
+
+		entry = self._entries.pop(id(item), None)
+		if entry is None:
+			return
+
+		for word in entry[3].split(' '):
+			postings = self._postings[word]
+			del postings[id(item)]
+			if not postings:
+				del self._postings[word]
+				del self._words[bisect_left(self._words, word)]
+				for trigram in SearchIndex.trigrams(word):
+					words = self._trigrams[trigram]
+					words.discard(word)
+					if not words:
+						del self._trigrams[trigram]
+
+	def add_category(self,category):
+		"""Used to index a theme and its tracks. The tracks of a smart theme are
+		indexed with the themes listing them.
+		Takes one parameter:
+		- category as Category object
+		Returns nothing.
+		"""
+		self.add(category,SearchIndex.THEME,category.name)
+		if not category.query:
+			for track in category.tracks:
+				self.add_track(category,track)
+
+	def update_category(self,category):
+		"""Used to index again a theme renamed, its tracks being unchanged.
+		Takes one parameter:
+		- category as Category object
+		Returns nothing.
+		"""
+		self.add(category,SearchIndex.THEME,category.name)
+
+	def remove_category(self,category):
+		"""Used to remove a theme and its tracks from the index.
+		Takes one parameter:
+		- category as Category object
+		Returns nothing.
+		"""
+		self.remove(category)
+		if not category.query:
+			for track in category.tracks:
+				self.remove(track)
+
+	def add_track(self,category,track):
+		"""Used to index a track by its name, the paths of its files and its tags.
+		Takes two parameters:
+		- category as Category object, the theme of the track
+		- track as Track object
+		Returns nothing.
+		"""
+		self.add(track,SearchIndex.TRACK,' '.join([track.name]+track.get_locations()+track.tags),category)
+
+	def add_pad(self,bank: int,pad):
+		"""Used to index a pad by the names and paths of its sound files.
+		Takes two parameters:
+		- bank as integer, index of the bank of the pad
+		- pad as Pad object
+		Returns nothing.
+		"""
+		self.add(pad,SearchIndex.PAD,' '.join(pad.get_sound_files()),bank)
+
+	def _prefix_range(self,term: str):
+		"""Used to get the positions of the words starting with a term.
+		Takes one parameter:
+		- term as string
+		Returns a (first, last + 1) tuple of integers.
+		"""
+		start = bisect_left(self._words, term)
+		end = bisect_left(self._words, term[:-1]+chr(ord(term[-1])+1), start)
+		return start, end
+
+	def _matching_words(self,term: str):
+		"""Used to get the words matching a term, the best matches first: the word
+		itself, the words starting with it, the words containing it and, if none
+		does, the words sharing most of its trigrams.
+		Takes one parameter:
+		- term as string
+		Yields strings.
+		"""
+		if term in self._postings:
+			yield term
+
+		start, end = self._prefix_range(term)
+		found = start < end
+		for index in range(start, end):
+			word = self._words[index]
+			if word != term:
+				yield word
+
+		if len(term) < 3:
+			return
+
+		trigrams = sorted(SearchIndex.trigrams(term), key=lambda trigram: len(self._trigrams.get(trigram, ())))
+		if all(trigram in self._trigrams for trigram in trigrams):
+			words = set(self._trigrams[trigrams[0]])
+			for trigram in trigrams[1:]:
+				words &= self._trigrams[trigram]
+			for word in sorted(words):
+				if term in word and not word.startswith(term):
+					found = True
+					yield word
+
+		if found:
+			return
+
+		#Misspelled term: words sharing enough trigrams, the closest first
+		shared = {}
+		for trigram in trigrams:
+			for word in self._trigrams.get(trigram, ()):
+				shared[word] = shared.get(word, 0) + 1
+
+		similarities = []
+		for word, count in shared.items():
+			similarity = 2*count/(len(trigrams)+max(len(word)-2, 0))
+			if similarity >= SearchIndex.MIN_SIMILARITY:
+				similarities.append((-similarity, word))
+
+		for similarity, word in sorted(similarities):
+			yield word
+
+	def search(self,query: str,limit: int=MAX_RESULTS):
+		"""Used to find the items matching every word of a query, by the start or
+		any part of their words. Results are found from the word of the query
+		starting the fewest indexed words, and the search stops as soon as enough
+		items are found.
+		Takes two parameters:
+		- query as string
+		- limit as integer, maximum number of results
+		Returns a list of (kind, item, owner) tuples, the best matches first.
+		"""
+		terms = set(SearchIndex.tokenize(query))
+		if not terms:
+			return []
+
+		#Words only found by a part of them or misspelled are looked for last
+		def selectivity(term):
+			start, end = self._prefix_range(term)
+			if start == end:
+				return len(self._entries)
+			sample = min(end-start, SearchIndex.ESTIMATE_SAMPLE)
+			return sum(len(self._postings[self._words[index]]) for index in range(start, start+sample))*(end-start)/sample
+		terms = sorted(terms, key=lambda term: (selectivity(term), -len(term)))
+
+		results = []
+		seen = set()
+		others = terms[1:]
+		for word in self._matching_words(terms[0]):
+			for key in self._postings[word]:
+				if key in seen:
+					continue
+				seen.add(key)
+
+				#Words hold no space: a term found in the joined words is part of one of them
+				kind, item, owner, words = self._entries[key]
+				for term in others:
+					if term not in words:
+						break
+				else:
+					results.append((kind, item, owner))
+					if len(results) >= limit:
+						return results
+
+		return results
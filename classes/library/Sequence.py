@@ -0,0 +1,117 @@
+###############################################################################
+#Author: 		Chappuis Anthony
+#Filename: 		Sequence.py
+#Application: 	DragonShout
+#Date:			October 2026
+#Description:	Contain the class for the scripted sequences of effects
+#
+#				Class Sequence:
+#					_name as string
+#						Attribut containing the name of the sequence
+#					_steps as list
+#						Attribut containing the steps of the sequence, each one
+#						as a dictionnary with its offset in seconds from the
+#						start and its type:
+#						- "pad": trigger of the pad at "bank", "row", "column"
+#						- "fade": "bus" reaching "volume" over "duration" seconds
+#						- "theme": change of the music to the "theme" category
+#
+#Modifications:
+###############################################################################
+
+class Sequence:
+	"""Class Sequence:
+			_name as string
+				Attribut containing the name of the sequence
+			_steps as list
+				Attribut containing the steps of the sequence sorted by
+				offset, each one as a dictionnary
+	"""
+
+	#class attribut
+	#Step types
+	PAD_STEP = "pad"
+	FADE_STEP = "fade"
+	THEME_STEP = "theme"
+
+	#class method
+	def unserialize(cls,data: dict):
+		"""Used to unserialize JSON data for Sequence instances
+		Takes one parameter:
+		- data as dictionnary
+		"""
+		if "__class__" in data :
+			if data["__class__"] == "Sequence":
+				#Creating Sequence instance
+				sequence_object = Sequence(data["name"],data["steps"])
+				return sequence_object
+			return data
+	unserialize = classmethod(unserialize)
+
+	#constructor
+	def __init__(self,name: str,steps: list=None):
+		self._name = name
+		self._steps = sorted((dict(step) for step in steps or []), key=lambda step: step["offset"])
+
+	#accessors
+	def _get_name(self):
+		return self._name
+
+	def _get_steps(self):
+		return self._steps
+
+	#mutators
+	def _set_name(self,new_name: str):
+		self._name = new_name
+
+	def _set_steps(self,new_steps: list):
+		self._steps = sorted(new_steps, key=lambda step: step["offset"])
+
+	#destructors
+	def _del_name(self):
+		del self._name
+
+	def _del_steps(self):
+		del self._steps
+
+	#help
+	def _help_name():
+		return "Contains the sequence name"
+
+	def _help_steps():
+		return "Contains the steps of the sequence sorted by offset"
+
+	#properties
+	name = property(_get_name,		_set_name,		_del_name,		_help_name)
+	steps = property(_get_steps,		_set_steps,		_del_steps,		_help_steps)
+
+	#methods
+	def add_step(self,offset: float,step_type: str,**settings):
+		"""Used to add a step to the sequence, keeping the steps sorted.
+		Takes at least two parameters:
+		- offset as float, in seconds from the start of the sequence
+		- step_type as one of the Sequence step constants
+		- the settings of the step as keyword arguments
+		Returns the step as dictionnary.
+		"""
+		step = dict(settings, offset=offset, type=step_type)
+		index = len(self._steps)
+		while index > 0 and self._steps[index-1]["offset"] > offset:
+			index -= 1
+		self._steps.insert(index,step)
+		return step
+
+	def get_duration(self):
+		"""Used to get the offset of the last step of the sequence, fades included.
+		Takes no parameter.
+		Returns a float in seconds.
+		"""
+		return max([step["offset"] + step.get("duration",0.0) for step in self._steps] or [0.0])
+
+	def serialize(self):
+		"""Used to serialize instance datas to JSON format
+		Takes no parameter
+		"""
+		return {"__class__": 	"Sequence",
+				"name":			self.name,
+				"steps":		self.steps}
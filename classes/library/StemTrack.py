@@ -0,0 +1,110 @@
+###############################################################################
+#Author: 		Chappuis Anthony
+#Filename: 		StemTrack.py
+#Application: 	DragonShout
+#Date:			October 2026
+#Description:	Contain the class for the tracks made of synchronized stems
+#
+#				Class StemTrack(Track):
+#					_stems as list
+#						Attribut containing the stems of the track, each one
+#						as a dictionnary with its location and the intensity
+#						threshold from which it is heard
+#
+#Modifications:
+###############################################################################
+
+from classes.library.Track import Track
+
+class StemTrack(Track):
+	"""Class StemTrack(Track):
+			_stems as list
+				Attribut containing the stems of the track, each one
+				as a dictionnary with its location and the intensity
+				threshold from which it is heard
+	"""
+
+	#class attribut
+	#Intensity range over which a stem fades in above its threshold
+	STEM_FADE_RANGE = 0.15
+
+	#class method
+	def unserialize(cls,data: dict):
+		"""Used to unserialize JSON data for StemTrack instances
+		Takes one parameter:
+		- data as dictionnary
+		"""
+		if "__class__" in data :
+			if data["__class__"] == "StemTrack":
+				#Creating track instance
+				track_object = StemTrack(data["name"],data["stems"])
+				track_object.duration = data.get("duration", 0)
+				track_object.playCount = data.get("playCount", 0)
+				track_object.tags = data.get("tags", [])
+				return track_object
+		return data
+	unserialize = classmethod(unserialize)
+
+	def from_locations(cls,name: str,locations: list):
+		"""Used to create a stem track with thresholds evenly spread from 0,
+		the first stem being always heard.
+		Takes two parameters:
+		- name as string
+		- locations as list of string
+		"""
+		count = len(locations)
+		stems = [{"location": location, "threshold": index/count} for index, location in enumerate(locations)]
+		return StemTrack(name,stems)
+	from_locations = classmethod(from_locations)
+
+	#constructor
+	def __init__(self,name: str,stems: list):
+		location = stems[0]["location"] if stems else ''
+		super().__init__(name,location)
+		self._stems 	= stems
+
+	#accessors
+	def _get_stems(self):
+		return self._stems
+
+	#mutators
+	def _set_stems(self,new_stems: list):
+		self._stems 	= new_stems
+
+	#destructors
+	def _del_stems(self):
+		del self._stems
+
+	#help
+	def _help_stems():
+		return "Contains the stems of the track as dictionnaries with their location and intensity threshold"
+
+	#properties
+	stems 		= property(_get_stems,		_set_stems,		_del_stems,		_help_stems)
+
+	#method
+	def get_locations(self):
+		"""Used to get the files played by the track
+		Takes no parameter
+		"""
+		return [stem["location"] for stem in self.stems]
+
+	def get_stem_gains(self,intensity: float):
+		"""Used to get the gain of each stem for an intensity
+		Takes one parameter:
+		- intensity as float between 0 and 1
+		"""
+		gains = []
+		for stem in self.stems:
+			gain = (intensity - stem["threshold"]) / StemTrack.STEM_FADE_RANGE + 1
+			gains.append(min(max(gain, 0.0), 1.0))
+		return gains
+
+	def serialize(self):
+		"""Used to serialize instance datas to JSON format
+		Takes no parameter
+		"""
+		data = super().serialize()
+		data["__class__"] = "StemTrack"
+		data["stems"] = self.stems
+		return data
@@ -0,0 +1,380 @@
+###############################################################################
+#Author: 		Chappuis Anthony
+#Filename: 		TagIndex.py
+#Application: 	DragonShout
+#Date:			October 2026
+#Description:	Contain the class keeping the tracks of the smart themes up to
+#				date. A smart theme plays the tracks of the library whose tags
+#				match a query such as "forest and (night or not combat)". The
+#				tracks of a query are found once from the tracks of each tag,
+#				then only the tracks whose tags change are checked again.
+#
+#				Class TagIndex:
+#					_tracks as dictionnary
+#						Attribut containing the tracks of the library by
+#						identity, with the themes listing them and their key
+#					_alike as dictionnary
+#						Attribut containing the tracks by key, to share the
+#						tracks added alike to several themes
+#					_tags as dictionnary
+#						Attribut containing for each tag the tracks using it
+#					_smart_themes as dictionnary
+#						Attribut containing the smart themes by identity, with
+#						their parsed query and the tracks they play
+#					_watchers as dictionnary
+#						Attribut containing for each tag the smart themes
+#						whose query uses it
+#
+#Modifications:
+###############################################################################
+
+import re
+import json
+
+class TagIndex:
+	"""Class TagIndex:
+			_tracks as dictionnary
+				Attribut containing the tracks of the library with the themes listing them
+			_alike as dictionnary
+				Attribut containing the tracks by key, from alike_key
+			_tags as dictionnary
+				Attribut containing for each tag the tracks using it
+			_smart_themes as dictionnary
+				Attribut containing the smart themes with their query and tracks
+			_watchers as dictionnary
+				Attribut containing for each tag the smart themes using it
+	"""
+
+	#class attribut
+	AND = 'and'
+	OR = 'or'
+	NOT = 'not'
+
+	_token_pattern = re.compile(r'\(|\)|[^\s()]+')
+
+	#class method
+	def parse_query(cls,query: str):
+		"""Used to parse a tag query: tags joined by "and", "or", "not" and parentheses,
+		"and" being implied between two tags.
+		Takes one parameter:
+		- query as string
+		Returns the query as nested tuples: ('tag', name), ('not', node), ('and', node, node)
+		or ('or', node, node).
+		Raises ValueError if the query is empty or malformed.
+		"""
+		tokens = cls._token_pattern.findall(query.casefold())
+		position = 0
+
+		def peek():
+			return tokens[position] if position < len(tokens) else None
+
+		def parse_or():
+			nonlocal position
+			node = parse_and()
+			while peek() == TagIndex.OR:
+				position += 1
+				node = (TagIndex.OR, node, parse_and())
+			return node
+
+		def parse_and():
+			nonlocal position
+			node = parse_not()
+			while peek() not in (None, TagIndex.OR, ')'):
+				if peek() == TagIndex.AND:
+					position += 1
+				node = (TagIndex.AND, node, parse_not())
+			return node
+
+		def parse_not():
+			nonlocal position
+			token = peek()
+			if token == TagIndex.NOT:
+				position += 1
+				return (TagIndex.NOT, parse_not())
+			if token == '(':
+				position += 1
+				node = parse_or()
+				if peek() != ')':
+					raise ValueError('missing ")" in the query "{}"'.format(query))
+				position += 1
+				return node
+			if token in (None, ')', TagIndex.AND, TagIndex.OR):
+				raise ValueError('a tag is expected at "{}" in the query "{}"'.format(token or '', query))
+			position += 1
+			return ('tag', token)
+
+		node = parse_or()
+		if position < len(tokens):
+			raise ValueError('unexpected "{}" in the query "{}"'.format(tokens[position], query))
+		return node
+	parse_query = classmethod(parse_query)
+
+	def query_tags(cls,node: tuple):
+		"""Used to get the tags used by a parsed query.
+		Takes one parameter:
+		- node as tuple, from parse_query
+		Returns a set of string.
+		"""
+		if node[0] == 'tag':
+			return {node[1]}
+		return set().union(*(cls.query_tags(child) for child in node[1:]))
+	query_tags = classmethod(query_tags)
+
+	def alike_key(cls,track):
+		"""Used to get the key of a track alike in everything but its play count, tags
+		and duration, measured once played: two tracks of a library are shared only
+		if their keys are equal.
+		Takes one parameter:
+		- track as Track object
+		Returns a string.
+		"""
+		data = track.serialize()
+		del data["playCount"], data["tags"], data["duration"]
+		return json.dumps(data, sort_keys=True)
+	alike_key = classmethod(alike_key)
+
+	def matches(cls,node: tuple,tags: set):
+		"""Used to check if the tags of a track match a parsed query.
+		Takes two parameters:
+		- node as tuple, from parse_query
+		- tags as set of string
+		Returns a boolean.
+		"""
+		if node[0] == 'tag':
+			return node[1] in tags
+		if node[0] == TagIndex.NOT:
+			return not cls.matches(node[1],tags)
+		if node[0] == TagIndex.AND:
+			return cls.matches(node[1],tags) and cls.matches(node[2],tags)
+		return cls.matches(node[1],tags) or cls.matches(node[2],tags)
+	matches = classmethod(matches)
+
+	#constructor
+	def __init__(self):
+		self._tracks = {}
+		self._alike = {}
+		self._tags = {}
+		self._smart_themes = {}
+		self._watchers = {}
+
+	#methods
+	def index_library(self,library):
+		"""Used to index the tracks of the themes of a library and fill its smart
+		themes, forgetting what was indexed before. A smart theme with a malformed
+		query stays empty.
+		Takes one parameter:
+		- library as Library object
+		Returns nothing.
+		"""
+		self.__init__()
+		for category in library.categories:
+			if not category.query:
+				for track in category.tracks:
+					self.add_track(category,track)
+
+		for category in library.categories:
+			if category.query:
+				try:
+					self.add_smart_theme(category)
+				except ValueError:
+					category.tracks[:] = []
+
+	def get_tags(self):
+		"""Used to get the tags used by the tracks of the library.
+		Takes no parameter.
+		Returns a sorted list of string.
+		"""
+		return sorted(self._tags)
+
+	def get_themes(self,track):
+		"""Used to get the themes, smart themes excepted, listing a track.
+		Takes one parameter:
+		- track as Track object
+		Returns a list of Category objects, empty if the track isn't in the library.
+		"""
+		entry = self._tracks.get(id(track))
+		return list(entry[1]) if entry else []
+
+	def shared_track(self,track):
+		"""Used to get the track of the library alike a track, so that a file added
+		to several themes is stored once.
+		Takes one parameter:
+		- track as Track object
+		Returns a Track object, the given one if the library has no such track.
+		"""
+		existing = self._alike.get(TagIndex.alike_key(track))
+		return existing if existing is not None else track
+
+	def add_track(self,category,track):
+		"""Used to index a track added to a theme, adding it to the smart themes it
+		matches if it is new in the library.
+		Takes two parameters:
+		- category as Category object
+		- track as Track object
+		Returns nothing.
+		"""
+		entry = self._tracks.get(id(track))
+		if entry is not None:
+			entry[1].append(category)
+			return
+
+		key = TagIndex.alike_key(track)
+		self._tracks[id(track)] = (track, [category], key)
+		self._alike.setdefault(key, track)
+		for tag in track.tags:
+			self._tags.setdefault(tag, {})[id(track)] = track
+
+		self._update_smart_themes(track, set(track.tags))
+
+	def remove_track(self,category,track):
+		"""Used to forget a track removed from a theme, removing it from the smart
+		themes if no other theme lists it.
+		Takes two parameters:
+		- category as Category object
+		- track as Track object
+		Returns nothing.
+		"""
+		entry = self._tracks.get(id(track))
+		if entry is None or category not in entry[1]:
+			return
+
+		entry[1].remove(category)
+		if entry[1]:
+			return
+
+		del self._tracks[id(track)]
+		if self._alike.get(entry[2]) is track:
+			del self._alike[entry[2]]
+		for tag in track.tags:
+			self._remove_posting(tag, track)
+
+		self._update_smart_themes(track, set(track.tags))
+
+	def update_track(self,track):
+		"""Used to index again a track renamed or cut in other segments, so that only
+		the tracks alike its new state share it.
+		Takes one parameter:
+		- track as Track object
+		Returns nothing.
+		"""
+		entry = self._tracks.get(id(track))
+		if entry is None:
+			return
+
+		if self._alike.get(entry[2]) is track:
+			del self._alike[entry[2]]
+		key = TagIndex.alike_key(track)
+		self._tracks[id(track)] = (track, entry[1], key)
+		self._alike.setdefault(key, track)
+
+	def set_tags(self,track,tags: list):
+		"""Used to change the tags of a track, updating only the smart themes whose
+		query uses a tag added or removed.
+		Takes two parameters:
+		- track as Track object
+		- tags as list of string
+		Returns nothing.
+		"""
+		old_tags = set(track.tags)
+		track.tags = tags
+		new_tags = set(track.tags)
+
+		if id(track) not in self._tracks:
+			return
+
+		for tag in old_tags - new_tags:
+			self._remove_posting(tag, track)
+		for tag in new_tags - old_tags:
+			self._tags.setdefault(tag, {})[id(track)] = track
+
+		self._update_smart_themes(track, old_tags ^ new_tags, False)
+
+	def add_smart_theme(self,category):
+		"""Used to fill a smart theme with the tracks matching its query.
+		Takes one parameter:
+		- category as Category object, with a query
+		Returns nothing.
+		Raises ValueError if the query is malformed, the theme being left unchanged.
+		"""
+		node = TagIndex.parse_query(category.query)
+		members = self._evaluate(node)
+
+		category.tracks[:] = [track for key, (track, themes, alike) in self._tracks.items() if key in members]
+		self._smart_themes[id(category)] = (category, node, members, TagIndex.matches(node, set()))
+		for tag in TagIndex.query_tags(node):
+			self._watchers.setdefault(tag, {})[id(category)] = category
+
+	def remove_smart_theme(self,category):
+		"""Used to stop updating a smart theme.
+		Takes one parameter:
+		- category as Category object
+		Returns nothing.
+		"""
+		entry = self._smart_themes.pop(id(category), None)
+		if entry is None:
+			return
+
+		for tag in TagIndex.query_tags(entry[1]):
+			watchers = self._watchers[tag]
+			del watchers[id(category)]
+			if not watchers:
+				del self._watchers[tag]
+
+	def set_query(self,category,query: str):
+		"""Used to change the query of a smart theme, or to turn a smart theme into an
+		empty theme with an empty query.
+		Takes two parameters:
+		- category as Category object
+		- query as string
+		Returns nothing.
+		Raises ValueError if the query is malformed, the theme being left unchanged.
+		"""
+		if query:
+			TagIndex.parse_query(query)
+
+		self.remove_smart_theme(category)
+		category.query = query
+		if query:
+			self.add_smart_theme(category)
+		else:
+			category.tracks[:] = []
+
+	def _remove_posting(self,tag: str,track):
+		postings = self._tags[tag]
+		del postings[id(track)]
+		if not postings:
+			del self._tags[tag]
+
+	def _evaluate(self,node: tuple):
+		"""Used to get the identities of the tracks matching a parsed query from the
+		tracks of each tag.
+		"""
+		if node[0] == 'tag':
+			return set(self._tags.get(node[1], ()))
+		if node[0] == TagIndex.NOT:
+			return set(self._tracks) - self._evaluate(node[1])
+		if node[0] == TagIndex.AND:
+			return self._evaluate(node[1]) & self._evaluate(node[2])
+		return self._evaluate(node[1]) | self._evaluate(node[2])
+
+	def _update_smart_themes(self,track,tags: set,presence_changed: bool=True):
+		"""Used to check a track again against the smart themes whose query uses one
+		of the given tags, and against the ones matching untagged tracks if the track
+		entered or left the library.
+		"""
+		themes = {}
+		for tag in tags:
+			themes.update(self._watchers.get(tag, {}))
+		if presence_changed:
+			themes.update((key, entry[0]) for key, entry in self._smart_themes.items() if entry[3])
+
+		in_library = id(track) in self._tracks
+		for key in themes:
+			category, node, members, matches_untagged = self._smart_themes[key]
+			matching = in_library and TagIndex.matches(node, set(track.tags))
+			if matching and id(track) not in members:
+				members.add(id(track))
+				category.tracks.append(track)
+			elif not matching and id(track) in members:
+				members.discard(id(track))
+				category.tracks.remove(track)
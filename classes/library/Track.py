@@ -14,6 +14,18 @@
 #					_location as string
 #						Attribut containing the physical location of the track
 #						on the drive
+#					_duration as int
+#						Attribut containing the duration of the track in msec
+#						(0 while unknown)
+#					_playCount as int
+#						Attribut containing the number of times the track was
+#						played
+#					_segments as dict
+#						Attribut containing the segment markers of the track
+#						(loopStart, loopEnd and barLength in seconds) or None
+#					_tags as list
+#						Attribut containing the tags of the track, in lower
+#						case, used by the smart themes
 #
 #Modifications:
 ###############################################################################
@@ -28,6 +40,17 @@ class Track:
 			_location as string
 				Attribut containing the physical location of the track
 				on the drive
+			_duration as int
+				Attribut containing the duration of the track in msec
+				(0 while unknown)
+			_playCount as int
+				Attribut containing the number of times the track was
+				played
+			_segments as dict
+				Attribut containing the segment markers of the track
+				(loopStart, loopEnd and barLength in seconds) or None
+			_tags as list
+				Attribut containing the tags of the track
 	"""
 
 	#class attribut
@@ -39,6 +62,17 @@ class Track:
 		return cls._track_number
 	get_track_number = classmethod(get_track_number)
 
+	def normalize_tags(cls,tags: list):
+		"""Used to clean a list of tags: lower case, inner spaces replaced by dashes,
+		no empty nor repeated tag.
+		Takes one parameter:
+		- tags as list of string
+		Returns a list of string.
+		"""
+		tags = ['-'.join(tag.casefold().split()) for tag in tags]
+		return list(dict.fromkeys(tag for tag in tags if tag))
+	normalize_tags = classmethod(normalize_tags)
+
 	def unserialize(cls,data: dict):
 		"""Used to unserialize JSON data for Track instances
 		Takes one parameter:
@@ -48,6 +82,10 @@ class Track:
 			if data["__class__"] == "Track":
 				#Creating track instance
 				track_object = Track(data["name"],data["location"])
+				track_object.duration = data.get("duration", 0)
+				track_object.playCount = data.get("playCount", 0)
+				track_object.segments = data.get("segments")
+				track_object.tags = data.get("tags", [])
 				return track_object
 		return data
 	unserialize = classmethod(unserialize)
@@ -56,6 +94,10 @@ class Track:
 	def __init__(self,name: str,location: str):
 		self._name 		= name
 		self._location 	= location
+		self._duration 	= 0
+		self._playCount = 0
+		self._segments 	= None
+		self._tags 		= []
 		#Bumping track number
 		Track._track_number += 1
 
@@ -66,6 +108,18 @@ class Track:
 	def _get_location(self):
 		return self._location
 
+	def _get_duration(self):
+		return self._duration
+
+	def _get_playCount(self):
+		return self._playCount
+
+	def _get_segments(self):
+		return self._segments
+
+	def _get_tags(self):
+		return self._tags
+
 	#mutators
 	def _set_name(self,new_name: str):
 		self._name 		= new_name
@@ -73,6 +127,18 @@ class Track:
 	def _set_location(self,new_location: str):
 		self._location 	= new_location
 
+	def _set_duration(self,new_duration: int):
+		self._duration 	= new_duration
+
+	def _set_playCount(self,new_playCount: int):
+		self._playCount = new_playCount
+
+	def _set_segments(self,new_segments: dict):
+		self._segments 	= new_segments
+
+	def _set_tags(self,new_tags: list):
+		self._tags 		= Track.normalize_tags(new_tags)
+
 	#destructors
 	def _del_name(self):
 		del self._name
@@ -80,6 +146,18 @@ class Track:
 	def _del_location(self):
 		del self._location
 
+	def _del_duration(self):
+		del self._duration
+
+	def _del_playCount(self):
+		del self._playCount
+
+	def _del_segments(self):
+		del self._segments
+
+	def _del_tags(self):
+		del self._tags
+
 	#help
 	def _help_name():
 		return "Contains the track name for this program. Real filename from the operating system may be different"
@@ -87,15 +165,41 @@ class Track:
 	def _help_location():
 		return "Contains the physical location of the track on the filesystem"
 
+	def _help_duration():
+		return "Contains the duration of the track in msec, 0 while unknown"
+
+	def _help_playCount():
+		return "Contains the number of times the track was played"
+
+	def _help_segments():
+		return "Contains the intro end (loopStart), outro start (loopEnd) and bar length of the track in seconds, None if the track is played whole"
+
+	def _help_tags():
+		return "Contains the tags of the track in lower case, used by the smart themes"
+
 	#properties
 	name 		= property(_get_name,		_set_name,		_del_name,		_help_name)
 	location 	= property(_get_location,	_set_location,	_del_location,	_help_location)
+	duration 	= property(_get_duration,	_set_duration,	_del_duration,	_help_duration)
+	playCount 	= property(_get_playCount,	_set_playCount,	_del_playCount,	_help_playCount)
+	segments 	= property(_get_segments,	_set_segments,	_del_segments,	_help_segments)
+	tags 		= property(_get_tags,		_set_tags,		_del_tags,		_help_tags)
 
 	#method
+	def get_locations(self):
+		"""Used to get the files played by the track
+		Takes no parameter
+		"""
+		return [self.location]
+
 	def serialize(self):
 		"""Used to serialize instance datas to JSON format
 		Takes no parameter
 		"""
 		return {"__class__": 	"Track",
 				"name":			self.name,
-				"location":		self.location}
+				"location":		self.location,
+				"duration":		self.duration,
+				"playCount":	self.playCount,
+				"segments":		self.segments,
+				"tags":			self.tags}
@@ -0,0 +1,198 @@
+#---------------------------------
+#Author: Chappuis Anthony
+#
+#Play the blocks rendered by the Mixer on the sound card. The audio output
+#pulls the blocks from its own thread so that the GUI never delays them.
+#
+#Application: DragonShout music sampler
+#Last Edited: October 19th 2026
+#---------------------------------
+
+from classes.multimedia.Mixer import Mixer
+from classes.multimedia.Voice import Voice
+
+from PyQt5.QtCore import Qt, QObject, QIODevice, QThread, pyqtSignal
+from PyQt5.QtMultimedia import QAudioFormat, QAudioDeviceInfo, QAudioOutput
+
+class MixerDevice(QIODevice):
+
+    def __init__(self, audioEngine:QObject, mixer:Mixer):
+        super().__init__()
+        self.audioEngine = audioEngine
+        self.mixer = mixer
+
+        #Bytes rendered but not read by the audio output yet (less than one block)
+        self.pending = b''
+
+        self.open(QIODevice.ReadOnly)
+
+    def readData(self, maxSize:int):
+        """Render as many blocks as needed by the audio output.
+            - Takes one parameter:
+                - maxSize as integer, number of bytes requested.
+            - Returns bytes.
+        """
+        data = bytearray(self.pending)
+        while len(data) < maxSize:
+            block = self.mixer.process()
+            data += (block*32767).astype('<i2').tobytes()
+
+        self.pending = bytes(data[maxSize:])
+
+        #Events first: a scheduled voice is announced before it can be reported ended
+        while self.mixer.dueEvents:
+            self.audioEngine.eventDue.emit(self.mixer.dueEvents.popleft())
+
+        while self.mixer.finishedVoices:
+            self.audioEngine.voiceFinished.emit(self.mixer.finishedVoices.popleft())
+
+        return bytes(data[:maxSize])
+
+    def writeData(self, data:bytes):
+        return -1
+
+    def isSequential(self):
+        return True
+
+    def bytesAvailable(self):
+        return self.mixer.blockSize*Mixer.CHANNELS*2 + super().bytesAvailable()
+
+class AudioWorker(QObject):
+
+    #Number of blocks buffered by the audio output
+    BUFFEREDBLOCKS = 4
+
+    def __init__(self, audioEngine:QObject, audioFormat:QAudioFormat):
+        super().__init__()
+        self.audioEngine = audioEngine
+        self.audioFormat = audioFormat
+        self.output = None
+        self.device = None
+
+    def start(self):
+        """Create the audio output in the audio thread and start pulling blocks.
+            - Takes no parameter.
+            - Returns nothing.
+        """
+        mixer = self.audioEngine.mixer
+        self.device = MixerDevice(self.audioEngine, mixer)
+
+        self.output = QAudioOutput(self.audioFormat)
+        self.output.setBufferSize(mixer.blockSize*Mixer.CHANNELS*2*AudioWorker.BUFFEREDBLOCKS)
+        self.output.start(self.device)
+
+    def stop(self):
+        """Stop the audio output.
+            - Takes no parameter.
+            - Returns nothing.
+        """
+        if self.output :
+            self.output.stop()
+        if self.device :
+            self.device.close()
+
+class AudioEngine(QObject):
+
+    #Emitted with the id of a voice when it ended
+    voiceFinished = pyqtSignal(int)
+
+    #Emitted with the events passed to Mixer.notify() once their clock is reached
+    eventDue = pyqtSignal(object)
+
+    #Used to stop the audio output from its thread
+    stopRequested = pyqtSignal()
+
+    def __init__(self, blockSize:int=Mixer.BLOCKSIZE):
+        super().__init__()
+
+        audioFormat = QAudioFormat()
+        audioFormat.setCodec('audio/pcm')
+        audioFormat.setSampleRate(Mixer.SAMPLERATE)
+        audioFormat.setChannelCount(Mixer.CHANNELS)
+        audioFormat.setSampleSize(16)
+        audioFormat.setSampleType(QAudioFormat.SignedInt)
+        audioFormat.setByteOrder(QAudioFormat.LittleEndian)
+
+        #Some sound cards only run at 44.1kHz
+        deviceInfo = QAudioDeviceInfo.defaultOutputDevice()
+        if not deviceInfo.isNull() and not deviceInfo.isFormatSupported(audioFormat):
+            audioFormat.setSampleRate(deviceInfo.nearestFormat(audioFormat).sampleRate())
+
+        self.mixer = Mixer(audioFormat.sampleRate(), blockSize)
+
+        self.thread = QThread()
+        self.thread.setObjectName('AudioEngine')
+        self.worker = AudioWorker(self, audioFormat)
+        self.worker.moveToThread(self.thread)
+
+        self.thread.started.connect(self.worker.start)
+        self.stopRequested.connect(self.worker.stop, Qt.BlockingQueuedConnection)
+        self.thread.start(QThread.TimeCriticalPriority)
+
+    def play(self, voice:Voice):
+        """Start a voice.
+            - Takes one parameter:
+                - voice as Voice object.
+            - Returns the voice id as integer.
+        """
+        return self.mixer.play(voice)
+
+    def stop(self, voiceId:int, fade:float=0.0):
+        """Fade out and end a voice.
+            - Takes two parameters:
+                - voiceId as integer.
+                - fade as float, in seconds.
+            - Returns nothing.
+        """
+        self.mixer.stop(voiceId, fade)
+
+    def setVoiceGain(self, voiceId:int, gain:float, fade:float=0.0):
+        """Change the gain of a playing voice.
+            - Takes three parameters:
+                - voiceId as integer.
+                - gain as float.
+                - fade as float, in seconds.
+            - Returns nothing.
+        """
+        self.mixer.setVoiceGain(voiceId, gain, fade)
+
+    def setVoicePanning(self, voiceId:int, pan:float=0.0, location:tuple=None):
+        """Move a playing voice in the stereo field.
+            - Takes three parameters:
+                - voiceId as integer.
+                - pan as float, from -1 (left) to 1 (right).
+                - location as (x, y) tuple in meters or None.
+            - Returns nothing.
+        """
+        self.mixer.setVoicePanning(voiceId, pan, location)
+
+    def setBusGain(self, bus:str, gain:float, fade:float=0.0):
+        """Change the gain of a bus.
+            - Takes three parameters:
+                - bus as string, one of the Mixer bus constants.
+                - gain as float.
+                - fade as float, in seconds.
+            - Returns nothing.
+        """
+        self.mixer.setBusGain(bus, gain, fade)
+
+    def setDucking(self, enabled:bool, threshold:float, depth:float, attack:float, release:float):
+        """Change how the sound effects lower the music.
+            - Takes five parameters:
+                - enabled as boolean.
+                - threshold as float, in dBFS.
+                - depth as float, in decibels.
+                - attack as float, in seconds.
+                - release as float, in seconds.
+            - Returns nothing.
+        """
+        self.mixer.setDucking(enabled, threshold, depth, attack, release)
+
+    def shutdown(self):
+        """Stop the audio output and its thread, called when the application quits.
+            - Takes no parameter.
+            - Returns nothing.
+        """
+        self.stopRequested.emit()
+        self.thread.quit()
+        self.thread.wait()
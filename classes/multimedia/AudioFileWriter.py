@@ -0,0 +1,76 @@
+#---------------------------------
+#Author: Chappuis Anthony
+#
+#Write the blocks of the mixer to a sound file as they are rendered. WAV
+#files are written directly in 16 bits, FLAC files need the soundfile
+#package.
+#
+#Application: DragonShout music sampler
+#Last Edited: October 19th 2026
+#---------------------------------
+
+import os
+import wave
+
+import numpy as np
+
+class AudioFileWriter():
+
+    WAVEEXTENSIONS = ('.wav', '.wave')
+    FLACEXTENSIONS = ('.flac',)
+    SAMPLEWIDTH = 2
+
+    def __init__(self, filepath:str, sampleRate:int, channels:int=2):
+        self.filepath = filepath
+        self.sampleRate = sampleRate
+        self.channels = channels
+        self.frames = 0
+
+        #Triangular dither for the 16 bits conversion
+        self.random = np.random.default_rng()
+
+        #The format is chosen by the extension, ValueError is raised for the other ones
+        extension = os.path.splitext(filepath)[1].lower()
+        if extension in AudioFileWriter.WAVEEXTENSIONS:
+            self.soundFile = None
+            self.waveFile = wave.open(filepath, 'wb')
+            self.waveFile.setnchannels(channels)
+            self.waveFile.setsampwidth(AudioFileWriter.SAMPLEWIDTH)
+            self.waveFile.setframerate(sampleRate)
+
+        elif extension in AudioFileWriter.FLACEXTENSIONS:
+            try:
+                import soundfile
+            except ImportError:
+                raise ValueError('{}: writing FLAC files needs the soundfile package'.format(filepath))
+            self.waveFile = None
+            self.soundFile = soundfile.SoundFile(filepath, 'w', sampleRate, channels, 'PCM_16', format='FLAC')
+
+        else:
+            raise ValueError('{}: unsupported output format, use .wav or .flac'.format(filepath))
+
+    def write(self, block:np.ndarray):
+        """Append frames to the file.
+            - Takes one parameter:
+                - block as float32 array of shape (frames, channels), between -1 and 1.
+            - Returns nothing.
+        """
+        self.frames += len(block)
+
+        if self.soundFile is not None:
+            self.soundFile.write(block)
+            return
+
+        dither = self.random.random(block.shape) - self.random.random(block.shape)
+        samples = np.clip(np.round(block*32767 + dither), -32768, 32767).astype('<i2')
+        self.waveFile.writeframes(samples.tobytes())
+
+    def close(self):
+        """Finish the file header and close it.
+            - Takes no parameter.
+            - Returns nothing.
+        """
+        if self.soundFile is not None:
+            self.soundFile.close()
+        else:
+            self.waveFile.close()
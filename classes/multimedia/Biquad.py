@@ -0,0 +1,79 @@
+#---------------------------------
+#Author: Chappuis Anthony
+#
+#Second order recursive filter processed a whole block at a time. The filter
+#is written as a state space system: the block output is the convolution of
+#the block with the impulse response plus the response to the state left by
+#the previous block, so that no loop runs over the frames.
+#
+#Application: DragonShout music sampler
+#Last Edited: October 19th 2026
+#---------------------------------
+
+import numpy as np
+
+class Biquad():
+
+    def __init__(self, blockSize:int, channels:int=2):
+        self.blockSize = blockSize
+        self.channels = channels
+        self.fftSize = 1 << (2*blockSize - 1).bit_length()
+
+        #Transposed direct form II state of every channel
+        self.state = np.zeros((2, channels))
+
+        self.setCoefficients(1.0, 0.0, 0.0, 0.0, 0.0)
+
+    def setCoefficients(self, b0:float, b1:float, b2:float, a1:float, a2:float):
+        """Change the filter coefficients (a0 being normalized to 1). The state is kept
+            so that coefficients can change between two blocks.
+            - Takes five parameters:
+                - b0, b1, b2 as float, numerator coefficients.
+                - a1, a2 as float, denominator coefficients.
+            - Returns nothing.
+        """
+        frames = self.blockSize
+        transition = np.array([[-a1, 1.0], [-a2, 0.0]])
+        inputVector = np.array([b1 - a1*b0, b2 - a2*b0])
+
+        #Powers of the transition matrix from 0 to frames, doubling the range at each step
+        powers = np.empty((frames+1, 2, 2))
+        powers[0] = np.eye(2)
+        count = 1
+        step = transition
+        while count <= frames:
+            length = min(count, frames+1-count)
+            powers[count:count+length] = powers[:length] @ step
+            count += length
+            step = step @ step
+
+        impulse = np.empty(frames)
+        impulse[0] = b0
+        impulse[1:] = powers[:frames-1, 0, :] @ inputVector
+
+        self.transfer = np.fft.rfft(impulse, self.fftSize)[:, None]
+        #Output produced by the state for each frame and state left by each input frame
+        self.stateResponse = powers[:frames, 0, :]
+        self.inputResponse = powers[frames-1::-1] @ inputVector
+        self.blockTransition = powers[frames]
+
+    def reset(self):
+        """Clear the filter memory.
+            - Takes no parameter.
+            - Returns nothing.
+        """
+        self.state.fill(0.0)
+
+    def process(self, block:np.ndarray):
+        """Filter a block in place.
+            - Takes one parameter:
+                - block as float32 array of shape (blockSize, channels).
+            - Returns nothing.
+        """
+        samples = block.astype(np.float64)
+
+        output = np.fft.irfft(np.fft.rfft(samples, self.fftSize, axis=0) * self.transfer, self.fftSize, axis=0)[:self.blockSize]
+        output += self.stateResponse @ self.state
+
+        self.state = self.blockTransition @ self.state + self.inputResponse.T @ samples
+        block[:] = output
@@ -0,0 +1,91 @@
+#---------------------------------
+#Author: Chappuis Anthony
+#
+#Equalizer and filter effect: low pass, high pass, peak and shelves, with the
+#coefficients of the Audio EQ Cookbook.
+#
+#Application: DragonShout music sampler
+#Last Edited: October 19th 2026
+#---------------------------------
+
+import math
+
+import numpy as np
+
+from classes.multimedia.Effect import Effect
+from classes.multimedia.Biquad import Biquad
+
+class BiquadFilter(Effect):
+
+    #Filter types
+    LOWPASS = 'lowPass'
+    HIGHPASS = 'highPass'
+    PEAK = 'peak'
+    LOWSHELF = 'lowShelf'
+    HIGHSHELF = 'highShelf'
+
+    #Frequency limits in Hz: a low pass at MAXFREQUENCY or a high pass at
+    #MINFREQUENCY are considered transparent
+    MINFREQUENCY = 20.0
+    MAXFREQUENCY = 20000.0
+
+    def __init__(self, name:str, sampleRate:int, blockSize:int, filterType:str=LOWPASS,
+                    frequency:float=MAXFREQUENCY, q:float=math.sqrt(0.5), gain:float=0.0, channels:int=2):
+        super().__init__(name, sampleRate, blockSize, channels)
+
+        self.filterType = filterType
+        self.filter = Biquad(blockSize, channels)
+
+        self.addParameter('frequency', frequency)
+        self.addParameter('q', q)
+        #Gain of the peak and shelf filters in decibels
+        self.addParameter('gain', gain)
+
+        self.update()
+
+    def coefficients(self):
+        """Returns the normalized coefficients (b0, b1, b2, a1, a2) of the current settings."""
+        frequency = min(max(self.parameters['frequency'], BiquadFilter.MINFREQUENCY), 0.49*self.sampleRate)
+        q = max(self.parameters['q'], 0.01)
+        amplitude = 10**(self.parameters['gain']/40)
+
+        omega = 2*math.pi*frequency/self.sampleRate
+        cosine = math.cos(omega)
+        alpha = math.sin(omega)/(2*q)
+
+        if self.filterType == BiquadFilter.HIGHPASS:
+            b = ((1 + cosine)/2, -(1 + cosine), (1 + cosine)/2)
+            a = (1 + alpha, -2*cosine, 1 - alpha)
+        elif self.filterType == BiquadFilter.PEAK:
+            b = (1 + alpha*amplitude, -2*cosine, 1 - alpha*amplitude)
+            a = (1 + alpha/amplitude, -2*cosine, 1 - alpha/amplitude)
+        elif self.filterType in (BiquadFilter.LOWSHELF, BiquadFilter.HIGHSHELF):
+            sign = 1 if self.filterType == BiquadFilter.LOWSHELF else -1
+            root = 2*math.sqrt(amplitude)*alpha
+            b = (amplitude*((amplitude + 1) - sign*(amplitude - 1)*cosine + root),
+                2*sign*amplitude*((amplitude - 1) - sign*(amplitude + 1)*cosine),
+                amplitude*((amplitude + 1) - sign*(amplitude - 1)*cosine - root))
+            a = ((amplitude + 1) + sign*(amplitude - 1)*cosine + root,
+                -2*sign*((amplitude - 1) + sign*(amplitude + 1)*cosine),
+                (amplitude + 1) + sign*(amplitude - 1)*cosine - root)
+        else:
+            b = ((1 - cosine)/2, 1 - cosine, (1 - cosine)/2)
+            a = (1 + alpha, -2*cosine, 1 - alpha)
+
+        return b[0]/a[0], b[1]/a[0], b[2]/a[0], a[1]/a[0], a[2]/a[0]
+
+    def update(self):
+        self.filter.setCoefficients(*self.coefficients())
+
+    def isNeutral(self):
+        if self.filterType == BiquadFilter.LOWPASS:
+            return self.parameters['frequency'] >= min(BiquadFilter.MAXFREQUENCY, 0.49*self.sampleRate)
+        elif self.filterType == BiquadFilter.HIGHPASS:
+            return self.parameters['frequency'] <= BiquadFilter.MINFREQUENCY
+        return self.parameters['gain'] == 0.0
+
+    def reset(self):
+        self.filter.reset()
+
+    def render(self, block:np.ndarray):
+        self.filter.process(block)
@@ -0,0 +1,38 @@
+#---------------------------------
+#Author: Chappuis Anthony
+#
+#Group of voices mixed together (music, effects) and processed by a chain of
+#effects before reaching the output.
+#
+#Application: DragonShout music sampler
+#Last Edited: October 19th 2026
+#---------------------------------
+
+import numpy as np
+
+from classes.multimedia.GainRamp import GainRamp
+from classes.multimedia.EffectsChain import EffectsChain
+
+class Bus():
+
+    def __init__(self, name:str, blockSize:int, channels:int=2):
+        self.name = name
+        self.buffer = np.zeros((blockSize, channels), dtype=np.float32)
+        self.gain = GainRamp(1.0)
+        self.effects = EffectsChain()
+
+    def clear(self):
+        """Silence the bus before the voices are added to it.
+            - Takes no parameter.
+            - Returns nothing.
+        """
+        self.buffer.fill(0.0)
+
+    def process(self):
+        """Apply the bus processing to the mixed voices.
+            - Takes no parameter.
+            - Returns the processed block as float32 array.
+        """
+        self.effects.process(self.buffer)
+        self.gain.apply(self.buffer)
+        return self.buffer
@@ -0,0 +1,94 @@
+#---------------------------------
+#Author: Chappuis Anthony
+#
+#Sidechain ducking: the level of the effects bus, measured on every block,
+#lowers the music bus so that the sound effects stay audible. It runs in the
+#mixer itself, the music is lowered in the very block where an effect starts.
+#
+#Application: DragonShout music sampler
+#Last Edited: October 19th 2026
+#---------------------------------
+
+import math
+
+import numpy as np
+
+from classes.multimedia.GainRamp import GainRamp
+
+class Ducker():
+
+    #Default settings: levels in decibels, times in seconds
+    THRESHOLD = -40.0
+    DEPTH = 12.0
+    ATTACK = 0.01
+    RELEASE = 0.4
+
+    #Limits of the settings
+    MINTHRESHOLD = -80.0
+    MAXDEPTH = 60.0
+    MAXTIME = 5.0
+
+    def __init__(self, sampleRate:int, blockSize:int):
+        self.blockDuration = blockSize / sampleRate
+
+        #Gain applied to the music, moving linearly over every block
+        self.gain = GainRamp(1.0)
+        #Current attenuation in decibels
+        self.reduction = 0.0
+
+        self.configure(False)
+
+    def configure(self, enabled:bool, threshold:float=THRESHOLD, depth:float=DEPTH, attack:float=ATTACK, release:float=RELEASE):
+        """Change the ducking settings.
+            - Takes five parameters:
+                - enabled as boolean.
+                - threshold as float, effects level in dBFS above which the music is lowered.
+                - depth as float, attenuation of the music in decibels.
+                - attack as float, time to lower the music in seconds.
+                - release as float, time to bring it back in seconds.
+            - Returns nothing.
+        """
+        self.enabled = bool(enabled)
+        self.threshold = min(max(float(threshold), Ducker.MINTHRESHOLD), 0.0)
+        self.depth = min(max(float(depth), 0.0), Ducker.MAXDEPTH)
+        self.attack = min(max(float(attack), 0.0), Ducker.MAXTIME)
+        self.release = min(max(float(release), 0.0), Ducker.MAXTIME)
+
+        #Share of the remaining distance to the target kept after one block
+        self.attackCoefficient = self.coefficient(self.attack)
+        self.releaseCoefficient = self.coefficient(self.release)
+        self.thresholdLevel = 10**(self.threshold/20)
+
+    def coefficient(self, duration:float):
+        """Returns the one block smoothing coefficient of a duration."""
+        if duration <= 0:
+            return 0.0
+        return math.exp(-self.blockDuration/duration)
+
+    def level(self, block:np.ndarray):
+        """Returns the RMS level of a block as float (1.0 being full scale)."""
+        return math.sqrt(float(np.dot(block.ravel(), block.ravel())) / block.size)
+
+    def process(self, key:np.ndarray, block:np.ndarray):
+        """Measure the key block and lower the other one accordingly, in place.
+            - Takes two parameters:
+                - key as float32 array, the effects bus.
+                - block as float32 array, the music bus.
+            - Returns nothing.
+        """
+        if self.enabled and self.depth and self.level(key) > self.thresholdLevel:
+            target, coefficient = self.depth, self.attackCoefficient
+        else:
+            target, coefficient = 0.0, self.releaseCoefficient
+
+        if self.reduction == target and not self.gain.isRamping():
+            if self.reduction:
+                self.gain.apply(block)
+            return
+
+        self.reduction = target + (self.reduction - target)*coefficient
+        if abs(self.reduction - target) < 0.01:
+            self.reduction = target
+
+        self.gain.set(10**(-self.reduction/20), len(block))
+        self.gain.apply(block)
@@ -0,0 +1,130 @@
+#---------------------------------
+#Author: Chappuis Anthony
+#
+#Base class of the effects processing the blocks of a bus. Parameters move
+#smoothly towards the values they are given and each effect measures the time
+#it spends on every block.
+#
+#Application: DragonShout music sampler
+#Last Edited: October 19th 2026
+#---------------------------------
+
+import math
+import time
+
+import numpy as np
+
+class Effect():
+
+    #Time for a parameter to cover most of a change, in seconds
+    SMOOTHING = 0.05
+
+    def __init__(self, name:str, sampleRate:int, blockSize:int, channels:int=2):
+        self.name = name
+        self.sampleRate = sampleRate
+        self.blockSize = blockSize
+        self.channels = channels
+
+        self.enabled = True
+        #True when the effect is skipped because it wouldn't change the sound
+        self.idle = False
+
+        #name => current value and name => value it moves to
+        self.parameters = {}
+        self.targets = {}
+        self.smoothing = math.exp(-blockSize/(sampleRate*Effect.SMOOTHING))
+
+        #Duration of the last block processing in seconds
+        self.processingTime = 0.0
+
+    def addParameter(self, name:str, value:float):
+        """Declare a parameter of the effect.
+            - Takes two parameters:
+                - name as string.
+                - value as float.
+            - Returns nothing.
+        """
+        self.parameters[name] = float(value)
+        self.targets[name] = float(value)
+
+    def setParameter(self, name:str, value:float, smooth:bool=True):
+        """Change a parameter. Unless smooth is False the change is spread over the
+            next blocks.
+            - Takes three parameters:
+                - name as string.
+                - value as float.
+                - smooth as boolean.
+            - Returns nothing.
+        """
+        self.targets[name] = float(value)
+        if not smooth:
+            self.parameters[name] = float(value)
+            self.update()
+
+    def parameter(self, name:str):
+        """Returns the current value of a parameter as float."""
+        return self.parameters[name]
+
+    def smoothParameters(self):
+        """Move the parameters one block closer to their target.
+            - Takes no parameter.
+            - Returns True if any parameter changed.
+        """
+        changed = False
+        for name, target in self.targets.items():
+            value = self.parameters[name]
+            if value == target:
+                continue
+
+            value = target + (value - target)*self.smoothing
+            if abs(value - target) <= 1e-4*max(abs(target), 1.0):
+                value = target
+            self.parameters[name] = value
+            changed = True
+
+        return changed
+
+    def update(self):
+        """Called when the parameters changed, to compute what depends on them."""
+        pass
+
+    def isNeutral(self):
+        """Returns True when the current parameters leave the sound unchanged."""
+        return False
+
+    def reset(self):
+        """Clear the memory of the effect."""
+        pass
+
+    def render(self, block:np.ndarray):
+        """Process a block in place.
+            - Takes one parameter:
+                - block as float32 array of shape (blockSize, channels).
+            - Returns nothing.
+        """
+        raise NotImplementedError
+
+    def process(self, block:np.ndarray):
+        """Process a block in place, skipping the effect while it has no effect.
+            - Takes one parameter:
+                - block as float32 array of shape (blockSize, channels).
+            - Returns nothing.
+        """
+        start = time.perf_counter()
+
+        moving = self.smoothParameters()
+        if moving :
+            self.update()
+
+        if self.enabled and (moving or not self.isNeutral()):
+            self.render(block)
+            self.idle = False
+        elif not self.idle:
+            self.reset()
+            self.idle = True
+
+        self.processingTime = time.perf_counter() - start
+
+    def load(self):
+        """Returns the share of the real time used by the effect on the last block."""
+        return self.processingTime * self.sampleRate / self.blockSize
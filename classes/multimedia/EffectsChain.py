@@ -0,0 +1,55 @@
+#---------------------------------
+#Author: Chappuis Anthony
+#
+#Ordered list of the effects processing the blocks of a bus.
+#
+#Application: DragonShout music sampler
+#Last Edited: October 19th 2026
+#---------------------------------
+
+import numpy as np
+
+from classes.multimedia.Effect import Effect
+
+class EffectsChain():
+
+    def __init__(self):
+        self.effects = []
+
+    def add(self, effect:Effect):
+        """Add an effect at the end of the chain, replacing the effect with the same name.
+            - Takes one parameter:
+                - effect as Effect object.
+            - Returns nothing.
+        """
+        self.remove(effect.name)
+        self.effects.append(effect)
+
+    def remove(self, name:str):
+        """Remove an effect from the chain.
+            - Takes one parameter:
+                - name as string.
+            - Returns nothing.
+        """
+        self.effects = [effect for effect in self.effects if effect.name != name]
+
+    def effect(self, name:str):
+        """Returns the effect with the given name or None."""
+        for effect in self.effects:
+            if effect.name == name:
+                return effect
+        return None
+
+    def process(self, block:np.ndarray):
+        """Run every effect on a block, in place.
+            - Takes one parameter:
+                - block as float32 array.
+            - Returns nothing.
+        """
+        for effect in self.effects:
+            effect.process(block)
+
+    def report(self):
+        """Returns the cost of each effect on the last block as a list of
+            (name, share of the real time, idle) tuples."""
+        return [(effect.name, effect.load(), effect.idle) for effect in self.effects]
@@ -0,0 +1,67 @@
+#---------------------------------
+#Author: Chappuis Anthony
+#
+#Linear gain ramp applied block by block by the mixer. Any gain change goes
+#through a ramp so that voices and buses never click.
+#
+#Application: DragonShout music sampler
+#Last Edited: October 19th 2026
+#---------------------------------
+
+import numpy as np
+
+class GainRamp():
+
+    #Distance to the target below which the ramp is over: the ramp is computed
+    #in float32, which can't reach most float64 targets exactly
+    TOLERANCE = 1e-6
+
+    def __init__(self, gain:float=1.0):
+        self.gain = float(gain)
+        self.target = float(gain)
+        self.step = 0.0
+
+    def set(self, gain:float, frames:int=0):
+        """Move towards a new gain.
+            - Takes two parameters:
+                - gain as float.
+                - frames as integer, duration of the ramp (0 for an immediate change).
+            - Returns nothing.
+        """
+        self.target = float(gain)
+
+        if frames <= 0:
+            self.gain = self.target
+            self.step = 0.0
+        else:
+            self.step = (self.target - self.gain) / frames
+
+    def isRamping(self):
+        """Returns True while the gain hasn't reached its target."""
+        return self.step != 0.0
+
+    def apply(self, block:np.ndarray):
+        """Multiply a block of frames by the gain, in place.
+            - Takes one parameter:
+                - block as float32 array of shape (frames, channels).
+            - Returns nothing.
+        """
+        frames = len(block)
+
+        if self.step == 0.0:
+            if self.gain != 1.0:
+                block *= self.gain
+            return
+
+        ramp = self.gain + self.step*np.arange(1, frames+1, dtype=np.float32)
+        if self.step > 0:
+            np.minimum(ramp, self.target, out=ramp)
+        else:
+            np.maximum(ramp, self.target, out=ramp)
+
+        block *= ramp[:, None]
+        self.gain = float(ramp[-1])
+
+        if abs(self.gain - self.target) <= GainRamp.TOLERANCE:
+            self.gain = self.target
+            self.step = 0.0
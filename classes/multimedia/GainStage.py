@@ -0,0 +1,30 @@
+#---------------------------------
+#Author: Chappuis Anthony
+#
+#Effect changing the level of a bus, in decibels.
+#
+#Application: DragonShout music sampler
+#Last Edited: October 19th 2026
+#---------------------------------
+
+import numpy as np
+
+from classes.multimedia.Effect import Effect
+from classes.multimedia.GainRamp import GainRamp
+
+class GainStage(Effect):
+
+    def __init__(self, name:str, sampleRate:int, blockSize:int, gain:float=0.0, channels:int=2):
+        super().__init__(name, sampleRate, blockSize, channels)
+
+        self.ramp = GainRamp(10**(gain/20))
+        self.addParameter('gain', gain)
+
+    def update(self):
+        self.ramp.set(10**(self.parameters['gain']/20), self.blockSize)
+
+    def isNeutral(self):
+        return self.parameters['gain'] == 0.0 and not self.ramp.isRamping()
+
+    def render(self, block:np.ndarray):
+        self.ramp.apply(block)
@@ -0,0 +1,107 @@
+#---------------------------------
+#Author: Chappuis Anthony
+#
+#A sound looped by the mixer between two sample-accurate loop points. The end
+#of the loop is crossfaded with the frames preceding the loop start so that
+#jumping back to the start is gapless and click free.
+#
+#Application: DragonShout music sampler
+#Last Edited: October 19th 2026
+#---------------------------------
+
+import numpy as np
+
+from classes.multimedia.Voice import Voice
+
+class LoopVoice(Voice):
+
+    #Distance searched around a loop point to find a zero crossing, in seconds
+    ZEROCROSSINGWINDOW = 0.05
+
+    def findZeroCrossing(cls, mono:np.ndarray, position:int, window:int):
+        """Find the rising zero crossing nearest to a position.
+            - Takes three parameters:
+                - mono as float32 array of frames.
+                - position as integer.
+                - window as integer, number of frames searched on each side.
+            - Returns the frame index as integer, the position itself if there is none.
+        """
+        start = max(0, position - window)
+        end = min(len(mono), position + window)
+        if end - start < 2:
+            return position
+
+        area = mono[start:end]
+        crossings = np.flatnonzero((area[:-1] < 0) & (area[1:] >= 0)) + start + 1
+        if len(crossings) == 0:
+            return position
+
+        return int(crossings[np.abs(crossings - position).argmin()])
+    findZeroCrossing = classmethod(findZeroCrossing)
+
+    def findLoopPoints(cls, buffer:np.ndarray, sampleRate:int, crossfade:int=0):
+        """Find loop points at rising zero crossings near both ends of a sound. The
+            start leaves room for the crossfade before it.
+            - Takes three parameters:
+                - buffer as float32 array of shape (frames, 2).
+                - sampleRate as integer.
+                - crossfade as integer, number of frames.
+            - Returns loop start and loop end as integers.
+        """
+        mono = buffer.sum(axis=1)
+        window = int(LoopVoice.ZEROCROSSINGWINDOW*sampleRate)
+
+        loopStart = cls.findZeroCrossing(mono, min(crossfade + window, len(mono)//4), window)
+        loopEnd = cls.findZeroCrossing(mono, max(len(mono) - window, loopStart + 1), window)
+
+        return loopStart, max(loopEnd, loopStart + 1)
+    findLoopPoints = classmethod(findLoopPoints)
+
+    def __init__(self, buffer:np.ndarray, bus:str, gain:float=1.0, loopStart:int=None, loopEnd:int=None, crossfade:int=0, sampleRate:int=48000):
+        super().__init__(buffer, bus, gain)
+
+        if loopStart is None or loopEnd is None:
+            foundStart, foundEnd = LoopVoice.findLoopPoints(buffer, sampleRate, crossfade)
+            if loopStart is None:
+                loopStart = foundStart
+            if loopEnd is None:
+                loopEnd = foundEnd
+
+        self.loopEnd = min(max(int(loopEnd), 1), len(buffer))
+        self.loopStart = min(max(int(loopStart), 0), self.loopEnd - 1)
+
+        #The crossfade needs as many frames before the loop start as inside the loop
+        crossfade = max(0, min(int(crossfade), self.loopStart, self.loopEnd - self.loopStart))
+        self.tailStart = self.loopEnd - crossfade
+
+        #Equal power crossfade between the end of the loop and the frames leading to its start
+        fade = (np.arange(crossfade, dtype=np.float32) + 0.5) / max(crossfade, 1) * (np.pi/2)
+        self.tail = (buffer[self.tailStart:self.loopEnd]*np.cos(fade)[:, None]
+                    + buffer[self.loopStart-crossfade:self.loopStart]*np.sin(fade)[:, None]).astype(np.float32)
+
+    def read(self, block:np.ndarray):
+        """Copy the next frames of the loop in a block, jumping back to the loop
+            start as many times as needed.
+            - Takes one parameter:
+                - block as float32 array of shape (frames, 2).
+            - Returns the number of frames copied as integer.
+        """
+        frames = len(block)
+        written = 0
+
+        while written < frames:
+            if self.position >= self.loopEnd:
+                self.position = self.loopStart
+
+            if self.position < self.tailStart:
+                count = min(frames - written, self.tailStart - self.position)
+                block[written:written+count] = self.buffer[self.position:self.position+count]
+            else:
+                offset = self.position - self.tailStart
+                count = min(frames - written, self.loopEnd - self.position)
+                block[written:written+count] = self.tail[offset:offset+count]
+
+            written += count
+            self.position += count
+
+        return written
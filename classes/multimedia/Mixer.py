@@ -0,0 +1,429 @@
+#---------------------------------
+#Author: Chappuis Anthony
+#
+#Mix the voices played from decoded buffers, bus by bus, in fixed size blocks.
+#It doesn't depend on Qt: the AudioEngine feeds its blocks to the sound card
+#and an offline render can call it directly. Commands posted from other
+#threads are applied at the start of the next block, scheduled commands at
+#the start of the block holding their clock. The effects bus ducks the music
+#bus.
+#
+#Application: DragonShout music sampler
+#Last Edited: October 19th 2026
+#---------------------------------
+
+import time
+import itertools
+from collections import deque, OrderedDict
+
+import numpy as np
+
+from classes.multimedia.Bus import Bus
+from classes.multimedia.Ducker import Ducker
+from classes.multimedia.Effect import Effect
+from classes.multimedia.Panner import Panner
+from classes.multimedia.Scheduler import Scheduler
+from classes.multimedia.Voice import Voice
+from classes.multimedia.SegmentVoice import SegmentVoice
+from classes.multimedia.StemVoice import StemVoice
+
+class Mixer():
+
+    #Output format
+    SAMPLERATE = 48000
+    BLOCKSIZE = 512
+    CHANNELS = 2
+
+    #Buses
+    MUSICBUS = 'music'
+    EFFECTSBUS = 'effects'
+
+    def __init__(self, sampleRate:int=SAMPLERATE, blockSize:int=BLOCKSIZE):
+        self.sampleRate = sampleRate
+        self.blockSize = blockSize
+
+        #Number of frames rendered since the mixer was created
+        self.clock = 0
+
+        self.buses = OrderedDict((name, Bus(name, blockSize, Mixer.CHANNELS)) for name in (Mixer.MUSICBUS, Mixer.EFFECTSBUS))
+        self.voices = OrderedDict()
+
+        #Lowers the music while sound effects play
+        self.ducker = Ducker(sampleRate, blockSize)
+
+        #Voice currently playing the music, replaced by changeMusic()
+        self.musicVoice = None
+
+        #(command, arguments) posted by other threads and ids of the ended voices
+        self.commands = deque()
+        #Commands gathered by beginBatch() to be applied in the same block
+        self.batch = None
+        self.finishedVoices = deque()
+        self.voiceIds = itertools.count(1)
+
+        #Commands waiting for their clock, the voices they will start and the
+        #events to hand over to the thread which scheduled them
+        self.scheduler = Scheduler()
+        self.scheduleHandles = itertools.count(1)
+        self.scheduledVoices = {}
+        self.dueEvents = deque()
+
+        self.output = np.zeros((blockSize, Mixer.CHANNELS), dtype=np.float32)
+
+        #Duration of the last block processing in seconds
+        self.processingTime = 0.0
+
+    def frames(self, seconds:float):
+        """Convert a duration to a number of frames.
+            - Takes one parameter:
+                - seconds as float.
+            - Returns an integer.
+        """
+        return int(round(seconds*self.sampleRate))
+
+    def post(self, command, *args):
+        """Run a command at the start of the next block. Can be called from any thread.
+            - Takes at least one parameter:
+                - command as callable.
+                - arguments of the command.
+            - Returns nothing.
+        """
+        if self.batch is not None:
+            self.batch.append((command, args))
+        else:
+            self.commands.append((command, args))
+
+    def beginBatch(self):
+        """Gather the next posted commands until endBatch() so that they are all
+            applied at the start of the same block. Called from the thread posting them.
+            - Takes no parameter.
+            - Returns nothing.
+        """
+        self.batch = []
+
+    def endBatch(self):
+        """Post the gathered commands as a single one.
+            - Takes no parameter.
+            - Returns nothing.
+        """
+        batch = self.batch
+        self.batch = None
+        if batch :
+            self.commands.append((self._runBatch, (batch,)))
+
+    def play(self, voice:Voice, clock:int=None):
+        """Start a voice at the next block or at a precise frame.
+            - Takes two parameters:
+                - voice as Voice object.
+                - clock as integer, mixer clock at which the voice starts (None for now).
+            - Returns the voice id as integer.
+        """
+        voice.voiceId = next(self.voiceIds)
+        voice.startClock = clock
+
+        if clock is None:
+            self.post(self._addVoice, voice)
+        else:
+            #The voice only joins the mixer in the block where it starts
+            handle = self.schedule(clock, self._addVoice, voice)
+            self.post(self.scheduledVoices.__setitem__, voice.voiceId, handle)
+        return voice.voiceId
+
+    def changeMusic(self, voice:Voice, transition:str=SegmentVoice.BOUNDARY, fade:float=0.0, clock:int=None):
+        """Replace the music. A track with segments plays its outro, either at its
+            next musical boundary or right away, and the new music starts at that exact
+            frame. Other tracks are crossfaded.
+            - Takes four parameters:
+                - voice as Voice object.
+                - transition as one of the SegmentVoice constants: BOUNDARY, OUTRO.
+                - fade as float, crossfade duration in seconds.
+                - clock as integer, mixer clock of the change (None for now).
+            - Returns the voice id as integer.
+        """
+        voice.voiceId = next(self.voiceIds)
+        if clock is None:
+            self.post(self._changeMusic, voice, transition, self.frames(fade))
+        else:
+            #Like scheduled voices, stop() cancels the change until it happens
+            handle = self.schedule(clock, self._changeMusic, voice, transition, self.frames(fade), clock)
+            self.post(self.scheduledVoices.__setitem__, voice.voiceId, handle)
+        return voice.voiceId
+
+    def stopMusic(self, transition:str=SegmentVoice.OUTRO, fade:float=0.0):
+        """End the music, through its outro if it has segments.
+            - Takes two parameters:
+                - transition as one of the SegmentVoice constants: BOUNDARY, OUTRO.
+                - fade as float, fade out duration in seconds.
+            - Returns nothing.
+        """
+        self.post(self._releaseMusic, transition, self.frames(fade))
+
+    def stop(self, voiceId:int, fade:float=0.0):
+        """Fade out and end a voice, or cancel it if it is scheduled and hasn't started.
+            - Takes two parameters:
+                - voiceId as integer.
+                - fade as float, in seconds.
+            - Returns nothing.
+        """
+        self.post(self._stopVoice, voiceId, self.frames(fade))
+
+    def setVoiceGain(self, voiceId:int, gain:float, fade:float=0.0):
+        """Change the gain of a playing voice.
+            - Takes three parameters:
+                - voiceId as integer.
+                - gain as float.
+                - fade as float, in seconds.
+            - Returns nothing.
+        """
+        self.post(self._setVoiceGain, voiceId, gain, self.frames(fade))
+
+    def setVoicePanning(self, voiceId:int, pan:float=0.0, location:tuple=None):
+        """Move a playing voice in the stereo field.
+            - Takes three parameters:
+                - voiceId as integer.
+                - pan as float, from -1 (left) to 1 (right).
+                - location as (x, y) tuple in meters or None, replacing the pan when given.
+            - Returns nothing.
+        """
+        self.post(self._setVoicePanning, voiceId, pan, location)
+
+    def setBusGain(self, bus:str, gain:float, fade:float=0.0, clock:int=None):
+        """Change the gain of a bus.
+            - Takes four parameters:
+                - bus as string, one of the Mixer bus constants.
+                - gain as float.
+                - fade as float, in seconds.
+                - clock as integer, mixer clock of the change (None for now).
+            - Returns the handle of the scheduled change or None.
+        """
+        if clock is None:
+            self.post(self._setBusGain, bus, gain, self.frames(fade))
+            return None
+        return self.schedule(clock, self._setBusGain, bus, gain, self.frames(fade))
+
+    def setStemGains(self, voiceId:int, gains:list, fade:float=0.0):
+        """Change the gain of the stems of a playing StemVoice.
+            - Takes three parameters:
+                - voiceId as integer.
+                - gains as list of floats, one per stem.
+                - fade as float, in seconds.
+            - Returns nothing.
+        """
+        self.post(self._setStemGains, voiceId, gains, self.frames(fade))
+
+    def setDucking(self, enabled:bool, threshold:float=Ducker.THRESHOLD, depth:float=Ducker.DEPTH,
+                    attack:float=Ducker.ATTACK, release:float=Ducker.RELEASE):
+        """Change how much and how fast the sound effects lower the music.
+            - Takes five parameters:
+                - enabled as boolean.
+                - threshold as float, effects level in dBFS above which the music is lowered.
+                - depth as float, attenuation of the music in decibels.
+                - attack as float, in seconds.
+                - release as float, in seconds.
+            - Returns nothing.
+        """
+        self.post(self.ducker.configure, enabled, threshold, depth, attack, release)
+
+    def addEffect(self, bus:str, effect:Effect):
+        """Add an effect at the end of the chain of a bus.
+            - Takes two parameters:
+                - bus as string, one of the Mixer bus constants.
+                - effect as Effect object, created for the mixer sample rate and block size.
+            - Returns nothing.
+        """
+        self.post(self.buses[bus].effects.add, effect)
+
+    def removeEffect(self, bus:str, name:str):
+        """Remove an effect from the chain of a bus.
+            - Takes two parameters:
+                - bus as string, one of the Mixer bus constants.
+                - name as string.
+            - Returns nothing.
+        """
+        self.post(self.buses[bus].effects.remove, name)
+
+    def setEffectParameter(self, bus:str, name:str, parameter:str, value:float):
+        """Change a parameter of an effect, smoothly.
+            - Takes four parameters:
+                - bus as string, one of the Mixer bus constants.
+                - name as string, name of the effect.
+                - parameter as string.
+                - value as float.
+            - Returns nothing.
+        """
+        self.post(self._setEffectParameter, bus, name, parameter, value)
+
+    def effectsReport(self):
+        """Returns the cost of the effects on the last block.
+            - Takes no parameter.
+            - Returns an OrderedDict: bus => list of (name, share of the real time, idle) tuples.
+        """
+        return OrderedDict((name, bus.effects.report()) for name, bus in self.buses.items())
+
+    def schedule(self, clock:int, command, *args):
+        """Run a command at the start of the block holding a given frame. Can be
+            called from any thread.
+            - Takes at least two parameters:
+                - clock as integer, mixer frame.
+                - command as callable.
+                - arguments of the command.
+            - Returns the handle of the event as integer.
+        """
+        handle = next(self.scheduleHandles)
+        self.post(self.scheduler.push, handle, clock, command, args)
+        return handle
+
+    def cancel(self, handle:int):
+        """Cancel a scheduled event. Voices scheduled by play() are cancelled by stop().
+            - Takes one parameter:
+                - handle as integer.
+            - Returns nothing.
+        """
+        self.post(self.scheduler.remove, handle)
+
+    def notify(self, clock:int, event):
+        """Hand an event over to the thread reading dueEvents once the mixer
+            reaches a given frame.
+            - Takes two parameters:
+                - clock as integer.
+                - event as any object.
+            - Returns the handle of the event as integer.
+        """
+        return self.schedule(clock, self.dueEvents.append, event)
+
+    def _runBatch(self, batch:list):
+        for command, args in batch:
+            command(*args)
+
+    def _addVoice(self, voice:Voice):
+        self.scheduledVoices.pop(voice.voiceId, None)
+        self.voices[voice.voiceId] = voice
+
+    def _changeMusic(self, voice:Voice, transition:str, frames:int, clock:int=None):
+        self.scheduledVoices.pop(voice.voiceId, None)
+        delay, crossfade = self._releaseMusic(transition, frames)
+
+        voice.startClock = max(clock or self.clock, self.clock) + delay
+        if crossfade :
+            gain = voice.gain.target
+            voice.gain.set(0.0)
+            voice.gain.set(gain, frames)
+
+        self.voices[voice.voiceId] = voice
+        self.musicVoice = voice
+
+    def _releaseMusic(self, transition:str, frames:int):
+        """Returns the number of frames before the next music can start and
+            whether it has to fade in."""
+        voice = self.musicVoice
+        self.musicVoice = None
+
+        if voice is None or voice.finished or voice.voiceId not in self.voices:
+            return 0, False
+
+        #The music was waiting for a boundary: the next one takes its place
+        if voice.startClock is not None and voice.startClock > self.clock:
+            del self.voices[voice.voiceId]
+            self.finishedVoices.append(voice.voiceId)
+            return voice.startClock - self.clock, False
+
+        if isinstance(voice, SegmentVoice):
+            return voice.release(transition), False
+
+        voice.stop(frames)
+        return 0, True
+
+    def _stopVoice(self, voiceId:int, frames:int):
+        voice = self.voices.get(voiceId)
+        if voice :
+            voice.stop(frames)
+        elif voiceId in self.scheduledVoices:
+            self.scheduler.remove(self.scheduledVoices.pop(voiceId))
+            self.finishedVoices.append(voiceId)
+
+    def _setVoiceGain(self, voiceId:int, gain:float, frames:int):
+        voice = self.voices.get(voiceId)
+        if voice :
+            voice.setGain(gain, frames)
+
+    def _setVoicePanning(self, voiceId:int, pan:float, location:tuple):
+        voice = self.voices.get(voiceId)
+        if voice :
+            voice.setPanning(pan, location)
+
+    def _updatePanning(self):
+        """Compute in one pass the channel gains of the voices moved since the last block."""
+        voices = [voice for voice in self.voices.values() if voice.panChanged]
+        if not voices:
+            return
+
+        pans = np.array([voice.pan for voice in voices])
+        locations = np.array([voice.location if voice.location is not None else (np.nan, np.nan) for voice in voices], dtype=np.float64)
+
+        for voice, gains in zip(voices, Panner.gains(pans, locations)):
+            voice.setChannelGains(gains)
+
+    def _setStemGains(self, voiceId:int, gains:list, frames:int):
+        voice = self.voices.get(voiceId)
+        if isinstance(voice, StemVoice):
+            voice.setStemGains(gains, frames)
+
+    def _setEffectParameter(self, bus:str, name:str, parameter:str, value:float):
+        effect = self.buses[bus].effects.effect(name)
+        if effect :
+            effect.setParameter(parameter, value)
+
+    def _setBusGain(self, bus:str, gain:float, frames:int):
+        self.buses[bus].gain.set(gain, frames)
+
+    def process(self):
+        """Render the next block.
+            - Takes no parameter.
+            - Returns a float32 array of shape (blockSize, CHANNELS), reused by the next call.
+        """
+        start = time.perf_counter()
+
+        while self.commands:
+            command, args = self.commands.popleft()
+            command(*args)
+
+        self.scheduler.run(self.clock + self.blockSize)
+
+        self._updatePanning()
+
+        for bus in self.buses.values():
+            bus.clear()
+
+        for voiceId, voice in list(self.voices.items()):
+            offset = 0
+            if voice.startClock is not None and voice.startClock > self.clock:
+                offset = voice.startClock - self.clock
+                if offset >= self.blockSize:
+                    continue
+
+            voice.render(self.buses[voice.bus].buffer[offset:])
+            if voice.finished:
+                del self.voices[voiceId]
+                self.finishedVoices.append(voiceId)
+
+        for bus in self.buses.values():
+            bus.process()
+        self.ducker.process(self.buses[Mixer.EFFECTSBUS].buffer, self.buses[Mixer.MUSICBUS].buffer)
+
+        self.output.fill(0.0)
+        for bus in self.buses.values():
+            self.output += bus.buffer
+        np.clip(self.output, -1.0, 1.0, out=self.output)
+
+        self.clock += self.blockSize
+        self.processingTime = time.perf_counter() - start
+
+        return self.output
+
+    def load(self):
+        """Returns the share of the real time used by the last block, 1.0 meaning
+            that the mixer can barely keep up.
+            - Takes no parameter.
+            - Returns a float.
+        """
+        return self.processingTime * self.sampleRate / self.blockSize
@@ -1,68 +1,147 @@
 #---------------------------------
 #Author: Chappuis Anthony
 #
-#This class handle the music for the application. Uses two separate QMediaPlayers
+#This class handle the music for the application. Tracks are streamed from
+#their decoding and played by the audio engine on its music bus: tracks are crossfaded, or play
+#their outro when they have segment markers. Stem tracks follow the intensity.
+#The music bus can be muffled ("heard through a wall") or given a cave reverb.
 #
 #Application: DragonShout music sampler
-#Last Edited: October 05th 2017
+#Last Edited: October 19th 2026
 #---------------------------------
+import time
+
 from classes.interface import MainWindow
+from classes.library.Track import Track
+from classes.library.StemTrack import StemTrack
+from classes.multimedia.Mixer import Mixer
+from classes.multimedia.Playback import Playback
+from classes.multimedia.SegmentVoice import SegmentVoice
 
-from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent, QAudio
-from PyQt5.QtCore import QTimer
 from PyQt5.QtWidgets import QMessageBox
 
 class MusicPlayer():
 
-    FadeIn = 1
-    FadeOut = -1
     MaxVolume = 100
     MinVolume = 0
 
-    def __init__(self, mainWindow:MainWindow, volume:int=100):
-        #Constants
-        self.Pause = 50
-
-        self.NoVolume = 0
-        self.VolumeStep = 1
+    #Crossfade between two tracks and fade of the jump to an outro, in seconds
+    FadeDuration = Playback.FADEDURATION
+    VolumeFadeDuration = Playback.VOLUMEFADEDURATION
+    StemFadeDuration = 1.0
 
-        self.InFadingTimer = QTimer()
-        self.OutFadingTimer = QTimer()
+    MaxIntensity = 100
 
+    def __init__(self, mainWindow:MainWindow, volume:int=100):
         #variables
         self.volume = volume
         self.mainWindow = mainWindow
+        self.engine = mainWindow.audioEngine
+
+        #How a track with segments hands over to the next one
+        self.transition = SegmentVoice.BOUNDARY
+
+        #Intensity of the stem tracks, between 0 and 1
+        self.intensity = 1.0
+
+        #Music bus effects toggled live
+        self.muffled = False
+        self.reverb = False
 
-        self.player1 = QMediaPlayer()
-        self.player1.setAudioRole(QAudio.MusicRole)
-        self.player1.setVolume(self.NoVolume)
-        self.player1.mediaStatusChanged.connect(lambda *args: self.handlePlayerSignals(self.player1))
+        #Track being played, its voice and the track waiting to be decoded
+        self.currentTrack = None
+        self.voiceId = None
+        self.waitingTrack = None
 
-        self.player2 = QMediaPlayer()
-        self.player2.setAudioRole(QAudio.MusicRole)
-        self.player2.setVolume(self.NoVolume)
-        self.player2.mediaStatusChanged.connect(lambda *args: self.handlePlayerSignals(self.player2))
+        #filepath => (load latency in msec, file was warm when requested)
+        self.loadLatencies = {}
+        self.loadRequests = {}
 
+        Playback.installMusicEffects(self.engine.mixer)
 
-    def handlePlayerSignals(self, player:QMediaPlayer):
-        """Check which signal is emmited by the player.
+        self.engine.voiceFinished.connect(lambda voiceId: self.voiceFinished(voiceId))
+        self.mainWindow.samples.sampleReady.connect(lambda filepath: self.sampleReady(filepath))
+        self.mainWindow.samples.sampleFailed.connect(lambda filepath: self.sampleFailed(filepath))
+
+    def voiceFinished(self, voiceId:int):
+        """Play the next track when the current one reached its end.
             Takes one parameter :
-            - player as QMediaPlayer object.
+            - voiceId as integer.
         """
-        #Media loaded in the Player
-        if player.mediaStatus() == QMediaPlayer.LoadedMedia:
-            player.play()
-            self.fadeSound(player,MusicPlayer.FadeIn)
-            self.mainWindow.playlist.initiateDurationBar(player.duration())
-
-        #Player reached the end of the current media
-        if player.mediaStatus() == QMediaPlayer.EndOfMedia:
+        if voiceId == self.voiceId:
+            self.voiceId = None
+            self.currentTrack = None
             self.mainWindow.playlist.playNextMedia()
 
-        #Player encountered an error relative to the loaded media
-        if player.mediaStatus() == QMediaPlayer.InvalidMedia:
+    def sampleReady(self, filepath:str):
+        """Start the track waiting for its decoding.
+            Takes one parameter :
+            - filepath as string.
+        """
+        if self.waitingTrack and filepath in self.waitingTrack.get_locations():
+            self.changeMusic(self.waitingTrack)
+
+    def sampleFailed(self, filepath:str):
+        """Warn the user that the track waiting for its decoding can't be played.
+            Takes one parameter :
+            - filepath as string.
+        """
+        if self.waitingTrack and filepath in self.waitingTrack.get_locations():
+            self.loadRequests.pop(self.waitingTrack.location, None)
+            self.waitingTrack = None
             QMessageBox(QMessageBox.Critical,self.mainWindow.text.localisation('messageBoxes','loadMedia','title'),self.mainWindow.text.localisation('messageBoxes','loadMedia','caption')).exec()
 
+    def recordLoadLatency(self, filepath:str):
+        """Store the time elapsed between the track request and its start.
+            Takes one parameter:
+            - filepath as string.
+        """
+        request = self.loadRequests.pop(filepath, None)
+
+        if request :
+            requestTime, warm = request
+            self.loadLatencies[filepath] = ((time.perf_counter()-requestTime)*1000, warm)
+
+    def latencyReport(self):
+        """Returns the time taken by the tracks to start, with the open latencies
+            measured when they were read ahead.
+            Returns a list of tuples (filepath, load msec, warm when requested as boolean,
+            cold open msec or None, warm open msec or None).
+        """
+        latencies = {filepath: (cold, warm) for filepath, cold, warm in self.mainWindow.prefetcher.latencyReport()}
+        return [(filepath, load, requestedWarm) + latencies.get(filepath, (None, None))
+                for filepath, (load, requestedWarm) in self.loadLatencies.items()]
+
+    def createVoice(self, track:Track, streams:list):
+        """Create the voice playing a track.
+            Takes two parameters:
+            - track as Track object.
+            - streams as list of MusicStream objects, one per file of the track.
+            Returns a Voice object.
+        """
+        return Playback.trackVoice(track, streams, self.engine.mixer.sampleRate, self.intensity)
+
+    def streams(self, track:Track):
+        """Returns the streams of the files of a track, starting their decoding.
+            Takes one parameter:
+            - track as Track object.
+            Returns a list of MusicStream objects or None while one of them can't start.
+        """
+        streams = [self.mainWindow.samples.stream(location) for location in track.get_locations()]
+        if any(stream is None for stream in streams):
+            return None
+        return streams
+
+    def initiateDurationBar(self, track:Track, streams:list):
+        """Show the duration of a track starting, as expected while it is decoded.
+            Takes two parameters:
+            - track as Track object.
+            - streams as list of MusicStream objects.
+        """
+        length = max(stream.length() for stream in streams)
+        duration = int(length*1000/self.engine.mixer.sampleRate) if length else track.duration
+        self.mainWindow.playlist.initiateDurationBar(duration)
+
     def changeVolume(self, volume:int):
         """Change the volume of the MusicPlayer.
             Takes one parameter:
@@ -74,103 +153,110 @@ class MusicPlayer():
             volume = MusicPlayer.MinVolume
 
         self.volume = volume
-        self.player1.setVolume(self.volume)
-        self.player2.setVolume(self.volume)
-
+        self.engine.setBusGain(Mixer.MUSICBUS, self.volume/MusicPlayer.MaxVolume, MusicPlayer.VolumeFadeDuration)
 
-    def changeMusic(self,media:QMediaContent):
-        """Handle the change between two tracks using a fade-in/fade-out mechanism.
+    def changeMusic(self, track:Track):
+        """Hand over to another track. The track starts once decoded, the current
+            one keeps playing meanwhile.
             Takes one parameter:
-            - media as QMediaContent
-        """
-        player1State = self.player1.state()
-        player2State = self.player2.state()
-        #Both player are stopped
-        if player1State == QMediaPlayer.StoppedState and player2State == QMediaPlayer.StoppedState :
-            self.player1.setMedia(media)
-        else:
-            #Player 1 is running
-            if self.player1.state() == QMediaPlayer.PlayingState :
-                self.player2.setMedia(media)
-                self.fadeSound(self.player1,MusicPlayer.FadeOut)
-
-            #Player 2 is running
-            elif self.player2.state() == QMediaPlayer.PlayingState :
-                self.player1.setMedia(media)
-                self.fadeSound(self.player2,MusicPlayer.FadeOut)
-
-    def fadeSound(self, player:QMediaPlayer, fadingType:int):
-        """Defines if the fading action is a fade-In or a fade-out and call the corresponding timer and incrementOrDecrementVolume() function.
-            Takes two parameters:
-            - player as QMediaPlayer object.
-            - fadingType as MusicPlayer.FadeIn or MusicPlayer.FadeOut constants
+            - track as Track object.
         """
-        if fadingType == MusicPlayer.FadeIn :
-            self.InFadingTimer.timeout.connect(lambda *args: self.incrementOrDecrementVolume(player,MusicPlayer.FadeIn))
-            self.mainWindow.themes.toggleThemes(False)
-            self.InFadingTimer.start(self.Pause)
-        else:
-            self.OutFadingTimer.timeout.connect(lambda *args: self.incrementOrDecrementVolume(player,MusicPlayer.FadeOut))
-            self.mainWindow.themes.toggleThemes(False)
-            self.OutFadingTimer.start(self.Pause)
+        filepath = track.location
+        if filepath not in self.loadRequests:
+            self.loadRequests[filepath] = (time.perf_counter(), self.mainWindow.prefetcher.isWarm(filepath))
+
+        streams = self.streams(track)
+        if streams is None:
+            self.waitingTrack = track
+            return
+
+        self.waitingTrack = None
+        self.recordLoadLatency(filepath)
 
+        self.currentTrack = track
+        self.voiceId = self.engine.mixer.changeMusic(self.createVoice(track, streams), self.transition, MusicPlayer.FadeDuration)
+        self.initiateDurationBar(track, streams)
 
-    def incrementOrDecrementVolume(self, player:QMediaPlayer,fadingType:int):
-        """Fades the sound of the given player according to the fading type and stop the fading timer once done.
+    def scheduleMusic(self, track:Track, clock:int):
+        """Prepare a change of music at a precise frame of the audio engine. The
+            player follows it once adoptMusic() is called.
             Takes two parameters:
-            - player as QMediaPlayer object.
-            - fadingType as MusicPlayer.FadeIn or MusicPlayer.FadeOut constant.
+            - track as Track object.
+            - clock as integer, mixer clock.
+            Returns the voice id as integer or None if the track can't start yet.
+        """
+        streams = self.streams(track)
+        if streams is None:
+            return None
+        return self.engine.mixer.changeMusic(self.createVoice(track, streams), self.transition, MusicPlayer.FadeDuration, clock)
 
+    def adoptMusic(self, track:Track, voiceId:int):
+        """Follow a music started by the scheduler.
+            Takes two parameters:
+            - track as Track object.
+            - voiceId as integer.
         """
-        self.mainWindow.playlist.durationBar.setValue(player.volume())
-        volume = player.volume()
-        volume += self.VolumeStep*fadingType
-        player.setVolume(volume)
+        self.waitingTrack = None
+        self.currentTrack = track
+        self.voiceId = voiceId
+
+        streams = self.streams(track)
+        if streams is not None:
+            self.initiateDurationBar(track, streams)
 
-        if (player.volume() >= self.volume) and (fadingType == MusicPlayer.FadeIn) :
-            self.InFadingTimer.stop()
-            self.InFadingTimer.timeout.disconnect()
-            self.mainWindow.themes.toggleThemes(True)
+    def setIntensity(self, intensity:int):
+        """Fade the stems of the current track in or out according to the intensity.
+            Takes one parameter:
+            - intensity as integer between 0 and MaxIntensity.
+        """
+        self.intensity = min(max(intensity, 0), MusicPlayer.MaxIntensity)/MusicPlayer.MaxIntensity
 
-        if (player.volume() <= self.NoVolume) and (fadingType == MusicPlayer.FadeOut) :
-            self.OutFadingTimer.stop()
-            player.setMedia(QMediaContent())
-            player.stop()
-            self.OutFadingTimer.timeout.disconnect()
-            self.mainWindow.themes.toggleThemes(True)
+        if isinstance(self.currentTrack, StemTrack) and self.voiceId is not None:
+            self.engine.mixer.setStemGains(self.voiceId, self.currentTrack.get_stem_gains(self.intensity), MusicPlayer.StemFadeDuration)
+
+    def setMuffled(self, muffled:bool):
+        """Sweep the music bus low pass filter in or out.
+            Takes one parameter:
+            - muffled as boolean.
+        """
+        self.muffled = muffled
+        Playback.setMuffled(self.engine.mixer, muffled)
+
+    def setReverb(self, reverb:bool):
+        """Fade the music bus reverb in or out.
+            Takes one parameter:
+            - reverb as boolean.
+        """
+        self.reverb = reverb
+        Playback.setReverb(self.engine.mixer, reverb)
+
+    def setTransition(self, transition:str):
+        """Choose how tracks with segments hand over to the next one.
+            Takes one parameter:
+            - transition as one of the SegmentVoice constants: BOUNDARY, OUTRO.
+        """
+        self.transition = transition
 
     def stop(self):
-        """Stop all media players.
+        """Stop the music, through its outro for a track with segments.
             Takes no parameter.
         """
-        if self.player1.state() == QMediaPlayer.PlayingState :
-            self.fadeSound(self.player1,MusicPlayer.FadeOut)
-
-        if self.player2.state() == QMediaPlayer.PlayingState :
-            self.fadeSound(self.player2,MusicPlayer.FadeOut)
+        self.waitingTrack = None
+        self.voiceId = None
+        self.currentTrack = None
+        self.engine.mixer.stopMusic(SegmentVoice.OUTRO, MusicPlayer.FadeDuration)
 
     def getCurrentMedia(self):
-        """Returns the name of the track being played
+        """Returns the track being played
             Takes no parameter.
         """
-        player1State = self.player1.state()
-        player2State = self.player2.state()
-
-        if player1State == QMediaPlayer.PlayingState :
-            return self.player1.currentMedia()
-        elif player2State == QMediaPlayer.PlayingState :
-            return self.player2.currentMedia()
+        if self.currentTrack :
+            return self.currentTrack
         else :
             return False
 
     def isPlaying(self):
-        """Returns true if one of the MediaPlayer is active and false in the contrary.
+        """Returns true if a track is being played or about to be and false in the contrary.
             Takes no Parameter.
         """
-        player1State = self.player1.state()
-        player2State = self.player2.state()
-
-        if (player1State or player2State) == QMediaPlayer.PlayingState :
-            return True
-        else:
-            return False
+        return self.voiceId is not None or self.waitingTrack is not None
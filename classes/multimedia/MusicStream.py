@@ -0,0 +1,123 @@
+#---------------------------------
+#Author: Chappuis Anthony
+#
+#A music file decoded on a worker thread as 16 bit PCM frames written to a
+#temporary file, and read back block by block by the voice playing it. The
+#track starts once its first seconds are decoded and only the blocks being
+#played are held in memory, whatever the length of the track. Voices use it
+#like a float32 array of shape (frames, 2): len() and slices.
+#
+#Application: DragonShout music sampler
+#Last Edited: October 19th 2026
+#---------------------------------
+
+import sys
+import tempfile
+import threading
+
+import numpy as np
+
+from classes.multimedia.SoundDecoder import SoundDecoder
+
+class MusicStream():
+
+    #Seconds decoded before the track can start
+    HEADDURATION = 2.0
+
+    #Bytes of a frame: two channels of 16 bit samples
+    FRAMEBYTES = 4
+    SCALE = 32768
+
+    def __init__(self, filepath:str, sampleRate:int):
+        self.filepath = filepath
+        self.sampleRate = sampleRate
+
+        #Frames written so far and frames expected, 0 while unknown
+        self.available = 0
+        self.expectedFrames = 0
+        self.complete = False
+        self.error = None
+
+        #Deleted as soon as the stream is no longer used
+        self._file = tempfile.TemporaryFile(prefix='dragonShout')
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Returns the number of frames of the track. While it is decoded the track
+            is as long as possible, so that the voice never ends before the decoder.
+        """
+        return self.available if self.complete else sys.maxsize
+
+    def __getitem__(self, frames:slice):
+        """Returns frames of the track, silent where they aren't decoded yet.
+            - Takes one parameter:
+                - frames as slice, without step.
+            - Returns a float32 array of shape (frames, 2).
+        """
+        start = max(frames.start or 0, 0)
+        stop = max(frames.stop if frames.stop is not None else self.available, start)
+        if self.complete:
+            stop = min(stop, self.available)
+
+        result = np.zeros((stop - start, SoundDecoder.CHANNELS), dtype=np.float32)
+
+        with self._lock:
+            count = min(stop, self.available) - start
+            if count > 0:
+                self._file.seek(start*MusicStream.FRAMEBYTES)
+                data = self._file.read(count*MusicStream.FRAMEBYTES)
+
+        if count > 0:
+            samples = np.frombuffer(data, dtype='<i2').reshape(-1, SoundDecoder.CHANNELS)
+            np.multiply(samples, 1/MusicStream.SCALE, out=result[:len(samples)], casting='unsafe')
+        return result
+
+    def length(self):
+        """Returns the number of frames of the track: exact once decoded, expected
+            before, 0 if unknown.
+            - Takes no parameter.
+            - Returns an integer.
+        """
+        return self.available if self.complete else self.expectedFrames
+
+    def append(self, frames:np.ndarray):
+        """Add decoded frames at the end of the track.
+            - Takes one parameter:
+                - frames as float32 array of shape (frames, 2).
+            - Returns nothing.
+        """
+        samples = np.clip(np.rint(frames*MusicStream.SCALE), -MusicStream.SCALE, MusicStream.SCALE-1).astype('<i2')
+
+        with self._lock:
+            self._file.seek(self.available*MusicStream.FRAMEBYTES)
+            self._file.write(samples.tobytes())
+            self.available += len(samples)
+
+    def decode(self, started):
+        """Decode the whole file, on a worker thread.
+            - Takes one parameter:
+                - started as function taking a boolean, called once: True when the first
+                  seconds are decoded, False if nothing could be decoded.
+            - Returns nothing.
+        """
+        headFrames = int(MusicStream.HEADDURATION*self.sampleRate)
+        notified = []
+
+        def write(frames:np.ndarray):
+            self.append(frames)
+            if not notified and self.available >= headFrames:
+                notified.append(True)
+                started(True)
+
+        def setLength(frames:int):
+            self.expectedFrames = frames
+
+        try:
+            SoundDecoder.stream(self.filepath, self.sampleRate, write, setLength)
+        except (OSError, ValueError) as error:
+            #A file broken in the middle plays up to the error
+            self.error = str(error)
+
+        self.complete = True
+        if not notified:
+            started(self.available > 0)
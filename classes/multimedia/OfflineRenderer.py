@@ -0,0 +1,286 @@
+#---------------------------------
+#Author: Chappuis Anthony
+#
+#Render a scene or a sequence of a library to a sound file faster than real
+#time. The mixer is driven block after block by a virtual clock instead of
+#the sound card: music changes, fades, pads and bus effects go through the
+#same mixing path as in the live application. Files with the same content
+#are decoded once.
+#
+#Application: DragonShout music sampler
+#Last Edited: October 19th 2026
+#---------------------------------
+
+import time
+import random
+
+from classes.library.Library import Library
+from classes.library.Category import Category
+from classes.library.Scene import Scene
+from classes.library.Sequence import Sequence
+from classes.library.SampleSet import SampleSet
+from classes.multimedia.Mixer import Mixer
+from classes.multimedia.Ducker import Ducker
+from classes.multimedia.Playback import Playback
+from classes.multimedia.SegmentVoice import SegmentVoice
+from classes.multimedia.SoundDecoder import SoundDecoder
+from classes.multimedia.AudioFileWriter import AudioFileWriter
+
+class OfflineRenderer():
+
+    #Default length of a scene render and silence kept after a sequence, in seconds
+    SCENEDURATION = 60.0
+    TAIL = 3.0
+
+    #Volumes used by the application when nothing else is set
+    DEFAULTVOLUME = 50
+    MAXVOLUME = 100
+
+    def load(cls, filepath:str, sampleRate:int=Mixer.SAMPLERATE, blockSize:int=Mixer.BLOCKSIZE, seed:int=None, contents=None):
+        """Create a renderer working on a library file and its sample set.
+            - Takes five parameters:
+                - filepath as string.
+                - sampleRate as integer.
+                - blockSize as integer.
+                - seed as integer or None, to get the same random choices on every render.
+                - contents as ContentIndex or None, giving the file decoded for the files with the same content.
+            - Returns an OfflineRenderer object.
+            - Raises ValueError if the file can't be read as a library.
+        """
+        library = Library.load(filepath)
+        if not library :
+            raise ValueError('{}: not a library file'.format(filepath))
+        return OfflineRenderer(library, sampleRate, blockSize, seed, contents)
+    load = classmethod(load)
+
+    def __init__(self, library:Library, sampleRate:int=Mixer.SAMPLERATE, blockSize:int=Mixer.BLOCKSIZE, seed:int=None, contents=None):
+        self.library = library
+        self.contents = contents
+
+        self.mixer = Mixer(sampleRate, blockSize)
+        Playback.installMusicEffects(self.mixer)
+        self.random = random.Random(seed)
+
+        self.sampleSet = None
+        self.setSampleSet(library.sample_set or SampleSet())
+        self.mixer.setBusGain(Mixer.MUSICBUS, OfflineRenderer.DEFAULTVOLUME/OfflineRenderer.MAXVOLUME)
+        self.mixer.setBusGain(Mixer.EFFECTSBUS, OfflineRenderer.DEFAULTVOLUME/OfflineRenderer.MAXVOLUME)
+
+        #filepath decoded => decoded buffer, None when the file couldn't be decoded
+        self.buffers = {}
+        self.missingFiles = []
+        self.decodingTime = 0.0
+
+        #Theme played, row of its track and the voice playing it
+        self.theme = None
+        self.trackRow = 0
+        self.musicVoiceId = None
+
+    def setSampleSet(self, sampleSet:SampleSet):
+        """Play the pads of a sample set and apply its ducking.
+            - Takes one parameter:
+                - sampleSet as SampleSet object.
+            - Returns nothing.
+        """
+        self.sampleSet = sampleSet
+
+        ducking = sampleSet.ducking
+        self.mixer.setDucking(ducking.get("enabled", True), ducking.get("threshold", Ducker.THRESHOLD), ducking.get("depth", Ducker.DEPTH),
+                                ducking.get("attack", Ducker.ATTACK), ducking.get("release", Ducker.RELEASE))
+
+    def buffer(self, filepath:str):
+        """Returns a decoded sound file, decoding it the first time.
+            - Takes one parameter:
+                - filepath as string.
+            - Returns a float32 array or None if the file can't be decoded.
+        """
+        decodedPath = self.contents.canonical(filepath) if self.contents else filepath
+        if decodedPath not in self.buffers:
+            start = time.perf_counter()
+            try:
+                self.buffers[decodedPath] = SoundDecoder.decode(decodedPath, self.mixer.sampleRate)
+            except (OSError, ValueError):
+                self.buffers[decodedPath] = None
+                self.missingFiles.append(filepath)
+            self.decodingTime += time.perf_counter() - start
+        return self.buffers[decodedPath]
+
+    #Music
+    def playTrack(self, theme:Category, row:int, clock:int):
+        """Hand the music over to a track of a theme, skipping the tracks that can't
+            be decoded.
+            - Takes three parameters:
+                - theme as Category object.
+                - row as integer, index of the track in the theme.
+                - clock as integer, mixer clock of the change.
+            - Returns the row of the track played and its voice id, (None, None) if no
+              track of the theme can be played.
+        """
+        tracks = theme.tracks
+        for offset in range(len(tracks)):
+            track = tracks[(row+offset) % len(tracks)]
+            buffers = [self.buffer(location) for location in track.get_locations()]
+            if all(buffer is not None for buffer in buffers):
+                voice = Playback.trackVoice(track, buffers, self.mixer.sampleRate)
+                return (row+offset) % len(tracks), self.mixer.changeMusic(voice, SegmentVoice.BOUNDARY, Playback.FADEDURATION, clock)
+        return None, None
+
+    def changeTheme(self, theme:Category, clock:int):
+        """Start a random track of a theme at a precise frame, as the playlist does.
+            The theme is followed once the mixer reaches the change.
+            - Takes two parameters:
+                - theme as Category object.
+                - clock as integer, mixer clock of the change.
+            - Returns nothing.
+        """
+        if not theme or not theme.tracks:
+            return
+
+        row, voiceId = self.playTrack(theme, self.random.randrange(len(theme.tracks)), clock)
+        if voiceId is not None:
+            self.mixer.notify(clock, ('theme', theme, row, voiceId))
+
+    #Pads
+    def triggerPad(self, key:tuple, clock:int):
+        """Start a pad at a precise frame with the randomization of the live pads.
+            - Takes two parameters:
+                - key as (bank, row, column) tuple.
+                - clock as integer, mixer clock of the trigger.
+            - Returns the voice id as integer or None if the pad can't be played.
+        """
+        pad = self.sampleSet.get_pad(*key)
+        if pad is None or not pad.get_sound_files():
+            return None
+
+        buffer = self.buffer(pad.filepaths[pad.next_variation(self.random)])
+        if buffer is None:
+            return None
+
+        voice = Playback.triggerVoice(pad, buffer, self.mixer.sampleRate, generator=self.random)
+        return self.mixer.play(voice, clock)
+
+    #Scenes and sequences
+    def applyScene(self, scene:Scene, clock:int=0):
+        """Apply a scene: theme, volumes, looping pads and music effects. Music effects
+            change at the next block.
+            - Takes two parameters:
+                - scene as Scene object.
+                - clock as integer, mixer clock of the theme and pads.
+            - Returns nothing.
+        """
+        self.mixer.setBusGain(Mixer.MUSICBUS, scene.music_volume/OfflineRenderer.MAXVOLUME, Playback.VOLUMEFADEDURATION, clock)
+        self.mixer.setBusGain(Mixer.EFFECTSBUS, scene.sampler_volume/OfflineRenderer.MAXVOLUME, Playback.VOLUMEFADEDURATION, clock)
+        self.changeTheme(self.library.get_category(scene.theme), clock)
+
+        for loop in scene.loops:
+            pad = self.sampleSet.get_pad(*loop)
+            if pad and pad.loop :
+                self.triggerPad(loop, clock)
+
+        Playback.setMuffled(self.mixer, scene.effects.get("muffled", False))
+        Playback.setReverb(self.mixer, scene.effects.get("reverb", False))
+
+    def scheduleSequence(self, sequence:Sequence, clock:int=0):
+        """Hand every step of a sequence over to the mixer scheduler.
+            - Takes two parameters:
+                - sequence as Sequence object.
+                - clock as integer, mixer clock of the start of the sequence.
+            - Returns nothing.
+        """
+        for step in sequence.steps:
+            stepClock = clock + self.mixer.frames(step["offset"])
+
+            if step["type"] == Sequence.PAD_STEP:
+                self.triggerPad((step["bank"], step["row"], step["column"]), stepClock)
+
+            elif step["type"] == Sequence.FADE_STEP:
+                self.mixer.setBusGain(step["bus"], step["volume"]/OfflineRenderer.MAXVOLUME,
+                                        max(step["duration"], Playback.VOLUMEFADEDURATION), stepClock)
+
+            elif step["type"] == Sequence.THEME_STEP:
+                self.changeTheme(self.library.get_category(step["theme"]), stepClock)
+
+    def followEvents(self):
+        """Do what the interface does when the mixer reaches an event: follow the
+            theme changes and play the next track when the music ends.
+            - Takes no parameter.
+            - Returns nothing.
+        """
+        while self.mixer.dueEvents:
+            event = self.mixer.dueEvents.popleft()
+            if event[0] == 'theme':
+                self.theme, self.trackRow, self.musicVoiceId = event[1:]
+
+        while self.mixer.finishedVoices:
+            voiceId = self.mixer.finishedVoices.popleft()
+            if voiceId == self.musicVoiceId :
+                self.trackRow, self.musicVoiceId = self.playTrack(self.theme, self.trackRow+1, self.mixer.clock)
+
+    def render(self, filepath:str, duration:float):
+        """Render the mix scheduled so far to a sound file.
+            - Takes two parameters:
+                - filepath as string, .wav or .flac.
+                - duration as float, in seconds.
+            - Returns a dictionnary: duration, renderTime and decodingTime in seconds,
+              speed as multiple of the real time and missingFiles as list. The decoding
+              time counts every file decoded since the renderer was created, including
+              the ones decoded while the scene and the sequence were scheduled.
+            - Raises ValueError if the output format isn't supported.
+        """
+        writer = AudioFileWriter(filepath, self.mixer.sampleRate, Mixer.CHANNELS)
+        frames = self.mixer.frames(duration)
+
+        start = time.perf_counter()
+        try:
+            while writer.frames < frames:
+                block = self.mixer.process()
+                writer.write(block[:frames-writer.frames])
+                self.followEvents()
+        finally:
+            writer.close()
+        renderTime = time.perf_counter() - start
+
+        return {"duration":     frames/self.mixer.sampleRate,
+                "renderTime":   renderTime,
+                "decodingTime": self.decodingTime,
+                "speed":        frames/self.mixer.sampleRate/max(renderTime, 1e-9),
+                "missingFiles": list(self.missingFiles)}
+
+    def renderScene(self, name:str, filepath:str, duration:float=SCENEDURATION):
+        """Render a scene of the library.
+            - Takes three parameters:
+                - name as string.
+                - filepath as string, .wav or .flac.
+                - duration as float, in seconds.
+            - Returns the report of render().
+            - Raises KeyError if the scene doesn't exist.
+        """
+        scene = self.library.get_scene(name)
+        if not scene :
+            raise KeyError(name)
+
+        self.applyScene(scene, self.mixer.clock)
+        return self.render(filepath, duration)
+
+    def renderSequence(self, name:str, filepath:str, sceneName:str='', tail:float=TAIL):
+        """Render a sequence of the library, optionally played over a scene.
+            - Takes four parameters:
+                - name as string.
+                - filepath as string, .wav or .flac.
+                - sceneName as string, scene applied at the start ('' for none).
+                - tail as float, seconds rendered after the last step.
+            - Returns the report of render().
+            - Raises KeyError if the sequence or the scene doesn't exist.
+        """
+        sequence = self.library.get_sequence(name)
+        if not sequence :
+            raise KeyError(name)
+
+        if sceneName :
+            scene = self.library.get_scene(sceneName)
+            if not scene :
+                raise KeyError(sceneName)
+            self.applyScene(scene, self.mixer.clock)
+
+        self.scheduleSequence(sequence, self.mixer.clock)
+        return self.render(filepath, sequence.get_duration() + tail)
@@ -0,0 +1,53 @@
+#---------------------------------
+#Author: Chappuis Anthony
+#
+#Stereo placement of the voices. The left and right gains of every voice to
+#update are computed at once as a gain matrix: equal power panning, either
+#from a pan value or from a position around the listener, with a distance
+#attenuation for positioned voices.
+#
+#Application: DragonShout music sampler
+#Last Edited: October 19th 2026
+#---------------------------------
+
+import math
+
+import numpy as np
+
+from classes.library.Pad import Pad
+
+class Panner():
+
+    #Distance in meters under which a positioned voice is not attenuated and
+    #how fast it fades beyond it (inverse distance law)
+    REFERENCEDISTANCE = 1.0
+    ROLLOFF = 1.0
+
+    #Farthest position in meters
+    MAXDISTANCE = Pad.MAX_DISTANCE
+
+    def gains(cls, pans:np.ndarray, locations:np.ndarray):
+        """Compute the channel gains of several voices.
+            - Takes two parameters:
+                - pans as float array of shape (voices,), from -1 (left) to 1 (right).
+                - locations as float array of shape (voices, 2): x (left/right) and
+                y (front) in meters, NaN for the voices only panned.
+            - Returns a float32 array of shape (voices, 2), centered voices having a gain of 1.
+        """
+        positioned = ~np.isnan(locations[:, 0])
+        x = np.where(positioned, locations[:, 0], 0.0)
+        y = np.where(positioned, locations[:, 1], 0.0)
+
+        distance = np.hypot(x, y)
+        direction = np.divide(x, distance, out=np.zeros_like(x), where=distance > 0)
+
+        pans = np.clip(np.where(positioned, direction, pans), -1.0, 1.0)
+        attenuation = np.where(positioned,
+            cls.REFERENCEDISTANCE / (cls.REFERENCEDISTANCE + cls.ROLLOFF*(np.maximum(distance, cls.REFERENCEDISTANCE) - cls.REFERENCEDISTANCE)),
+            1.0)
+
+        angles = (pans + 1)*math.pi/4
+        gains = np.stack((np.cos(angles), np.sin(angles)), axis=1)
+        gains *= (math.sqrt(2)*attenuation)[:, None]
+        return gains.astype(np.float32)
+    gains = classmethod(gains)
@@ -0,0 +1,138 @@
+#---------------------------------
+#Author: Chappuis Anthony
+#
+#Rules turning tracks and pads into mixer voices and setting up the music
+#bus effects. They don't depend on Qt so that the live players and the
+#offline renderer produce exactly the same mix.
+#
+#Application: DragonShout music sampler
+#Last Edited: October 19th 2026
+#---------------------------------
+
+import random
+
+import numpy as np
+
+from classes.library.StemTrack import StemTrack
+from classes.library.Pad import Pad
+from classes.multimedia.Mixer import Mixer
+from classes.multimedia.Voice import Voice
+from classes.multimedia.LoopVoice import LoopVoice
+from classes.multimedia.SegmentVoice import SegmentVoice
+from classes.multimedia.StemVoice import StemVoice
+from classes.multimedia.BiquadFilter import BiquadFilter
+from classes.multimedia.Reverb import Reverb
+
+class Playback():
+
+    #Crossfade between two tracks and fade of the jump to an outro, in seconds
+    FADEDURATION = 5.0
+    JUMPFADEDURATION = 0.05
+    VOLUMEFADEDURATION = 0.05
+
+    #Music bus effects
+    MUFFLEEFFECT = 'muffle'
+    REVERBEFFECT = 'reverb'
+    MUFFLEDFREQUENCY = 600.0
+    REVERBDECAY = 3.0
+    REVERBWET = 0.35
+
+    #Loop crossfade of the pads, in seconds
+    LOOPCROSSFADE = Pad.LOOP_CROSSFADE
+
+    def trackVoice(cls, track, buffers:list, sampleRate:int, intensity:float=1.0):
+        """Create the voice playing a track on the music bus.
+            - Takes four parameters:
+                - track as Track or StemTrack object.
+                - buffers as list of float32 arrays or MusicStream objects, one per file of the track.
+                - sampleRate as integer.
+                - intensity as float between 0 and 1, for stem tracks.
+            - Returns a Voice object.
+        """
+        if isinstance(track, StemTrack):
+            return StemVoice(buffers, Mixer.MUSICBUS, 1.0, track.get_stem_gains(intensity))
+
+        segments = track.segments
+        if not segments :
+            return Voice(buffers[0], Mixer.MUSICBUS)
+
+        frames = lambda seconds: int(round(seconds*sampleRate))
+        return SegmentVoice(buffers[0], Mixer.MUSICBUS, 1.0, frames(segments["loopStart"]), frames(segments["loopEnd"]),
+                            frames(segments.get("barLength", 0)), 0, frames(cls.JUMPFADEDURATION), sampleRate)
+    trackVoice = classmethod(trackVoice)
+
+    def padVoice(cls, buffer:np.ndarray, sampleRate:int, gain:float=1.0, rate:float=1.0, pan:float=0.0, location:tuple=None,
+                    loop:bool=False, loopStart:float=None, loopEnd:float=None, loopCrossfade:float=LOOPCROSSFADE):
+        """Create the voice of a pad trigger on the effects bus.
+            - Takes ten parameters:
+                - buffer as float32 array.
+                - sampleRate as integer.
+                - gain as float.
+                - rate as float, playback speed of one shots (1.0 for the original pitch).
+                - pan as float, from -1 (left) to 1 (right).
+                - location as (x, y) tuple in meters or None, replacing the pan when given.
+                - loop as boolean.
+                - loopStart as float in seconds, None to find it automatically.
+                - loopEnd as float in seconds, None to find it automatically.
+                - loopCrossfade as float in seconds.
+            - Returns a Voice object.
+        """
+        frames = lambda seconds: None if seconds is None else int(round(seconds*sampleRate))
+
+        if loop :
+            voice = LoopVoice(buffer, Mixer.EFFECTSBUS, gain, frames(loopStart), frames(loopEnd), frames(loopCrossfade), sampleRate)
+        else:
+            voice = Voice(buffer, Mixer.EFFECTSBUS, gain)
+            if rate != 1.0:
+                voice.setRate(rate)
+
+        if pan or location :
+            voice.setPanning(pan, location)
+
+        return voice
+    padVoice = classmethod(padVoice)
+
+    def triggerVoice(cls, pad:Pad, buffer:np.ndarray, sampleRate:int, gain:float=1.0, generator:random.Random=random):
+        """Create the voice of a pad trigger, randomized with the pad settings.
+            - Takes five parameters:
+                - pad as Pad object.
+                - buffer as float32 array, the variation to play.
+                - sampleRate as integer.
+                - gain as float, volume of the pad. The sampler volume is the gain of the effects bus.
+                - generator as random.Random, the random module by default.
+            - Returns a Voice object.
+        """
+        return cls.padVoice(buffer, sampleRate, gain*pad.trigger_gain(generator), pad.trigger_rate(generator), pad.trigger_pan(generator),
+                            pad.location, pad.loop, pad.loop_start, pad.loop_end, pad.loop_crossfade)
+    triggerVoice = classmethod(triggerVoice)
+
+    def installMusicEffects(cls, mixer:Mixer):
+        """Add the muffle filter and the reverb, both off, to the music bus.
+            - Takes one parameter:
+                - mixer as Mixer object.
+            - Returns nothing.
+        """
+        mixer.addEffect(Mixer.MUSICBUS, BiquadFilter(cls.MUFFLEEFFECT, mixer.sampleRate, mixer.blockSize, BiquadFilter.LOWPASS))
+        mixer.addEffect(Mixer.MUSICBUS, Reverb(cls.REVERBEFFECT, mixer.sampleRate, mixer.blockSize, cls.REVERBDECAY, wet=0.0))
+    installMusicEffects = classmethod(installMusicEffects)
+
+    def setMuffled(cls, mixer:Mixer, muffled:bool):
+        """Sweep the music bus low pass filter in or out.
+            - Takes two parameters:
+                - mixer as Mixer object.
+                - muffled as boolean.
+            - Returns nothing.
+        """
+        frequency = cls.MUFFLEDFREQUENCY if muffled else BiquadFilter.MAXFREQUENCY
+        mixer.setEffectParameter(Mixer.MUSICBUS, cls.MUFFLEEFFECT, 'frequency', frequency)
+    setMuffled = classmethod(setMuffled)
+
+    def setReverb(cls, mixer:Mixer, reverb:bool):
+        """Fade the music bus reverb in or out.
+            - Takes two parameters:
+                - mixer as Mixer object.
+                - reverb as boolean.
+            - Returns nothing.
+        """
+        mixer.setEffectParameter(Mixer.MUSICBUS, cls.REVERBEFFECT, 'wet', cls.REVERBWET if reverb else 0.0)
+    setReverb = classmethod(setReverb)
@@ -0,0 +1,211 @@
+#---------------------------------
+#Author: Chappuis Anthony
+#
+#This class warms the operating system page cache with the files that are
+#likely to be played soon (next tracks of the playlist, sampler pads) so that
+#the first read made by the media players does not stall on slow drives or
+#network shares. It also measures cold/warm open latencies for each file.
+#Of the files with the same content, only the one decoded is read. Files are
+#read in the order asked, the tracks coming next before the sampler pads.
+#
+#Application: DragonShout music sampler
+#Last Edited: October 19th 2026
+#---------------------------------
+
+import os
+import time
+import threading
+from collections import deque, OrderedDict
+
+class Prefetcher():
+
+    #Read-ahead settings
+    CHUNKSIZE = 256*1024
+    PROBESIZE = 64*1024
+    MAXFILESIZE = 512*1024*1024
+
+    #I/O budget in bytes per second spent by the read-ahead worker
+    DEFAULTBUDGET = 32*1024*1024
+
+    #Maximum number of files waiting to be warmed, per priority, and remembered as warm
+    MAXPENDING = 64
+    MAXWARMED = 512
+
+    #Priorities, the files of the first queue being read first: hints of the
+    #session, never dropped, tracks played next, then sound files warmed in
+    #bulk such as the pads of a bank
+    HINT = 0
+    NEXT = 1
+    BULK = 2
+
+    def __init__(self, budget:int=DEFAULTBUDGET, contents=None):
+        self.budget = budget
+
+        #ContentIndex giving the file read for the files with the same content
+        self.contents = contents
+
+        #filepath => {'cold': msec, 'warm': msec, 'size': bytes}
+        self.latencies = OrderedDict()
+
+        #One queue of files waiting to be warmed per priority
+        self._pending = [deque(), deque(), deque()]
+        self._warmed = OrderedDict()
+        self._condition = threading.Condition()
+
+        self._worker = threading.Thread(target=self._run, name='Prefetcher', daemon=True)
+        self._worker.start()
+
+    def prefetch(self, filepaths:list, priority:int=NEXT):
+        """Queue files to be read ahead in the background, in the given order. Files
+            already warm or already queued with the same or a higher priority are ignored.
+            When a queue is full the oldest requests are dropped, the files of a request
+            being kept in their order. Files of a priority never push out the others and
+            hints are never dropped, so they must be few.
+            - Takes two parameters:
+                - filepaths as list of string.
+                - priority as integer, Prefetcher.HINT, Prefetcher.NEXT or Prefetcher.BULK.
+            - Returns nothing.
+        """
+        if self.contents :
+            filepaths = [self.contents.canonical(filepath) if filepath else filepath for filepath in filepaths]
+
+        with self._condition:
+            queue = self._pending[priority]
+            queued = 0
+            for filepath in filepaths:
+                if not filepath or filepath in self._warmed :
+                    continue
+                if any(filepath in self._pending[higher] for higher in range(priority+1)):
+                    continue
+                if priority != Prefetcher.HINT:
+                    if queued >= Prefetcher.MAXPENDING:
+                        break
+                    if len(queue) >= Prefetcher.MAXPENDING:
+                        queue.popleft()
+                queued += 1
+
+                #Files asked again with a higher priority move up
+                for lower in self._pending[priority+1:]:
+                    if filepath in lower:
+                        lower.remove(filepath)
+                queue.append(filepath)
+
+            self._condition.notify()
+
+    def isWarm(self, filepath:str):
+        """Returns True if the file has been read ahead by this prefetcher.
+            - Takes one parameter:
+                - filepath as string.
+            - Returns a boolean.
+        """
+        if self.contents :
+            filepath = self.contents.canonical(filepath)
+
+        with self._condition:
+            return filepath in self._warmed
+
+    def forget(self, filepath:str):
+        """Forget that a file was warmed (for instance when it has been modified).
+            - Takes one parameter:
+                - filepath as string.
+            - Returns nothing.
+        """
+        with self._condition:
+            self._warmed.pop(filepath, None)
+
+    def measure(self, filepaths:list):
+        """Read files ahead on the calling thread, measuring their open latencies, for
+            the command line. Missing or unreadable files are passed.
+            - Takes one parameter:
+                - filepaths as list of strings.
+            - Returns the latency report, as latencyReport().
+        """
+        for filepath in filepaths:
+            try:
+                self._warm(filepath)
+            except OSError:
+                continue
+        return self.latencyReport()
+
+    def latencyReport(self):
+        """Returns the open latencies measured for each file, before and after it was read ahead.
+            - Takes no parameter.
+            - Returns a list of tuples (filepath, cold msec, warm msec).
+        """
+        with self._condition:
+            return [(filepath, values['cold'], values['warm']) for filepath, values in self.latencies.items()]
+
+    def _run(self):
+        """Worker loop: waits for files to warm and reads them one after the other.
+            - Takes no parameter.
+            - Returns nothing.
+        """
+        while True:
+            with self._condition:
+                while not any(self._pending):
+                    self._condition.wait()
+                filepath = next(queue for queue in self._pending if queue).popleft()
+
+            try:
+                self._warm(filepath)
+            except OSError:
+                #Missing or unreadable files are reported by the players themselves
+                continue
+
+    def _probe(self, filepath:str):
+        """Measure the time needed to open a file and read its first bytes.
+            - Takes one parameter:
+                - filepath as string.
+            - Returns the latency in msec as float.
+        """
+        start = time.perf_counter()
+        with open(filepath, 'rb', buffering=0) as probedFile:
+            probedFile.read(Prefetcher.PROBESIZE)
+        return (time.perf_counter()-start)*1000
+
+    def _warm(self, filepath:str):
+        """Read a file ahead: hint the kernel with posix_fadvise when available then
+            read it through in chunks without exceeding the I/O budget, which also
+            works on network mounts ignoring the hint.
+            - Takes one parameter:
+                - filepath as string.
+            - Returns nothing.
+        """
+        size = os.path.getsize(filepath)
+        if size > Prefetcher.MAXFILESIZE:
+            return
+
+        coldLatency = self._probe(filepath)
+
+        with open(filepath, 'rb', buffering=0) as warmedFile:
+            if hasattr(os, 'posix_fadvise'):
+                os.posix_fadvise(warmedFile.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+
+            windowStart = time.perf_counter()
+            windowBytes = 0
+            while True:
+                chunk = warmedFile.read(Prefetcher.CHUNKSIZE)
+                if not chunk:
+                    break
+
+                #Throttle the worker so that it never competes with the players
+                windowBytes += len(chunk)
+                elapsed = time.perf_counter()-windowStart
+                expected = windowBytes/self.budget
+                if expected > elapsed:
+                    time.sleep(expected-elapsed)
+                if elapsed >= 1:
+                    windowStart = time.perf_counter()
+                    windowBytes = 0
+
+        warmLatency = self._probe(filepath)
+
+        with self._condition:
+            self._warmed[filepath] = True
+            if len(self._warmed) > Prefetcher.MAXWARMED:
+                self._warmed.popitem(last=False)
+
+            self.latencies[filepath] = {'cold': coldLatency, 'warm': warmLatency, 'size': size}
+            self.latencies.move_to_end(filepath)
+            if len(self.latencies) > Prefetcher.MAXWARMED:
+                self.latencies.popitem(last=False)
@@ -0,0 +1,98 @@
+#---------------------------------
+#Author: Chappuis Anthony
+#
+#Feedback delay network reverb. Every delay line is longer than a block, so
+#a whole block can be read from the lines before the feedback of that block
+#is written back: the network is processed without any loop over the frames.
+#
+#Application: DragonShout music sampler
+#Last Edited: October 19th 2026
+#---------------------------------
+
+import numpy as np
+
+from classes.multimedia.Effect import Effect
+from classes.multimedia.Biquad import Biquad
+from classes.multimedia.GainRamp import GainRamp
+
+class Reverb(Effect):
+
+    #Delay line lengths in frames at 44.1kHz, scaled to the sample rate
+    DELAYS = (1116, 1188, 1277, 1356, 1422, 1491, 1557, 1617)
+    REFERENCERATE = 44100
+
+    #Parameter limits
+    MINDECAY = 0.1
+    MAXDECAY = 20.0
+    MAXDAMPING = 0.95
+
+    def __init__(self, name:str, sampleRate:int, blockSize:int, decay:float=2.0, damping:float=0.3, wet:float=0.3, channels:int=2):
+        super().__init__(name, sampleRate, blockSize, channels)
+
+        lines = len(Reverb.DELAYS)
+        self.delays = np.array([max(blockSize, int(round(delay*sampleRate/Reverb.REFERENCERATE))) for delay in Reverb.DELAYS])
+        self.lines = [np.zeros(delay, dtype=np.float32) for delay in self.delays]
+        self.positions = [0]*lines
+
+        #Householder matrix: lossless mixing of the lines
+        self.matrix = (np.eye(lines) - 2.0/lines*np.ones((lines, lines))).astype(np.float32)
+
+        #High frequencies fade faster than low ones, one low pass per line
+        self.damping = Biquad(blockSize, lines)
+        self.feedback = np.ones(lines, dtype=np.float32)
+        self.wet = GainRamp(wet)
+        self.outputs = np.zeros((blockSize, lines), dtype=np.float32)
+
+        #Reverberation time in seconds, damping from 0 to MAXDAMPING and wet level
+        self.addParameter('decay', decay)
+        self.addParameter('damping', damping)
+        self.addParameter('wet', wet)
+
+        self.update()
+
+    def update(self):
+        decay = min(max(self.parameters['decay'], Reverb.MINDECAY), Reverb.MAXDECAY)
+        damping = min(max(self.parameters['damping'], 0.0), Reverb.MAXDAMPING)
+
+        #Each line loses 60dB over the reverberation time
+        self.feedback = (10**(-3*self.delays/(decay*self.sampleRate))).astype(np.float32)
+        self.damping.setCoefficients(1 - damping, 0.0, 0.0, -damping, 0.0)
+        self.wet.set(self.parameters['wet'], self.blockSize)
+
+    def isNeutral(self):
+        return self.parameters['wet'] == 0.0 and not self.wet.isRamping()
+
+    def reset(self):
+        for line in self.lines:
+            line.fill(0.0)
+        self.damping.reset()
+
+    def render(self, block:np.ndarray):
+        frames = len(block)
+        outputs = self.outputs[:frames]
+
+        #Lines output the frames written one delay ago
+        indexes = []
+        for line, (position, delay) in enumerate(zip(self.positions, self.delays)):
+            index = (position + np.arange(frames)) % delay
+            outputs[:, line] = self.lines[line][index]
+            indexes.append(index)
+
+        feedback = outputs.copy()
+        self.damping.process(feedback)
+        feedback *= self.feedback
+        feedback = feedback @ self.matrix
+        feedback += block.mean(axis=1, keepdims=True)
+
+        for line, index in enumerate(indexes):
+            self.lines[line][index] = feedback[:, line]
+            self.positions[line] = (self.positions[line] + frames) % self.delays[line]
+
+        #Even lines feed the left channel and odd lines the right one
+        wet = np.empty_like(block)
+        wet[:, 0] = outputs[:, 0::2].sum(axis=1)
+        wet[:, -1] = outputs[:, 1::2].sum(axis=1)
+        wet *= 2.0/len(self.lines)
+
+        self.wet.apply(wet)
+        block += wet
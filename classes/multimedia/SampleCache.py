@@ -0,0 +1,247 @@
+#---------------------------------
+#Author: Chappuis Anthony
+#
+#Cache of the sounds decoded for the mixer. Files are decoded on worker
+#threads ahead of time so that a pad starts without waiting for its file.
+#The least recently used sounds are dropped above a memory budget. Files with
+#the same content are decoded and kept once. Music files are not kept whole:
+#they are streamed, starting as soon as their first seconds are decoded.
+#
+#Application: DragonShout music sampler
+#Last Edited: October 19th 2026
+#---------------------------------
+
+import os
+from collections import OrderedDict
+
+from classes.multimedia.SoundDecoder import SoundDecoder
+from classes.multimedia.MusicStream import MusicStream
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+class SampleJob(QRunnable):
+
+    def __init__(self, sampleCache:QObject, key:str, path:str, sampleRate:int):
+        super().__init__()
+        self.sampleCache = sampleCache
+        self.key = key
+        self.path = path
+        self.sampleRate = sampleRate
+
+    def run(self):
+        """Decode the sound and give it back to the cache.
+            - Takes no parameter.
+            - Returns nothing.
+        """
+        try:
+            buffer = SoundDecoder.decode(self.path, self.sampleRate)
+        except (OSError, ValueError):
+            buffer = None
+
+        self.sampleCache.sampleDecoded.emit(self.key, buffer)
+
+class StreamJob(QRunnable):
+
+    def __init__(self, sampleCache:QObject, key:str, stream:MusicStream):
+        super().__init__()
+        self.sampleCache = sampleCache
+        self.key = key
+        self.stream = stream
+
+    def run(self):
+        """Decode a music file, telling the cache once it can start.
+            - Takes no parameter.
+            - Returns nothing.
+        """
+        self.stream.decode(lambda started: self.sampleCache.streamStarted.emit(self.key, started))
+
+class SampleCache(QObject):
+
+    #Memory kept for decoded sounds, in bytes
+    MAXBYTES = 1024*1024*1024
+
+    #Music files kept decoded, the ones being played excepted
+    MAXSTREAMS = 4
+
+    #Emitted from the worker threads, received in the GUI thread
+    sampleDecoded = pyqtSignal(str, object)
+    streamStarted = pyqtSignal(str, bool)
+
+    #Emitted with the sound path once it is decoded, or when it can't be
+    sampleReady = pyqtSignal(str)
+    sampleFailed = pyqtSignal(str)
+
+    def __init__(self, sampleRate:int, maxBytes:int=MAXBYTES, contents=None):
+        super().__init__()
+
+        self.sampleRate = sampleRate
+        self.maxBytes = maxBytes
+        self.size = 0
+
+        #ContentIndex giving the file read for the files with the same content
+        self.contents = contents
+
+        #key => decoded frames, the most recently used last
+        self.buffers = OrderedDict()
+        #key => paths of the sounds being decoded
+        self.pendingPaths = {}
+        #key => paths played from the decoded frames
+        self.sharingPaths = {}
+
+        #key => music file streamed, the most recently used last
+        self.streams = OrderedDict()
+        #key => paths of the music files waiting for their first seconds
+        self.pendingStreams = {}
+
+        self.threadPool = QThreadPool()
+        self.threadPool.setMaxThreadCount(2)
+        #Music files are decoded apart so that a long track never delays a pad
+        self.streamPool = QThreadPool()
+        self.streamPool.setMaxThreadCount(2)
+
+        self.sampleDecoded.connect(self.receiveSample)
+        self.streamStarted.connect(self.receiveStream)
+
+    def key(self, path:str):
+        """Returns the cache key of a sound: it is the same for the files with the same
+            content and changes whenever the file is modified.
+            - Takes one parameter:
+                - path as string.
+            - Returns a string or None if the file doesn't exist.
+        """
+        if self.contents :
+            path = self.contents.canonical(path)
+
+        try:
+            status = os.stat(path)
+        except OSError:
+            return None
+
+        return '{}|{}|{}'.format(os.path.abspath(path), status.st_mtime_ns, status.st_size)
+
+    def savedBytes(self):
+        """Returns the memory that the sounds decoded once for several files would
+            take if each file was decoded.
+            - Takes no parameter.
+            - Returns an integer in bytes.
+        """
+        return sum(buffer.nbytes*(len(self.sharingPaths.get(key, ())) - 1) for key, buffer in self.buffers.items() if key in self.sharingPaths)
+
+    def buffer(self, path:str):
+        """Returns the decoded sound and schedules its decoding if it isn't ready.
+            - Takes one parameter:
+                - path as string.
+            - Returns a float32 array of shape (frames, 2) or None while it is decoded.
+        """
+        key = self.key(path)
+        if key is None:
+            return None
+
+        if key in self.buffers:
+            self.buffers.move_to_end(key)
+            self.sharingPaths.setdefault(key, set()).add(os.path.abspath(path))
+            return self.buffers[key]
+
+        #The file decoded is the one named by the key, shared by the files with the same content
+        if key not in self.pendingPaths:
+            self.pendingPaths[key] = [path]
+            self.threadPool.start(SampleJob(self, key, key.rsplit('|', 2)[0], self.sampleRate))
+        elif path not in self.pendingPaths[key]:
+            self.pendingPaths[key].append(path)
+
+        return None
+
+    def stream(self, path:str):
+        """Returns a music file streamed from its decoding and starts its decoding if
+            it isn't started yet.
+            - Takes one parameter:
+                - path as string.
+            - Returns a MusicStream object or None while its first seconds are decoded.
+        """
+        key = self.key(path)
+        if key is None:
+            return None
+
+        if key in self.streams:
+            self.streams.move_to_end(key)
+            if key not in self.pendingStreams:
+                return self.streams[key]
+        else:
+            #The file decoded is the one named by the key
+            stream = MusicStream(key.rsplit('|', 2)[0], self.sampleRate)
+            self.streams[key] = stream
+            self.pendingStreams[key] = []
+            self.streamPool.start(StreamJob(self, key, stream))
+
+            #Streams dropped stay alive as long as a voice plays them
+            for oldKey in list(self.streams)[:-SampleCache.MAXSTREAMS]:
+                if oldKey not in self.pendingStreams:
+                    del self.streams[oldKey]
+
+        if path not in self.pendingStreams[key]:
+            self.pendingStreams[key].append(path)
+        return None
+
+    def prepareMusic(self, paths:list):
+        """Start decoding in the background the music files that are not streamed yet.
+            - Takes one parameter:
+                - paths as list of strings.
+            - Returns nothing.
+        """
+        for path in paths:
+            if path :
+                self.stream(path)
+
+    def receiveStream(self, key:str, started:bool):
+        """Tell the players that a music file can start, or that it can't be decoded.
+            - Takes two parameters:
+                - key as string.
+                - started as boolean, False if the file can't be decoded.
+            - Returns nothing.
+        """
+        paths = self.pendingStreams.pop(key, [])
+
+        if not started:
+            self.streams.pop(key, None)
+            for path in paths:
+                self.sampleFailed.emit(path)
+            return
+
+        for path in paths:
+            self.sampleReady.emit(path)
+
+    def prepare(self, paths:list):
+        """Decode in the background the sounds that are not cached yet.
+            - Takes one parameter:
+                - paths as list of strings.
+            - Returns nothing.
+        """
+        for path in paths:
+            if path :
+                self.buffer(path)
+
+    def receiveSample(self, key:str, buffer):
+        """Store a decoded sound, dropping the oldest ones above the memory budget.
+            - Takes two parameters:
+                - key as string.
+                - buffer as float32 array or None if the decoding failed.
+            - Returns nothing.
+        """
+        paths = self.pendingPaths.pop(key, [])
+
+        if buffer is None:
+            for path in paths:
+                self.sampleFailed.emit(path)
+            return
+
+        self.buffers[key] = buffer
+        self.sharingPaths[key] = set(os.path.abspath(path) for path in paths)
+        self.size += buffer.nbytes
+
+        while self.size > self.maxBytes and len(self.buffers) > 1:
+            oldKey, oldBuffer = self.buffers.popitem(last=False)
+            self.sharingPaths.pop(oldKey, None)
+            self.size -= oldBuffer.nbytes
+
+        for path in paths:
+            self.sampleReady.emit(path)
@@ -0,0 +1,115 @@
+#---------------------------------
+#Author: Chappuis Anthony
+#
+#Commands run by the mixer at a given frame of its clock. The events are
+#kept in a binary heap indexed by handle, so that an event can be added,
+#cancelled or moved in logarithmic time whatever the number of events.
+#
+#Application: DragonShout music sampler
+#Last Edited: October 19th 2026
+#---------------------------------
+
+class Scheduler():
+
+    def __init__(self):
+        #Heap of [clock, order, handle, command, args] lists, earliest first
+        self.heap = []
+        #handle => index of the event in the heap
+        self.positions = {}
+        #Events scheduled at the same clock run in the order they were added
+        self.order = 0
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push(self, handle:int, clock:int, command, args:tuple=()):
+        """Schedule a command, replacing the event with the same handle.
+            - Takes four parameters:
+                - handle as integer, unique id of the event.
+                - clock as integer, mixer frame at which the command runs.
+                - command as callable.
+                - args as tuple, arguments of the command.
+            - Returns nothing.
+        """
+        self.remove(handle)
+
+        self.order += 1
+        self.heap.append([clock, self.order, handle, command, args])
+        self.positions[handle] = len(self.heap) - 1
+        self.siftUp(len(self.heap) - 1)
+
+    def remove(self, handle:int):
+        """Cancel an event.
+            - Takes one parameter:
+                - handle as integer.
+            - Returns True if the event was waiting.
+        """
+        index = self.positions.pop(handle, None)
+        if index is None:
+            return False
+
+        last = self.heap.pop()
+        if index < len(self.heap):
+            self.heap[index] = last
+            self.positions[last[2]] = index
+            self.siftUp(index)
+            self.siftDown(self.positions[last[2]])
+        return True
+
+    def reschedule(self, handle:int, clock:int):
+        """Move an event to another clock.
+            - Takes two parameters:
+                - handle as integer.
+                - clock as integer.
+            - Returns True if the event was waiting.
+        """
+        index = self.positions.get(handle)
+        if index is None:
+            return False
+
+        event = self.heap[index]
+        self.push(handle, clock, event[3], event[4])
+        return True
+
+    def run(self, clock:int):
+        """Run the commands scheduled before a clock.
+            - Takes one parameter:
+                - clock as integer, first frame not to run yet.
+            - Returns the number of commands run as integer.
+        """
+        count = 0
+        while self.heap and self.heap[0][0] < clock:
+            event = self.heap[0]
+            self.remove(event[2])
+            event[3](*event[4])
+            count += 1
+        return count
+
+    def less(self, first:int, second:int):
+        return self.heap[first][:2] < self.heap[second][:2]
+
+    def swap(self, first:int, second:int):
+        heap = self.heap
+        heap[first], heap[second] = heap[second], heap[first]
+        self.positions[heap[first][2]] = first
+        self.positions[heap[second][2]] = second
+
+    def siftUp(self, index:int):
+        while index > 0:
+            parent = (index - 1) // 2
+            if not self.less(index, parent):
+                break
+            self.swap(index, parent)
+            index = parent
+
+    def siftDown(self, index:int):
+        size = len(self.heap)
+        while True:
+            smallest = index
+            for child in (2*index + 1, 2*index + 2):
+                if child < size and self.less(child, smallest):
+                    smallest = child
+            if smallest == index:
+                break
+            self.swap(index, smallest)
+            index = smallest
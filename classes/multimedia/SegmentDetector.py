@@ -0,0 +1,100 @@
+#---------------------------------
+#Author: Chappuis Anthony
+#
+#Guess the segment markers of a music track: the bar length from the tempo of
+#its onsets, the end of the intro where the track reaches its full level and
+#the start of the outro a whole number of bars later, before it fades away.
+#
+#Application: DragonShout music sampler
+#Last Edited: October 19th 2026
+#---------------------------------
+
+import numpy as np
+
+from classes.multimedia.LoopVoice import LoopVoice
+
+class SegmentDetector():
+
+    #Analysis hop in frames
+    HOP = 512
+
+    #Tempo range searched, in beats per minute
+    MINTEMPO = 60
+    MAXTEMPO = 180
+    BEATSPERBAR = 4
+
+    #Share of the median loudness above which the track is considered playing fully
+    LOUDNESSTHRESHOLD = 0.5
+
+    def detect(cls, buffer:np.ndarray, sampleRate:int):
+        """Detect the segment markers of a track.
+            - Takes two parameters:
+                - buffer as float32 array of shape (frames, 2).
+                - sampleRate as integer.
+            - Returns a dictionnary with loopStart, loopEnd and barLength in seconds,
+              or None if the track is too short to have segments.
+        """
+        mono = buffer.mean(axis=1)
+        hops = len(mono) // SegmentDetector.HOP
+        if hops < 16:
+            return None
+
+        #Loudness and onset strength per hop
+        frames = mono[:hops*SegmentDetector.HOP].reshape(hops, SegmentDetector.HOP)
+        loudness = np.sqrt((frames**2).mean(axis=1))
+        onsets = np.maximum(np.diff(loudness, prepend=loudness[0]), 0)
+
+        barLength = cls.barLength(onsets, sampleRate)
+
+        #Intro ends and outro starts where the track is at its full level
+        loud = np.flatnonzero(loudness >= np.median(loudness)*SegmentDetector.LOUDNESSTHRESHOLD)
+        if len(loud) == 0:
+            return None
+        loopStart = int(loud[0])*SegmentDetector.HOP
+        lastLoud = (int(loud[-1])+1)*SegmentDetector.HOP
+
+        if barLength and lastLoud - loopStart >= barLength:
+            loopEnd = loopStart + (lastLoud - loopStart)//barLength*barLength
+        else:
+            loopEnd = lastLoud
+
+        #Loop points on zero crossings to avoid clicks
+        window = SegmentDetector.HOP
+        loopStart = LoopVoice.findZeroCrossing(mono, loopStart, window)
+        loopEnd = LoopVoice.findZeroCrossing(mono, loopEnd, window)
+        if loopEnd <= loopStart:
+            return None
+
+        return {"loopStart":    loopStart/sampleRate,
+                "loopEnd":      loopEnd/sampleRate,
+                "barLength":    barLength/sampleRate}
+    detect = classmethod(detect)
+
+    def barLength(cls, onsets:np.ndarray, sampleRate:int):
+        """Estimate the bar length from the autocorrelation of the onsets.
+            - Takes two parameters:
+                - onsets as float array, onset strength per hop.
+                - sampleRate as integer.
+            - Returns the bar length in frames as integer, 0 if no tempo is found.
+        """
+        onsets = onsets - onsets.mean()
+        if not onsets.any():
+            return 0
+
+        #Autocorrelation through the FFT
+        size = 1 << int(2*len(onsets)-1).bit_length()
+        spectrum = np.fft.rfft(onsets, size)
+        correlation = np.fft.irfft(spectrum*np.conj(spectrum), size)[:len(onsets)]
+
+        hopsPerSecond = sampleRate / SegmentDetector.HOP
+        shortest = int(hopsPerSecond*60/SegmentDetector.MAXTEMPO)
+        longest = min(int(hopsPerSecond*60/SegmentDetector.MINTEMPO), len(correlation)-1)
+        if longest <= shortest:
+            return 0
+
+        beat = shortest + int(np.argmax(correlation[shortest:longest+1]))
+        if correlation[beat] <= 0:
+            return 0
+
+        return beat*SegmentDetector.HOP*SegmentDetector.BEATSPERBAR
+    barLength = classmethod(barLength)
@@ -0,0 +1,115 @@
+#---------------------------------
+#Author: Chappuis Anthony
+#
+#A music track made of an intro played once, a main section looped as long as
+#needed and an outro played when the track is released. The outro starts at
+#the next musical boundary of the loop or right away.
+#
+#Application: DragonShout music sampler
+#Last Edited: October 19th 2026
+#---------------------------------
+
+import numpy as np
+
+from classes.multimedia.LoopVoice import LoopVoice
+
+class SegmentVoice(LoopVoice):
+
+    #Transitions
+    BOUNDARY = 'boundary'
+    OUTRO = 'outro'
+
+    def __init__(self, buffer:np.ndarray, bus:str, gain:float, loopStart:int, loopEnd:int, barLength:int=0,
+                    crossfade:int=0, jumpFade:int=0, sampleRate:int=48000):
+        super().__init__(buffer, bus, gain, loopStart, loopEnd, crossfade, sampleRate)
+
+        #Frames between two boundaries of the loop, 0 if the only boundary is the loop end
+        self.barLength = max(0, int(barLength))
+        #Crossfade used when jumping from a boundary to the outro
+        self.jumpFade = max(0, int(jumpFade))
+
+        self.releasing = False
+        self.outro = False
+        self.transitionPosition = None
+
+        self.jumpSource = 0
+        self.jumpProgress = 0
+        self.jumpLength = 0
+
+    def release(self, transition:str):
+        """Ask the track to play its outro.
+            - Takes one parameter:
+                - transition as one of the SegmentVoice constants: BOUNDARY, OUTRO.
+            - Returns the number of frames before the outro starts as integer.
+        """
+        if self.outro or self.finished:
+            return 0
+        if self.releasing:
+            return self.transitionPosition - self.position
+
+        if transition == SegmentVoice.OUTRO:
+            target = self.position
+        elif self.position < self.loopStart:
+            target = self.loopStart
+        elif self.barLength :
+            bars = -(-(self.position - self.loopStart) // self.barLength)
+            target = min(self.loopStart + bars*self.barLength, self.loopEnd)
+        else:
+            target = self.loopEnd
+
+        self.releasing = True
+        self.transitionPosition = target
+        return target - self.position
+
+    def startOutro(self):
+        """Jump to the outro, crossfading from the current position unless it is
+            already the loop end.
+            - Takes no parameter.
+            - Returns nothing.
+        """
+        self.outro = True
+
+        if self.position != self.loopEnd:
+            self.jumpSource = self.position
+            self.jumpProgress = 0
+            self.jumpLength = max(0, min(self.jumpFade, len(self.buffer) - self.position, len(self.buffer) - self.loopEnd))
+            self.position = self.loopEnd
+
+    def read(self, block:np.ndarray):
+        """Copy the next frames of the track: intro and loop until the transition,
+            then the outro until the end of the sound.
+            - Takes one parameter:
+                - block as float32 array of shape (frames, 2).
+            - Returns the number of frames copied as integer.
+        """
+        frames = len(block)
+        written = 0
+
+        while written < frames:
+            if self.releasing and not self.outro and self.position == self.transitionPosition:
+                self.startOutro()
+
+            if not self.outro:
+                count = frames - written
+                if self.releasing:
+                    count = min(count, self.transitionPosition - self.position)
+                written += LoopVoice.read(self, block[written:written+count])
+                continue
+
+            count = min(frames - written, len(self.buffer) - self.position)
+            if count <= 0:
+                break
+
+            block[written:written+count] = self.buffer[self.position:self.position+count]
+
+            if self.jumpProgress < self.jumpLength:
+                fadeCount = min(count, self.jumpLength - self.jumpProgress)
+                fade = (np.arange(self.jumpProgress, self.jumpProgress+fadeCount, dtype=np.float32) + 0.5) / self.jumpLength
+                source = self.buffer[self.jumpSource+self.jumpProgress:self.jumpSource+self.jumpProgress+fadeCount]
+                block[written:written+fadeCount] = block[written:written+fadeCount]*fade[:, None] + source*(1-fade)[:, None]
+                self.jumpProgress += fadeCount
+
+            written += count
+            self.position += count
+
+        return written
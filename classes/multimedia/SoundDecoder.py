@@ -0,0 +1,275 @@
+#---------------------------------
+#Author: Chappuis Anthony
+#
+#Decode a sound file to float32 stereo frames at the mixer sample rate.
+#WAV files are read directly, other formats go through QAudioDecoder. Music
+#files are decoded chunk by chunk so that they can start before the end.
+#
+#Application: DragonShout music sampler
+#Last Edited: October 19th 2026
+#---------------------------------
+
+import os
+import wave
+
+import numpy as np
+
+class SoundDecoder():
+
+    WAVEEXTENSIONS = ('.wav', '.wave')
+    CHANNELS = 2
+
+    #Frames read at once from a WAV file decoded chunk by chunk
+    CHUNKFRAMES = 65536
+
+    def decode(cls, filepath:str, sampleRate:int):
+        """Decode a whole sound file in memory.
+            - Takes two parameters:
+                - filepath as string.
+                - sampleRate as integer, sample rate of the result.
+            - Returns a float32 array of shape (frames, 2).
+            - Raises OSError if the file can't be read and ValueError if it can't be decoded.
+        """
+        if os.path.splitext(filepath)[1].lower() in SoundDecoder.WAVEEXTENSIONS:
+            frames, fileSampleRate = cls.decodeWave(filepath)
+        else:
+            frames, fileSampleRate = cls.decodeWithQt(filepath, sampleRate)
+
+        return cls.resample(cls.toStereo(frames), fileSampleRate, sampleRate)
+    decode = classmethod(decode)
+
+    def stream(cls, filepath:str, sampleRate:int, write, setLength=None):
+        """Decode a sound file chunk by chunk.
+            - Takes four parameters:
+                - filepath as string.
+                - sampleRate as integer, sample rate of the result.
+                - write as function taking a float32 array of shape (frames, 2), called for each chunk decoded.
+                - setLength as function taking the number of frames expected as integer, or None.
+            - Returns nothing.
+            - Raises OSError if the file can't be read and ValueError if it can't be decoded.
+        """
+        resamplers = {}
+
+        def writeChunk(frames:np.ndarray, fileSampleRate:int):
+            if fileSampleRate not in resamplers:
+                resamplers[fileSampleRate] = cls.chunkResampler(fileSampleRate, sampleRate)
+            frames = resamplers[fileSampleRate](cls.toStereo(frames))
+            if len(frames):
+                write(frames)
+
+        if os.path.splitext(filepath)[1].lower() in SoundDecoder.WAVEEXTENSIONS:
+            cls.streamWave(filepath, sampleRate, writeChunk, setLength)
+        else:
+            cls.decodeWithQt(filepath, sampleRate, writeChunk, setLength)
+
+        for resampler in resamplers.values():
+            frames = cls.toStereo(resampler(None))
+            if len(frames):
+                write(frames)
+    stream = classmethod(stream)
+
+    def chunkResampler(cls, fileSampleRate:int, sampleRate:int):
+        """Returns a function resampling the successive chunks of a sound, the frames
+            between two chunks being interpolated as if the sound was resampled at once.
+            - Takes two parameters:
+                - fileSampleRate as integer.
+                - sampleRate as integer.
+            - Returns a function taking and returning a float32 array of shape (frames, channels).
+              Called with None once the sound ends, it returns the last frames of the sound.
+        """
+        if fileSampleRate == sampleRate:
+            return lambda frames: frames if frames is not None else np.zeros((0, cls.CHANNELS), dtype=np.float32)
+
+        step = fileSampleRate / sampleRate
+        #Next position to compute, relative to the first frame kept, and last frame of the previous chunk
+        state = {'position': 0.0, 'previous': None, 'read': 0, 'written': 0}
+
+        def resampleChunk(frames:np.ndarray):
+            if frames is None:
+                #The sound resampled at once ends with copies of its last frame
+                count = max(int(round(state['read'] * sampleRate / fileSampleRate)) - state['written'], 0)
+                if state['previous'] is None:
+                    return np.zeros((0, cls.CHANNELS), dtype=np.float32)
+                return np.repeat(state['previous'], count, axis=0).astype(np.float32)
+
+            state['read'] += len(frames)
+            if state['previous'] is not None:
+                frames = np.concatenate((state['previous'], frames))
+            if len(frames) == 0:
+                return frames
+
+            last = len(frames) - 1
+            count = int(np.floor((last - state['position']) / step)) + 1 if state['position'] <= last else 0
+            positions = state['position'] + np.arange(count) * step
+            original = np.arange(len(frames))
+
+            result = np.empty((count, frames.shape[1]), dtype=np.float32)
+            for channel in range(frames.shape[1]):
+                result[:, channel] = np.interp(positions, original, frames[:, channel])
+
+            state['position'] += count * step - last
+            state['previous'] = frames[-1:]
+            state['written'] += count
+            return result
+
+        return resampleChunk
+    chunkResampler = classmethod(chunkResampler)
+
+    def decodeWave(cls, filepath:str):
+        """Read a PCM WAV file.
+            - Takes one parameter:
+                - filepath as string.
+            - Returns a float32 array of shape (frames, channels) and the sample rate as integer.
+        """
+        try:
+            with wave.open(filepath, 'rb') as waveFile:
+                channels = waveFile.getnchannels()
+                sampleWidth = waveFile.getsampwidth()
+                fileSampleRate = waveFile.getframerate()
+                data = waveFile.readframes(waveFile.getnframes())
+        except (wave.Error, EOFError) as error:
+            raise ValueError('{}: {}'.format(filepath, error))
+
+        return cls.waveSamples(filepath, data, sampleWidth).reshape(-1, channels), fileSampleRate
+    decodeWave = classmethod(decodeWave)
+
+    def streamWave(cls, filepath:str, sampleRate:int, write, setLength=None):
+        """Read a PCM WAV file chunk by chunk.
+            - Takes four parameters:
+                - filepath as string.
+                - sampleRate as integer, sample rate the chunks will be resampled to.
+                - write as function taking a float32 array of shape (frames, channels) and its sample rate as integer.
+                - setLength as function taking the number of frames expected as integer, or None.
+            - Returns nothing.
+        """
+        try:
+            with wave.open(filepath, 'rb') as waveFile:
+                channels = waveFile.getnchannels()
+                sampleWidth = waveFile.getsampwidth()
+                fileSampleRate = waveFile.getframerate()
+                if setLength :
+                    setLength(int(round(waveFile.getnframes() * sampleRate / fileSampleRate)))
+
+                while True:
+                    data = waveFile.readframes(SoundDecoder.CHUNKFRAMES)
+                    if not data:
+                        break
+                    write(cls.waveSamples(filepath, data, sampleWidth).reshape(-1, channels), fileSampleRate)
+        except (wave.Error, EOFError) as error:
+            raise ValueError('{}: {}'.format(filepath, error))
+    streamWave = classmethod(streamWave)
+
+    def waveSamples(cls, filepath:str, data:bytes, sampleWidth:int):
+        """Returns the PCM samples of a WAV file as float32 values between -1 and 1."""
+        if sampleWidth == 1:
+            return (np.frombuffer(data, dtype=np.uint8).astype(np.float32) - 128) / 128
+        elif sampleWidth == 2:
+            return np.frombuffer(data, dtype='<i2').astype(np.float32) / 32768
+        elif sampleWidth == 3:
+            raw = np.frombuffer(data, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+            return ((raw[:, 0] << 8 | raw[:, 1] << 16 | raw[:, 2] << 24) >> 8).astype(np.float32) / 8388608
+        elif sampleWidth == 4:
+            return np.frombuffer(data, dtype='<i4').astype(np.float32) / 2147483648
+        raise ValueError('{}: unsupported sample width {}'.format(filepath, sampleWidth))
+    waveSamples = classmethod(waveSamples)
+
+    def decodeWithQt(cls, filepath:str, sampleRate:int, write=None, setLength=None):
+        """Decode any format supported by the Qt multimedia backend.
+            - Takes four parameters:
+                - filepath as string.
+                - sampleRate as integer, sample rate requested to the decoder.
+                - write as function taking a float32 array of shape (frames, channels) and its sample rate as integer,
+                  called for each chunk decoded, or None to decode the whole file.
+                - setLength as function taking the number of frames expected as integer, or None.
+            - Returns a float32 array of shape (frames, channels) and the sample rate as integer, or nothing
+              when the chunks are written.
+        """
+        from PyQt5.QtCore import QEventLoop
+        from PyQt5.QtMultimedia import QAudioDecoder, QAudioFormat
+
+        if not os.path.isfile(filepath):
+            raise OSError('{}: no such file'.format(filepath))
+
+        audioFormat = QAudioFormat()
+        audioFormat.setCodec('audio/pcm')
+        audioFormat.setSampleRate(sampleRate)
+        audioFormat.setChannelCount(SoundDecoder.CHANNELS)
+        audioFormat.setSampleSize(16)
+        audioFormat.setSampleType(QAudioFormat.SignedInt)
+        audioFormat.setByteOrder(QAudioFormat.LittleEndian)
+
+        decoder = QAudioDecoder()
+        decoder.setAudioFormat(audioFormat)
+        decoder.setSourceFilename(filepath)
+
+        chunks = []
+        errors = []
+        decodedFormat = []
+        loop = QEventLoop()
+
+        def readBuffer():
+            audioBuffer = decoder.read()
+            if not decodedFormat:
+                decodedFormat.append(audioBuffer.format())
+                if setLength and decoder.duration() > 0:
+                    setLength(int(decoder.duration() * sampleRate / 1000))
+            data = audioBuffer.constData().asstring(audioBuffer.byteCount())
+
+            if write is None:
+                chunks.append(data)
+                return
+            try:
+                samples = np.frombuffer(data, dtype='<i2').astype(np.float32) / 32768
+                write(samples.reshape(-1, decodedFormat[0].channelCount()), decodedFormat[0].sampleRate())
+            except (OSError, ValueError) as error:
+                errors.append(str(error))
+                decoder.stop()
+                loop.quit()
+
+        decoder.bufferReady.connect(readBuffer)
+        decoder.finished.connect(loop.quit)
+        decoder.error.connect(lambda *args: (errors.append(decoder.errorString()), loop.quit()))
+        decoder.start()
+        loop.exec()
+
+        if errors or not decodedFormat:
+            raise ValueError('{}: {}'.format(filepath, errors[0] if errors else 'nothing decoded'))
+        if write is not None:
+            return
+
+        decodedFormat = decodedFormat[0]
+        samples = np.frombuffer(b''.join(chunks), dtype='<i2').astype(np.float32) / 32768
+        return samples.reshape(-1, decodedFormat.channelCount()), decodedFormat.sampleRate()
+    decodeWithQt = classmethod(decodeWithQt)
+
+    def toStereo(cls, frames:np.ndarray):
+        """Returns the frames with exactly two channels.
+            - Takes one parameter:
+                - frames as float32 array of shape (frames, channels).
+            - Returns a float32 array of shape (frames, 2).
+        """
+        if frames.shape[1] == 1:
+            return np.repeat(frames, 2, axis=1)
+        return np.ascontiguousarray(frames[:, :2])
+    toStereo = classmethod(toStereo)
+
+    def resample(cls, frames:np.ndarray, fileSampleRate:int, sampleRate:int):
+        """Linear resampling to the mixer sample rate.
+            - Takes three parameters:
+                - frames as float32 array of shape (frames, channels).
+                - fileSampleRate as integer.
+                - sampleRate as integer.
+            - Returns a float32 array of shape (frames, channels).
+        """
+        if fileSampleRate == sampleRate or len(frames) == 0:
+            return frames
+
+        count = int(round(len(frames) * sampleRate / fileSampleRate))
+        positions = np.arange(count) * (fileSampleRate / sampleRate)
+        original = np.arange(len(frames))
+
+        result = np.empty((count, frames.shape[1]), dtype=np.float32)
+        for channel in range(frames.shape[1]):
+            result[:, channel] = np.interp(positions, original, frames[:, channel])
+        return result
+    resample = classmethod(resample)
@@ -0,0 +1,67 @@
+#---------------------------------
+#Author: Chappuis Anthony
+#
+#A music track made of several stems played on the same clock. Each stem has
+#its own gain ramp so stems fade in and out without restarting anything.
+#
+#Application: DragonShout music sampler
+#Last Edited: October 19th 2026
+#---------------------------------
+
+import numpy as np
+
+from classes.multimedia.Voice import Voice
+from classes.multimedia.GainRamp import GainRamp
+
+class StemVoice(Voice):
+
+    def __init__(self, buffers:list, bus:str, gain:float=1.0, stemGains:list=None):
+        super().__init__(buffers[0], bus, gain)
+
+        self.buffers = buffers
+
+        if stemGains is None:
+            stemGains = [1.0]*len(buffers)
+        self.stemGains = [GainRamp(stemGain) for stemGain in stemGains]
+
+        self._stemScratch = None
+
+    def setStemGains(self, gains:list, frames:int=0):
+        """Change the gain of each stem.
+            - Takes two parameters:
+                - gains as list of floats, one per stem.
+                - frames as integer, duration of the change.
+            - Returns nothing.
+        """
+        for stemGain, gain in zip(self.stemGains, gains):
+            stemGain.set(gain, frames)
+
+    def read(self, block:np.ndarray):
+        """Mix the next frames of the audible stems in a block.
+            - Takes one parameter:
+                - block as float32 array of shape (frames, 2).
+            - Returns the number of frames copied as integer.
+        """
+        #Streamed stems get their length once decoded
+        count = max(0, min(len(block), max(len(buffer) for buffer in self.buffers) - self.position))
+        block[:count] = 0.0
+
+        if self._stemScratch is None or len(self._stemScratch) < len(block):
+            self._stemScratch = np.zeros(block.shape, dtype=np.float32)
+
+        for buffer, stemGain in zip(self.buffers, self.stemGains):
+            #Silent stems cost nothing
+            if stemGain.gain == 0.0 and not stemGain.isRamping():
+                continue
+
+            available = max(0, min(count, len(buffer) - self.position))
+            if available == 0:
+                continue
+
+            scratch = self._stemScratch[:available]
+            scratch[:] = buffer[self.position:self.position+available]
+            stemGain.apply(scratch)
+            block[:available] += scratch
+
+        self.position += count
+        return count
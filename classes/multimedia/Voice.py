@@ -0,0 +1,171 @@
+#---------------------------------
+#Author: Chappuis Anthony
+#
+#A sound played once by the mixer from a decoded in-memory buffer.
+#
+#Application: DragonShout music sampler
+#Last Edited: October 19th 2026
+#---------------------------------
+
+import numpy as np
+
+from classes.multimedia.GainRamp import GainRamp
+
+class Voice():
+
+    def __init__(self, buffer:np.ndarray, bus:str, gain:float=1.0):
+        #Decoded frames as float32 array of shape (frames, 2)
+        self.buffer = buffer
+        self.bus = bus
+        self.position = 0
+
+        #Playback speed, pitching the sound up or down
+        self.rate = 1.0
+
+        self.gain = GainRamp(gain)
+        self.voiceId = None
+
+        #Stereo placement: pan from -1 (left) to 1 (right), or a (x, y) location
+        #in meters around the listener. The mixer turns them into channel gains.
+        self.pan = 0.0
+        self.location = None
+        self.panChanged = False
+        self.channelGains = None
+        self.targetGains = None
+
+        #Mixer clock at which the voice starts, None to start at the next block
+        self.startClock = None
+        self.stopping = False
+        self.finished = False
+
+        self._scratch = None
+
+    def setGain(self, gain:float, frames:int=0):
+        """Change the voice gain.
+            - Takes two parameters:
+                - gain as float.
+                - frames as integer, duration of the change.
+            - Returns nothing.
+        """
+        if not self.stopping:
+            self.gain.set(gain, frames)
+
+    def setPanning(self, pan:float=0.0, location:tuple=None):
+        """Place the voice in the stereo field.
+            - Takes two parameters:
+                - pan as float, from -1 (left) to 1 (right).
+                - location as (x, y) tuple in meters or None, replacing the pan when given.
+            - Returns nothing.
+        """
+        self.pan = float(pan)
+        self.location = tuple(location) if location is not None else None
+        self.panChanged = True
+
+    def setChannelGains(self, gains:np.ndarray):
+        """Change the left and right gains, ramped over the next block once the
+            voice has started.
+            - Takes one parameter:
+                - gains as float32 array of shape (2,).
+            - Returns nothing.
+        """
+        self.panChanged = False
+        if self.channelGains is None and self.position == 0:
+            self.channelGains = gains
+        else:
+            self.targetGains = gains
+
+    def setRate(self, rate:float):
+        """Change the playback speed, resampling the sound on the fly.
+            - Takes one parameter:
+                - rate as float, 1.0 for the original pitch.
+            - Returns nothing.
+        """
+        self.rate = float(rate)
+        self.position = float(self.position)
+
+    def stop(self, frames:int=0):
+        """Fade the voice out and end it.
+            - Takes one parameter:
+                - frames as integer, duration of the fade out.
+            - Returns nothing.
+        """
+        self.stopping = True
+        self.gain.set(0.0, frames)
+        if frames <= 0:
+            self.finished = True
+
+    def read(self, block:np.ndarray):
+        """Copy the next frames of the sound in a block.
+            - Takes one parameter:
+                - block as float32 array of shape (frames, 2).
+            - Returns the number of frames copied as integer.
+        """
+        if self.rate != 1.0:
+            return self.readResampled(block)
+
+        count = max(0, min(len(block), len(self.buffer) - self.position))
+        block[:count] = self.buffer[self.position:self.position+count]
+        self.position += count
+        return count
+
+    def readResampled(self, block:np.ndarray):
+        """Copy the next frames of the sound in a block at the voice rate, with
+            a linear interpolation between the frames of the buffer.
+            - Takes one parameter:
+                - block as float32 array of shape (frames, 2).
+            - Returns the number of frames copied as integer.
+        """
+        last = len(self.buffer) - 1
+        count = max(0, min(len(block), int(np.ceil((last - self.position) / self.rate))))
+
+        positions = self.position + np.arange(count) * self.rate
+        indexes = positions.astype(np.int64)
+        weights = (positions - indexes).astype(np.float32)[:, None]
+
+        block[:count] = self.buffer[indexes]
+        block[:count] += (self.buffer[np.minimum(indexes + 1, last)] - block[:count]) * weights
+        self.position += count * self.rate
+        return count
+
+    def render(self, output:np.ndarray):
+        """Add the next block of the voice to a bus buffer.
+            - Takes one parameter:
+                - output as float32 array of shape (frames, 2).
+            - Returns nothing.
+        """
+        if self.finished:
+            return
+
+        frames = len(output)
+        if self._scratch is None or len(self._scratch) < frames:
+            self._scratch = np.zeros((frames, output.shape[1]), dtype=np.float32)
+        block = self._scratch[:frames]
+
+        count = self.read(block)
+        if count < frames:
+            block[count:] = 0.0
+            self.finished = True
+
+        if self.targetGains is None and self.channelGains is not None and not self.gain.isRamping():
+            #Steady voice: the gain and the channel gains in a single pass
+            block *= self.gain.gain*self.channelGains
+            output += block
+            if self.stopping:
+                self.finished = True
+            return
+
+        self.gain.apply(block)
+
+        if self.targetGains is not None:
+            current = self.channelGains if self.channelGains is not None else np.ones(2, dtype=np.float32)
+            ramp = np.arange(1, frames+1, dtype=np.float32)[:, None] / frames
+            block *= current + (self.targetGains - current)*ramp
+            self.channelGains = self.targetGains
+            self.targetGains = None
+        elif self.channelGains is not None:
+            block *= self.channelGains
+
+        output += block
+
+        if self.stopping and not self.gain.isRamping():
+            self.finished = True
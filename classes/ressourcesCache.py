@@ -0,0 +1,110 @@
+#---------------------------------
+#Author: Chappuis Anthony
+#
+#Load once and share every ressource of the application (stylesheets and
+#images listed in ressourcesFilepath) so that widgets never read them from
+#the drive again.
+#
+#Application: DragonShout music sampler
+#Last Edited: October 19th 2026
+#---------------------------------
+
+from classes.ressourcesFilepath import Stylesheets, Images
+
+from PyQt5.QtGui import QIcon, QPixmap
+
+class RessourcesCache():
+
+    #Stylesheets concatenated in the main window stylesheet. Widgets select
+    #their state through dynamic properties (padState, active) instead of
+    #receiving their own stylesheet.
+    APPLICATIONSTYLESHEETS = (Stylesheets.globalStyle, Stylesheets.activeToggleButtons, Stylesheets.defaultButtons,
+        Stylesheets.effectButtons, Stylesheets.activeEffectButtons)
+
+    _stylesheets = {}
+    _pixmaps = {}
+    _icons = {}
+
+    def ressourcePaths(cls, ressourceClass:type):
+        """Returns the filepaths declared in one of the ressourcesFilepath classes.
+            - Takes one parameter:
+                - ressourceClass as Stylesheets or Images.
+            - Returns a list of strings.
+        """
+        return [value for key, value in vars(ressourceClass).items() if not key.startswith('_') and isinstance(value, str)]
+    ressourcePaths = classmethod(ressourcePaths)
+
+    def preload(cls):
+        """Load every stylesheet and image of the application. Requires a QApplication.
+            - Takes no parameter.
+            - Returns nothing.
+        """
+        for path in cls.ressourcePaths(Stylesheets):
+            cls.stylesheet(path)
+
+        for path in cls.ressourcePaths(Images):
+            cls.icon(path)
+    preload = classmethod(preload)
+
+    def stylesheet(cls, path:str):
+        """Returns the content of a stylesheet, reading it only the first time.
+            - Takes one parameter:
+                - path as string.
+            - Returns a string.
+        """
+        if path not in cls._stylesheets:
+            with open(path, 'r', encoding='utf-8') as styleSheetFile:
+                cls._stylesheets[path] = styleSheetFile.read()
+        return cls._stylesheets[path]
+    stylesheet = classmethod(stylesheet)
+
+    def applicationStyleSheet(cls):
+        """Returns the stylesheet of the main window with every widget state.
+            - Takes no parameter.
+            - Returns a string.
+        """
+        key = '<application>'
+        if key not in cls._stylesheets:
+            cls._stylesheets[key] = '\n'.join(cls.stylesheet(path) for path in cls.APPLICATIONSTYLESHEETS)
+        return cls._stylesheets[key]
+    applicationStyleSheet = classmethod(applicationStyleSheet)
+
+    def pixmap(cls, path:str):
+        """Returns a shared pixmap, decoding the image only the first time.
+            - Takes one parameter:
+                - path as string.
+            - Returns a QPixmap.
+        """
+        if path not in cls._pixmaps:
+            cls._pixmaps[path] = QPixmap(path)
+        return cls._pixmaps[path]
+    pixmap = classmethod(pixmap)
+
+    def icon(cls, path:str):
+        """Returns a shared icon, decoding the image only the first time.
+            - Takes one parameter:
+                - path as string.
+            - Returns a QIcon.
+        """
+        if path not in cls._icons:
+            cls._icons[path] = QIcon(cls.pixmap(path))
+        return cls._icons[path]
+    icon = classmethod(icon)
+
+    def setProperty(cls, widget, name:str, value):
+        """Change a dynamic property used by the stylesheets and repolish the widget
+            so that the matching style is applied.
+            - Takes three parameters:
+                - widget as QWidget.
+                - name as string.
+                - value as any type supported by QVariant.
+            - Returns nothing.
+        """
+        if widget.property(name) == value:
+            return
+
+        widget.setProperty(name, value)
+        style = widget.style()
+        style.unpolish(widget)
+        style.polish(widget)
+    setProperty = classmethod(setProperty)
@@ -9,7 +9,6 @@
 
 class Stylesheets():
     globalStyle = "ressources/interface/stylesheets/global.css"
-    themeButtons = "ressources/interface/stylesheets/themeButtons.css"
     activeToggleButtons = "ressources/interface/stylesheets/activeToggleButtons.css"
 
     effectButtons = "ressources/interface/stylesheets/soundEffectButtons.css"
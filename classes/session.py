@@ -0,0 +1,155 @@
+#---------------------------------
+#Author: Chappuis Anthony
+#
+#State of the application kept from one launch to the next: language, last
+#library, volumes, window layout and, for each library, the scene applied
+#and how often its pads and themes are used, so that the most used ones are
+#prepared first at startup. It is kept in the user data folder.
+#
+#Application: DragonShout music sampler
+#Last Edited: October 19th 2026
+#---------------------------------
+
+import os
+import json
+
+from PyQt5.QtCore import QStandardPaths
+
+class Session():
+
+    FILENAME = 'session.json'
+
+    #Number of pads and themes prepared ahead of time at startup, and tracks
+    #read ahead for each of these themes
+    MAXHINTS = 8
+    HINTTRACKS = 2
+
+    _filepath = FILENAME
+    _values = {}
+
+    def load(cls, filepath:str=''):
+        """Read the session file, starting a new session if it can't be read.
+            - Takes one parameter:
+                - filepath as string, the file of the user data folder by default.
+            - Returns nothing.
+        """
+        if filepath == '':
+            filepath = os.path.join(QStandardPaths.writableLocation(QStandardPaths.AppDataLocation), Session.FILENAME)
+            #Session of the versions keeping it in the current folder
+            if not os.path.isfile(filepath) and os.path.isfile(Session.FILENAME):
+                cls._filepath = filepath
+                cls._read(Session.FILENAME)
+                return
+
+        cls._filepath = filepath
+        cls._read(filepath)
+    load = classmethod(load)
+
+    def _read(cls, filepath:str):
+        """Read the values of a session file, or none if it can't be read."""
+        try:
+            with open(filepath, 'r', encoding='utf-8') as sessionFile:
+                cls._values = json.load(sessionFile)
+        except (OSError, ValueError):
+            cls._values = {}
+    _read = classmethod(_read)
+
+    def save(cls):
+        """Write the session file. The file is replaced at once so that a crash
+            while writing never loses the previous session.
+            - Takes no parameter.
+            - Returns nothing.
+        """
+        temporaryPath = cls._filepath + '.tmp'
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(cls._filepath)), exist_ok=True)
+            with open(temporaryPath, 'w', encoding='utf-8') as sessionFile:
+                json.dump(cls._values, sessionFile, indent=4)
+            os.replace(temporaryPath, cls._filepath)
+        except OSError:
+            print('WARNING - the session could not be saved in {}'.format(cls._filepath))
+    save = classmethod(save)
+
+    def value(cls, key:str, default=None):
+        """Returns a value of the session or the default one if it isn't set.
+            - Takes two parameters:
+                - key as string.
+                - default as any JSON value.
+            - Returns a JSON value.
+        """
+        return cls._values.get(key, default)
+    value = classmethod(value)
+
+    def setValue(cls, key:str, value):
+        """Change a value of the session, written by the next save().
+            - Takes two parameters:
+                - key as string.
+                - value as any JSON value.
+            - Returns nothing.
+        """
+        cls._values[key] = value
+    setValue = classmethod(setValue)
+
+    def libraryState(cls, libraryPath:str):
+        """Returns the state kept for a library file: {'scene', 'pads', 'themes'}.
+            - Takes one parameter:
+                - libraryPath as string.
+            - Returns a dictionnary, modified in place.
+        """
+        libraries = cls._values.setdefault('libraries', {})
+        state = libraries.setdefault(os.path.abspath(libraryPath), {})
+        state.setdefault('scene', None)
+        state.setdefault('pads', {})
+        state.setdefault('themes', {})
+        return state
+    libraryState = classmethod(libraryState)
+
+    def countPad(cls, libraryPath:str, bank:int, row:int, column:int):
+        """Count a trigger of a pad. Libraries never saved are not followed.
+            - Takes four parameters:
+                - libraryPath as string.
+                - bank as integer.
+                - row as integer.
+                - column as integer.
+            - Returns nothing.
+        """
+        if libraryPath :
+            pads = cls.libraryState(libraryPath)['pads']
+            key = '{},{},{}'.format(bank, row, column)
+            pads[key] = pads.get(key, 0) + 1
+    countPad = classmethod(countPad)
+
+    def countTheme(cls, libraryPath:str, name:str):
+        """Count a selection of a theme. Libraries never saved are not followed.
+            - Takes two parameters:
+                - libraryPath as string.
+                - name as string.
+            - Returns nothing.
+        """
+        if libraryPath :
+            themes = cls.libraryState(libraryPath)['themes']
+            themes[name] = themes.get(name, 0) + 1
+    countTheme = classmethod(countTheme)
+
+    def mostUsedPads(cls, libraryPath:str, count:int=MAXHINTS):
+        """Returns the places of the pads of a library triggered most often.
+            - Takes two parameters:
+                - libraryPath as string.
+                - count as integer.
+            - Returns a list of (bank, row, column) tuples.
+        """
+        pads = cls.libraryState(libraryPath)['pads'] if libraryPath else {}
+        keys = sorted(pads, key=lambda key: pads[key], reverse=True)[:count]
+        return [tuple(int(value) for value in key.split(',')) for key in keys]
+    mostUsedPads = classmethod(mostUsedPads)
+
+    def mostUsedThemes(cls, libraryPath:str, count:int=MAXHINTS):
+        """Returns the names of the themes of a library selected most often.
+            - Takes two parameters:
+                - libraryPath as string.
+                - count as integer.
+            - Returns a list of strings.
+        """
+        themes = cls.libraryState(libraryPath)['themes'] if libraryPath else {}
+        return sorted(themes, key=lambda name: themes[name], reverse=True)[:count]
+    mostUsedThemes = classmethod(mostUsedThemes)
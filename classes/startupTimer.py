@@ -0,0 +1,65 @@
+#---------------------------------
+#Author: Chappuis Anthony
+#
+#Record how long each phase of the application startup takes, from the
+#moment this module is imported, so that the time until the window is first
+#painted can be watched and kept within a budget.
+#
+#Application: DragonShout music sampler
+#Last Edited: October 19th 2026
+#---------------------------------
+
+import time
+
+class StartupTimer():
+
+    #Phases marked by the application
+    IMPORTS = 'imports'
+    WINDOW = 'window'
+    FIRSTPAINT = 'firstPaint'
+    MEDIA = 'media'
+    WIDGETS = 'widgets'
+    LIBRARY = 'library'
+
+    #Time allowed until the window is first painted, in seconds
+    FIRSTPAINTBUDGET = 1.0
+
+    _start = time.perf_counter()
+    _phases = []
+
+    def mark(cls, phase:str):
+        """Record the end of a startup phase.
+            - Takes one parameter:
+                - phase as string, one of the StartupTimer phase constants.
+            - Returns the time elapsed since the start in seconds, as float.
+        """
+        elapsed = time.perf_counter() - cls._start
+        cls._phases.append((phase, elapsed))
+        return elapsed
+    mark = classmethod(mark)
+
+    def elapsed(cls, phase:str):
+        """Returns the time elapsed from the start to the end of a phase in seconds,
+            or None if the phase isn't over.
+            - Takes one parameter:
+                - phase as string.
+            - Returns a float or None.
+        """
+        for name, elapsed in cls._phases:
+            if name == phase:
+                return elapsed
+        return None
+    elapsed = classmethod(elapsed)
+
+    def report(cls):
+        """Returns the phases with their duration and the time elapsed at their end.
+            - Takes no parameter.
+            - Returns a string, one line per phase.
+        """
+        lines = []
+        previous = 0.0
+        for name, elapsed in cls._phases:
+            lines.append('{:<12} {:>7.0f} ms {:>7.0f} ms'.format(name, (elapsed-previous)*1000, elapsed*1000))
+            previous = elapsed
+        return '\n'.join(lines)
+    report = classmethod(report)
@@ -0,0 +1,190 @@
+#---------------------------------
+#Author: Chappuis Anthony
+#
+#Cache of pre-scaled thumbnails for the icons chosen by the user (themes and
+#sample buttons). Thumbnails are generated on worker threads, stored on the
+#drive keyed by path, modification time and size, and shared in memory by
+#every button showing the same icon.
+#
+#Application: DragonShout music sampler
+#Last Edited: October 19th 2026
+#---------------------------------
+
+import os
+import hashlib
+
+from classes.ressourcesFilepath import Images
+from classes.ressourcesCache import RessourcesCache
+
+from PyQt5.QtCore import Qt, QObject, QSize, QRunnable, QThreadPool, QStandardPaths, pyqtSignal
+from PyQt5.QtGui import QIcon, QImage, QImageReader, QPixmap
+
+class ThumbnailJob(QRunnable):
+
+    def __init__(self, thumbnailCache:QObject, key:str, path:str, size:QSize, cachePath:str):
+        super().__init__()
+        self.thumbnailCache = thumbnailCache
+        self.key = key
+        self.path = path
+        self.size = size
+        self.cachePath = cachePath
+
+    def run(self):
+        """Decode the image at the thumbnail size and store it on the drive. JPEG
+            images are directly decoded at the reduced size by QImageReader.
+            - Takes no parameter.
+            - Returns nothing.
+        """
+        reader = QImageReader(self.path)
+        reader.setAutoTransform(True)
+
+        originalSize = reader.size()
+        if originalSize.isValid():
+            reader.setScaledSize(originalSize.scaled(self.size, Qt.KeepAspectRatio))
+
+        image = reader.read()
+        if not image.isNull() and (image.width() > self.size.width() or image.height() > self.size.height()):
+            image = image.scaled(self.size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+        if not image.isNull():
+            image.save(self.cachePath, 'PNG')
+
+        self.thumbnailCache.thumbnailGenerated.emit(self.key, image)
+
+class ThumbnailCache(QObject):
+
+    #Size of the icons shown by the theme and sample buttons
+    ICONSIZE = QSize(100,100)
+
+    #Emitted from the worker threads, received in the GUI thread
+    thumbnailGenerated = pyqtSignal(str, QImage)
+
+    #Emitted with the image path once its thumbnail is available
+    thumbnailReady = pyqtSignal(str)
+
+    def __init__(self, cacheFolder:str=''):
+        super().__init__()
+
+        if cacheFolder == '':
+            cacheFolder = os.path.join(QStandardPaths.writableLocation(QStandardPaths.CacheLocation), 'thumbnails')
+        self.cacheFolder = cacheFolder
+        os.makedirs(self.cacheFolder, exist_ok=True)
+
+        #key => QIcon shared by all the buttons
+        self.icons = {}
+        #key => list of (widget, path) waiting for the thumbnail
+        self.waitingWidgets = {}
+        #key => path of the thumbnails being generated
+        self.pendingPaths = {}
+
+        self.ressourcePaths = set(RessourcesCache.ressourcePaths(Images))
+
+        self.threadPool = QThreadPool()
+        self.threadPool.setMaxThreadCount(2)
+
+        self.thumbnailGenerated.connect(self.receiveThumbnail)
+
+    def key(self, path:str, size:QSize):
+        """Returns the cache key of an image: it changes whenever the file is modified.
+            - Takes two parameters:
+                - path as string.
+                - size as QSize.
+            - Returns a string or None if the file doesn't exist.
+        """
+        try:
+            status = os.stat(path)
+        except OSError:
+            return None
+
+        identity = '{}|{}|{}|{}x{}'.format(os.path.abspath(path), status.st_mtime_ns, status.st_size, size.width(), size.height())
+        return hashlib.sha1(identity.encode('utf-8')).hexdigest()
+
+    def setIcon(self, widget, path:str, size:QSize=ICONSIZE):
+        """Set the thumbnail of an image as the widget icon. If the thumbnail isn't
+            ready yet, the default icon is shown until the worker is done.
+            - Takes three parameters:
+                - widget as any widget having a setIcon method.
+                - path as string.
+                - size as QSize.
+            - Returns nothing.
+        """
+        widget.setProperty('thumbnailPath', path)
+
+        if path in self.ressourcePaths:
+            widget.setIcon(RessourcesCache.icon(path))
+            return
+
+        icon = self.icon(path, size)
+        if icon :
+            widget.setIcon(icon)
+        else:
+            widget.setIcon(RessourcesCache.icon(Images.defaultButtonIcon))
+            key = self.key(path, size)
+            if key :
+                self.waitingWidgets.setdefault(key, []).append((widget, path))
+
+    def icon(self, path:str, size:QSize=ICONSIZE):
+        """Returns the thumbnail icon if it is in memory or on the drive and
+            schedules its generation otherwise.
+            - Takes two parameters:
+                - path as string.
+                - size as QSize.
+            - Returns a QIcon or None while the thumbnail is generated.
+        """
+        key = self.key(path, size)
+        if key is None:
+            return None
+
+        if key in self.icons:
+            return self.icons[key]
+
+        cachePath = os.path.join(self.cacheFolder, key+'.png')
+        if os.path.isfile(cachePath):
+            pixmap = QPixmap(cachePath)
+            if not pixmap.isNull():
+                self.icons[key] = QIcon(pixmap)
+                return self.icons[key]
+
+        if key not in self.pendingPaths:
+            self.waitingWidgets.setdefault(key, [])
+            self.pendingPaths[key] = path
+            self.threadPool.start(ThumbnailJob(self, key, path, size, cachePath))
+
+        return None
+
+    def prepare(self, paths:list, size:QSize=ICONSIZE):
+        """Generate in the background the thumbnails that are not cached yet.
+            - Takes two parameters:
+                - paths as list of strings.
+                - size as QSize.
+            - Returns nothing.
+        """
+        for path in paths:
+            if path and path not in self.ressourcePaths:
+                self.icon(path, size)
+
+    def receiveThumbnail(self, key:str, image:QImage):
+        """Store a generated thumbnail and give it to the widgets waiting for it.
+            - Takes two parameters:
+                - key as string.
+                - image as QImage.
+            - Returns nothing.
+        """
+        waitingWidgets = self.waitingWidgets.pop(key, [])
+        path = self.pendingPaths.pop(key, '')
+        if image.isNull():
+            return
+
+        icon = QIcon(QPixmap.fromImage(image))
+        self.icons[key] = icon
+
+        for widget, widgetPath in waitingWidgets:
+            try:
+                #The widget may have been given another icon in the meantime
+                if widget.property('thumbnailPath') == widgetPath:
+                    widget.setIcon(icon)
+            except RuntimeError:
+                #The widget has been deleted
+                continue
+
+        self.thumbnailReady.emit(path)
@@ -0,0 +1,47 @@
+import math
+
+import numpy as np
+
+from classes.multimedia.Biquad import Biquad
+from classes.multimedia.BiquadFilter import BiquadFilter
+
+SAMPLERATE = 48000
+BLOCKSIZE = 512
+
+def amplitude(effect, frequency):
+    time = np.arange(64*BLOCKSIZE)/SAMPLERATE
+    sine = np.repeat(np.sin(2*math.pi*frequency*time)[:, None], 2, axis=1).astype(np.float32)
+    for start in range(0, len(sine), BLOCKSIZE):
+        effect.process(sine[start:start+BLOCKSIZE])
+    settled = sine[-4800:, 0].astype(np.float64)
+    return math.sqrt(2*np.mean(settled**2))
+
+def test_cutoff_is_three_decibels_down():
+    for filterType in (BiquadFilter.LOWPASS, BiquadFilter.HIGHPASS):
+        effect = BiquadFilter('filter', SAMPLERATE, BLOCKSIZE, filterType, frequency=1000.0)
+        assert math.isclose(20*math.log10(amplitude(effect, 1000.0)), -3.01, abs_tol=0.05)
+
+def test_low_pass_keeps_the_low_frequencies_only():
+    assert math.isclose(amplitude(BiquadFilter('filter', SAMPLERATE, BLOCKSIZE, frequency=1000.0), 100.0), 1.0, abs_tol=0.01)
+    assert amplitude(BiquadFilter('filter', SAMPLERATE, BLOCKSIZE, frequency=1000.0), 10000.0) < 0.02
+
+def test_peak_gain_at_its_frequency():
+    effect = BiquadFilter('filter', SAMPLERATE, BLOCKSIZE, BiquadFilter.PEAK, frequency=1000.0, q=1.0, gain=6.0)
+    assert math.isclose(20*math.log10(amplitude(effect, 1000.0)), 6.0, abs_tol=0.05)
+
+def test_blocks_match_the_recursion_frame_by_frame():
+    coefficients = (0.2, 0.3, 0.1, -0.5, 0.25)
+    biquad = Biquad(64, 1)
+    biquad.setCoefficients(*coefficients)
+    signal = np.random.default_rng(0).standard_normal((256, 1)).astype(np.float32)
+
+    expected = np.empty(256)
+    b0, b1, b2, a1, a2 = coefficients
+    first = second = 0.0
+    for index, sample in enumerate(signal[:, 0].astype(np.float64)):
+        expected[index] = b0*sample + first
+        first, second = b1*sample - a1*expected[index] + second, b2*sample - a2*expected[index]
+
+    for start in range(0, 256, 64):
+        biquad.process(signal[start:start+64])
+    assert np.allclose(signal[:, 0], expected, atol=1e-5)
@@ -0,0 +1,26 @@
+import os
+
+from classes.contentIndex import ContentIndex
+
+def test_a_file_named_by_several_paths_is_not_its_own_copy(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'a.wav').write_bytes(b'sound'*1000)
+    (tmp_path / 'b.wav').write_bytes(b'sound'*1000)
+    os.symlink(tmp_path / 'a.wav', tmp_path / 'link.wav')
+
+    contents = ContentIndex(str(tmp_path / 'contents.json'))
+    contents.scan(['./a.wav', str(tmp_path / 'a.wav'), 'link.wav', 'b.wav'])
+
+    assert contents.duplicates() == [[str(tmp_path / 'a.wav'), str(tmp_path / 'b.wav')]]
+    assert contents.canonical('b.wav') == str(tmp_path / 'a.wav')
+    assert contents.canonical('./a.wav') == './a.wav'
+
+def test_the_index_is_kept_in_the_user_cache_folder(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'cache'))
+
+    contents = ContentIndex()
+    contents.save()
+
+    assert not (tmp_path / ContentIndex.FILENAME).exists()
+    assert os.path.isfile(contents.filepath)
@@ -0,0 +1,36 @@
+import math
+
+import numpy as np
+
+from classes.multimedia.Ducker import Ducker
+
+def blocks(ducker, key, count):
+    for _ in range(count):
+        music = np.ones((480, 2), dtype=np.float32)
+        ducker.process(np.full((480, 2), key, dtype=np.float32), music)
+    return music
+
+def test_attack_lowers_the_music_by_the_depth():
+    ducker = Ducker(48000, 480)
+    ducker.configure(True, threshold=-40.0, depth=12.0, attack=0.05, release=0.4)
+
+    blocks(ducker, 0.5, 5)
+    assert math.isclose(ducker.reduction, 12.0*(1 - math.exp(-1)), rel_tol=1e-6)
+
+    music = blocks(ducker, 0.5, 100)
+    assert ducker.reduction == 12.0
+    assert np.allclose(music, 10**(-12/20))
+
+def test_release_brings_the_music_back():
+    ducker = Ducker(48000, 480)
+    ducker.configure(True, depth=12.0, attack=0.0, release=0.4)
+
+    blocks(ducker, 0.5, 1)
+    assert ducker.reduction == 12.0
+
+    blocks(ducker, 0.0, 40)
+    assert math.isclose(ducker.reduction, 12.0*math.exp(-1), rel_tol=1e-6)
+
+    music = blocks(ducker, 0.0, 400)
+    assert ducker.reduction == 0.0
+    assert np.allclose(music, 1.0)
@@ -0,0 +1,23 @@
+import numpy as np
+
+from classes.multimedia.GainRamp import GainRamp
+
+def test_ramp_reaches_a_target_float32_cannot_represent():
+    ramp = GainRamp(1.0)
+    ramp.set(0.7, 100)
+
+    ramp.apply(np.ones((64, 2), dtype=np.float32))
+    assert ramp.isRamping()
+
+    ramp.apply(np.ones((64, 2), dtype=np.float32))
+    assert not ramp.isRamping()
+    assert ramp.gain == 0.7
+
+def test_steady_gain_after_the_ramp():
+    ramp = GainRamp(0.0)
+    ramp.set(0.3, 10)
+    ramp.apply(np.ones((16, 2), dtype=np.float32))
+
+    block = np.ones((4, 2), dtype=np.float32)
+    ramp.apply(block)
+    assert np.allclose(block, 0.3)
@@ -0,0 +1,32 @@
+import os
+import json
+
+from classes.history import History
+
+def test_the_history_is_kept_in_the_user_data_folder(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('XDG_DATA_HOME', str(tmp_path / 'data'))
+
+    history = History()
+    history.record(History.PLAY, 'a.wav')
+    history.close()
+
+    assert not (tmp_path / History.FOLDERNAME).exists()
+    assert os.path.isfile(os.path.join(history.folder, History.STATISTICSFILENAME))
+    #The history is read by the worker thread, stopped by close()
+    reopened = History(history.folder)
+    reopened.close()
+    assert reopened.statistics('a.wav')["plays"] == 1
+
+def test_logs_that_could_not_be_read_are_not_compacted(tmp_path):
+    folder = tmp_path / 'history'
+    folder.mkdir()
+    (folder / '0.log').write_text(json.dumps([1.0, History.PLAY, 'a.wav'])+'\n', encoding='utf-8')
+    #A folder named like a log can't be opened
+    (folder / '1.log').mkdir()
+
+    history = History(str(folder))
+    history.record(History.PLAY, 'b.wav')
+    history.close()
+
+    assert sorted(os.listdir(folder)) == ['0.log', '1.log']
@@ -0,0 +1,53 @@
+from classes.library.Library import Library
+from classes.library.Track import Track
+
+def library(*tracks):
+    library = Library('library', '')
+    for name, (trackName, segments, playCount) in zip(('forest', 'cave'), tracks):
+        library.add_category(name)
+        library.get_category(name).add_track(trackName, '/music/rain.ogg')
+        track = library.get_category(name).tracks[0]
+        track.segments = segments
+        track.playCount = playCount
+    return library
+
+def test_copies_of_a_track_are_shared():
+    shared = library(('rain', None, 2), ('rain', None, 3))
+
+    assert shared.share_tracks() == 1
+    assert shared.get_category('forest').tracks[0] is shared.get_category('cave').tracks[0]
+    assert shared.get_category('cave').tracks[0].playCount == 5
+
+def test_tracks_renamed_or_cut_differently_stay_apart():
+    renamed = library(('rain', None, 2), ('storm', None, 3))
+    cut = library(('rain', None, 2), ('rain', {"loopStart": 1.0, "loopEnd": 9.0, "barLength": 2.0}, 3))
+
+    for apart in (renamed, cut):
+        assert apart.share_tracks() == 0
+        assert apart.get_category('forest').tracks[0] is not apart.get_category('cave').tracks[0]
+
+def test_adding_a_track_shares_only_an_alike_track():
+    library = Library('library', '')
+    for name in ('forest', 'cave', 'swamp'):
+        library.add_category(name)
+    rain = library.add_track(library.get_category('forest'), Track('rain', '/music/rain.ogg'))
+    cut = Track('rain', '/music/rain.ogg')
+    cut.segments = {"loopStart": 1.0, "loopEnd": 9.0, "barLength": 2.0}
+
+    assert library.add_track(library.get_category('cave'), Track('rain', '/music/rain.ogg')) is rain
+    assert library.add_track(library.get_category('swamp'), Track('storm', '/music/rain.ogg')) is not rain
+    assert library.add_track(library.get_category('swamp'), cut) is cut
+
+def test_a_track_cut_again_is_shared_by_its_new_segments():
+    library = Library('library', '')
+    for name in ('forest', 'cave'):
+        library.add_category(name)
+    rain = library.add_track(library.get_category('forest'), Track('rain', '/music/rain.ogg'))
+    rain.duration = 180000
+    rain.segments = {"loopStart": 1.0, "loopEnd": 9.0, "barLength": 2.0}
+    library.tag_index.update_track(rain)
+
+    assert library.add_track(library.get_category('cave'), Track('rain', '/music/rain.ogg')) is not rain
+    cut = Track('rain', '/music/rain.ogg')
+    cut.segments = {"loopStart": 1.0, "loopEnd": 9.0, "barLength": 2.0}
+    assert library.add_track(library.get_category('cave'), cut) is rain
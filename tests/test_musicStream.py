@@ -0,0 +1,44 @@
+import wave
+
+import numpy as np
+
+from classes.multimedia.MusicStream import MusicStream
+from classes.multimedia.SoundDecoder import SoundDecoder
+
+def writeWave(filepath, frames, sampleRate):
+    with wave.open(str(filepath), 'wb') as waveFile:
+        waveFile.setnchannels(1)
+        waveFile.setsampwidth(2)
+        waveFile.setframerate(sampleRate)
+        waveFile.writeframes((frames*32767).astype('<i2').tobytes())
+
+def test_stream_matches_the_whole_decoding(tmp_path):
+    filepath = tmp_path / 'tone.wav'
+    writeWave(filepath, 0.5*np.sin(np.arange(3*22050)/20), 22050)
+
+    stream = MusicStream(str(filepath), 44100)
+    started = []
+    stream.decode(started.append)
+
+    assert started == [True]
+    assert stream.error is None
+    buffer = SoundDecoder.decode(str(filepath), 44100)
+    assert len(stream) == stream.length() == len(buffer)
+    assert np.allclose(stream[0:len(stream)], buffer, atol=1/MusicStream.SCALE)
+
+def test_frames_not_decoded_yet_are_silent(tmp_path):
+    stream = MusicStream(str(tmp_path / 'missing.wav'), 44100)
+    stream.append(np.full((10, 2), 0.25, dtype=np.float32))
+
+    assert len(stream) > 10
+    block = stream[5:20]
+    assert block.shape == (15, 2)
+    assert np.allclose(block[:5], 0.25) and not block[5:].any()
+
+def test_unreadable_file_never_starts(tmp_path):
+    stream = MusicStream(str(tmp_path / 'missing.wav'), 44100)
+    started = []
+    stream.decode(started.append)
+
+    assert started == [False]
+    assert len(stream) == 0
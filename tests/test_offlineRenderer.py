@@ -0,0 +1,26 @@
+import wave
+
+import numpy as np
+
+from classes.library.Library import Library
+from classes.library.Scene import Scene
+from classes.multimedia.OfflineRenderer import OfflineRenderer
+
+def test_files_decoded_while_scheduling_count_as_decoding_time(tmp_path):
+    filepath = str(tmp_path / 'forest.wav')
+    with wave.open(filepath, 'wb') as waveFile:
+        waveFile.setnchannels(1)
+        waveFile.setsampwidth(2)
+        waveFile.setframerate(22050)
+        waveFile.writeframes(np.zeros(22050, dtype='<i2').tobytes())
+
+    library = Library('library', '')
+    library.add_category('forest')
+    library.get_category('forest').add_track('forest', filepath)
+    library.set_scene(Scene('night', 'forest'))
+
+    renderer = OfflineRenderer(library, seed=1)
+    report = renderer.renderScene('night', str(tmp_path / 'night.wav'), 0.1)
+
+    assert report["missingFiles"] == []
+    assert report["decodingTime"] > 0.0
@@ -0,0 +1,24 @@
+import math
+
+import numpy as np
+
+from classes.multimedia.Panner import Panner
+
+def test_panning_keeps_the_power_constant():
+    pans = np.linspace(-1.0, 1.0, 21)
+    gains = Panner.gains(pans, np.full((21, 2), np.nan)).astype(np.float64)
+
+    assert np.allclose((gains**2).sum(axis=1), 2.0, atol=1e-6)
+    assert np.allclose(gains[0], (math.sqrt(2), 0.0), atol=1e-6)
+    assert np.allclose(gains[10], (1.0, 1.0), atol=1e-6)
+    assert np.allclose(gains[-1], (0.0, math.sqrt(2)), atol=1e-6)
+
+def test_positioned_voices_follow_their_direction_and_distance():
+    locations = np.array([[3.0, 0.0], [0.0, 0.5], [-2.0, 2.0]])
+    gains = Panner.gains(np.zeros(3), locations).astype(np.float64)
+
+    assert np.allclose(gains[0], (0.0, math.sqrt(2)/3), atol=1e-6)
+    assert np.allclose(gains[1], (1.0, 1.0), atol=1e-6)
+    distance = math.hypot(-2.0, 2.0)
+    assert math.isclose((gains[2]**2).sum(), 2/distance**2, rel_tol=1e-5)
+    assert gains[2, 0] > gains[2, 1]
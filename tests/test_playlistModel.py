@@ -0,0 +1,30 @@
+from PyQt5.QtCore import QItemSelectionModel
+
+from classes.library.Category import Category
+from classes.interface.PlaylistModel import PlaylistModel
+
+def playlist(count):
+    category = Category('theme')
+    for number in range(count):
+        category.add_track(str(number), '/music/{}.ogg'.format(number))
+    model = PlaylistModel()
+    model.setCategory(category)
+    return model, QItemSelectionModel(model)
+
+def test_moving_tracks_keeps_the_current_track():
+    model, selection = playlist(8)
+    current = model.track(4)
+    selection.setCurrentIndex(model.index(4), QItemSelectionModel.NoUpdate)
+
+    assert model.moveTrackRows([0, 1, 5], 7) == 4
+
+    assert [track.name for track in model.tracks] == ['2', '3', '4', '6', '0', '1', '5', '7']
+    assert model.track(selection.currentIndex().row()) is current
+
+def test_moved_tracks_stay_selected():
+    model, selection = playlist(5)
+    selection.select(model.index(3), QItemSelectionModel.Select)
+
+    model.moveTrackRows([3], 0)
+
+    assert [index.row() for index in selection.selectedRows()] == [0]
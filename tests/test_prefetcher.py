@@ -0,0 +1,45 @@
+import json
+import time
+
+from classes.commandLine import CommandLine
+from classes.library.Library import Library
+from classes.multimedia.Prefetcher import Prefetcher
+
+def soundFiles(tmp_path):
+    filepaths = []
+    for name in ('rain.wav', 'wind.wav'):
+        (tmp_path / name).write_bytes(b'\0'*(3*Prefetcher.PROBESIZE))
+        filepaths.append(str(tmp_path / name))
+    return filepaths
+
+def test_files_read_ahead_report_their_cold_and_warm_latencies(tmp_path):
+    filepaths = soundFiles(tmp_path)
+    prefetcher = Prefetcher()
+    prefetcher.prefetch(filepaths)
+
+    deadline = time.time() + 5
+    while not all(prefetcher.isWarm(filepath) for filepath in filepaths) and time.time() < deadline:
+        time.sleep(0.01)
+
+    report = prefetcher.latencyReport()
+    assert [filepath for filepath, cold, warm in report] == filepaths
+    assert all(cold >= 0.0 and warm >= 0.0 for filepath, cold, warm in report)
+
+def test_missing_files_are_not_measured(tmp_path):
+    filepaths = soundFiles(tmp_path)
+    report = Prefetcher().measure([filepaths[0], str(tmp_path / 'missing.wav'), filepaths[1]])
+
+    assert [filepath for filepath, cold, warm in report] == filepaths
+
+def test_stats_command_prints_the_latencies(tmp_path, capsys):
+    filepaths = soundFiles(tmp_path)
+    library = Library('library', '')
+    library.add_category('weather')
+    for filepath in filepaths:
+        library.get_category('weather').add_track(filepath, filepath)
+    library.save(str(tmp_path / 'library.json'))
+
+    assert CommandLine.run(['stats', str(tmp_path / 'library.json'), '--latency', '--json']) == 0
+
+    latencies = json.loads(capsys.readouterr().out)["latencies"]
+    assert [filepath for filepath, cold, warm in latencies] == filepaths
@@ -0,0 +1,33 @@
+import math
+
+import numpy as np
+
+from classes.multimedia.Reverb import Reverb
+
+def impulse(reverb, seconds):
+    signal = np.zeros((int(seconds*48000)//512*512, 2), dtype=np.float32)
+    signal[0] = 1.0
+    for start in range(0, len(signal), 512):
+        reverb.process(signal[start:start+512])
+    return signal
+
+def level(signal, start, end):
+    return 10*math.log10(np.mean(signal[int(start*48000):int(end*48000)].astype(np.float64)**2))
+
+def test_tail_starts_after_the_shortest_delay():
+    reverb = Reverb('reverb', 48000, 512, wet=1.0)
+    signal = impulse(reverb, 0.1)
+
+    assert np.all(signal[1:reverb.delays.min(), :] == 0.0)
+    assert np.any(signal[reverb.delays.min(), :] != 0.0)
+
+def test_tail_loses_sixty_decibels_over_the_decay():
+    signal = impulse(Reverb('reverb', 48000, 512, decay=1.0, damping=0.0, wet=1.0), 1.3)
+
+    assert math.isclose(level(signal, 0.1, 0.2) - level(signal, 1.1, 1.2), 60.0, abs_tol=1.0)
+
+def test_dry_reverb_leaves_the_sound_unchanged():
+    signal = impulse(Reverb('reverb', 48000, 512, wet=0.0), 0.5)
+
+    assert signal[0, 0] == 1.0
+    assert not np.any(signal[1:])
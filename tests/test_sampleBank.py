@@ -0,0 +1,26 @@
+from classes.library.Pad import Pad
+from classes.library.SampleBank import SampleBank
+
+def test_pads_are_found_by_their_cell():
+    bank = SampleBank('bank', 2, 2)
+    rain = Pad((0, 1), ['/sounds/rain.wav'])
+    thunder = Pad((3, 0), ['/sounds/thunder.wav'])
+
+    assert bank.set_pad(rain) is None
+    assert bank.set_pad(thunder) is None
+
+    assert bank.get_pad(0, 1) is rain
+    assert bank.get_pad(3, 0) is thunder
+    assert bank.get_pad(1, 1) is None
+    assert (bank.rows, bank.columns) == (4, 2)
+
+def test_a_pad_replaces_the_pad_of_its_cell():
+    bank = SampleBank()
+    rain = Pad((0, 0), ['/sounds/rain.wav'])
+    wind = Pad((0, 0), ['/sounds/wind.wav'])
+    bank.set_pad(rain)
+
+    assert bank.set_pad(wind) is rain
+    assert bank.pads == [wind]
+    assert bank.remove_pad((0, 0)) is wind
+    assert bank.pads == []
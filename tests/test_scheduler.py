@@ -0,0 +1,66 @@
+import random
+
+import numpy as np
+
+from classes.multimedia.Mixer import Mixer
+from classes.multimedia.Scheduler import Scheduler
+from classes.multimedia.Voice import Voice
+
+def test_events_run_by_clock_then_in_the_order_added():
+    scheduler = Scheduler()
+    ran = []
+    for handle, clock in enumerate((30, 10, 20, 10, 30)):
+        scheduler.push(handle, clock, ran.append, (handle,))
+
+    assert scheduler.run(25) == 3
+    assert ran == [1, 3, 2]
+    assert scheduler.run(100) == 2
+    assert ran == [1, 3, 2, 0, 4]
+
+def test_cancelled_and_replaced_events():
+    scheduler = Scheduler()
+    ran = []
+    for handle in range(4):
+        scheduler.push(handle, 10, ran.append, (handle,))
+
+    assert scheduler.remove(1)
+    assert not scheduler.remove(1)
+    #An event replaced runs after the events already waiting at its clock
+    scheduler.push(0, 10, ran.append, ('replaced',))
+    assert scheduler.reschedule(2, 5)
+    assert not scheduler.reschedule(7, 5)
+
+    scheduler.run(11)
+    assert ran == [2, 3, 'replaced']
+    assert len(scheduler) == 0
+
+def test_random_operations_match_a_sorted_list():
+    generator = random.Random(0)
+    scheduler = Scheduler()
+    waiting = {}
+    ran = []
+    for order in range(2000):
+        handle = generator.randrange(200)
+        if generator.random() < 0.3:
+            assert scheduler.remove(handle) == (waiting.pop(handle, None) is not None)
+        else:
+            clock = generator.randrange(1000)
+            scheduler.push(handle, clock, ran.append, (handle,))
+            waiting[handle] = (clock, order)
+
+    scheduler.run(1000)
+    assert ran == sorted(waiting, key=waiting.get)
+
+def test_events_fire_at_their_frame_within_a_block():
+    mixer = Mixer(48000, 512)
+    mixer.play(Voice(np.full((100, 2), 0.5, dtype=np.float32), Mixer.EFFECTSBUS), 700)
+    mixer.notify(600, 'due')
+
+    assert not np.any(mixer.process())
+    assert not mixer.dueEvents
+
+    output = mixer.process()
+    assert list(mixer.dueEvents) == ['due']
+    assert not np.any(output[:188])
+    assert np.allclose(output[188:288], 0.5)
+    assert not np.any(output[288:])
@@ -0,0 +1,23 @@
+from classes.library.Library import Library
+from classes.library.SearchIndex import SearchIndex
+
+def test_changes_made_while_an_index_is_built_are_applied_to_it():
+    library = Library('library', '')
+    library.add_category('tavern')
+    tavern = library.get_category('tavern')
+    tavern.add_track('drunken sailor', '/music/sailor.ogg')
+    tavern.add_track('lute song', '/music/lute.ogg')
+
+    searchIndex = SearchIndex()
+    searchIndex.record_changes()
+    built = SearchIndex()
+    built.index_library(library)
+
+    tavern.add_track('dark cave', '/music/cave.ogg')
+    searchIndex.add_track(tavern, tavern.tracks[-1])
+    searchIndex.remove(tavern.tracks[0])
+    searchIndex.replay_changes(built)
+
+    assert [item.name for kind, item, owner in built.search('dark cave')] == ['dark cave']
+    assert built.search('sailor') == []
+    assert [item.name for kind, item, owner in built.search('song mus')] == ['lute song']
@@ -0,0 +1,26 @@
+import os
+import json
+
+from classes.session import Session
+
+def test_the_session_is_kept_in_the_user_data_folder(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('XDG_DATA_HOME', str(tmp_path / 'data'))
+
+    Session.load()
+    Session.setValue('language', 'English')
+    Session.save()
+
+    assert not (tmp_path / Session.FILENAME).exists()
+    assert str(tmp_path / 'data') in Session._filepath
+    assert os.path.isfile(Session._filepath)
+
+def test_the_session_of_the_previous_versions_is_read(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('XDG_DATA_HOME', str(tmp_path / 'data'))
+    (tmp_path / Session.FILENAME).write_text(json.dumps({'language': 'Français'}), encoding='utf-8')
+
+    Session.load()
+
+    assert Session.value('language') == 'Français'
+    assert str(tmp_path / 'data') in Session._filepath
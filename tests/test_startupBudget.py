@@ -0,0 +1,26 @@
+import os
+import sys
+import subprocess
+
+import pytest
+
+#The audio engine needs Qt Multimedia and its system libraries
+pytest.importorskip('PyQt5.QtMultimedia', exc_type=ImportError)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def startup(tmp_path, *budget):
+    """Start the application offscreen, with StartupTimer.FIRSTPAINTBUDGET unless a budget is given."""
+    environment = dict(os.environ, QT_QPA_PLATFORM='offscreen',
+                        XDG_DATA_HOME=str(tmp_path / 'data'), XDG_CACHE_HOME=str(tmp_path / 'cache'))
+    return subprocess.run([sys.executable, 'DragonShout.py', '--startup-budget'] + [str(seconds) for seconds in budget], cwd=ROOT, env=environment,
+                            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True, timeout=120)
+
+def test_startup_within_the_budget(tmp_path):
+    result = startup(tmp_path)
+    assert result.returncode == 0, result.stdout
+    assert 'First paint after' in result.stdout
+
+def test_startup_over_the_budget_fails(tmp_path):
+    result = startup(tmp_path, 0)
+    assert result.returncode == 1, result.stdout